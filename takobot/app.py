@@ -4,7 +4,6 @@ import argparse
 import asyncio
 from collections import deque
 import contextlib
-import importlib.util
 import json
 import os
 import platform
@@ -14,7 +13,7 @@ import socket
 import subprocess
 import sys
 import time
-from datetime import date, datetime, timezone
+from datetime import date, datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Mapping
@@ -45,8 +44,8 @@ from .config import (
 )
 from .daily import append_daily_note, ensure_daily_log
 from . import dose
-from .ens import DEFAULT_ENS_RPC_URLS, resolve_recipient
 from .git_safety import assert_not_tracked, auto_commit_pending, ensure_local_git_identity, panic_check_runtime_secrets
+from .http_cache import HTTP_CACHE_DIRNAME, configure_http_cache, http_cache_stats_lines
 from .inference import (
     PI_TYPE1_THINKING_DEFAULT,
     PI_TYPE1_MODEL_DEFAULT,
@@ -78,6 +77,15 @@ from .inference import (
     set_inference_preferred_provider,
     stream_inference_prompt_with_fallback,
 )
+from .health_checks import (
+    HEALTH_CACHE_FILE,
+    HealthCheck,
+    dns_check,
+    module_check,
+    run_health_checks,
+    xmtp_runtime_check,
+)
+from .heartbeat_stages import HeartbeatTimings, StageInputs, directory_signature, elapsed_since, file_signature
 from .identity import (
     build_identity_name_intent_prompt,
     build_identity_name_prompt,
@@ -97,15 +105,18 @@ from .input_history import InputHistory
 from .keys import derive_eth_address, load_or_create_keys
 from .life_stage import DEFAULT_LIFE_STAGE, normalize_life_stage_name, stage_policy_for_name, stage_titles_csv
 from .locks import instance_lock
+from .log_writer import append_log_line, configure_log_rotation, shared_log_writer
 from .memory_frontmatter import load_memory_frontmatter_excerpt
 from .jobs import (
     add_job_from_natural_text,
     claim_due_jobs,
     format_jobs_report,
     get_job,
+    jobs_store_path,
     list_jobs,
     looks_like_natural_job_request,
     mark_job_manual_trigger,
+    next_job_due_at,
     remove_job,
     record_job_error,
 )
@@ -124,10 +135,9 @@ from .paths import code_root, daily_root, ensure_code_dir, ensure_runtime_dirs,
 from .problem_tasks import ensure_problem_tasks
 from .ascii_octo import octopus_ascii_for_stage
 from .rag_context import format_focus_summary, focus_profile_from_dose, query_memory_with_ragrep
-from .self_update import run_self_update
-from .skillpacks import seed_openclaw_starter_skills
 from .starter_tools import seed_starter_tools
 from .sensors import CuriositySensor, RSSSensor, Sensor
+from .startup_profile import STARTUP_PROFILE_FILE, StartupProfile, profile_imports
 from .soul import (
     DEFAULT_SOUL_NAME,
     DEFAULT_SOUL_ROLE,
@@ -139,33 +149,17 @@ from .soul import (
     update_mission_objectives,
 )
 from .tool_ops import fetch_webpage, run_local_command, workspace_command_path_prefixes
-from .runtime import EventBus, Runtime, RuntimeHeartbeatTick
-from .xmtp import close_client, create_client, hint_for_xmtp_error, probe_xmtp_runtime, sync_identity_profile
+from .tui_render import PanelRefreshScheduler
+from .runtime import EventBus, EventDedupe, Runtime, RuntimeHeartbeatTick, Type1Inbox
+from .runtime.ingest import TYPE1_SPILL_FILE
+from .runtime.type2_pool import Type2Batch, Type2Pool
+from .xmtp import close_client, create_client, hint_for_xmtp_error, sync_identity_profile
 from .productivity import open_loops as prod_open_loops
 from .productivity import outcomes as prod_outcomes
 from .productivity import promote as prod_promote
 from .productivity import summarize as prod_summarize
 from .productivity import tasks as prod_tasks
 from .productivity import weekly_review as prod_weekly
-from .extensions.analyze import ManifestError, analyze_quarantine
-from .extensions.enable import permissions_ok as ext_permissions_ok
-from .extensions.enable import verify_integrity as ext_verify_integrity
-from .extensions.install import InstallError, install_from_quarantine
-from .extensions.draft import create_draft_extension
-from .extensions.model import PermissionSet as ExtPermissionSet
-from .extensions.model import QuarantineProvenance
-from .extensions.quarantine import QuarantineError, fetch_to_quarantine
-from .extensions.registry import (
-    enable_all_installed as ext_enable_all_installed,
-    drop_pending as ext_drop_pending,
-    get_installed as ext_get_installed,
-    get_pending as ext_get_pending,
-    list_installed as ext_list_installed,
-    list_pending as ext_list_pending,
-    record_installed as ext_record_installed,
-    record_pending as ext_record_pending,
-    set_enabled as ext_set_enabled,
-)
 
 
 HEARTBEAT_JITTER = 0.2
@@ -174,7 +168,9 @@ LOCAL_CHAT_TOTAL_TIMEOUT_S = 420.0
 LOCAL_CHAT_MAX_CHARS = 700
 ACTIVITY_LOG_MAX = 80
 TRANSCRIPT_LOG_MAX = 2000
+TRANSCRIPT_TRIM_BATCH = 200
 STREAM_BOX_MAX_CHARS = 8000
+STREAM_BOX_TRIM_SLACK_CHARS = 2000
 STREAM_BOX_MAX_STATUS_LINES = 40
 LIVE_WORK_ITEMS_MAX = 12
 INPUT_HISTORY_MAX = 200
@@ -387,10 +383,16 @@ class TakoTerminalApp(App[None]):
         padding: 0 1;
     }
 
+    #stream-header {
+        height: auto;
+        max-height: 3;
+        margin: 1 0 0 0;
+        padding: 0 1;
+    }
+
     #stream-box {
         height: 7;
         border: solid $secondary;
-        margin: 1 0 0 0;
         padding: 0 1;
     }
 
@@ -401,10 +403,12 @@ class TakoTerminalApp(App[None]):
 
     BINDINGS = _tui_bindings()
 
-    def __init__(self, *, interval: float = 30.0) -> None:
+    def __init__(self, *, interval: float = 30.0, startup_profile: StartupProfile | None = None) -> None:
         super().__init__()
         self.interval = max(1.0, float(interval))
         self.started_at = time.monotonic()
+        self.startup_profile = startup_profile if startup_profile is not None else StartupProfile()
+        self.boot_ready = asyncio.Event()
 
         self.state = SessionState.BOOTING
         self.mode = "boot"
@@ -468,9 +472,9 @@ class TakoTerminalApp(App[None]):
 
         self.event_log_path: Path | None = None
         self.app_log_path: Path | None = None
-        self.seen_event_ids: set[str] = set()
-        self.type1_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
-        self.type2_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self.event_dedupe = EventDedupe()
+        self.type1_queue = Type1Inbox()
+        self.type2_pool = Type2Pool(self._run_type2_batch, on_repeats=self._note_type2_repeats)
         self.event_bus = EventBus()
         self.event_bus.subscribe(self._enqueue_type1_event)
         self.event_bus.subscribe(self._apply_dose_from_bus_event)
@@ -526,11 +530,23 @@ class TakoTerminalApp(App[None]):
 
         self.activity_entries: deque[str] = deque(maxlen=ACTIVITY_LOG_MAX)
         self.transcript_lines: deque[str] = deque(maxlen=TRANSCRIPT_LOG_MAX)
+        self.transcript_row_counts: deque[int] = deque()
+        self.panel_refresh = PanelRefreshScheduler()
+        self.heartbeat_timings = HeartbeatTimings()
+        self.heartbeat_inputs = StageInputs()
+        self.heartbeat_jobs_next_due: datetime | None = None
+        self.open_loops_cache: list[prod_open_loops.OpenLoop] = []
+        self.open_loop_inputs: tuple[list[prod_tasks.Task], list[prod_outcomes.Outcome]] | None = None
         self.stream_provider = "none"
         self.stream_model = "auto"
         self.stream_status_lines: list[str] = []
         self.live_work_items: deque[str] = deque(maxlen=LIVE_WORK_ITEMS_MAX)
-        self.stream_reply = ""
+        self.stream_reply_chunks: list[str] = []
+        self.stream_reply_chars = 0
+        self.stream_box_pending: list[str] = []
+        self.stream_box_status_text = ""
+        self.stream_box_reload = True
+        self.stream_header_text = ""
         self.stream_active = False
         self.stream_focus = ""
         self.stream_started_at: float | None = None
@@ -542,6 +558,7 @@ class TakoTerminalApp(App[None]):
 
         self.status_bar: Static
         self.transcript: TextArea
+        self.stream_header: Static
         self.stream_box: TextArea
         self.input_box: Input
         self.slash_menu: Static
@@ -569,6 +586,7 @@ class TakoTerminalApp(App[None]):
                 yield Static("", id="panel-memory", classes="panel", markup=False)
                 yield Static("", id="panel-sensors", classes="panel", markup=False)
                 yield Static("", id="panel-activity", classes="panel", markup=False)
+        yield Static("", id="stream-header", markup=False)
         yield TextArea(
             "",
             id="stream-box",
@@ -585,6 +603,7 @@ class TakoTerminalApp(App[None]):
     def on_mount(self) -> None:
         self.status_bar = self.query_one("#status-bar", Static)
         self.transcript = self.query_one("#transcript", TextArea)
+        self.stream_header = self.query_one("#stream-header", Static)
         self.stream_box = self.query_one("#stream-box", TextArea)
         self.input_box = self.query_one("#input-box", Input)
         self.slash_menu = self.query_one("#slash-menu", Static)
@@ -597,8 +616,10 @@ class TakoTerminalApp(App[None]):
         self._ensure_input_focus()
         self.input_worker_task = asyncio.create_task(self._input_worker_loop(), name="tako-input-worker")
         self.set_interval(0.5, self._refresh_status)
-        self.set_interval(1.0 / OCTO_RENDER_FPS, self._refresh_octo_panel)
+        self.set_interval(1.0 / OCTO_RENDER_FPS, self._render_frame)
         self._refresh_panels()
+        self._flush_panels()
+        self.call_after_refresh(self.startup_profile.mark, "first_paint")
         self.boot_task = asyncio.create_task(self._boot())
 
     def on_resize(self, _: events.Resize) -> None:
@@ -765,6 +786,7 @@ class TakoTerminalApp(App[None]):
             if not self.indicator.startswith("type2:"):
                 self._set_indicator("thinking")
             try:
+                await self._wait_for_boot_ready()
                 if self.runtime_service is not None:
                     with contextlib.suppress(Exception):
                         self.runtime_service.handle_input(text)
@@ -789,7 +811,18 @@ class TakoTerminalApp(App[None]):
                     self._set_indicator("idle")
                 self._ensure_input_focus()
 
+    async def _wait_for_boot_ready(self) -> None:
+        # Input typed while booting is held (not rejected) until the first interactive state.
+        if self.state != SessionState.BOOTING or self.boot_ready.is_set():
+            return
+        if self.boot_task is None or self.boot_task.done():
+            return
+        self._add_activity("input", "holding input until boot is ready")
+        await self.boot_ready.wait()
+
     async def _boot(self) -> None:
+        profile = self.startup_profile
+        profile.lap("launch")
         self._set_state(SessionState.BOOTING)
         self.mode = "boot"
         self.runtime_mode = "offline"
@@ -800,10 +833,12 @@ class TakoTerminalApp(App[None]):
         try:
             self.paths = ensure_runtime_dirs(runtime_paths())
             self.app_log_path = self.paths.logs_dir / "app.log"
+            configure_http_cache(self.paths.state_dir / HTTP_CACHE_DIRNAME)
             self.conversations = ConversationStore(self.paths.state_dir)
             root = repo_root()
             self.code_dir = ensure_code_dir(root)
             self._add_activity("workspace", f"code dir ready: {self.code_dir}")
+            profile.lap("workspace")
 
             cfg, warn = load_tako_toml(root / "tako.toml")
             self.config = cfg
@@ -812,6 +847,8 @@ class TakoTerminalApp(App[None]):
             self.life_stage = stage_policy_for_name(cfg.life.stage).stage.value
             self.stage_policy = stage_policy_for_name(self.life_stage)
             self.stage_changed_at = time.monotonic()
+            self._configure_event_ingest()
+            configure_log_rotation(cfg.logging, self.paths.logs_dir)
             if warn:
                 self._write_system(warn)
                 self._add_activity("config", f"warning: {warn}")
@@ -840,6 +877,7 @@ class TakoTerminalApp(App[None]):
                 ),
             )
             self._add_activity("update", f"auto-updates {'on' if self.auto_updates_enabled else 'off'}")
+            profile.lap("config")
 
             self.dose_path = self.paths.state_dir / "dose.json"
             try:
@@ -867,6 +905,7 @@ class TakoTerminalApp(App[None]):
                 self.dose_label = self.dose.label()
                 self.dose_last_emitted_label = self.dose_label
                 self._write_system(f"dose init warning: {_summarize_error(exc)}")
+            profile.lap("dose")
 
             keys_preexisting = self.paths.keys_json.exists()
             operator_preexisting = self.paths.operator_json.exists()
@@ -884,112 +923,57 @@ class TakoTerminalApp(App[None]):
             self.wallet_key = keys["wallet_key"]
             self.db_encryption_key = keys["db_encryption_key"]
             self.address = derive_eth_address(self.wallet_key)
+            profile.lap("keys")
 
             ensure_daily_log(daily_root(), date.today())
             append_daily_note(daily_root(), date.today(), "Interactive terminal app session started.")
 
             self.open_loops_path = self.paths.state_dir / "open_loops.json"
             self._refresh_open_loops(save=True)
+            profile.lap("daily_log")
 
             self.extensions_registry_path = self.paths.state_dir / "extensions.json"
             self.quarantine_root = self.paths.root / "quarantine"
             self.quarantine_root.mkdir(parents=True, exist_ok=True)
-            seeded = seed_openclaw_starter_skills(root, registry_path=self.extensions_registry_path)
-            if seeded.created_skills or seeded.registered_skills:
-                self._add_activity(
-                    "skills",
-                    (
-                        "starter skills synced "
-                        f"(created={len(seeded.created_skills)} registered={len(seeded.registered_skills)})"
-                    ),
-                )
-                append_daily_note(
-                    daily_root(),
-                    date.today(),
-                    (
-                        "OpenClaw starter skills synced: "
-                        f"created={len(seeded.created_skills)} "
-                        f"registered={len(seeded.registered_skills)}"
-                    ),
-                )
-            starter_tools = seed_starter_tools(root)
-            if starter_tools.created:
-                self._add_activity(
-                    "tools",
-                    f"starter tools synced (created={len(starter_tools.created)})",
-                )
-                append_daily_note(
-                    daily_root(),
-                    date.today(),
-                    "Starter tools synced: " + ", ".join(starter_tools.created),
-                )
-            for warning in starter_tools.warnings:
-                self._add_activity("tools", f"starter tools warning: {warning}")
-            enabled_now, installed_total = ext_enable_all_installed(self.extensions_registry_path)
-            if enabled_now:
-                self._add_activity(
-                    "extensions",
-                    f"auto-enabled {enabled_now}/{installed_total} installed extensions",
-                )
-                append_daily_note(
-                    daily_root(),
-                    date.today(),
-                    f"Auto-enabled installed extensions: {enabled_now}/{installed_total}.",
-                )
 
-            self.identity_name, self.identity_role = read_identity()
-            self.mission_objectives = read_mission_objectives()
-            legacy_routines_path = self.paths.state_dir / "routines.txt"
-            if not self.mission_objectives and legacy_routines_path.exists():
-                with contextlib.suppress(Exception):
-                    legacy_routines = _sanitize_for_display(legacy_routines_path.read_text(encoding="utf-8")).strip()
-                    if legacy_routines and legacy_routines.lower() not in {
-                        "no explicit routines yet.",
-                        "no explicit mission objectives yet.",
-                    }:
-                        migrated_objectives = parse_mission_objectives_text(legacy_routines)
-                        if migrated_objectives:
-                            self.mission_objectives = update_mission_objectives(migrated_objectives)
-                            self._add_activity("identity", "mission objectives migrated from legacy routines file")
-            self.routines = (
-                "; ".join(self.mission_objectives)
-                if self.mission_objectives
-                else "No explicit mission objectives yet."
-            )
-            config_path = root / "tako.toml"
-            configured_name = _sanitize_for_display(str(self.config.workspace.name or "")).strip()
-            if configured_name.lower() in {"tako-workspace", "takobot-workspace"}:
-                configured_name = ""
-            if configured_name and configured_name != self.identity_name:
-                previous_name = self.identity_name
-                self.identity_name = configured_name
-                self.identity_name, self.identity_role = update_identity(self.identity_name, self.identity_role)
-                append_daily_note(
-                    daily_root(),
-                    date.today(),
-                    f"Identity name synced from tako.toml: {previous_name} -> {self.identity_name}",
+            # Seeding and inference discovery only touch files/CLIs, so they run in worker
+            # threads while identity sync runs here; results are applied back on the loop.
+            seed_task = asyncio.create_task(
+                profile.timed(
+                    "seed_workspace",
+                    asyncio.to_thread(_seed_workspace_extras, root, self.extensions_registry_path),
                 )
-                self._add_activity("identity", f"name synced from config ({self.identity_name})")
-            elif self.identity_name:
-                ok, _summary = set_workspace_name(config_path, self.identity_name)
-                if ok:
-                    refreshed_cfg, _warn2 = load_tako_toml(config_path)
-                    self.config = refreshed_cfg
-                    self._add_activity("config", "workspace.name synced from identity")
+            )
+            discovery_task = asyncio.create_task(
+                profile.timed("inference_discovery", asyncio.to_thread(discover_inference_runtime))
+            )
+            try:
+                with profile.phase("identity"):
+                    self._sync_boot_identity(root)
+            finally:
+                seed_result, discovered = await asyncio.gather(seed_task, discovery_task, return_exceptions=True)
+            if isinstance(seed_result, BaseException):
+                raise seed_result
+            self._apply_workspace_seed(*seed_result)
             self.instance_kind = (
                 "established"
                 if keys_preexisting or operator_preexisting or xmtp_db_preexisting or state_preexisting
                 else "brand-new"
             )
 
-            self._initialize_inference_runtime()
-            await self._initialize_reasoning_runtime()
-            await self._run_startup_health_check(
-                keys_preexisting=keys_preexisting,
-                operator_preexisting=operator_preexisting,
-                xmtp_db_preexisting=xmtp_db_preexisting,
-                state_preexisting=state_preexisting,
-            )
+            if isinstance(discovered, BaseException):
+                self._note_inference_discovery_error(discovered)
+            else:
+                self._initialize_inference_runtime(discovered)
+            with profile.phase("reasoning_runtime"):
+                await self._initialize_reasoning_runtime()
+            with profile.phase("health_check"):
+                await self._run_startup_health_check(
+                    keys_preexisting=keys_preexisting,
+                    operator_preexisting=operator_preexisting,
+                    xmtp_db_preexisting=xmtp_db_preexisting,
+                    state_preexisting=state_preexisting,
+                )
 
             self._write_tako(f"all set! my XMTP address is {self.address}.")
             self._add_activity("xmtp", f"wallet address ready: {self.address[:12]}...")
@@ -1035,8 +1019,97 @@ class TakoTerminalApp(App[None]):
             )
             self.input_box.disabled = True
         finally:
+            self.boot_ready.set()
             self._set_indicator("idle")
 
+    def _sync_boot_identity(self, root: Path) -> None:
+        self.identity_name, self.identity_role = read_identity()
+        self.mission_objectives = read_mission_objectives()
+        legacy_routines_path = self.paths.state_dir / "routines.txt"
+        if not self.mission_objectives and legacy_routines_path.exists():
+            with contextlib.suppress(Exception):
+                legacy_routines = _sanitize_for_display(legacy_routines_path.read_text(encoding="utf-8")).strip()
+                if legacy_routines and legacy_routines.lower() not in {
+                    "no explicit routines yet.",
+                    "no explicit mission objectives yet.",
+                }:
+                    migrated_objectives = parse_mission_objectives_text(legacy_routines)
+                    if migrated_objectives:
+                        self.mission_objectives = update_mission_objectives(migrated_objectives)
+                        self._add_activity("identity", "mission objectives migrated from legacy routines file")
+        self.routines = (
+            "; ".join(self.mission_objectives)
+            if self.mission_objectives
+            else "No explicit mission objectives yet."
+        )
+        config_path = root / "tako.toml"
+        configured_name = _sanitize_for_display(str(self.config.workspace.name or "")).strip()
+        if configured_name.lower() in {"tako-workspace", "takobot-workspace"}:
+            configured_name = ""
+        if configured_name and configured_name != self.identity_name:
+            previous_name = self.identity_name
+            self.identity_name = configured_name
+            self.identity_name, self.identity_role = update_identity(self.identity_name, self.identity_role)
+            append_daily_note(
+                daily_root(),
+                date.today(),
+                f"Identity name synced from tako.toml: {previous_name} -> {self.identity_name}",
+            )
+            self._add_activity("identity", f"name synced from config ({self.identity_name})")
+        elif self.identity_name:
+            ok, _summary = set_workspace_name(config_path, self.identity_name)
+            if ok:
+                refreshed_cfg, _warn2 = load_tako_toml(config_path)
+                self.config = refreshed_cfg
+                self._add_activity("config", "workspace.name synced from identity")
+
+    def _apply_workspace_seed(
+        self,
+        seeded: Any,
+        starter_tools: Any,
+        enabled_now: int,
+        installed_total: int,
+    ) -> None:
+        if seeded.created_skills or seeded.registered_skills:
+            self._add_activity(
+                "skills",
+                (
+                    "starter skills synced "
+                    f"(created={len(seeded.created_skills)} registered={len(seeded.registered_skills)})"
+                ),
+            )
+            append_daily_note(
+                daily_root(),
+                date.today(),
+                (
+                    "OpenClaw starter skills synced: "
+                    f"created={len(seeded.created_skills)} "
+                    f"registered={len(seeded.registered_skills)}"
+                ),
+            )
+        if starter_tools.created:
+            self._add_activity(
+                "tools",
+                f"starter tools synced (created={len(starter_tools.created)})",
+            )
+            append_daily_note(
+                daily_root(),
+                date.today(),
+                "Starter tools synced: " + ", ".join(starter_tools.created),
+            )
+        for warning in starter_tools.warnings:
+            self._add_activity("tools", f"starter tools warning: {warning}")
+        if enabled_now:
+            self._add_activity(
+                "extensions",
+                f"auto-enabled {enabled_now}/{installed_total} installed extensions",
+            )
+            append_daily_note(
+                daily_root(),
+                date.today(),
+                f"Auto-enabled installed extensions: {enabled_now}/{installed_total}.",
+            )
+
     def _today_outcomes_blank(self) -> bool:
         try:
             daily_path = ensure_daily_log(daily_root(), date.today())
@@ -1091,7 +1164,7 @@ class TakoTerminalApp(App[None]):
             RSSSensor(
                 feeds,
                 poll_minutes=self._stage_world_watch_poll_minutes(),
-                seen_path=self.paths.state_dir / "rss_seen.json",
+                seen_path=self.paths.state_dir / "rss_seen.ids",
             )
         ]
         if self.life_stage == "child":
@@ -1100,7 +1173,7 @@ class TakoTerminalApp(App[None]):
                     sources=["reddit", "hackernews", "wikipedia"],
                     site_urls=list(self.config.world_watch.sites),
                     poll_minutes=max(15, self._stage_world_watch_poll_minutes()),
-                    seen_path=self.paths.state_dir / "curiosity_seen.json",
+                    seen_path=self.paths.state_dir / "curiosity_seen.ids",
                 )
             )
         return sensors
@@ -1153,7 +1226,7 @@ class TakoTerminalApp(App[None]):
         if self.type1_task is None:
             self.type1_task = asyncio.create_task(self._type1_loop(), name="tako-type1")
         if self.type2_task is None:
-            self.type2_task = asyncio.create_task(self._type2_loop(), name="tako-type2")
+            self.type2_task = asyncio.create_task(self.type2_pool.run(), name="tako-type2")
         await self._start_local_heartbeat()
         await self._start_periodic_update_checks()
 
@@ -1169,12 +1242,13 @@ class TakoTerminalApp(App[None]):
             metadata={"event_log": str(self.event_log_path)},
         )
 
-    def _initialize_inference_runtime(self) -> None:
+    def _initialize_inference_runtime(self, runtime: InferenceRuntime | None = None) -> None:
         if self.paths is None:
             return
 
         try:
-            runtime = discover_inference_runtime()
+            if runtime is None:
+                runtime = discover_inference_runtime()
             self.inference_runtime = runtime
             self.inference_last_error = ""
             self.inference_last_provider = runtime.selected_provider or "none"
@@ -1198,17 +1272,20 @@ class TakoTerminalApp(App[None]):
                 },
             )
         except Exception as exc:  # noqa: BLE001
-            self.inference_runtime = None
-            self.inference_last_error = _summarize_error(exc)
-            self.inference_last_provider = "none"
-            self._write_system(f"inference discovery warning: {self.inference_last_error}")
-            self._add_activity("inference", f"discovery warning: {self.inference_last_error}")
-            self._record_event(
-                "inference.runtime.error",
-                f"Inference discovery failed: {exc}",
-                severity="warn",
-                source="startup",
-            )
+            self._note_inference_discovery_error(exc)
+
+    def _note_inference_discovery_error(self, exc: BaseException) -> None:
+        self.inference_runtime = None
+        self.inference_last_error = _summarize_error(exc)
+        self.inference_last_provider = "none"
+        self._write_system(f"inference discovery warning: {self.inference_last_error}")
+        self._add_activity("inference", f"discovery warning: {self.inference_last_error}")
+        self._record_event(
+            "inference.runtime.error",
+            f"Inference discovery failed: {exc}",
+            severity="warn",
+            source="startup",
+        )
 
     def _maybe_open_inference_gate_for_turn(self, text: str) -> None:
         if self.inference_gate_open:
@@ -1246,13 +1323,37 @@ class TakoTerminalApp(App[None]):
 
         disk = shutil.disk_usage(self.paths.root)
         disk_free_mb = int(disk.free / (1024 * 1024))
-        dns_xmtp_ok = _dns_lookup_ok("grpc.production.xmtp.network")
-        xmtp_runtime_ok, xmtp_runtime_status = probe_xmtp_runtime()
-        web3_import_ok = importlib.util.find_spec("web3") is not None
-        textual_import_ok = importlib.util.find_spec("textual") is not None
-        git_identity_ok, git_identity_detail, git_identity_auto_configured = ensure_local_git_identity(
-            repo_root(),
-            identity_name=self.identity_name,
+        git_identity_state: dict[str, bool] = {}
+        identity_name = self.identity_name
+
+        def probe_git_identity() -> tuple[bool, str]:
+            ok, detail, auto_configured = ensure_local_git_identity(repo_root(), identity_name=identity_name)
+            git_identity_state["auto_configured"] = auto_configured
+            return ok, detail
+
+        checks = [
+            dns_check("grpc.production.xmtp.network"),
+            xmtp_runtime_check(),
+            module_check("web3_import", "web3"),
+            module_check("textual_import", "textual"),
+            HealthCheck(name="git_identity", probe=probe_git_identity, timeout_s=15.0),
+        ]
+        checks_started_at = time.perf_counter()
+        results = await asyncio.to_thread(
+            run_health_checks,
+            checks,
+            cache_path=self.paths.state_dir / HEALTH_CACHE_FILE,
+        )
+        dns_xmtp_ok = results["dns_xmtp"].ok
+        xmtp_runtime_ok, xmtp_runtime_status = results["xmtp_runtime"].ok, results["xmtp_runtime"].detail
+        web3_import_ok = results["web3_import"].ok
+        textual_import_ok = results["textual_import"].ok
+        git_identity_ok, git_identity_detail = results["git_identity"].ok, results["git_identity"].detail
+        git_identity_auto_configured = git_identity_state.get("auto_configured", False)
+        cached_checks = sum(1 for result in results.values() if result.cached)
+        self._add_activity(
+            "health",
+            f"{len(results)} checks ({cached_checks} cached) in {elapsed_since(checks_started_at) * 1000.0:.0f}ms",
         )
         if git_identity_ok and git_identity_auto_configured:
             self._add_activity("git", f"identity auto-configured ({git_identity_detail})")
@@ -1283,6 +1384,7 @@ class TakoTerminalApp(App[None]):
             "git_identity_auto_configured": _yes_no(git_identity_auto_configured),
             "dns_xmtp": _yes_no(dns_xmtp_ok),
             "python": platform.python_version(),
+            "health_check_timings": ", ".join(f"{name}={result.timing_text()}" for name, result in results.items()),
         }
         if self.inference_runtime is not None:
             self.health_summary["inference_selected"] = self.inference_runtime.selected_provider or "none"
@@ -1450,15 +1552,23 @@ class TakoTerminalApp(App[None]):
             )
         )
 
+    def _configure_event_ingest(self) -> None:
+        events_cfg = self.config.events
+        self.event_dedupe.configure(capacity=events_cfg.dedupe_max, window_s=events_cfg.dedupe_window_seconds)
+        self.type1_queue.configure(
+            maxsize=events_cfg.type1_queue_max,
+            policy=events_cfg.type1_overflow,
+            spill_path=self.paths.state_dir / TYPE1_SPILL_FILE if self.paths is not None else None,
+        )
+
     def _enqueue_type1_event(self, event: dict[str, Any]) -> None:
         event_id = str(event.get("id") or "")
-        if event_id and event_id in self.seen_event_ids:
+        if event_id and self.event_dedupe.seen(event_id):
             return
-        if event_id:
-            self.seen_event_ids.add(event_id)
         self.event_total_ingested += 1
-        with contextlib.suppress(asyncio.QueueFull):
-            self.type1_queue.put_nowait(event)
+        outcome = self.type1_queue.put_nowait(event)
+        if outcome != "queued":
+            self._refresh_panels("sensors")
 
     def _apply_dose_from_bus_event(self, event: dict[str, Any]) -> None:
         if self.dose is None:
@@ -1500,32 +1610,48 @@ class TakoTerminalApp(App[None]):
                 source="type1",
                 metadata={"event_type": event_type, "depth": depth, "reason": reason},
             )
-            await self.type2_queue.put({"event": event, "depth": depth, "reason": reason})
+            self.type2_pool.submit(event, depth=depth, reason=reason)
 
-    async def _type2_loop(self) -> None:
-        while True:
-            payload = await self.type2_queue.get()
-            event = payload.get("event")
-            depth = str(payload.get("depth", "medium"))
-            reason = str(payload.get("reason", "serious signal"))
-            if not isinstance(event, dict):
-                continue
-            if not self._consume_type2_budget():
-                event_type = str(event.get("type", "unknown"))
-                self._record_event(
-                    "type2.budget.exhausted",
-                    f"Type2 budget exhausted for {self.type2_budget_day}; deferred {event_type}.",
-                    severity="warn",
-                    source="type2",
-                    metadata={
-                        "event_type": event_type,
-                        "budget": self.stage_policy.type2_budget_per_day,
-                        "used": self.type2_budget_used_today,
-                        "stage": self.life_stage,
-                    },
-                )
-                continue
-            await self._run_type2_thinking(event, depth=depth, reason=reason)
+    async def _run_type2_batch(self, batch: Type2Batch) -> None:
+        # Escalations sharing a root cause cost one budget unit and one reasoning pass.
+        if not self._consume_type2_budget():
+            event_type = str(batch.event.get("type", "unknown"))
+            self._record_event(
+                "type2.budget.exhausted",
+                f"Type2 budget exhausted for {self.type2_budget_day}; deferred {event_type} (x{batch.occurrences}).",
+                severity="warn",
+                source="type2",
+                metadata={
+                    "event_type": event_type,
+                    "occurrences": batch.occurrences,
+                    "budget": self.stage_policy.type2_budget_per_day,
+                    "used": self.type2_budget_used_today,
+                    "stage": self.life_stage,
+                },
+            )
+            return
+        self._set_indicator(f"type2:{batch.depth}")
+        try:
+            await self._run_type2_thinking(
+                batch.event,
+                depth=batch.depth,
+                reason=batch.reason,
+                occurrences=batch.occurrences,
+            )
+        finally:
+            if self.type2_pool.metrics.in_flight <= 1:
+                self._set_indicator("idle")
+
+    def _note_type2_repeats(self, batch: Type2Batch, repeats: int) -> None:
+        # Repeats folded in after the Type2 pass started never reached its prompt; surface them here.
+        event_type = str(batch.event.get("type", "unknown"))
+        self._add_activity("type2", f"{event_type}: +{repeats} repeats since the last Type2 pass")
+        self._record_event(
+            "type2.repeats",
+            f"{event_type} repeated {repeats} more time(s) since its Type2 pass ({batch.occurrences} total).",
+            source="type2",
+            metadata={"event_type": event_type, "repeats": repeats, "occurrences": batch.occurrences},
+        )
 
     def _roll_type2_budget_day(self) -> None:
         today_iso = date.today().isoformat()
@@ -1547,15 +1673,14 @@ class TakoTerminalApp(App[None]):
         self.type2_budget_exhausted_noted = False
         return True
 
-    async def _run_type2_thinking(self, event: dict[str, Any], *, depth: str, reason: str) -> None:
-        sleep_s = {"light": 0.15, "medium": 0.4, "deep": 0.9}.get(depth, 0.4)
-        previous_indicator = self.indicator
-        self._set_indicator(f"type2:{depth}")
-        try:
-            await asyncio.sleep(sleep_s)
-        finally:
-            self._set_indicator(previous_indicator if previous_indicator.startswith("type2:") else "idle")
-
+    async def _run_type2_thinking(
+        self,
+        event: dict[str, Any],
+        *,
+        depth: str,
+        reason: str,
+        occurrences: int = 1,
+    ) -> None:
         event_type = str(event.get("type", "unknown"))
         message = str(event.get("message", ""))
         recommendation = _type2_recommendation(event_type, message)
@@ -1574,6 +1699,7 @@ class TakoTerminalApp(App[None]):
                 depth=depth,
                 reason=reason,
                 fallback=recommendation,
+                occurrences=occurrences,
                 memory_frontmatter=load_memory_frontmatter_excerpt(root=repo_root(), max_chars=700),
                 focus_summary=focus_summary,
                 rag_context=rag_context,
@@ -1638,17 +1764,27 @@ class TakoTerminalApp(App[None]):
                 )
         self.type2_escalations += 1
         self.type2_last = f"{event_type}:{depth}:{model_used}"
-        self._write_system(f"Type2[{depth}] ({model_used}): {recommendation}")
+        repeat_note = f" (x{occurrences})" if occurrences > 1 else ""
+        self._write_system(f"Type2[{depth}] ({model_used}){repeat_note}: {recommendation}")
         append_daily_note(
             daily_root(),
             date.today(),
-            f"Type2 escalation ({depth}) on {event_type} via {model_used}: {reason}. Recommendation: {recommendation}",
+            (
+                f"Type2 escalation ({depth}) on {event_type}{repeat_note} via {model_used}: {reason}. "
+                f"Recommendation: {recommendation}"
+            ),
         )
         self._record_event(
             "type2.result",
             recommendation,
             source="type2",
-            metadata={"event_type": event_type, "depth": depth, "reason": reason, "model_used": model_used},
+            metadata={
+                "event_type": event_type,
+                "depth": depth,
+                "reason": reason,
+                "model_used": model_used,
+                "occurrences": occurrences,
+            },
         )
 
     def _assess_event_for_type2(self, event: dict[str, Any]) -> tuple[bool, str, str]:
@@ -1945,6 +2081,8 @@ class TakoTerminalApp(App[None]):
             metadata={"handle": handle},
         )
 
+        from .ens import DEFAULT_ENS_RPC_URLS, resolve_recipient
+
         try:
             resolved = resolve_recipient(handle, list(DEFAULT_ENS_RPC_URLS))
         except Exception as exc:  # noqa: BLE001
@@ -2483,6 +2621,8 @@ class TakoTerminalApp(App[None]):
 
     async def _run_periodic_update_check(self) -> None:
         try:
+            from .self_update import run_self_update
+
             result = await asyncio.to_thread(run_self_update, repo_root(), apply=False)
         except Exception as exc:  # noqa: BLE001
             summary = f"update check failed: {_summarize_error(exc)}"
@@ -2534,6 +2674,8 @@ class TakoTerminalApp(App[None]):
         self._record_event("update.auto.apply.start", message, source="update", metadata={"detail": detail})
 
         try:
+            from .self_update import run_self_update
+
             result = await asyncio.to_thread(run_self_update, repo_root(), apply=True)
         except Exception as exc:  # noqa: BLE001
             summary = f"auto-update failed: {_summarize_error(exc)}"
@@ -2577,6 +2719,8 @@ class TakoTerminalApp(App[None]):
         if not argv_tail:
             argv_tail = ["app", "--interval", str(self.interval)]
         args = [sys.executable, "-m", "takobot", *argv_tail]
+        # execv skips atexit, so drain queued log lines first.
+        shared_log_writer().flush()
         try:
             os.execv(sys.executable, args)
         except OSError as exc:
@@ -2595,7 +2739,8 @@ class TakoTerminalApp(App[None]):
     async def _on_runtime_heartbeat_tick(self, tick: RuntimeHeartbeatTick) -> None:
         if self.safe_mode:
             return
-        ensure_daily_log(daily_root(), date.today())
+        tick_started = time.perf_counter()
+        await self._heartbeat_stage("daily_log", self._heartbeat_daily_log)
         self.heartbeat_ticks = tick.tick
         now = tick.at_wall
         if self.dose is not None:
@@ -2628,13 +2773,86 @@ class TakoTerminalApp(App[None]):
         if self.dose is not None and self.dose_path is not None:
             should_save = label_changed or (self.heartbeat_ticks % 5 == 0)
             if should_save:
-                try:
-                    dose.save(self.dose_path, self.dose)
-                except Exception as exc:  # noqa: BLE001
-                    self._write_system(f"dose save warning: {_summarize_error(exc)}")
+                await self._heartbeat_stage("dose_save", self._heartbeat_dose_save)
+        await self._heartbeat_stage("jobs", self._heartbeat_due_jobs)
+        await self._heartbeat_stage("open_loops", self._heartbeat_open_loops)
+        await self._heartbeat_stage("git", self._run_git_autocommit)
+        self.heartbeat_timings.tick.observe(elapsed_since(tick_started))
+
+    async def _heartbeat_stage(self, name: str, stage) -> None:
+        # Stages return False when their inputs were unchanged and the work was skipped.
+        started_at = time.perf_counter()
+        ran = await stage()
+        if ran is False:
+            self.heartbeat_timings.record_skip(name)
+            return
+        self.heartbeat_timings.record(name, elapsed_since(started_at))
+
+    async def _heartbeat_daily_log(self) -> bool:
+        today = date.today()
+        daily_path = daily_root() / f"{today.isoformat()}.md"
+        signature = (today.isoformat(), file_signature(daily_path)[0][1] >= 0)
+        if self.heartbeat_inputs.unchanged("daily_log", signature):
+            return False
+        await asyncio.to_thread(ensure_daily_log, daily_root(), today)
+        self.heartbeat_inputs.remember("daily_log", (today.isoformat(), True))
+        return True
+
+    async def _heartbeat_dose_save(self) -> None:
+        if self.dose is None or self.dose_path is None:
+            return
+        try:
+            await asyncio.to_thread(dose.save, self.dose_path, self.dose)
+        except Exception as exc:  # noqa: BLE001
+            self._write_system(f"dose save warning: {_summarize_error(exc)}")
+
+    async def _heartbeat_due_jobs(self) -> bool:
+        if self.paths is None:
+            return False
+        signature = file_signature(jobs_store_path(self.paths.state_dir))
+        next_due = self.heartbeat_jobs_next_due
+        if self.heartbeat_inputs.unchanged("jobs", signature) and (
+            next_due is None or datetime.now().astimezone() < next_due
+        ):
+            return False
         await self._run_due_jobs()
-        self._refresh_open_loops(save=True)
-        await self._run_git_autocommit()
+        state_dir = self.paths.state_dir
+        self.heartbeat_jobs_next_due = await asyncio.to_thread(next_job_due_at, state_dir)
+        self.heartbeat_inputs.remember("jobs", file_signature(jobs_store_path(state_dir)))
+        return True
+
+    async def _heartbeat_open_loops(self) -> bool:
+        if self.paths is None:
+            return False
+        root = repo_root()
+        daily_path = daily_root() / f"{date.today().isoformat()}.md"
+        session = self._open_loops_session()
+        signal_ids = tuple(loop.id for loop in self.signal_loops)
+        signature = await asyncio.to_thread(
+            lambda: (
+                directory_signature(prod_tasks.tasks_root(root)),
+                file_signature(daily_path),
+                tuple(sorted(session.items())),
+                signal_ids,
+            )
+        )
+        if self.heartbeat_inputs.unchanged("open_loops", signature) and self.open_loop_inputs is not None:
+            # Files are unchanged: rebuild from the parsed tasks/outcomes so session and
+            # outcome loops (stamped "now") do not start aging from the last full pass.
+            tasks, outcomes = self.open_loop_inputs
+            loops = _build_open_loops(tasks, outcomes, session, list(self.signal_loops))
+            self._apply_open_loops(tasks, outcomes, loops)
+            return False
+        tasks, outcomes, loops = await asyncio.to_thread(
+            _compute_open_loops,
+            root,
+            session,
+            list(self.signal_loops),
+            self.open_loops_path,
+        )
+        self._apply_open_loops(tasks, outcomes, loops)
+        self.heartbeat_inputs.remember("open_loops", signature)
+        return True
 
     def _on_runtime_briefing(self, message: str) -> None:
         self._write_tako(message)
@@ -3012,7 +3230,14 @@ class TakoTerminalApp(App[None]):
                 f"events_written: {self.event_bus.events_written}",
                 f"events_ingested: {self.event_total_ingested}",
                 f"type1_processed: {self.type1_processed}",
+                *self.type1_queue.lines(),
+                (
+                    f"event_dedupe: ids={len(self.event_dedupe)}/{self.event_dedupe.capacity} "
+                    f"duplicates={self.event_dedupe.duplicates} evicted={self.event_dedupe.evicted}"
+                ),
                 f"type2_escalations: {self.type2_escalations}",
+                *self.type2_pool.lines(),
+                shared_log_writer().stats_line(),
                 f"open_tasks: {self.open_tasks_count}",
                 f"open_loops: {loops_count}",
                 f"world_watch_feeds: {len(self.config.world_watch.feeds)}",
@@ -3027,6 +3252,10 @@ class TakoTerminalApp(App[None]):
                 f"stage_explore_interval_minutes: {self.stage_policy.explore_interval_minutes}",
                 f"type2_budget_used: {self.type2_budget_used_today}/{self.stage_policy.type2_budget_per_day}",
             ]
+            lines.extend(http_cache_stats_lines())
+            lines.extend(self.panel_refresh.stats.lines())
+            lines.extend(self.heartbeat_timings.lines())
+            lines.extend(self.startup_profile.lines())
             if self.dose is None:
                 lines.append("dose: not ready")
             else:
@@ -3683,6 +3912,8 @@ class TakoTerminalApp(App[None]):
                 if self.extensions_registry_path is None:
                     self._write_tako("review pending unavailable: runtime paths missing.")
                     return
+                from .extensions.registry import list_pending as ext_list_pending
+
                 pending = ext_list_pending(self.extensions_registry_path)
                 if not pending:
                     self._write_tako("pending installs: none")
@@ -3977,6 +4208,8 @@ class TakoTerminalApp(App[None]):
                 metadata={"apply": apply_update},
             )
             try:
+                from .self_update import run_self_update
+
                 result = await asyncio.to_thread(run_self_update, repo_root(), apply=apply_update)
             except Exception as exc:  # noqa: BLE001
                 summary = _summarize_error(exc)
@@ -4014,6 +4247,8 @@ class TakoTerminalApp(App[None]):
             if self.extensions_registry_path is None:
                 self._write_tako("extensions unavailable: runtime paths missing.")
                 return
+            from .extensions.registry import list_installed as ext_list_installed
+
             tail = rest.strip().lower()
             kind = None
             if tail in {"skill", "skills"}:
@@ -4038,6 +4273,17 @@ class TakoTerminalApp(App[None]):
             if self.paths is None or self.extensions_registry_path is None or self.quarantine_root is None:
                 self._write_tako("install unavailable: runtime paths missing.")
                 return
+            from .extensions.analyze import ManifestError, analyze_quarantine
+            from .extensions.install import InstallError, install_from_quarantine
+            from .extensions.model import PermissionSet as ExtPermissionSet
+            from .extensions.model import QuarantineProvenance
+            from .extensions.quarantine import QuarantineError, fetch_to_quarantine
+            from .extensions.registry import (
+                drop_pending as ext_drop_pending,
+                get_pending as ext_get_pending,
+                record_installed as ext_record_installed,
+                record_pending as ext_record_pending,
+            )
 
             parts = rest.strip().split()
             if not parts:
@@ -4248,6 +4494,11 @@ class TakoTerminalApp(App[None]):
             if self.extensions_registry_path is None:
                 self._write_tako("enable unavailable: runtime paths missing.")
                 return
+            from .extensions.enable import permissions_ok as ext_permissions_ok
+            from .extensions.enable import verify_integrity as ext_verify_integrity
+            from .extensions.model import PermissionSet as ExtPermissionSet
+            from .extensions.registry import get_installed as ext_get_installed
+            from .extensions.registry import set_enabled as ext_set_enabled
             parts = rest.strip().split(maxsplit=1)
             if len(parts) < 2:
                 self._write_tako("usage: `enable skill <name>` or `enable tool <name>`")
@@ -4298,6 +4549,7 @@ class TakoTerminalApp(App[None]):
             if self.extensions_registry_path is None:
                 self._write_tako("draft unavailable: runtime paths missing.")
                 return
+            from .extensions.draft import create_draft_extension
             parts = rest.strip().split(maxsplit=1)
             if len(parts) < 2:
                 self._write_tako("usage: `draft skill <name>` or `draft tool <name>`")
@@ -4493,12 +4745,15 @@ class TakoTerminalApp(App[None]):
         self.stream_provider = "none"
         self.stream_model = "auto"
         self.stream_status_lines = []
-        self.stream_reply = ""
+        self._stream_reset_reply()
         self.stream_focus = ""
         self.stream_started_at = None
         self.stream_last_render_at = 0.0
         if hasattr(self, "stream_box"):
+            self.stream_header_text = ""
+            self.stream_header.update("")
             self.stream_box.load_text("")
+            self.stream_box_reload = False
 
     def _stream_begin(self, *, focus: str = "") -> None:
         self.stream_active = True
@@ -4506,7 +4761,7 @@ class TakoTerminalApp(App[None]):
         self.stream_model = "auto"
         self.stream_status_lines = []
         self.live_work_items.clear()
-        self.stream_reply = ""
+        self._stream_reset_reply()
         self.stream_focus = _stream_focus_summary(focus)
         self.stream_started_at = time.monotonic()
         self.stream_last_render_at = 0.0
@@ -4516,7 +4771,7 @@ class TakoTerminalApp(App[None]):
         if kind == "provider":
             self.stream_provider = payload.strip() or self.stream_provider
             self._add_activity("inference", f"provider attempt: {self.stream_provider}")
-            self._append_app_log("inference", f"provider={self.stream_provider}")
+            self._append_app_log("inference", "provider-attempt", provider=self.stream_provider)
             self._stream_render(force=True)
             return
 
@@ -4525,7 +4780,7 @@ class TakoTerminalApp(App[None]):
             self.stream_status_lines.append(f"model: {self.stream_model}")
             if len(self.stream_status_lines) > STREAM_BOX_MAX_STATUS_LINES:
                 self.stream_status_lines = self.stream_status_lines[-STREAM_BOX_MAX_STATUS_LINES :]
-            self._append_app_log("inference", f"model={self.stream_model}")
+            self._append_app_log("inference", "model-selected", model=self.stream_model)
             self._add_activity("inference", f"model selected: {self.stream_model}")
             self._stream_render(force=True)
             return
@@ -4538,7 +4793,7 @@ class TakoTerminalApp(App[None]):
             self.stream_status_lines.append(f"task: {line}")
             if len(self.stream_status_lines) > STREAM_BOX_MAX_STATUS_LINES:
                 self.stream_status_lines = self.stream_status_lines[-STREAM_BOX_MAX_STATUS_LINES :]
-            self._append_app_log("inference", f"task={_summarize_text(line)}")
+            self._append_app_log("inference", "task", text=_summarize_text(line))
             self._add_activity("research", line)
             self._stream_render()
             return
@@ -4551,7 +4806,7 @@ class TakoTerminalApp(App[None]):
             if hinted_task:
                 self._note_live_work(hinted_task)
             self._append_stream_status_line(line)
-            self._append_app_log("inference", f"status={_summarize_text(line)}")
+            self._append_app_log("inference", "status", text=_summarize_text(line))
             self._stream_render()
             return
 
@@ -4559,12 +4814,33 @@ class TakoTerminalApp(App[None]):
             delta = _sanitize_for_display(payload)
             if not delta:
                 return
-            self.stream_reply += delta
-            if len(self.stream_reply) > STREAM_BOX_MAX_CHARS:
-                self.stream_reply = self.stream_reply[-STREAM_BOX_MAX_CHARS :]
+            self._stream_append_reply(delta)
             self._stream_render()
             return
 
+    @property
+    def stream_reply(self) -> str:
+        return "".join(self.stream_reply_chunks)
+
+    def _stream_reset_reply(self) -> None:
+        self.stream_reply_chunks = []
+        self.stream_reply_chars = 0
+        self.stream_box_pending = []
+        self.stream_box_status_text = ""
+        self.stream_box_reload = True
+
+    def _stream_append_reply(self, delta: str) -> None:
+        self.stream_reply_chunks.append(delta)
+        self.stream_reply_chars += len(delta)
+        self.stream_box_pending.append(delta)
+        if self.stream_reply_chars > STREAM_BOX_MAX_CHARS + STREAM_BOX_TRIM_SLACK_CHARS:
+            # Compact in batches so trimming stays amortized O(1) per streamed character.
+            tail = self.stream_reply[-STREAM_BOX_MAX_CHARS:]
+            self.stream_reply_chunks = [tail]
+            self.stream_reply_chars = len(tail)
+            self.stream_box_pending = []
+            self.stream_box_reload = True
+
     def _note_live_work(self, detail: str) -> None:
         item = _summarize_text(" ".join(_sanitize_for_display(detail).split()))
         if not item:
@@ -4572,7 +4848,7 @@ class TakoTerminalApp(App[None]):
         if self.live_work_items and self.live_work_items[0] == item:
             return
         self.live_work_items.appendleft(item)
-        self._refresh_panels()
+        self._refresh_panels("tasks")
 
     def _append_stream_status_line(self, line: str) -> None:
         merged = _merge_thinking_status_line(self.stream_status_lines, line)
@@ -4588,26 +4864,40 @@ class TakoTerminalApp(App[None]):
         if not force and (now - self.stream_last_render_at) < 0.05:
             return
         self.stream_last_render_at = now
+        if not hasattr(self, "stream_box"):
+            return
 
         elapsed_s = 0
         if self.stream_started_at is not None:
             elapsed_s = int(max(0.0, time.monotonic() - self.stream_started_at))
         header = (
             f"bubble stream: provider={self.stream_provider} model={self.stream_model} | "
-            f"mind={self._thinking_visual()} | elapsed={elapsed_s}s\n"
+            f"mind={self._thinking_visual()} | elapsed={elapsed_s}s"
         )
-        focus = f"focus: {self.stream_focus}\n" if self.stream_focus else ""
-        status = ""
-        if self.stream_status_lines:
-            status = "\n".join(self.stream_status_lines) + "\n\n"
-        elif self.stream_active and elapsed_s >= 3:
-            status = "thinking about the current request...\n\n"
-
-        caret = "|" if self.stream_active else ""
-        body = self.stream_reply + caret
-
-        self.stream_box.load_text(header + focus + status + body)
-        self.stream_box.scroll_end(animate=False)
+        if self.stream_focus:
+            header += f"\nfocus: {self.stream_focus}"
+        if not self.stream_status_lines and self.stream_active and elapsed_s >= 3:
+            header += "\nthinking about the current request..."
+        if header != self.stream_header_text:
+            self.stream_header_text = header
+            self.stream_header.update(header)
+
+        # The box holds the status lines followed by the reply body. Only the small
+        # status block is ever rewritten; reply deltas are appended at the end.
+        status = "\n".join(self.stream_status_lines) + "\n\n" if self.stream_status_lines else ""
+        box = self.stream_box
+        if self.stream_box_reload:
+            box.load_text(status + self.stream_reply)
+            self.stream_box_reload = False
+        else:
+            if status != self.stream_box_status_text:
+                rows = self.stream_box_status_text.count("\n")
+                box.replace(status, (0, 0), (rows, 0))
+            if self.stream_box_pending:
+                box.insert("".join(self.stream_box_pending), box.document.end)
+        self.stream_box_status_text = status
+        self.stream_box_pending = []
+        box.scroll_end(animate=False)
 
     def _ready_inference_providers(self) -> list[str]:
         runtime = self.inference_runtime
@@ -4749,13 +5039,11 @@ class TakoTerminalApp(App[None]):
             )
         self._append_app_log(
             "inference",
-            (
-                "chat-start "
-                f"selected={self.inference_runtime.selected_provider or 'none'} "
-                f"ready={','.join(ready_providers) or 'none'} "
-                f"per_provider_timeout={LOCAL_CHAT_TIMEOUT_S:.0f}s "
-                f"total_timeout={LOCAL_CHAT_TOTAL_TIMEOUT_S:.0f}s"
-            ),
+            "chat-start",
+            selected=self.inference_runtime.selected_provider or "none",
+            ready=",".join(ready_providers) or "none",
+            per_provider_timeout=f"{LOCAL_CHAT_TIMEOUT_S:.0f}s",
+            total_timeout=f"{LOCAL_CHAT_TOTAL_TIMEOUT_S:.0f}s",
         )
         started_at = time.monotonic()
         watchdog_stop = asyncio.Event()
@@ -4847,10 +5135,10 @@ class TakoTerminalApp(App[None]):
         self.inference_ever_used = True
         self.inference_last_provider = provider
         self.inference_last_error = ""
-        self._append_app_log("inference", f"chat-success provider={provider} elapsed={elapsed_s}s")
+        self._append_app_log("inference", "chat-success", provider=provider, elapsed=f"{elapsed_s}s")
         if provider == "pi":
-            self._append_app_log("pi-chat", f"user={_summarize_text(_sanitize_for_display(text))}")
-            self._append_app_log("pi-chat", f"assistant={_summarize_text(cleaned)}")
+            self._append_app_log("pi-chat", "user", text=_summarize_text(_sanitize_for_display(text)))
+            self._append_app_log("pi-chat", "assistant", text=_summarize_text(cleaned))
         self._add_activity("inference", f"terminal chat used provider={provider}")
         self._record_event(
             "inference.chat.reply",
@@ -5412,11 +5700,14 @@ class TakoTerminalApp(App[None]):
         await self._stop_xmtp_runtime()
         await self._stop_local_heartbeat()
         await _cancel_task(self.type1_task)
+        with contextlib.suppress(Exception):
+            await self.type1_queue.flush_spill()
         await _cancel_task(self.type2_task)
         await _cancel_task(self.runtime_update_restart_task)
         self.type1_task = None
         self.type2_task = None
         self.runtime_update_restart_task = None
+        await asyncio.to_thread(shared_log_writer().flush)
 
         if self.lock_context is not None and self.lock_acquired:
             with contextlib.suppress(Exception):
@@ -5426,7 +5717,10 @@ class TakoTerminalApp(App[None]):
 
     def _set_state(self, state: SessionState) -> None:
         self.state = state
-        self._refresh_panels()
+        if state != SessionState.BOOTING and not self.boot_ready.is_set():
+            self.startup_profile.mark("first_input")
+            self.boot_ready.set()
+        self._refresh_panels("tasks")
 
     def _set_indicator(self, indicator: str) -> None:
         self.indicator = indicator
@@ -5560,36 +5854,35 @@ class TakoTerminalApp(App[None]):
         panel_width = 0
         with contextlib.suppress(Exception):
             panel_width = int(getattr(self.octo_panel, "size").width)
-        self.octo_panel.update(
-            _octopus_panel_text(
-                self.life_stage,
-                int((time.monotonic() - self.started_at) * OCTO_RENDER_FPS),
-                panel_width=panel_width,
-                version=__version__,
-                stage_title=self.stage_policy.title,
-                stage_tone=self.stage_policy.tone,
-                dose_state=self.dose,
-                dose_label=self.dose_label,
-                thinking=thinking or self._thinking_visual(),
-            )
+        text = _octopus_panel_text(
+            self.life_stage,
+            int((time.monotonic() - self.started_at) * OCTO_RENDER_FPS),
+            panel_width=panel_width,
+            version=__version__,
+            stage_title=self.stage_policy.title,
+            stage_tone=self.stage_policy.tone,
+            dose_state=self.dose,
+            dose_label=self.dose_label,
+            thinking=thinking or self._thinking_visual(),
         )
+        if self.panel_refresh.changed("octo", text):
+            self.octo_panel.update(text)
 
     def _refresh_open_loops(self, *, save: bool) -> None:
         if self.paths is None:
             return
+        tasks, outcomes, loops = _compute_open_loops(
+            repo_root(),
+            self._open_loops_session(),
+            list(self.signal_loops),
+            self.open_loops_path if save else None,
+        )
+        self._apply_open_loops(tasks, outcomes, loops)
+        # Explicit refreshes may follow changes the heartbeat signature cannot see.
+        self.heartbeat_inputs.forget("open_loops")
 
-        root = repo_root()
-        tasks = prod_tasks.list_tasks(root)
-        self.open_tasks_count = sum(1 for task in tasks if task.is_open)
-
-        daily_path = ensure_daily_log(daily_root(), date.today())
-        with contextlib.suppress(Exception):
-            prod_outcomes.ensure_outcomes_section(daily_path)
-        outcomes = []
-        with contextlib.suppress(Exception):
-            outcomes = prod_outcomes.get_outcomes(daily_path)
-
-        session = {
+    def _open_loops_session(self) -> dict[str, object]:
+        return {
             "state": self.state.value,
             "stage": self.life_stage,
             "operator_paired": self.operator_paired,
@@ -5597,21 +5890,62 @@ class TakoTerminalApp(App[None]):
             "safe_mode": self.safe_mode,
             "inference_ready": bool(self.inference_runtime is not None and self.inference_runtime.ready),
         }
-        loops = prod_open_loops.compute_open_loops(tasks=tasks, outcomes=outcomes, session=session)
-        loops.extend(list(self.signal_loops))
+
+    def _apply_open_loops(
+        self,
+        tasks: list[prod_tasks.Task],
+        outcomes: list[prod_outcomes.Outcome],
+        loops: list[prod_open_loops.OpenLoop],
+    ) -> None:
+        self.open_tasks_count = sum(1 for task in tasks if task.is_open)
+        self.open_loop_inputs = (tasks, outcomes)
+        self.open_loops_cache = loops
         self.open_loops_summary = prod_open_loops.summarize_open_loops(loops)
 
-        if save and self.open_loops_path is not None:
-            with contextlib.suppress(Exception):
-                prod_open_loops.save_open_loops(self.open_loops_path, loops)
+    def _refresh_panels(self, *panels: str) -> None:
+        """Mark side panels dirty (all when none are named); the next frame redraws them."""
+        self.panel_refresh.mark(*panels)
+
+    def _render_frame(self) -> None:
+        # The octopus is animated, so it is redrawn every frame alongside any dirty panels.
+        self.panel_refresh.mark("octo")
+        self._flush_panels()
+
+    def _flush_panels(self) -> None:
+        if not hasattr(self, "tasks_panel"):
+            return
+        dirty = self.panel_refresh.take()
+        if not dirty:
+            return
+        started_at = time.perf_counter()
+        self._render_panels(dirty)
+        self.panel_refresh.record_frame(started_at)
 
-    def _refresh_panels(self) -> None:
+    def _update_panel(self, name: str, widget: Static, text: str) -> None:
+        if self.panel_refresh.changed(name, text):
+            widget.update(text)
+
+    def _render_panels(self, dirty: frozenset[str]) -> None:
         if self.runtime_service is not None:
             self.heartbeat_ticks = self.runtime_service.heartbeat_ticks
             self.last_heartbeat_at = self.runtime_service.last_heartbeat_at
             self.explore_ticks = self.runtime_service.explore_ticks
             self.last_explore_at = self.runtime_service.last_explore_at
         self.event_total_written = self.event_bus.events_written
+        thinking = self._thinking_visual()
+        type2_budget = f"{self.type2_budget_used_today}/{self.stage_policy.type2_budget_per_day}"
+        if "octo" in dirty:
+            self._refresh_octo_panel(thinking=thinking)
+        if "activity" in dirty:
+            self._update_panel("activity", self.activity_panel, _activity_text(list(self.activity_entries)))
+        if "tasks" in dirty:
+            self._render_tasks_panel(thinking=thinking, type2_budget=type2_budget)
+        if "memory" in dirty:
+            self._render_memory_panel()
+        if "sensors" in dirty:
+            self._render_sensors_panel(thinking=thinking, type2_budget=type2_budget)
+
+    def _render_tasks_panel(self, *, thinking: str, type2_budget: str) -> None:
         pair_next = "establish XMTP pairing" if not self.operator_paired else "process operator commands (terminal + XMTP)"
         heartbeat_age = (
             f"{int(time.monotonic() - self.last_heartbeat_at)}s"
@@ -5631,10 +5965,8 @@ class TakoTerminalApp(App[None]):
         loops_count = int(self.open_loops_summary.get("count") or 0)
         loops_age_s = float(self.open_loops_summary.get("oldest_age_s") or 0.0)
         loops_age = f"{int(loops_age_s // 3600)}h" if loops_age_s >= 3600 else f"{int(loops_age_s)}s"
-        thinking = self._thinking_visual()
         active_work = _active_work_summary(list(self.live_work_items))
         stage_routines = ", ".join(self.stage_policy.routines_active)
-        type2_budget = f"{self.type2_budget_used_today}/{self.stage_policy.type2_budget_per_day}"
         tasks = (
             "Tasks\n"
             f"- state: {self.state.value}\n"
@@ -5658,9 +5990,9 @@ class TakoTerminalApp(App[None]):
             f"- last explore: {explore_age}\n"
             f"- last update check: {update_check_age}"
         )
-        self.tasks_panel.update(tasks)
-        self._refresh_octo_panel(thinking=thinking)
+        self._update_panel("tasks", self.tasks_panel, tasks)
 
+    def _render_memory_panel(self) -> None:
         event_log_value = str(self.event_log_path) if self.event_log_path is not None else "not ready"
         mission_objectives = self.mission_objectives or [self.identity_role]
         mission_preview = "; ".join(mission_objectives[:3])
@@ -5677,8 +6009,9 @@ class TakoTerminalApp(App[None]):
             f"- routines: {self.routines or mission_preview}\n"
             f"- event log: {event_log_value}"
         )
-        self.memory_panel.update(memory)
+        self._update_panel("memory", self.memory_panel, memory)
 
+    def _render_sensors_panel(self, *, thinking: str, type2_budget: str) -> None:
         operator = self.operator_address or "not paired"
         inference_provider = self.inference_runtime.selected_provider if self.inference_runtime else "none"
         inference_ready = "yes" if self.inference_runtime and self.inference_runtime.ready else "no"
@@ -5702,8 +6035,12 @@ class TakoTerminalApp(App[None]):
             f"- world-watch sites: {len(self.config.world_watch.sites)}\n"
             f"- explore cadence: every {self.stage_policy.explore_interval_minutes}m\n"
             f"- auto updates: {'on' if self.auto_updates_enabled else 'off'}\n"
-            f"- type1 processed: {self.type1_processed}\n"
+            f"- type1 processed: {self.type1_processed} (queued {self.type1_queue.qsize()})\n"
+            f"- type1 overflow ({self.type1_queue.policy}): {self.type1_queue.counters.summary()}\n"
+            f"- event dedupe: {len(self.event_dedupe)} ids, {self.event_dedupe.duplicates} duplicates dropped\n"
             f"- type2 escalations: {self.type2_escalations}\n"
+            f"- type2 pool: {self.type2_pool.metrics.in_flight}/{self.type2_pool.workers} busy, "
+            f"{self.type2_pool.pending()} pending, {self.type2_pool.metrics.merged} merged\n"
             f"- type2 budget used: {type2_budget}\n"
             f"- type2 last: {self.type2_last}\n"
             f"{dose_line}\n"
@@ -5713,8 +6050,7 @@ class TakoTerminalApp(App[None]):
             f"- operator: {operator}\n"
             f"- events written: {self.event_total_written} / ingested: {self.event_total_ingested}"
         )
-        self.sensors_panel.update(sensors)
-        self.activity_panel.update(_activity_text(list(self.activity_entries)))
+        self._update_panel("sensors", self.sensors_panel, sensors)
 
     def _write_tako(self, text: str) -> None:
         safe = _sanitize_for_display(text)
@@ -5736,26 +6072,38 @@ class TakoTerminalApp(App[None]):
 
     def _append_transcript_line(self, line: str) -> None:
         self.transcript_lines.append(line)
-        payload = "\n".join(self.transcript_lines)
-        self.transcript.load_text(payload)
-        self.transcript.scroll_end(animate=False)
-
-    def _append_app_log(self, channel: str, message: str) -> None:
+        transcript = self.transcript
+        follow_tail = transcript.scroll_y >= transcript.max_scroll_y
+        # Append at the document end instead of reloading the whole transcript,
+        # so each line costs the same and an active selection survives.
+        prefix = "\n" if self.transcript_row_counts else ""
+        transcript.insert(prefix + line, transcript.document.end)
+        self.transcript_row_counts.append(line.count("\n") + 1)
+        if len(self.transcript_row_counts) > TRANSCRIPT_LOG_MAX + TRANSCRIPT_TRIM_BATCH:
+            self._trim_transcript()
+        if follow_tail:
+            transcript.scroll_end(animate=False)
+
+    def _trim_transcript(self) -> None:
+        # Trim in batches so dropping old lines stays amortized O(1) per appended line.
+        rows = 0
+        while len(self.transcript_row_counts) > TRANSCRIPT_LOG_MAX:
+            rows += self.transcript_row_counts.popleft()
+        self.transcript.delete((0, 0), (rows, 0))
+        # The widget is read-only; undo history for programmatic appends is dead weight.
+        self.transcript.history.clear()
+
+    def _append_app_log(self, channel: str, message: str, **fields: Any) -> None:
         if self.app_log_path is None:
             return
-        stamp = datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
-        safe_channel = channel.strip().lower() or "system"
-        safe_message = " ".join(message.split())
-        with contextlib.suppress(Exception):
-            self.app_log_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.app_log_path.open("a", encoding="utf-8") as handle:
-                handle.write(f"{stamp} [{safe_channel}] {safe_message}\n")
+        # Queued for the shared background writer; no file I/O on the UI loop.
+        append_log_line(self.app_log_path, channel.strip() or "system", message, **fields)
 
     def _add_activity(self, kind: str, detail: str) -> None:
         stamp = datetime.now().strftime("%H:%M:%S")
         entry = f"{stamp} {kind}: {_summarize_text(_sanitize_for_display(detail))}"
         self.activity_entries.appendleft(entry)
-        self._refresh_panels()
+        self._refresh_panels("activity")
 
     def _error_card(self, summary: str, detail: str, next_steps: list[str]) -> None:
         self._write_system(f"ERROR: {summary}: {_summarize_text(detail)}")
@@ -5778,9 +6126,17 @@ class TakoTerminalApp(App[None]):
         )
 
 
-def run_terminal_app(*, interval: float = 30.0) -> int:
-    app = TakoTerminalApp(interval=interval)
+def run_terminal_app(*, interval: float = 30.0, profile: StartupProfile | None = None) -> int:
+    app = TakoTerminalApp(interval=interval, startup_profile=profile)
     app.run()
+    if profile is not None:
+        # Import breakdown runs after exit so profiling never delays the first input.
+        profile.imports = profile_imports("takobot.app")
+        if app.paths is not None:
+            with contextlib.suppress(Exception):
+                profile.write(app.paths.state_dir / STARTUP_PROFILE_FILE)
+        for line in profile.lines():
+            print(line, file=sys.stderr)
     return 0
 
 
@@ -6461,6 +6817,7 @@ def _build_type2_prompt(
     depth: str,
     reason: str,
     fallback: str,
+    occurrences: int = 1,
     memory_frontmatter: str = "",
     focus_summary: str = "",
     rag_context: str = "",
@@ -6474,6 +6831,8 @@ def _build_type2_prompt(
     memory_block = (memory_frontmatter or "").strip() or "MEMORY.md unavailable."
     focus_line = " ".join((focus_summary or "").split()).strip() or "unknown"
     rag_block = (rag_context or "").strip() or "No semantic memory context."
+    # Batched escalations share one root cause; the latest event stands in for the rest.
+    occurrences_line = f"event.occurrences={occurrences} (same signature, batched)\n" if occurrences > 1 else ""
 
     return (
         "You are Tako Type2 reasoning.\n"
@@ -6488,6 +6847,7 @@ def _build_type2_prompt(
         f"event.source={source}\n"
         f"event.message={message}\n"
         f"event.metadata={metadata_json}\n"
+        f"{occurrences_line}"
         "memory_frontmatter=\n"
         f"{memory_block}\n"
         f"focus_state={focus_line}\n"
@@ -6583,6 +6943,50 @@ def _type2_recommendation(event_type: str, message: str) -> str:
     return "Review the event details, then choose a safe next action or pause in safe mode."
 
 
+def _seed_workspace_extras(root: Path, registry_path: Path) -> tuple[Any, Any, int, int]:
+    from .extensions.registry import enable_all_installed
+    from .skillpacks import seed_openclaw_starter_skills
+
+    seeded = seed_openclaw_starter_skills(root, registry_path=registry_path)
+    starter_tools = seed_starter_tools(root)
+    enabled_now, installed_total = enable_all_installed(registry_path)
+    return seeded, starter_tools, enabled_now, installed_total
+
+
+def _compute_open_loops(
+    root: Path,
+    session: dict[str, object],
+    signal_loops: list[prod_open_loops.OpenLoop],
+    save_path: Path | None,
+) -> tuple[list[prod_tasks.Task], list[prod_outcomes.Outcome], list[prod_open_loops.OpenLoop]]:
+    """Parse tasks and today's outcomes into open loops; safe to run off the UI loop."""
+    tasks = prod_tasks.list_tasks(root)
+
+    daily_path = ensure_daily_log(daily_root(), date.today())
+    with contextlib.suppress(Exception):
+        prod_outcomes.ensure_outcomes_section(daily_path)
+    outcomes = []
+    with contextlib.suppress(Exception):
+        outcomes = prod_outcomes.get_outcomes(daily_path)
+
+    loops = _build_open_loops(tasks, outcomes, session, signal_loops)
+    if save_path is not None:
+        with contextlib.suppress(Exception):
+            prod_open_loops.save_open_loops(save_path, loops)
+    return tasks, outcomes, loops
+
+
+def _build_open_loops(
+    tasks: list[prod_tasks.Task],
+    outcomes: list[prod_outcomes.Outcome],
+    session: dict[str, object],
+    signal_loops: list[prod_open_loops.OpenLoop],
+) -> list[prod_open_loops.OpenLoop]:
+    loops = prod_open_loops.compute_open_loops(tasks=tasks, outcomes=outcomes, session=session)
+    loops.extend(signal_loops)
+    return loops
+
+
 def _activity_text(entries: list[str]) -> str:
     if not entries:
         return "Activity\n- idle"
@@ -6800,13 +7204,6 @@ def _dose_meter(value: float, *, width: int = 4) -> str:
     return ("●" * filled) + ("○" * (width - filled))
 
 
-def _dns_lookup_ok(host: str) -> bool:
-    with contextlib.suppress(Exception):
-        socket.gethostbyname(host)
-        return True
-    return False
-
-
 def _dir_has_entries(path: Path) -> bool:
     with contextlib.suppress(FileNotFoundError):
         return any(path.iterdir())
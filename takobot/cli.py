@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import argparse
-import base64
 import contextlib
 from collections import deque
 from dataclasses import dataclass, replace
@@ -15,8 +14,8 @@ import re
 import subprocess
 import sys
 import time
-from datetime import date, datetime, timezone
-from typing import Callable
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable
 
 from . import __version__
 from . import dose
@@ -29,13 +28,13 @@ from .capability_frontmatter import (
 from .config import add_world_watch_sites, explain_tako_toml, load_tako_toml, set_workspace_name
 from .conversation import ConversationStore
 from .daily import append_daily_note, ensure_daily_log
-from .ens import DEFAULT_ENS_RPC_URLS, resolve_recipient
 from .git_safety import assert_not_tracked, auto_commit_pending, ensure_local_git_identity, panic_check_runtime_secrets
 from .inference import (
     PI_TYPE2_THINKING_DEFAULT,
     CONFIGURABLE_API_KEY_VARS,
     SUPPORTED_PROVIDER_PREFERENCES,
     InferenceRuntime,
+    StreamEventHook,
     auto_repair_inference_runtime,
     clear_inference_api_key,
     discover_inference_runtime,
@@ -50,11 +49,24 @@ from .inference import (
     prepare_pi_login_plan,
     run_inference_prompt_with_fallback,
     set_inference_api_key,
+    stream_inference_prompt_with_fallback,
     set_inference_preferred_provider,
 )
+from .health_checks import (
+    HEALTH_CACHE_FILE,
+    HealthCheck,
+    HealthResult,
+    command_check,
+    format_health_timing_lines,
+    module_check,
+    run_health_checks,
+    xmtp_runtime_check,
+)
+from .http_cache import HTTP_CACHE_DIRNAME, configure_http_cache
 from .keys import derive_eth_address, load_or_create_keys
 from .life_stage import stage_policy_for_name
 from .locks import instance_lock
+from .log_writer import append_log_line, configure_log_rotation
 from .memory_frontmatter import load_memory_frontmatter_excerpt
 from .jobs import (
     add_job_from_natural_text,
@@ -77,16 +89,27 @@ from .operator_profile import (
     write_operator_profile_note,
 )
 from .pairing import clear_pending
-from .paths import RuntimePaths, code_root, daily_root, ensure_code_dir, ensure_runtime_dirs, repo_root, runtime_paths
+from .paths import (
+    RuntimePaths,
+    code_root,
+    daily_root,
+    ensure_code_dir,
+    ensure_runtime_dirs,
+    repo_root,
+    runtime_paths,
+    use_workspace_root,
+)
 from .problem_tasks import ensure_problem_tasks
+from .seen_ids import SeenIdStore
 from .rag_context import format_focus_summary, focus_profile_from_dose, query_memory_with_ragrep
-from .self_update import run_self_update
-from .skillpacks import seed_openclaw_starter_skills
+from .reply_stream import ReplyStreamer
 from .starter_tools import seed_starter_tools
+from .startup_profile import StartupProfile
 from .soul import (
     load_soul_excerpt,
     read_identity,
     read_mission_objectives,
+    soul_path,
     update_identity,
     update_mission_objectives,
 )
@@ -99,11 +122,14 @@ from .xmtp import (
     ensure_profile_message_for_conversation,
     hint_for_xmtp_error,
     parse_profile_message,
-    probe_xmtp_runtime,
     send_dm_sync,
     set_typing_indicator,
     sync_identity_profile,
 )
+from .xmtp_context import XmtpContextCache
+from .xmtp_dispatch import ConversationDispatcher
+from .xmtp_outbox import XMTP_OUTBOX_DEAD_LETTER_FILE, XMTP_OUTBOX_FILE, XmtpOutbox
+from .xmtp_poll import XMTP_POLL_CURSORS_FILE, XmtpPollCursors
 from .identity import (
     build_identity_name_intent_prompt,
     build_identity_role_prompt,
@@ -117,7 +143,6 @@ from .identity import (
     looks_like_role_change_request,
     looks_like_role_info_query,
 )
-from .extensions.registry import enable_all_installed as ext_enable_all_installed
 from .productivity import open_loops as prod_open_loops
 from .productivity import outcomes as prod_outcomes
 from .productivity import promote as prod_promote
@@ -136,6 +161,8 @@ STREAM_POLL_INTERVAL_S = 3.0
 STREAM_POLL_STABLE_CYCLES = 4
 MESSAGE_HISTORY_PER_CONVERSATION = 80
 SEEN_MESSAGE_CACHE_MAX = 4096
+SEEN_MESSAGE_LEDGER_FILE = "xmtp_seen.ids"
+XMTP_RESUME_MAX_AGE_S = 10 * 60
 CHAT_INFERENCE_TIMEOUT_S = 180.0
 CHAT_REPLY_MAX_CHARS = 700
 CHAT_CONTEXT_USER_TURNS = 12
@@ -146,6 +173,7 @@ UPDATE_CHECK_INTERVAL_S = 6 * 60 * 60
 XMTP_TYPING_LEAD_S = 0.35
 XMTP_SEND_RETRY_ATTEMPTS = 3
 XMTP_SEND_RETRY_BASE_S = 0.4
+XMTP_OUTBOX_DRAIN_TIMEOUT_S = 30.0
 XMTP_POLL_ERROR_REBUILD_THRESHOLD = 4
 XMTP_STREAM_CRASH_REBUILD_THRESHOLD = 2
 XMTP_CLIENT_REBUILD_COOLDOWN_S = 30.0
@@ -180,13 +208,7 @@ def _emit_runtime_log(
 
 
 def _append_runtime_log(log_file: Path, *, level: str, message: str) -> None:
-    normalized_message = " ".join(message.split())
-    stamp = datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
-    line = f"{stamp} [{level.lower()}] {normalized_message}\n"
-    with contextlib.suppress(Exception):
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        with log_file.open("a", encoding="utf-8") as handle:
-            handle.write(line)
+    append_log_line(log_file, level, message)
 
 
 def _hooks_with_log_file(hooks: RuntimeHooks | None, log_file: Path) -> RuntimeHooks:
@@ -222,6 +244,11 @@ def build_parser() -> argparse.ArgumentParser:
         description="Takobot: your highly autonomous and incredibly curious octopus friend",
     )
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and boot phase timings (time-to-first-input) for the interactive app.",
+    )
 
     sub = parser.add_subparsers(dest="cmd", required=False)
 
@@ -235,6 +262,13 @@ def build_parser() -> argparse.ArgumentParser:
     run = sub.add_parser("run", help="Start Tako daemon (operator XMTP channel).")
     run.add_argument("--interval", type=float, default=30.0, help="(dev) Heartbeat interval seconds")
     run.add_argument("--once", action="store_true", help="(dev) Run a single tick and exit")
+    run.add_argument(
+        "--workspace",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Also host this workspace profile (own identity/operator/state) in the same process; repeatable.",
+    )
 
     bootstrap = sub.add_parser("bootstrap", help="Terminal-first onboarding + outbound pairing, then daemon.")
     bootstrap.add_argument("--interval", type=float, default=30.0, help="(dev) Heartbeat interval seconds")
@@ -246,6 +280,8 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def _ens_rpc_urls_from_args(value: str | None) -> list[str]:
+    from .ens import DEFAULT_ENS_RPC_URLS
+
     if not value:
         return list(DEFAULT_ENS_RPC_URLS)
     urls = [item.strip() for item in value.split(",") if item.strip()]
@@ -274,10 +310,14 @@ def _terminal_text_ui_unavailable_reason() -> str:
     return ""
 
 
-def _run_terminal_app_entry(*, interval: float) -> int:
-    from .app import run_terminal_app
+def _run_terminal_app_entry(*, interval: float, profile: StartupProfile | None = None) -> int:
+    if profile is None:
+        from .app import run_terminal_app
 
-    return run_terminal_app(interval=interval)
+        return run_terminal_app(interval=interval)
+    with profile.phase("import_app"):
+        from .app import run_terminal_app
+    return run_terminal_app(interval=interval, profile=profile)
 
 
 def cmd_app(args: argparse.Namespace) -> int:
@@ -290,8 +330,12 @@ def cmd_app(args: argparse.Namespace) -> int:
         )
         return cmd_run(argparse.Namespace(interval=interval, once=False))
 
+    entry_kwargs: dict[str, object] = {"interval": interval}
+    profile = getattr(args, "startup_profile", None)
+    if profile is not None:
+        entry_kwargs["profile"] = profile
     try:
-        return _run_terminal_app_entry(interval=interval)
+        return _run_terminal_app_entry(**entry_kwargs)
     except ModuleNotFoundError as exc:
         if exc.name == "textual":
             print(
@@ -320,6 +364,8 @@ def cmd_hi(args: argparse.Namespace) -> int:
     db_root = paths.xmtp_db_dir
     db_root.mkdir(parents=True, exist_ok=True)
 
+    from .ens import resolve_recipient
+
     try:
         resolved = resolve_recipient(args.to, ens_rpc_urls)
     except Exception as exc:  # noqa: BLE001
@@ -403,11 +449,27 @@ def _doctor_report(root, paths, env: str) -> tuple[list[str], list[str]]:
     else:
         lines.append("- inference auto-fix: no changes needed")
 
+    # Probes are independent, so they run concurrently; passing toolchain probes are
+    # cached in `.tako/state/health.json` and reused while their inputs are unchanged.
+    inference_runtime = discover_inference_runtime()
     git_identity_name = _preferred_git_identity_name(root)
-    git_identity_ok, git_identity_detail, git_identity_auto_configured = ensure_local_git_identity(
-        root,
-        identity_name=git_identity_name,
-    )
+    git_identity_state: dict[str, bool] = {}
+
+    def probe_git_identity() -> tuple[bool, str]:
+        ok, detail, auto_configured = ensure_local_git_identity(root, identity_name=git_identity_name)
+        git_identity_state["auto_configured"] = auto_configured
+        return ok, detail
+
+    checks = [
+        HealthCheck(name="git_identity", probe=probe_git_identity, timeout_s=15.0),
+        xmtp_runtime_check(),
+        module_check("web3", "web3", import_module=True),
+        *_doctor_cli_checks(inference_runtime),
+    ]
+    results = run_health_checks(checks, cache_path=paths.state_dir / HEALTH_CACHE_FILE)
+
+    git_identity_ok, git_identity_detail = results["git_identity"].ok, results["git_identity"].detail
+    git_identity_auto_configured = git_identity_state.get("auto_configured", False)
     if git_identity_auto_configured:
         lines.append(f"- git identity: auto-configured local identity ({git_identity_detail})")
     else:
@@ -423,30 +485,60 @@ def _doctor_report(root, paths, env: str) -> tuple[list[str], list[str]]:
     else:
         lines.append("- operator: not imprinted")
 
-    xmtp_ok, xmtp_status = probe_xmtp_runtime()
-    lines.append(f"- xmtp: {xmtp_status}")
-    if not xmtp_ok:
-        problems.append(f"xmtp runtime unavailable: {xmtp_status}")
-
-    try:
-        import web3  # noqa: F401
+    xmtp_result = results["xmtp_runtime"]
+    lines.append(f"- xmtp: {xmtp_result.detail}")
+    if not xmtp_result.ok:
+        problems.append(f"xmtp runtime unavailable: {xmtp_result.detail}")
 
-        lines.append("- web3: import OK")
-    except Exception as exc:  # noqa: BLE001
-        problems.append(f"web3 import failed: {exc}")
+    web3_result = results["web3"]
+    if web3_result.ok:
+        lines.append(f"- web3: {web3_result.detail}")
+    else:
+        problems.append(f"web3 {web3_result.detail}")
 
-    inference_runtime = discover_inference_runtime()
     lines.extend(f"- {line}" for line in format_runtime_lines(inference_runtime))
-    inference_lines, inference_problems = _doctor_inference_diagnostics(inference_runtime, paths)
+    inference_lines, inference_problems = _doctor_inference_diagnostics(inference_runtime, paths, results)
     lines.extend(inference_lines)
     problems.extend(inference_problems)
+    lines.extend(format_health_timing_lines(results))
 
     return lines, problems
 
 
-def _doctor_inference_diagnostics(runtime: InferenceRuntime, paths) -> tuple[list[str], list[str]]:
+def _doctor_cli_checks(runtime: InferenceRuntime) -> list[HealthCheck]:
+    checks: list[HealthCheck] = []
+    for provider in ("pi",):
+        status = runtime.statuses.get(provider)
+        if status is None or not status.cli_installed:
+            continue
+        cli_exec = status.cli_path or status.cli_name
+        for flag in ("--version", "--help"):
+            command = [cli_exec, flag]
+            checks.append(
+                command_check(
+                    f"{provider}{flag.replace('--', '_')}",
+                    lambda command=command: _probe_cli_command(command, timeout_s=7.0),
+                    cli_exec,
+                    timeout_s=10.0,
+                )
+            )
+    return checks
+
+
+def _doctor_inference_diagnostics(
+    runtime: InferenceRuntime,
+    paths,
+    probe_results: dict[str, HealthResult] | None = None,
+) -> tuple[list[str], list[str]]:
     lines: list[str] = []
     problems: list[str] = []
+    probe_results = probe_results or {}
+
+    def cli_probe(name: str, command: list[str]) -> tuple[bool, str]:
+        result = probe_results.get(name)
+        if result is not None:
+            return result.ok, result.detail
+        return _probe_cli_command(command, timeout_s=7.0)
 
     lines.append("- inference doctor: local offline diagnostics")
     for provider in ("pi",):
@@ -460,13 +552,13 @@ def _doctor_inference_diagnostics(runtime: InferenceRuntime, paths) -> tuple[lis
             lines.append(f"- {provider} probe: CLI missing")
             continue
 
-        version_ok, version_detail = _probe_cli_command([cli_exec, "--version"], timeout_s=7.0)
+        version_ok, version_detail = cli_probe(f"{provider}_version", [cli_exec, "--version"])
         lines.append(f"- {provider} probe: --version {'ok' if version_ok else 'failed'} ({version_detail})")
         if not version_ok:
             problems.append(f"{provider} CLI appears installed but --version failed: {version_detail}")
 
         command_probe = [cli_exec, "--help"]
-        command_ok, command_detail = _probe_cli_command(command_probe, timeout_s=7.0)
+        command_ok, command_detail = cli_probe(f"{provider}_help", command_probe)
         lines.append(
             f"- {provider} probe: {' '.join(command_probe[1:])} "
             f"{'ok' if command_ok else 'failed'} ({command_detail})"
@@ -577,34 +669,111 @@ def cmd_bootstrap(args: argparse.Namespace) -> int:
     return run_bootstrap(args)
 
 
+@dataclass
+class _DaemonProfile:
+    name: str
+    root: Path
+    paths: RuntimePaths
+    wallet_key: str
+    db_encryption_key: str
+    address: str
+    hooks: RuntimeHooks
+
+
+def _prepare_daemon_profile(root: Path, *, hooks: RuntimeHooks | None = None) -> _DaemonProfile:
+    with use_workspace_root(root) as resolved:
+        paths = ensure_runtime_dirs(runtime_paths())
+        panic_check_runtime_secrets(resolved, paths.root)
+        assert_not_tracked(resolved, paths.keys_json)
+
+        keys = load_or_create_keys(paths.keys_json, legacy_config_path=paths.root / "config.json")
+        address = derive_eth_address(keys["wallet_key"])
+        operator_inbox_id = get_operator_inbox_id(load_operator(paths.operator_json))
+        profile = _DaemonProfile(
+            name=resolved.name or str(resolved),
+            root=resolved,
+            paths=paths,
+            wallet_key=keys["wallet_key"],
+            db_encryption_key=keys["db_encryption_key"],
+            address=address,
+            hooks=_hooks_with_log_file(hooks, paths.logs_dir / "runtime.log"),
+        )
+
+    _emit_runtime_log(f"takobot address: {address}", hooks=profile.hooks)
+    _emit_runtime_log("status: starting daemon", hooks=profile.hooks)
+    if operator_inbox_id:
+        _emit_runtime_log("pairing: operator already imprinted", hooks=profile.hooks)
+    else:
+        _emit_runtime_log("pairing: unpaired (launch `takobot` for terminal onboarding)", hooks=profile.hooks)
+    return profile
+
+
+def _profile_console_hooks(name: str) -> RuntimeHooks:
+    def _log(level: str, message: str) -> None:
+        stream = sys.stderr if level in {"warn", "error"} else sys.stdout
+        print(f"[{name}] {message}", file=stream)
+
+    return RuntimeHooks(log=_log, emit_console=False)
+
+
 def cmd_run(args: argparse.Namespace) -> int:
-    paths = ensure_runtime_dirs(runtime_paths())
+    extra_roots = [Path(raw).expanduser() for raw in (getattr(args, "workspace", None) or [])]
+    if extra_roots:
+        return _cmd_run_profiles(args, [repo_root(), *extra_roots])
 
-    root = repo_root()
-    panic_check_runtime_secrets(root, paths.root)
-    assert_not_tracked(root, paths.keys_json)
+    profile = _prepare_daemon_profile(repo_root())
+    configure_http_cache(profile.paths.state_dir / HTTP_CACHE_DIRNAME)
 
-    keys = load_or_create_keys(paths.keys_json, legacy_config_path=paths.root / "config.json")
-    wallet_key = keys["wallet_key"]
-    db_encryption_key = keys["db_encryption_key"]
+    try:
+        with instance_lock(profile.paths.locks_dir / "tako.lock"):
+            return asyncio.run(
+                _run_daemon(
+                    args,
+                    profile.paths,
+                    DEFAULT_ENV,
+                    profile.wallet_key,
+                    profile.db_encryption_key,
+                    profile.address,
+                    hooks=profile.hooks,
+                )
+            )
+    except KeyboardInterrupt:
+        return 130
+    except Exception as exc:  # noqa: BLE001
+        print(str(exc), file=sys.stderr)
+        return 2
 
-    env = DEFAULT_ENV
 
-    address = derive_eth_address(wallet_key)
-    operator_cfg = load_operator(paths.operator_json)
-    operator_inbox_id = get_operator_inbox_id(operator_cfg)
-    hooks = _hooks_with_log_file(None, paths.logs_dir / "runtime.log")
+def _cmd_run_profiles(args: argparse.Namespace, roots: list[Path]) -> int:
+    """Host several workspace profiles in one daemon process.
 
-    _emit_runtime_log(f"takobot address: {address}", hooks=hooks)
-    _emit_runtime_log("status: starting daemon", hooks=hooks)
-    if operator_inbox_id:
-        _emit_runtime_log("pairing: operator already imprinted", hooks=hooks)
-    else:
-        _emit_runtime_log("pairing: unpaired (launch `takobot` for terminal onboarding)", hooks=hooks)
+    Each profile keeps its own keys, XMTP identity, operator, conversations and
+    `.tako/state`; the event loop, inference runtime, HTTP cache and update
+    check are shared.
+    """
+
+    unique_roots: list[Path] = []
+    for root in roots:
+        resolved = root.resolve()
+        if resolved not in unique_roots:
+            unique_roots.append(resolved)
+    names = [root.name or str(root) for root in unique_roots]
+    labels = [name if names.count(name) == 1 else str(root) for name, root in zip(names, unique_roots)]
+    try:
+        profiles = [
+            _prepare_daemon_profile(root, hooks=_profile_console_hooks(label))
+            for root, label in zip(unique_roots, labels)
+        ]
+    except Exception as exc:  # noqa: BLE001
+        print(str(exc), file=sys.stderr)
+        return 2
+    configure_http_cache(profiles[0].paths.state_dir / HTTP_CACHE_DIRNAME)
 
     try:
-        with instance_lock(paths.locks_dir / "tako.lock"):
-            return asyncio.run(_run_daemon(args, paths, env, wallet_key, db_encryption_key, address, hooks=hooks))
+        with contextlib.ExitStack() as stack:
+            for profile in profiles:
+                stack.enter_context(instance_lock(profile.paths.locks_dir / "tako.lock"))
+            return asyncio.run(_run_daemon_profiles(args, profiles))
     except KeyboardInterrupt:
         return 130
     except Exception as exc:  # noqa: BLE001
@@ -612,6 +781,44 @@ def cmd_run(args: argparse.Namespace) -> int:
         return 2
 
 
+async def _run_daemon_profiles(args: argparse.Namespace, profiles: list[_DaemonProfile]) -> int:
+    with use_workspace_root(profiles[0].root):
+        inference_runtime = await asyncio.to_thread(discover_inference_runtime)
+
+    tasks: list[asyncio.Task[int]] = []
+    for index, profile in enumerate(profiles):
+        # Tasks copy the current context, so each daemon keeps resolving paths inside its own workspace.
+        with use_workspace_root(profile.root):
+            tasks.append(
+                asyncio.create_task(
+                    _run_daemon(
+                        args,
+                        profile.paths,
+                        DEFAULT_ENV,
+                        profile.wallet_key,
+                        profile.db_encryption_key,
+                        profile.address,
+                        hooks=profile.hooks,
+                        inference_runtime=inference_runtime,
+                        update_check=index == 0,
+                    ),
+                    name=f"takobot-profile:{profile.name}",
+                )
+            )
+
+    exit_code = 0
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for profile, result in zip(profiles, results):
+        if isinstance(result, BaseException):
+            if isinstance(result, (KeyboardInterrupt, asyncio.CancelledError)):
+                raise result
+            _emit_runtime_log(f"daemon stopped: {_summarize_stream_error(result)}", level="error", stderr=True, hooks=profile.hooks)
+            exit_code = exit_code or 2
+        elif result:
+            exit_code = exit_code or int(result)
+    return exit_code
+
+
 async def _run_daemon(
     args: argparse.Namespace,
     paths,
@@ -620,14 +827,22 @@ async def _run_daemon(
     db_encryption_key: str,
     address: str,
     hooks: RuntimeHooks | None = None,
+    *,
+    inference_runtime: InferenceRuntime | None = None,
+    update_check: bool = True,
 ) -> int:
     # Ensure today’s daily log exists (committed).
     ensure_daily_log(daily_root(), date.today())
     hooks = _hooks_with_log_file(hooks, paths.logs_dir / "runtime.log")
     root = repo_root()
+    workspace_cfg, _warn = load_tako_toml(root / "tako.toml")
+    configure_log_rotation(workspace_cfg.logging, paths.logs_dir)
     code_dir = ensure_code_dir(root)
     conversations = ConversationStore(paths.state_dir)
     _emit_runtime_log(f"workspace code dir: {code_dir}", hooks=hooks)
+    from .extensions.registry import enable_all_installed as ext_enable_all_installed
+    from .skillpacks import seed_openclaw_starter_skills
+
     registry_path = paths.state_dir / "extensions.json"
     seeded = seed_openclaw_starter_skills(root, registry_path=registry_path)
     if seeded.created_skills or seeded.registered_skills:
@@ -673,7 +888,8 @@ async def _run_daemon(
 
     operator_cfg = load_operator(paths.operator_json)
     operator_inbox_id = get_operator_inbox_id(operator_cfg)
-    inference_runtime = discover_inference_runtime()
+    if inference_runtime is None:
+        inference_runtime = discover_inference_runtime()
     _emit_runtime_log(
         f"inference: selected={inference_runtime.selected_provider or 'none'} "
         f"ready={'yes' if inference_runtime.ready else 'no'}",
@@ -710,12 +926,28 @@ async def _run_daemon(
                 hooks=hooks,
             )
 
+    context_cache = _new_context_cache(paths, root)
+
+    async def _outbox_send(conversation_id: str, text: str, conversation: object) -> object:
+        # Reads `client` at call time so client rebuilds are picked up.
+        target = conversation
+        if target is None:
+            target = await context_cache.conversation(client, bytes.fromhex(conversation_id))
+        if target is None:
+            raise RuntimeError(f"conversation not found: {conversation_id[:12]}")
+        return await target.send(text)
+
+    outbox = _new_outbox(_outbox_send, paths, hooks=hooks)
+    restored_sends = outbox.restore()
+    if restored_sends:
+        _emit_runtime_log(f"xmtp outbox: re-queued {restored_sends} unsent message(s) from the spool", hooks=hooks)
     startup_profile_sync = await _sync_xmtp_profile(
         client,
         paths=paths,
         identity_name=git_identity_name,
         hooks=hooks,
         context="startup",
+        context_cache=context_cache,
     )
 
     if operator_inbox_id:
@@ -746,6 +978,7 @@ async def _run_daemon(
             operator_cfg=operator_cfg,
             message=startup_message,
             hooks=hooks,
+            outbox=outbox,
         )
     else:
         _emit_runtime_log("status: unpaired", hooks=hooks)
@@ -753,210 +986,98 @@ async def _run_daemon(
 
     _emit_runtime_log(f"inbox_id: {client.inbox_id}", hooks=hooks)
     if args.once:
+        await outbox.close(timeout_s=XMTP_OUTBOX_DRAIN_TIMEOUT_S)
         return 0
 
     _emit_runtime_log("Daemon started. Press Ctrl+C to stop.", hooks=hooks)
 
     start = time.monotonic()
     heartbeat = asyncio.create_task(_heartbeat_loop(args, hooks=hooks, identity_name=git_identity_name))
-    update_check = asyncio.create_task(_periodic_update_check_loop(hooks=hooks))
-    reconnect_attempt = 0
-    error_burst_count = 0
-    last_error_at = 0.0
-    stream_crash_streak = 0
-    poll_successes = 0
-    poll_error_streak = 0
-    last_client_rebuild_at = 0.0
-    mode = "stream"
-    hint_last_printed: dict[str, float] = {}
-    seen_message_ids: set[bytes] = set()
-    seen_message_order: deque[bytes] = deque()
+    update_check_task = asyncio.create_task(_periodic_update_check_loop(hooks=hooks)) if update_check else None
+    seen_messages = SeenIdStore(paths.state_dir / SEEN_MESSAGE_LEDGER_FILE, capacity=SEEN_MESSAGE_CACHE_MAX)
+    poll_cursors = XmtpPollCursors(paths.state_dir / XMTP_POLL_CURSORS_FILE)
 
-    with contextlib.suppress(Exception):
-        await _prime_seen_messages(client, seen_message_ids, seen_message_order)
+    async def _dispatch_message(item) -> None:
+        # Reads `client`/`inference_runtime` at call time so client rebuilds are picked up.
+        await _handle_incoming_message(
+            item,
+            client,
+            paths,
+            address,
+            env,
+            start,
+            inference_runtime,
+            conversations,
+            hooks=hooks,
+            context_cache=context_cache,
+            outbox=outbox,
+        )
 
-    try:
-        while True:
-            if mode == "poll":
-                try:
-                    items = await _poll_new_messages(client, seen_message_ids, seen_message_order)
-                    for item in items:
-                        await _handle_incoming_message(
-                            item,
-                            client,
-                            paths,
-                            address,
-                            env,
-                            start,
-                            inference_runtime,
-                            conversations,
-                            hooks=hooks,
-                        )
-                    poll_successes += 1
-                    poll_error_streak = 0
-                    reconnect_attempt = 0
-                    if poll_successes >= STREAM_POLL_STABLE_CYCLES:
-                        _emit_runtime_log(
-                            "XMTP polling is stable; retrying stream mode.",
-                            level="warn",
-                            stderr=True,
-                            hooks=hooks,
-                        )
-                        mode = "stream"
-                        error_burst_count = 0
-                        continue
-                except asyncio.CancelledError:
-                    raise
-                except KeyboardInterrupt:
-                    raise
-                except Exception as exc:  # noqa: BLE001
-                    now = time.monotonic()
-                    summary = _summarize_stream_error(exc)
-                    _emit_runtime_log(f"XMTP polling error: {summary}", level="error", stderr=True, hooks=hooks)
-                    _maybe_print_xmtp_hint(exc, hint_last_printed, now, hooks=hooks)
-                    poll_successes = 0
-                    poll_error_streak += 1
-                    if (
-                        poll_error_streak >= XMTP_POLL_ERROR_REBUILD_THRESHOLD
-                        and (now - last_client_rebuild_at) >= XMTP_CLIENT_REBUILD_COOLDOWN_S
-                    ):
-                        rebuilt = await _rebuild_xmtp_client(
-                            client,
-                            env=env,
-                            db_root=paths.xmtp_db_dir,
-                            wallet_key=wallet_key,
-                            db_encryption_key=db_encryption_key,
-                            hooks=hooks,
-                        )
-                        last_client_rebuild_at = now
-                        if rebuilt is not None:
-                            client = rebuilt
-                            seen_message_ids.clear()
-                            seen_message_order.clear()
-                            with contextlib.suppress(Exception):
-                                await _prime_seen_messages(client, seen_message_ids, seen_message_order)
-                            await _sync_xmtp_profile(
-                                client,
-                                paths=paths,
-                                identity_name=_preferred_git_identity_name(root),
-                                hooks=hooks,
-                                context="rebuild",
-                            )
-                            poll_error_streak = 0
-                            stream_crash_streak = 0
-                            reconnect_attempt = 0
-                            mode = "stream"
-
-                await asyncio.sleep(STREAM_POLL_INTERVAL_S)
-                continue
+    def _dispatch_error(exc: BaseException, _item: object) -> None:
+        _emit_runtime_log(
+            f"XMTP message handling failed: {_summarize_stream_error(exc)}",
+            level="error",
+            stderr=True,
+            hooks=hooks,
+        )
 
-            stream = client.conversations.stream_all_messages()
-            try:
-                async for item in stream:
-                    if isinstance(item, Exception):
-                        now = time.monotonic()
-                        if now - last_error_at > STREAM_ERROR_BURST_WINDOW_S:
-                            error_burst_count = 0
-                        error_burst_count += 1
-                        last_error_at = now
-
-                        summary = _summarize_stream_error(item)
-                        _emit_runtime_log(f"XMTP stream warning: {summary}", level="warn", stderr=True, hooks=hooks)
-
-                        _maybe_print_xmtp_hint(item, hint_last_printed, now, hooks=hooks)
-
-                        if error_burst_count >= STREAM_ERROR_BURST_THRESHOLD:
-                            _emit_runtime_log(
-                                "XMTP stream unstable; switching to polling fallback.",
-                                level="warn",
-                                stderr=True,
-                                hooks=hooks,
-                            )
-                            mode = "poll"
-                            poll_successes = 0
-                            break
-                        continue
+    dispatcher = ConversationDispatcher(
+        _dispatch_message,
+        key_fn=_message_conversation_key,
+        priority_fn=lambda item: _is_operator_message(item, paths, context_cache=context_cache),
+        on_error=_dispatch_error,
+    )
 
-                    error_burst_count = 0
-                    stream_crash_streak = 0
-                    reconnect_attempt = 0
-                    if _mark_message_seen(item, seen_message_ids, seen_message_order):
-                        await _handle_incoming_message(
-                            item,
-                            client,
-                            paths,
-                            address,
-                            env,
-                            start,
-                            inference_runtime,
-                            conversations,
-                            hooks=hooks,
-                        )
-            except asyncio.CancelledError:
-                raise
-            except KeyboardInterrupt:
-                raise
-            except Exception as exc:  # noqa: BLE001
-                now = time.monotonic()
-                summary = _summarize_stream_error(exc)
-                _emit_runtime_log(f"XMTP stream crashed: {summary}", level="error", stderr=True, hooks=hooks)
-                _maybe_print_xmtp_hint(exc, hint_last_printed, now, hooks=hooks)
-                stream_crash_streak += 1
-                mode = "poll"
-                poll_successes = 0
-                if (
-                    stream_crash_streak >= XMTP_STREAM_CRASH_REBUILD_THRESHOLD
-                    and (now - last_client_rebuild_at) >= XMTP_CLIENT_REBUILD_COOLDOWN_S
-                ):
-                    rebuilt = await _rebuild_xmtp_client(
-                        client,
-                        env=env,
-                        db_root=paths.xmtp_db_dir,
-                        wallet_key=wallet_key,
-                        db_encryption_key=db_encryption_key,
-                        hooks=hooks,
-                    )
-                    last_client_rebuild_at = now
-                    if rebuilt is not None:
-                        client = rebuilt
-                        seen_message_ids.clear()
-                        seen_message_order.clear()
-                        with contextlib.suppress(Exception):
-                            await _prime_seen_messages(client, seen_message_ids, seen_message_order)
-                        await _sync_xmtp_profile(
-                            client,
-                            paths=paths,
-                            identity_name=_preferred_git_identity_name(root),
-                            hooks=hooks,
-                            context="rebuild",
-                        )
-                        stream_crash_streak = 0
-                        poll_error_streak = 0
-                        reconnect_attempt = 0
-                        mode = "stream"
-            finally:
-                with contextlib.suppress(Exception):
-                    await stream.close()
-
-            if mode == "poll":
-                continue
+    async def _rebuild_client(stale_client):
+        nonlocal client
+        rebuilt = await _rebuild_xmtp_client(
+            stale_client,
+            env=env,
+            db_root=paths.xmtp_db_dir,
+            wallet_key=wallet_key,
+            db_encryption_key=db_encryption_key,
+            hooks=hooks,
+        )
+        if rebuilt is not None:
+            # Set before the transport replays backlog so dispatched handlers see the new client.
+            client = rebuilt
+        return rebuilt
 
-            reconnect_delay = _stream_reconnect_delay(reconnect_attempt)
-            reconnect_attempt += 1
-            _emit_runtime_log(
-                f"XMTP stream reconnecting in {reconnect_delay:.1f}s...",
-                level="warn",
-                stderr=True,
-                hooks=hooks,
-            )
-            await asyncio.sleep(reconnect_delay)
+    async def _after_rebuild(rebuilt) -> None:
+        await _sync_xmtp_profile(
+            rebuilt,
+            paths=paths,
+            identity_name=_preferred_git_identity_name(root),
+            hooks=hooks,
+            context="rebuild",
+            context_cache=context_cache,
+        )
+
+    try:
+        await _run_xmtp_transport(
+            client,
+            seen=seen_messages,
+            cursors=poll_cursors,
+            submit=dispatcher.submit,
+            rebuild=_rebuild_client,
+            after_rebuild=_after_rebuild,
+            hooks=hooks,
+        )
     finally:
+        if dispatcher.stats.submitted:
+            _emit_runtime_log(dispatcher.summary(), hooks=hooks)
+            _emit_runtime_log(context_cache.stats.summary(), hooks=hooks)
+        await dispatcher.close()
+        await outbox.close()
+        if outbox.stats.enqueued:
+            _emit_runtime_log(outbox.summary(), hooks=hooks)
         heartbeat.cancel()
-        update_check.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await heartbeat
-        with contextlib.suppress(asyncio.CancelledError):
-            await update_check
+        if update_check_task is not None:
+            update_check_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await update_check_task
 
     return 0
 
@@ -964,9 +1085,16 @@ async def _run_daemon(
 class _ConversationWithTyping:
     _typing_unavailable_noted = False
 
-    def __init__(self, conversation, *, hooks: RuntimeHooks | None = None) -> None:
+    def __init__(
+        self,
+        conversation,
+        *,
+        hooks: RuntimeHooks | None = None,
+        outbox: XmtpOutbox | None = None,
+    ) -> None:
         self._conversation = conversation
         self._hooks = hooks
+        self._outbox = outbox
         self._typing_supported: bool | None = None
 
     async def send(self, content: object, content_type: object | None = None):
@@ -987,7 +1115,19 @@ class _ConversationWithTyping:
         self._emit_outbound_message(content)
         return result
 
+    async def send_system(self, content: str) -> None:
+        """Send a system note without waiting; queued notes may be merged into one message."""
+        conversation_id = _conversation_hex(self._conversation)
+        if self._outbox is None or not conversation_id:
+            await self.send(content)
+            return
+        self._outbox.post(conversation_id, content, conversation=self._conversation)
+        self._emit_outbound_message(content)
+
     async def _send_with_retry(self, content: object, *, content_type: object | None = None):
+        conversation_id = _conversation_hex(self._conversation)
+        if self._outbox is not None and content_type is None and isinstance(content, str) and conversation_id:
+            return await self._outbox.send(conversation_id, content, conversation=self._conversation)
         attempts = max(1, int(XMTP_SEND_RETRY_ATTEMPTS))
         for attempt in range(1, attempts + 1):
             try:
@@ -1057,7 +1197,11 @@ async def _handle_incoming_message(
     inference_runtime: InferenceRuntime,
     conversations: ConversationStore,
     hooks: RuntimeHooks | None = None,
+    context_cache: XmtpContextCache | None = None,
+    outbox: XmtpOutbox | None = None,
 ) -> None:
+    if context_cache is None:
+        context_cache = _new_context_cache(paths, repo_root())
     sender_inbox_id = getattr(item, "sender_inbox_id", None)
     if not isinstance(sender_inbox_id, str):
         return
@@ -1088,36 +1232,31 @@ async def _handle_incoming_message(
         return
     session_key = f"xmtp:{bytes(convo_id).hex()}"
 
-    raw_convo = await client.conversations.get_conversation_by_id(bytes(convo_id))
+    raw_convo = await context_cache.conversation(client, bytes(convo_id))
     if raw_convo is None:
         return
-    identity_name = _preferred_git_identity_name(repo_root())
-    avatar_cache = paths.state_dir / "xmtp-avatar.svg"
-    avatar_url = ""
-    with contextlib.suppress(Exception):
-        if avatar_cache.exists():
-            encoded = base64.b64encode(avatar_cache.read_bytes()).decode("ascii")
-            avatar_url = f"data:image/svg+xml;base64,{encoded}"
-    with contextlib.suppress(Exception):
-        broadcast = await ensure_profile_message_for_conversation(
-            client,
-            raw_convo,
-            state_dir=paths.state_dir,
-            identity_name=identity_name,
-            avatar_url=avatar_url,
-        )
-        if broadcast.self_sent or broadcast.peer_sent_count:
-            _emit_runtime_log(
-                (
-                    "xmtp profile metadata published for active conversation "
-                    f"(self={'yes' if broadcast.self_sent else 'no'} peers={broadcast.peer_sent_count})"
-                ),
-                hooks=hooks,
+    if not context_cache.profile_published(bytes(convo_id)):
+        with contextlib.suppress(Exception):
+            broadcast = await ensure_profile_message_for_conversation(
+                client,
+                raw_convo,
+                state_dir=paths.state_dir,
+                identity_name=context_cache.identity_name(),
+                avatar_url=context_cache.avatar_url(),
             )
-    convo = _ConversationWithTyping(raw_convo, hooks=hooks)
+            if broadcast.target_published:
+                context_cache.mark_profile_published(bytes(convo_id))
+            if broadcast.self_sent or broadcast.peer_sent_count:
+                _emit_runtime_log(
+                    (
+                        "xmtp profile metadata published for active conversation "
+                        f"(self={'yes' if broadcast.self_sent else 'no'} peers={broadcast.peer_sent_count})"
+                    ),
+                    hooks=hooks,
+                )
+    convo = _ConversationWithTyping(raw_convo, hooks=hooks, outbox=outbox)
 
-    operator_cfg = load_operator(paths.operator_json)
-    operator_inbox_id = get_operator_inbox_id(operator_cfg)
+    operator_inbox_id = context_cache.operator_inbox_id()
 
     if operator_inbox_id is None:
         if _looks_like_command(text):
@@ -1127,6 +1266,7 @@ async def _handle_incoming_message(
                 "enter your XMTP handle, and I'll send an outbound DM and imprint the operator channel."
             )
         else:
+            streamer = _reply_streamer(convo, context_cache)
             reply = await _chat_reply(
                 text,
                 inference_runtime,
@@ -1136,15 +1276,17 @@ async def _handle_incoming_message(
                 is_operator=False,
                 operator_paired=False,
                 hooks=hooks,
+                on_stream_event=streamer.on_event if streamer is not None else None,
             )
-            _record_chat_turn(conversations, session_key, text, reply, hooks=hooks)
-            await convo.send(reply)
+            delivered = await _deliver_chat_reply(convo, reply, streamer, hooks=hooks)
+            _record_chat_turn(conversations, session_key, text, delivered, hooks=hooks)
         return
 
     if sender_inbox_id != operator_inbox_id:
         if _looks_like_command(text):
             await convo.send("Operator-only: config/tools/permissions/routines require the operator.")
         else:
+            streamer = _reply_streamer(convo, context_cache)
             reply = await _chat_reply(
                 text,
                 inference_runtime,
@@ -1154,9 +1296,10 @@ async def _handle_incoming_message(
                 is_operator=False,
                 operator_paired=True,
                 hooks=hooks,
+                on_stream_event=streamer.on_event if streamer is not None else None,
             )
-            _record_chat_turn(conversations, session_key, text, reply, hooks=hooks)
-            await convo.send(reply)
+            delivered = await _deliver_chat_reply(convo, reply, streamer, hooks=hooks)
+            _record_chat_turn(conversations, session_key, text, delivered, hooks=hooks)
         return
 
     if not _looks_like_command(text):
@@ -1169,6 +1312,7 @@ async def _handle_incoming_message(
             convo,
             client=client,
             hooks=hooks,
+            context_cache=context_cache,
         ):
             return
         if looks_like_natural_job_request(text):
@@ -1178,6 +1322,7 @@ async def _handle_incoming_message(
             await convo.send(summary)
             return
         child_followups = await _capture_child_operator_context(text, paths, hooks=hooks)
+        streamer = _reply_streamer(convo, context_cache)
         reply = await _chat_reply(
             text,
             inference_runtime,
@@ -1187,13 +1332,14 @@ async def _handle_incoming_message(
             is_operator=True,
             operator_paired=True,
             hooks=hooks,
+            on_stream_event=streamer.on_event if streamer is not None else None,
         )
-        _record_chat_turn(conversations, session_key, text, reply, hooks=hooks)
-        await convo.send(reply)
+        delivered = await _deliver_chat_reply(convo, reply, streamer, hooks=hooks)
+        _record_chat_turn(conversations, session_key, text, delivered, hooks=hooks)
         if _should_emit_child_followups(reply):
             for line in child_followups:
                 if line.strip():
-                    await convo.send(line)
+                    await convo.send_system(line)
         return
 
     cmd, rest = _parse_command(text)
@@ -1209,6 +1355,7 @@ async def _handle_incoming_message(
             f"uptime_s: {uptime}\n"
             f"version: {__version__}\n"
             f"tako_address: {address}"
+            + (f"\n{outbox.summary()}" if outbox is not None else "")
         )
         return
     if cmd == "doctor":
@@ -1627,6 +1774,8 @@ async def _handle_incoming_message(
             return
         apply_update = action not in {"check", "status", "dry-run", "dryrun"}
         try:
+            from .self_update import run_self_update
+
             result = await asyncio.to_thread(run_self_update, repo_root(), apply=apply_update)
         except Exception as exc:  # noqa: BLE001
             await convo.send(f"self-update failed: {_summarize_stream_error(exc)}")
@@ -1692,6 +1841,7 @@ async def _handle_incoming_message(
             )
             return
         clear_operator(paths.operator_json)
+        context_cache.invalidate_operator()
         clear_pending(paths.state_dir / "pairing.json")
         append_daily_note(daily_root(), date.today(), "Operator cleared imprint (reimprint CONFIRM).")
         await convo.send("Operator imprint cleared. Run `.venv/bin/takobot` in the local terminal to pair a new operator.")
@@ -1708,6 +1858,7 @@ async def _maybe_handle_operator_identity_update(
     *,
     client,
     hooks: RuntimeHooks | None,
+    context_cache: XmtpContextCache | None = None,
 ) -> bool:
     if looks_like_role_info_query(text):
         current_name, current_role = read_identity()
@@ -1751,6 +1902,7 @@ async def _maybe_handle_operator_identity_update(
                     identity_name=current_name,
                     hooks=hooks,
                     context="operator-profile-sync-request",
+                    context_cache=context_cache,
                 )
                 await convo.send(
                     f"I just attempted XMTP profile sync to current identity `{current_name}`. "
@@ -1776,6 +1928,7 @@ async def _maybe_handle_operator_identity_update(
             identity_name=parsed,
             hooks=hooks,
             context="operator-name-update",
+            context_cache=context_cache,
         )
         append_daily_note(daily_root(), date.today(), f"Operator renamed via XMTP: {current_name} -> {parsed}")
         await convo.send(f"ink dried. I'll go by `{parsed}` now.")
@@ -1887,22 +2040,86 @@ def _message_id(item) -> bytes | None:
     return None
 
 
-def _mark_message_seen(item, seen_ids: set[bytes], seen_order: deque[bytes]) -> bool:
+def _message_conversation_key(item) -> bytes | None:
+    convo_id = getattr(item, "conversation_id", None)
+    if isinstance(convo_id, (bytes, bytearray)):
+        return bytes(convo_id)
+    return None
+
+
+def _is_operator_message(item, paths, *, context_cache: XmtpContextCache | None = None) -> bool:
+    sender = getattr(item, "sender_inbox_id", None)
+    if not isinstance(sender, str) or not sender:
+        return False
+    if context_cache is not None:
+        return sender == context_cache.operator_inbox_id()
+    return sender == get_operator_inbox_id(load_operator(paths.operator_json))
+
+
+def _conversation_hex(conversation: object) -> str:
+    id_hex = getattr(conversation, "id_hex", None)
+    if isinstance(id_hex, str) and id_hex.strip():
+        return id_hex.strip().lower()
+    raw = getattr(conversation, "id", None)
+    if isinstance(raw, (bytes, bytearray)) and raw:
+        return bytes(raw).hex()
+    return ""
+
+
+def _new_outbox(send_fn, paths: RuntimePaths, *, hooks: RuntimeHooks | None) -> XmtpOutbox:
+    def on_retry(message, attempt: int, delay: float, exc: Exception) -> None:
+        _emit_runtime_log(
+            (
+                f"XMTP send retry ({attempt}/{XMTP_SEND_RETRY_ATTEMPTS - 1}) in {delay:.1f}s: "
+                f"{_summarize_stream_error(exc)}"
+            ),
+            level="warn",
+            stderr=True,
+            hooks=hooks,
+        )
+
+    def on_failure(message, exc: Exception) -> None:
+        _emit_runtime_log(
+            (
+                f"XMTP {message.kind} message to {message.conversation_id[:12]} moved to "
+                f"{XMTP_OUTBOX_DEAD_LETTER_FILE}: {_summarize_stream_error(exc)}"
+            ),
+            level="warn",
+            stderr=True,
+            hooks=hooks,
+        )
+
+    return XmtpOutbox(
+        send_fn,
+        spool_path=paths.state_dir / XMTP_OUTBOX_FILE,
+        dead_letter_path=paths.state_dir / XMTP_OUTBOX_DEAD_LETTER_FILE,
+        max_attempts=XMTP_SEND_RETRY_ATTEMPTS,
+        retry_base_s=XMTP_SEND_RETRY_BASE_S,
+        is_retryable=_is_retryable_xmtp_error,
+        is_ambiguous=_is_ambiguous_xmtp_send_error,
+        on_retry=on_retry,
+        on_failure=on_failure,
+    )
+
+
+def _new_context_cache(paths: RuntimePaths, root: Path) -> XmtpContextCache:
+    return XmtpContextCache(
+        operator_path=paths.operator_json,
+        avatar_path=paths.state_dir / "xmtp-avatar.svg",
+        identity_loader=lambda: _preferred_git_identity_name(root),
+        identity_paths=(root / "tako.toml", soul_path()),
+        config_path=root / "tako.toml",
+    )
+
+
+def _mark_message_seen(item, seen: SeenIdStore) -> bool:
     message_id = _message_id(item)
     if message_id is None:
         return True
-    if message_id in seen_ids:
-        return False
+    return seen.add(message_id)
 
-    seen_ids.add(message_id)
-    seen_order.append(message_id)
-    while len(seen_order) > SEEN_MESSAGE_CACHE_MAX:
-        removed = seen_order.popleft()
-        seen_ids.discard(removed)
-    return True
 
-
-async def _collect_history_messages(client) -> list[object]:
+async def _collect_history_messages(client, cursors: XmtpPollCursors | None = None) -> list[object]:
     messages: list[object] = []
 
     with contextlib.suppress(Exception):
@@ -1915,19 +2132,38 @@ async def _collect_history_messages(client) -> list[object]:
         convo_id = getattr(convo, "id", None)
         if not isinstance(convo_id, (bytes, bytearray)):
             continue
+        cid = bytes(convo_id).hex()
+        marker = str(getattr(convo, "activity_marker", "") or "")
+        if cursors is not None and cursors.unchanged(cid, marker):
+            continue
+        sent_after = cursors.sent_after(cid) if cursors is not None else None
         try:
-            raw_messages = await client.conversations.messages(
-                bytes(convo_id),
-                limit=MESSAGE_HISTORY_PER_CONVERSATION,
-            )
+            if sent_after is None:
+                # No cursor yet: read the newest page so the cursor starts at the conversation head
+                # and older history is never paged forward as if it were new.
+                raw_messages = await client.conversations.messages(
+                    bytes(convo_id),
+                    limit=MESSAGE_HISTORY_PER_CONVERSATION,
+                    direction="descending",
+                )
+                complete = True
+            else:
+                raw_messages = await client.conversations.messages(
+                    bytes(convo_id),
+                    limit=MESSAGE_HISTORY_PER_CONVERSATION,
+                    sent_after=sent_after,
+                )
+                complete = len(raw_messages) < MESSAGE_HISTORY_PER_CONVERSATION
         except Exception:
             continue
 
-        for raw in raw_messages:
-            if not hasattr(raw, "id") or not hasattr(raw, "conversation_id"):
-                continue
-            messages.append(raw)
+        convo_messages = [raw for raw in raw_messages if hasattr(raw, "id") and hasattr(raw, "conversation_id")]
+        messages.extend(convo_messages)
+        if cursors is not None:
+            cursors.advance(cid, convo_messages, marker=marker, complete=complete)
 
+    if cursors is not None:
+        cursors.save()
     messages.sort(
         key=lambda item: getattr(
             item,
@@ -1938,21 +2174,252 @@ async def _collect_history_messages(client) -> list[object]:
     return messages
 
 
-async def _prime_seen_messages(client, seen_ids: set[bytes], seen_order: deque[bytes]) -> None:
-    history = await _collect_history_messages(client)
+async def _prime_seen_messages(client, seen: SeenIdStore, cursors: XmtpPollCursors | None = None) -> None:
+    history = await _collect_history_messages(client, cursors)
     for item in history:
-        _mark_message_seen(item, seen_ids, seen_order)
+        _mark_message_seen(item, seen)
+    seen.flush()
 
 
-async def _poll_new_messages(client, seen_ids: set[bytes], seen_order: deque[bytes]) -> list[object]:
-    history = await _collect_history_messages(client)
+async def _poll_new_messages(client, seen: SeenIdStore, cursors: XmtpPollCursors | None = None) -> list[object]:
+    history = await _collect_history_messages(client, cursors)
     new_items: list[object] = []
     for item in history:
-        if _mark_message_seen(item, seen_ids, seen_order):
+        if _mark_message_seen(item, seen):
             new_items.append(item)
+    seen.flush()
     return new_items
 
 
+async def _resume_seen_messages(
+    client,
+    seen: SeenIdStore,
+    cursors: XmtpPollCursors,
+    *,
+    max_age_s: float = XMTP_RESUME_MAX_AGE_S,
+) -> list[object]:
+    """Catch up from the persisted ledger instead of re-priming full history.
+
+    Used at startup and after every client rebuild. Returns messages newer than
+    the stored cursors that still deserve handling; anything older than
+    `max_age_s` is recorded as seen without a reply.
+    """
+    new_items = await _poll_new_messages(client, seen, cursors)
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(seconds=max_age_s)
+    return [item for item in new_items if getattr(item, "sent_at", cutoff) >= cutoff]
+
+
+@dataclass(frozen=True)
+class XmtpTransportSettings:
+    """Tunables of the XMTP stream/poll/rebuild loop (the benchmark shrinks the waits)."""
+
+    poll_interval_s: float = STREAM_POLL_INTERVAL_S
+    poll_stable_cycles: int = STREAM_POLL_STABLE_CYCLES
+    error_burst_window_s: float = STREAM_ERROR_BURST_WINDOW_S
+    error_burst_threshold: int = STREAM_ERROR_BURST_THRESHOLD
+    poll_error_rebuild_threshold: int = XMTP_POLL_ERROR_REBUILD_THRESHOLD
+    stream_crash_rebuild_threshold: int = XMTP_STREAM_CRASH_REBUILD_THRESHOLD
+    rebuild_cooldown_s: float = XMTP_CLIENT_REBUILD_COOLDOWN_S
+    reconnect_scale: float = 1.0
+    resume_max_age_s: float = XMTP_RESUME_MAX_AGE_S
+
+
+@dataclass
+class XmtpTransportStats:
+    stream_crashes: int = 0
+    stream_error_bursts: int = 0
+    poll_cycles: int = 0
+    poll_errors: int = 0
+    client_rebuilds: int = 0
+    last_stream_failure_at: float = 0.0
+
+
+async def _run_xmtp_transport(
+    client,
+    *,
+    seen: SeenIdStore,
+    cursors: XmtpPollCursors,
+    submit: Callable[[object], Awaitable[None]],
+    rebuild: Callable[[object], Awaitable[object | None]],
+    after_rebuild: Callable[[object], Awaitable[None]] | None = None,
+    settings: XmtpTransportSettings | None = None,
+    stats: XmtpTransportStats | None = None,
+    hooks: RuntimeHooks | None = None,
+) -> None:
+    """Deliver inbound XMTP messages to `submit` until cancelled.
+
+    Primes (or resumes) the seen-message ledger, then streams; error bursts and
+    crashes fall back to polling, repeated failures rebuild the client through
+    `rebuild` (which returns the new client or None), and stable polling
+    switches back to the stream. Shared by the daemon and `xmtp_bench`.
+    """
+    settings = settings or XmtpTransportSettings()
+    stats = stats if stats is not None else XmtpTransportStats()
+    reconnect_attempt = 0
+    error_burst_count = 0
+    last_error_at = 0.0
+    stream_crash_streak = 0
+    poll_successes = 0
+    poll_error_streak = 0
+    last_client_rebuild_at = 0.0
+    mode = "stream"
+    hint_last_printed: dict[str, float] = {}
+
+    async def rebuild_and_resume(now: float) -> bool:
+        nonlocal client, last_client_rebuild_at
+        rebuilt = await rebuild(client)
+        last_client_rebuild_at = now
+        if rebuilt is None:
+            return False
+        client = rebuilt
+        stats.client_rebuilds += 1
+        with contextlib.suppress(Exception):
+            for item in await _resume_seen_messages(client, seen, cursors, max_age_s=settings.resume_max_age_s):
+                await submit(item)
+        if after_rebuild is not None:
+            await after_rebuild(client)
+        return True
+
+    startup_backlog: list[object] = []
+    with contextlib.suppress(Exception):
+        if len(seen) and len(cursors):
+            # Resume from the ledger; only recent messages missed while offline get a reply.
+            startup_backlog = await _resume_seen_messages(
+                client,
+                seen,
+                cursors,
+                max_age_s=settings.resume_max_age_s,
+            )
+        else:
+            await _prime_seen_messages(client, seen, cursors)
+    for item in startup_backlog:
+        await submit(item)
+
+    while True:
+        if mode == "poll":
+            stats.poll_cycles += 1
+            try:
+                items = await _poll_new_messages(client, seen, cursors)
+                for item in items:
+                    await submit(item)
+                poll_successes += 1
+                poll_error_streak = 0
+                reconnect_attempt = 0
+                if poll_successes >= settings.poll_stable_cycles:
+                    _emit_runtime_log(
+                        "XMTP polling is stable; retrying stream mode.",
+                        level="warn",
+                        stderr=True,
+                        hooks=hooks,
+                    )
+                    mode = "stream"
+                    error_burst_count = 0
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except KeyboardInterrupt:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                now = time.monotonic()
+                stats.poll_errors += 1
+                summary = _summarize_stream_error(exc)
+                _emit_runtime_log(f"XMTP polling error: {summary}", level="error", stderr=True, hooks=hooks)
+                _maybe_print_xmtp_hint(exc, hint_last_printed, now, hooks=hooks)
+                poll_successes = 0
+                poll_error_streak += 1
+                if (
+                    poll_error_streak >= settings.poll_error_rebuild_threshold
+                    and (now - last_client_rebuild_at) >= settings.rebuild_cooldown_s
+                    and await rebuild_and_resume(now)
+                ):
+                    poll_error_streak = 0
+                    stream_crash_streak = 0
+                    reconnect_attempt = 0
+                    mode = "stream"
+
+            await asyncio.sleep(settings.poll_interval_s)
+            continue
+
+        stream = client.conversations.stream_all_messages()
+        try:
+            async for item in stream:
+                if isinstance(item, Exception):
+                    now = time.monotonic()
+                    if now - last_error_at > settings.error_burst_window_s:
+                        error_burst_count = 0
+                    error_burst_count += 1
+                    last_error_at = now
+
+                    summary = _summarize_stream_error(item)
+                    _emit_runtime_log(f"XMTP stream warning: {summary}", level="warn", stderr=True, hooks=hooks)
+
+                    _maybe_print_xmtp_hint(item, hint_last_printed, now, hooks=hooks)
+
+                    if error_burst_count >= settings.error_burst_threshold:
+                        _emit_runtime_log(
+                            "XMTP stream unstable; switching to polling fallback.",
+                            level="warn",
+                            stderr=True,
+                            hooks=hooks,
+                        )
+                        stats.stream_error_bursts += 1
+                        stats.last_stream_failure_at = now
+                        mode = "poll"
+                        poll_successes = 0
+                        break
+                    continue
+
+                error_burst_count = 0
+                stream_crash_streak = 0
+                reconnect_attempt = 0
+                if _mark_message_seen(item, seen):
+                    seen.flush()
+                    convo_key = _message_conversation_key(item)
+                    if convo_key is not None:
+                        cursors.advance(convo_key.hex(), [item], marker="", complete=False)
+                        cursors.save()
+                    await submit(item)
+        except asyncio.CancelledError:
+            raise
+        except KeyboardInterrupt:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            now = time.monotonic()
+            stats.stream_crashes += 1
+            stats.last_stream_failure_at = now
+            summary = _summarize_stream_error(exc)
+            _emit_runtime_log(f"XMTP stream crashed: {summary}", level="error", stderr=True, hooks=hooks)
+            _maybe_print_xmtp_hint(exc, hint_last_printed, now, hooks=hooks)
+            stream_crash_streak += 1
+            mode = "poll"
+            poll_successes = 0
+            if (
+                stream_crash_streak >= settings.stream_crash_rebuild_threshold
+                and (now - last_client_rebuild_at) >= settings.rebuild_cooldown_s
+                and await rebuild_and_resume(now)
+            ):
+                stream_crash_streak = 0
+                poll_error_streak = 0
+                reconnect_attempt = 0
+                mode = "stream"
+        finally:
+            with contextlib.suppress(Exception):
+                await stream.close()
+
+        if mode == "poll":
+            continue
+
+        reconnect_delay = _stream_reconnect_delay(reconnect_attempt)
+        reconnect_attempt += 1
+        _emit_runtime_log(
+            f"XMTP stream reconnecting in {reconnect_delay:.1f}s...",
+            level="warn",
+            stderr=True,
+            hooks=hooks,
+        )
+        await asyncio.sleep(reconnect_delay * settings.reconnect_scale)
+
+
 async def _close_xmtp_client(client) -> None:
     await close_client(client)
 
@@ -1964,6 +2431,7 @@ async def _sync_xmtp_profile(
     identity_name: str,
     hooks: RuntimeHooks | None = None,
     context: str,
+    context_cache: XmtpContextCache | None = None,
 ) -> XmtpProfileSyncResult | None:
     try:
         result = await sync_identity_profile(
@@ -1984,6 +2452,11 @@ async def _sync_xmtp_profile(
             hooks=hooks,
         )
         return None
+    finally:
+        if context_cache is not None:
+            # A sync can rename the identity or regenerate the avatar.
+            context_cache.invalidate_identity()
+            context_cache.invalidate_profile()
 
     if result.applied_name or result.applied_avatar:
         _emit_runtime_log(
@@ -2144,6 +2617,8 @@ async def _periodic_update_check_loop(*, hooks: RuntimeHooks | None = None) -> N
     last_signature = ""
     while True:
         try:
+            from .self_update import run_self_update
+
             result = await asyncio.to_thread(run_self_update, repo_root(), apply=False)
         except Exception as exc:  # noqa: BLE001
             message = f"update check failed: {_summarize_stream_error(exc)}"
@@ -2281,6 +2756,7 @@ async def _send_operator_startup_presence(
     operator_cfg: dict[str, object] | None,
     message: str,
     hooks: RuntimeHooks | None,
+    outbox: XmtpOutbox | None = None,
 ) -> bool:
     operator_inbox_id = get_operator_inbox_id(operator_cfg if isinstance(operator_cfg, dict) else None)
     if not operator_inbox_id:
@@ -2306,7 +2782,11 @@ async def _send_operator_startup_presence(
         seen.add(recipient)
         try:
             raw_convo = await client.conversations.new_dm(recipient)
-            convo = _ConversationWithTyping(raw_convo, hooks=hooks)
+            convo = _ConversationWithTyping(raw_convo, hooks=hooks, outbox=outbox)
+            if outbox is not None:
+                await convo.send_system(message)
+                _emit_runtime_log(f"startup presence queued for operator via {label}", hooks=hooks)
+                return True
             await convo.send(message)
             _emit_runtime_log(f"startup presence sent to operator via {label}", hooks=hooks)
             return True
@@ -2446,6 +2926,7 @@ async def _chat_reply(
     is_operator: bool,
     operator_paired: bool,
     hooks: RuntimeHooks | None,
+    on_stream_event: StreamEventHook | None = None,
 ) -> str:
     if _looks_like_tako_toml_question(text):
         cfg, warn = load_tako_toml(repo_root() / "tako.toml")
@@ -2535,6 +3016,14 @@ async def _chat_reply(
         rag_context=rag_result.context,
     )
     async def _infer_once() -> tuple[str, str]:
+        if on_stream_event is not None:
+            return await stream_inference_prompt_with_fallback(
+                inference_runtime,
+                prompt,
+                timeout_s=CHAT_INFERENCE_TIMEOUT_S,
+                on_event=on_stream_event,
+                model=inference_model_for_lane("type1"),
+            )
         return await asyncio.to_thread(
             run_inference_prompt_with_fallback,
             inference_runtime,
@@ -2742,6 +3231,39 @@ def _should_emit_child_followups(reply: str) -> bool:
     return not ("inference is unavailable right now" in lowered and "fallback mode" in lowered)
 
 
+def _reply_streamer(convo, context_cache: XmtpContextCache) -> ReplyStreamer | None:
+    cfg = context_cache.xmtp_config()
+    if not cfg.stream_replies:
+        return None
+    return ReplyStreamer(
+        convo.send,
+        flush_s=cfg.stream_flush_seconds,
+        min_chars=cfg.stream_min_chars,
+        max_chars=CHAT_REPLY_MAX_CHARS,
+    )
+
+
+async def _deliver_chat_reply(
+    convo,
+    reply: str,
+    streamer: ReplyStreamer | None,
+    *,
+    hooks: RuntimeHooks | None = None,
+) -> str:
+    """Send `reply` (or finish the stream) and return the text the peer actually received."""
+    if streamer is None:
+        await convo.send(reply)
+        return reply
+    delivered = await streamer.finish(reply)
+    if streamer.reply_restarted:
+        _emit_runtime_log(
+            "XMTP streamed reply diverged after a retry; sent the final reply as a restarted follow-up.",
+            level="warn",
+            hooks=hooks,
+        )
+    return delivered or reply
+
+
 def _clean_chat_reply(text: str) -> str:
     value = " ".join(text.strip().split())
     if not value:
@@ -2845,6 +3367,12 @@ def _is_retryable_xmtp_error(error: Exception) -> bool:
     return any(token in lowered for token in retryable_tokens)
 
 
+def _is_ambiguous_xmtp_send_error(error: Exception) -> bool:
+    """A send that timed out after it was handed off may already have been delivered."""
+    lowered = str(error).strip().lower()
+    return any(token in lowered for token in ("timeout", "timed out", "deadline exceeded"))
+
+
 def _summarize_stream_error(error: Exception) -> str:
     first_line = str(error).strip().splitlines()
     if not first_line:
@@ -2871,11 +3399,18 @@ def _stream_reconnect_delay(attempt: int) -> float:
 
 
 def main(argv: list[str] | None = None) -> int:
+    started_at = time.perf_counter()
     parser = build_parser()
     argv = list(argv) if argv is not None else list(sys.argv[1:])
     if not argv:
         argv = ["app"]
     args = parser.parse_args(argv)
+    if args.cmd is None and args.profile_startup:
+        args = parser.parse_args([*argv, "app"])
+    if args.profile_startup:
+        if args.cmd != "app":
+            parser.error("--profile-startup only applies to the interactive app")
+        args.startup_profile = StartupProfile(started_at=started_at)
 
     if args.cmd == "app":
         return cmd_app(args)
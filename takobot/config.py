@@ -56,6 +56,16 @@ def _as_str_list(value) -> list[str]:
     return []
 
 
+TYPE1_OVERFLOW_POLICIES = ("drop-oldest", "coalesce", "spill")
+
+
+def normalize_overflow_policy(value: object, *, default: str = "drop-oldest") -> str:
+    cleaned = str(value or "").strip().lower().replace("_", "-")
+    if cleaned == "drop":
+        cleaned = "drop-oldest"
+    return cleaned if cleaned in TYPE1_OVERFLOW_POLICIES else default
+
+
 @dataclass(frozen=True)
 class WorkspaceConfig:
     name: str = "Tako"
@@ -88,6 +98,28 @@ class WorldWatchConfig:
     poll_minutes: int = 15
 
 
+@dataclass(frozen=True)
+class XmtpConfig:
+    stream_replies: bool = False
+    stream_flush_seconds: float = 4.0
+    stream_min_chars: int = 240
+
+
+@dataclass(frozen=True)
+class EventsConfig:
+    type1_queue_max: int = 512
+    type1_overflow: str = "drop-oldest"
+    dedupe_max: int = 4096
+    dedupe_window_seconds: float = 3600.0
+
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    max_bytes: int = 5_000_000
+    backups: int = 5
+    compress: bool = True
+
+
 @dataclass(frozen=True)
 class LifeConfig:
     stage: str = DEFAULT_LIFE_STAGE
@@ -120,6 +152,9 @@ class TakoConfig:
     productivity: ProductivityConfig = field(default_factory=ProductivityConfig)
     updates: UpdatesConfig = field(default_factory=UpdatesConfig)
     world_watch: WorldWatchConfig = field(default_factory=WorldWatchConfig)
+    xmtp: XmtpConfig = field(default_factory=XmtpConfig)
+    events: EventsConfig = field(default_factory=EventsConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
     life: LifeConfig = field(default_factory=LifeConfig)
     security: SecurityConfig = field(default_factory=SecurityConfig)
 
@@ -147,6 +182,9 @@ def load_tako_toml(path: Path) -> tuple[TakoConfig, str]:
     productivity = data.get("productivity") if isinstance(data.get("productivity"), dict) else {}
     updates = data.get("updates") if isinstance(data.get("updates"), dict) else {}
     world_watch = data.get("world_watch") if isinstance(data.get("world_watch"), dict) else {}
+    xmtp = data.get("xmtp") if isinstance(data.get("xmtp"), dict) else {}
+    events = data.get("events") if isinstance(data.get("events"), dict) else {}
+    logging_cfg = data.get("logging") if isinstance(data.get("logging"), dict) else {}
     life = data.get("life") if isinstance(data.get("life"), dict) else {}
     security = data.get("security") if isinstance(data.get("security"), dict) else {}
     security_download = security.get("download") if isinstance(security.get("download"), dict) else {}
@@ -183,6 +221,28 @@ def load_tako_toml(path: Path) -> tuple[TakoConfig, str]:
                 ),
             ),
         ),
+        xmtp=XmtpConfig(
+            stream_replies=_as_bool(xmtp.get("stream_replies"), default=XmtpConfig.stream_replies),
+            stream_flush_seconds=max(
+                0.5,
+                _as_float(xmtp.get("stream_flush_seconds"), default=XmtpConfig.stream_flush_seconds),
+            ),
+            stream_min_chars=max(1, _as_int(xmtp.get("stream_min_chars"), default=XmtpConfig.stream_min_chars)),
+        ),
+        events=EventsConfig(
+            type1_queue_max=max(16, _as_int(events.get("type1_queue_max"), default=EventsConfig.type1_queue_max)),
+            type1_overflow=normalize_overflow_policy(events.get("type1_overflow"), default=EventsConfig.type1_overflow),
+            dedupe_max=max(64, _as_int(events.get("dedupe_max"), default=EventsConfig.dedupe_max)),
+            dedupe_window_seconds=max(
+                60.0,
+                _as_float(events.get("dedupe_window_seconds"), default=EventsConfig.dedupe_window_seconds),
+            ),
+        ),
+        logging=LoggingConfig(
+            max_bytes=max(100_000, _as_int(logging_cfg.get("max_bytes"), default=LoggingConfig.max_bytes)),
+            backups=max(0, min(50, _as_int(logging_cfg.get("backups"), default=LoggingConfig.backups))),
+            compress=_as_bool(logging_cfg.get("compress"), default=LoggingConfig.compress),
+        ),
         life=LifeConfig(
             stage=normalize_life_stage_name(str(life.get("stage") or LifeConfig.stage), default=LifeConfig.stage),
         ),
@@ -529,6 +589,22 @@ def explain_tako_toml(config: TakoConfig, *, path: Path | None = None) -> str:
         f"- sites: website URLs to sample in child-stage curiosity exploration (current: {len(config.world_watch.sites)})",
         f"- poll_minutes: feed polling cadence in minutes (current: {config.world_watch.poll_minutes})",
         "",
+        "[xmtp]",
+        f"- stream_replies: send long XMTP chat replies in chunks while inference runs (current: {'true' if config.xmtp.stream_replies else 'false'})",
+        f"- stream_flush_seconds: how often buffered reply text is sent (current: {config.xmtp.stream_flush_seconds:g})",
+        f"- stream_min_chars: minimum characters per streamed chunk (current: {config.xmtp.stream_min_chars})",
+        "",
+        "[events]",
+        f"- type1_queue_max: Type1 event queue bound before the overflow policy applies (current: {config.events.type1_queue_max})",
+        f"- type1_overflow: `drop-oldest`, `coalesce` (merge by event type), or `spill` (to `.tako/state/type1_spill.jsonl`) (current: {config.events.type1_overflow})",
+        f"- dedupe_max: recent event ids remembered for dedupe (current: {config.events.dedupe_max})",
+        f"- dedupe_window_seconds: how long an event id is remembered (current: {config.events.dedupe_window_seconds:g})",
+        "",
+        "[logging]",
+        f"- max_bytes: rotate `.tako/logs/*.log` once a file reaches this size (current: {config.logging.max_bytes})",
+        f"- backups: rotated files kept per log (current: {config.logging.backups})",
+        f"- compress: gzip rotated log files (current: {'true' if config.logging.compress else 'false'})",
+        "",
         "[life]",
         f"- stage: life stage (`{stage_titles_csv()}`) controlling routines/cadence/budgets (current: {config.life.stage})",
         "",
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass
+import hashlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+import shutil
+import socket
+import time
+from typing import Callable
+
+from .node_runtime import workspace_node_bin_dir
+from .xmtp_runtime import XMTP_CLI_VERSION, XMTP_MIN_NODE_MAJOR, probe_xmtp_runtime, workspace_xmtp_cli_path
+
+HEALTH_CACHE_FILE = "health.json"
+HEALTH_CACHE_VERSION = 1
+HEALTH_CHECK_DEFAULT_TIMEOUT_S = 10.0
+HEALTH_CHECK_TOOLCHAIN_TTL_S = 24 * 60 * 60
+HEALTH_CHECK_NETWORK_TTL_S = 10 * 60
+HEALTH_CHECK_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class HealthCheck:
+    """One independent startup/doctor probe.
+
+    `probe` returns `(ok, detail)`. A passing result is cached for `ttl_s`
+    seconds (0 disables caching) and reused only while `fingerprint()` —
+    the probe's inputs, e.g. binary paths and mtimes — is unchanged.
+    """
+
+    name: str
+    probe: Callable[[], tuple[bool, str]]
+    timeout_s: float = HEALTH_CHECK_DEFAULT_TIMEOUT_S
+    ttl_s: float = 0.0
+    fingerprint: Callable[[], object] | None = None
+
+
+@dataclass(frozen=True)
+class HealthResult:
+    name: str
+    ok: bool
+    detail: str
+    elapsed_s: float
+    cached: bool = False
+    timed_out: bool = False
+    age_s: float = 0.0
+
+    def timing_text(self) -> str:
+        if self.cached:
+            return f"cached ({_age_text(self.age_s)} old, probe took {self.elapsed_s * 1000.0:.0f}ms)"
+        if self.timed_out:
+            return f"timed out after {self.elapsed_s * 1000.0:.0f}ms"
+        return f"{self.elapsed_s * 1000.0:.0f}ms"
+
+
+class HealthCache:
+    """Passing health results persisted in `.tako/state/health.json`."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, object]] = {}
+        if path is None:
+            return
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:  # noqa: BLE001
+            return
+        if not isinstance(payload, dict) or payload.get("version") != HEALTH_CACHE_VERSION:
+            return
+        checks = payload.get("checks")
+        if isinstance(checks, dict):
+            self.entries = {str(key): value for key, value in checks.items() if isinstance(value, dict)}
+
+    def lookup(self, check: HealthCheck, fingerprint: str, *, now: float) -> HealthResult | None:
+        if check.ttl_s <= 0:
+            return None
+        entry = self.entries.get(check.name)
+        if entry is None or entry.get("fingerprint") != fingerprint or entry.get("ok") is not True:
+            return None
+        try:
+            checked_at = float(entry.get("checked_at", 0.0))
+            elapsed_ms = float(entry.get("elapsed_ms", 0.0))
+        except (TypeError, ValueError):
+            return None
+        age_s = now - checked_at
+        if age_s < 0 or age_s > check.ttl_s:
+            return None
+        return HealthResult(
+            name=check.name,
+            ok=True,
+            detail=str(entry.get("detail", "")),
+            elapsed_s=elapsed_ms / 1000.0,
+            cached=True,
+            age_s=age_s,
+        )
+
+    def store(self, check: HealthCheck, result: HealthResult, fingerprint: str, *, now: float) -> None:
+        if check.ttl_s <= 0 or result.cached:
+            return
+        if not result.ok:
+            # Failures are always re-probed; only a passing environment is reused.
+            self.entries.pop(check.name, None)
+            return
+        self.entries[check.name] = {
+            "ok": True,
+            "detail": result.detail,
+            "checked_at": now,
+            "elapsed_ms": round(result.elapsed_s * 1000.0, 1),
+            "fingerprint": fingerprint,
+        }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        payload = {"version": HEALTH_CACHE_VERSION, "checks": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception:  # noqa: BLE001
+            return
+
+
+def run_health_checks(
+    checks: list[HealthCheck],
+    *,
+    cache_path: Path | None = None,
+    now: float | None = None,
+) -> dict[str, HealthResult]:
+    """Run checks concurrently, each bounded by its own deadline; reuse cached passes."""
+    now = time.time() if now is None else now
+    cache = HealthCache(cache_path)
+    results: dict[str, HealthResult] = {}
+    pending: list[tuple[HealthCheck, str]] = []
+    for check in checks:
+        fingerprint = _fingerprint_text(check)
+        cached = cache.lookup(check, fingerprint, now=now)
+        if cached is not None:
+            results[check.name] = cached
+        else:
+            pending.append((check, fingerprint))
+
+    if pending:
+        executor = ThreadPoolExecutor(
+            max_workers=min(HEALTH_CHECK_MAX_WORKERS, len(pending)),
+            thread_name_prefix="tako-health",
+        )
+        started_at = time.perf_counter()
+        try:
+            # Each probe gets a copy of the caller's context so workspace overrides apply in the thread.
+            futures = {
+                check.name: executor.submit(contextvars.copy_context().run, _timed_probe, check)
+                for check, _fingerprint in pending
+            }
+            for check, fingerprint in pending:
+                future = futures[check.name]
+                remaining = check.timeout_s - (time.perf_counter() - started_at)
+                try:
+                    result = future.result(timeout=max(0.0, remaining))
+                except TimeoutError:
+                    future.cancel()
+                    result = HealthResult(
+                        name=check.name,
+                        ok=False,
+                        detail=f"timed out after {check.timeout_s:.0f}s",
+                        elapsed_s=check.timeout_s,
+                        timed_out=True,
+                    )
+                results[check.name] = result
+                cache.store(check, result, fingerprint, now=now)
+        finally:
+            # A probe stuck past its deadline must not hold up startup.
+            executor.shutdown(wait=False, cancel_futures=True)
+        cache.save()
+
+    return {check.name: results[check.name] for check in checks}
+
+
+def format_health_timing_lines(results: dict[str, HealthResult]) -> list[str]:
+    return [
+        f"- health check {name}: {'ok' if result.ok else 'failed'} in {result.timing_text()}"
+        for name, result in results.items()
+    ]
+
+
+def dns_check(host: str, *, name: str = "dns_xmtp") -> HealthCheck:
+    def probe() -> tuple[bool, str]:
+        try:
+            address = socket.gethostbyname(host)
+        except Exception as exc:  # noqa: BLE001
+            return False, f"{host}: {exc}"
+        return True, f"{host} -> {address}"
+
+    return HealthCheck(
+        name=name,
+        probe=probe,
+        timeout_s=5.0,
+        ttl_s=HEALTH_CHECK_NETWORK_TTL_S,
+        fingerprint=lambda: (host, file_fingerprint(Path("/etc/resolv.conf"), Path("/etc/hosts"))),
+    )
+
+
+def xmtp_runtime_check() -> HealthCheck:
+    def probe() -> tuple[bool, str]:
+        result = probe_xmtp_runtime()
+        return result.ok, result.status
+
+    return HealthCheck(
+        name="xmtp_runtime",
+        probe=probe,
+        timeout_s=20.0,
+        ttl_s=HEALTH_CHECK_TOOLCHAIN_TTL_S,
+        fingerprint=xmtp_runtime_fingerprint,
+    )
+
+
+def module_check(name: str, module: str, *, import_module: bool = False) -> HealthCheck:
+    """Check that `module` is importable; `import_module=True` actually imports it (slow for web3)."""
+
+    def probe() -> tuple[bool, str]:
+        try:
+            if import_module:
+                __import__(module)
+                return True, "import OK"
+            spec = importlib.util.find_spec(module)
+        except Exception as exc:  # noqa: BLE001
+            return False, f"import failed: {exc}"
+        if spec is None:
+            return False, "module not found"
+        return True, "module found"
+
+    def fingerprint() -> object:
+        try:
+            spec = importlib.util.find_spec(module)
+        except Exception:  # noqa: BLE001
+            return None
+        origin = getattr(spec, "origin", None) if spec is not None else None
+        return (module, file_fingerprint(Path(origin)) if origin else None)
+
+    return HealthCheck(
+        name=name,
+        probe=probe,
+        timeout_s=20.0,
+        ttl_s=HEALTH_CHECK_TOOLCHAIN_TTL_S if import_module else 0.0,
+        fingerprint=fingerprint,
+    )
+
+
+def command_check(
+    name: str,
+    probe: Callable[[], tuple[bool, str]],
+    executable: str,
+    *,
+    timeout_s: float,
+) -> HealthCheck:
+    """Cache a CLI probe (e.g. `pi --version`) against the resolved executable's mtime/size."""
+    return HealthCheck(
+        name=name,
+        probe=probe,
+        timeout_s=timeout_s,
+        ttl_s=HEALTH_CHECK_TOOLCHAIN_TTL_S,
+        fingerprint=lambda: (executable, file_fingerprint(_resolve_executable(executable))),
+    )
+
+
+def xmtp_runtime_fingerprint() -> object:
+    node_bin_dir = workspace_node_bin_dir(min_major=XMTP_MIN_NODE_MAJOR)
+    system_node = shutil.which("node")
+    return (
+        XMTP_CLI_VERSION,
+        file_fingerprint(workspace_xmtp_cli_path()),
+        str(node_bin_dir) if node_bin_dir is not None else None,
+        file_fingerprint(Path(system_node)) if system_node else None,
+    )
+
+
+def file_fingerprint(*paths: Path | None) -> tuple[tuple[str, int, int], ...]:
+    out: list[tuple[str, int, int]] = []
+    for path in paths:
+        if path is None:
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            out.append((str(path), -1, -1))
+            continue
+        out.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(out)
+
+
+def _resolve_executable(executable: str) -> Path | None:
+    resolved = shutil.which(executable)
+    if resolved:
+        return Path(resolved)
+    candidate = Path(executable)
+    return candidate if candidate.is_absolute() else None
+
+
+def _timed_probe(check: HealthCheck) -> HealthResult:
+    started_at = time.perf_counter()
+    try:
+        ok, detail = check.probe()
+    except Exception as exc:  # noqa: BLE001
+        ok, detail = False, f"probe error: {exc}"
+    return HealthResult(
+        name=check.name,
+        ok=bool(ok),
+        detail=str(detail),
+        elapsed_s=max(0.0, time.perf_counter() - started_at),
+    )
+
+
+def _fingerprint_text(check: HealthCheck) -> str:
+    if check.fingerprint is None:
+        return ""
+    try:
+        raw = repr(check.fingerprint())
+    except Exception as exc:  # noqa: BLE001
+        raw = f"error:{exc}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _age_text(seconds: float) -> str:
+    seconds = max(0.0, seconds)
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
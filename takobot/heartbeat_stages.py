@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+import time
+from typing import Hashable
+
+from .histogram import DurationHistogram
+
+
+class HeartbeatTimings:
+    """Per-tick and per-stage durations plus skip counts for the app heartbeat."""
+
+    def __init__(self) -> None:
+        self.tick = DurationHistogram()
+        self.stages: dict[str, DurationHistogram] = {}
+        self.skipped: dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.stages.setdefault(stage, DurationHistogram()).observe(seconds)
+
+    def record_skip(self, stage: str) -> None:
+        self.skipped[stage] = self.skipped.get(stage, 0) + 1
+
+    def lines(self) -> list[str]:
+        lines = [self.tick.summary("heartbeat_tick")]
+        for stage in sorted(set(self.stages) | set(self.skipped)):
+            histogram = self.stages.get(stage) or DurationHistogram()
+            lines.append(f"{histogram.summary(f'heartbeat_stage[{stage}]')} skipped={self.skipped.get(stage, 0)}")
+        return lines
+
+
+class StageInputs:
+    """Remember the last input signature per stage so unchanged stages can be skipped."""
+
+    def __init__(self) -> None:
+        self._last: dict[str, Hashable] = {}
+
+    def unchanged(self, stage: str, signature: Hashable) -> bool:
+        return stage in self._last and self._last[stage] == signature
+
+    def remember(self, stage: str, signature: Hashable) -> None:
+        self._last[stage] = signature
+
+    def forget(self, stage: str | None = None) -> None:
+        if stage is None:
+            self._last.clear()
+        else:
+            self._last.pop(stage, None)
+
+
+def file_signature(*paths: Path) -> tuple[tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) per file; missing files use -1 so their creation is noticed."""
+    out: list[tuple[str, int, int]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            out.append((str(path), -1, -1))
+            continue
+        out.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(out)
+
+
+def directory_signature(root: Path, pattern: str = "*.md") -> tuple[tuple[str, int, int], ...]:
+    """File signatures for every `pattern` match under `root` (non-recursive), sorted by name."""
+    try:
+        paths = sorted(root.glob(pattern))
+    except OSError:
+        return ()
+    return file_signature(root, *paths)
+
+
+def elapsed_since(started_at: float) -> float:
+    return max(0.0, time.perf_counter() - started_at)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+DURATION_BUCKETS_MS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+
+
+@dataclass
+class DurationHistogram:
+    """Fixed-bucket latency histogram (milliseconds), e.g. heartbeat stages and Type2 batches."""
+
+    buckets_ms: tuple[float, ...] = DURATION_BUCKETS_MS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    def __post_init__(self) -> None:
+        if len(self.counts) != len(self.buckets_ms) + 1:
+            self.counts = [0] * (len(self.buckets_ms) + 1)
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        millis = seconds * 1000.0
+        index = len(self.buckets_ms)
+        for idx, bound in enumerate(self.buckets_ms):
+            if millis <= bound:
+                index = idx
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Upper bucket bound that covers `fraction` of observations (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * min(1.0, max(0.0, fraction)))))
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if idx < len(self.buckets_ms):
+                    return self.buckets_ms[idx]
+                break
+        return self.max_s * 1000.0
+
+    def summary(self, label: str) -> str:
+        avg_ms = (self.total_s / self.count * 1000.0) if self.count else 0.0
+        return (
+            f"{label}: n={self.count} avg={avg_ms:.1f}ms p50<={self.percentile_ms(0.5):.0f}ms "
+            f"p95<={self.percentile_ms(0.95):.0f}ms max={self.max_s * 1000.0:.1f}ms"
+        )
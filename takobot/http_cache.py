@@ -0,0 +1,606 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import Message
+from email.utils import parsedate_to_datetime
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Iterator, Mapping
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+
+HTTP_CACHE_DIRNAME = "http-cache"
+HTTP_CACHE_MAX_BYTES = 64_000_000
+HTTP_CACHE_HEURISTIC_MAX_S = 24 * 60 * 60
+# Cache hits only bump `last_access`; those bumps are written back in batches.
+HTTP_CACHE_ACCESS_FLUSH_COUNT = 32
+HTTP_CACHE_ACCESS_FLUSH_S = 30.0
+# Only these request headers change the representation we get back, so only
+# these participate in the cache key (User-Agent deliberately does not).
+HTTP_CACHE_KEY_HEADERS = ("accept", "accept-language")
+
+Opener = Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    final_url: str
+    status: int
+    content_type: str
+    charset: str
+    body: bytes
+    from_cache: bool = False
+    revalidated: bool = False
+
+
+@dataclass
+class HttpCacheStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.revalidated + self.misses
+
+    def hit_ratio(self) -> float:
+        total = self.lookups
+        if total <= 0:
+            return 0.0
+        return (self.hits + self.revalidated) / total
+
+
+class HttpCache:
+    """Size-bounded on-disk HTTP response cache.
+
+    Bodies are stored gzip-compressed next to a small JSON index that tracks
+    validators (`ETag`/`Last-Modified`), freshness lifetime, and last access so
+    the cache can be trimmed least-recently-used first.
+
+    Several processes (daemon, TUI, tool subprocesses) share one cache
+    directory, so every index write re-reads the on-disk index under a file
+    lock and merges this process's pending changes into it.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int = HTTP_CACHE_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max(1_000_000, int(max_bytes))
+        self.stats = HttpCacheStats()
+        self._index_path = root / "index.json"
+        self._index_lock_path = root / "index.lock"
+        self._index: dict[str, dict[str, Any]] | None = None
+        self._index_mtime_ns: int | None = None
+        # Local changes not yet merged into index.json: entry writes (None = delete) and access bumps.
+        self._dirty: dict[str, dict[str, Any] | None] = {}
+        self._accessed: dict[str, float] = {}
+        self._accessed_flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout_s: float = 20.0,
+        max_bytes: int = 2_000_000,
+        max_stale_s: float | None = None,
+        opener: Opener | None = None,
+    ) -> CachedResponse:
+        request_headers = dict(headers or {})
+        key = cache_key(url, request_headers)
+        now = time.time()
+        entry = self._lookup(key)
+        body = self._read_body(key) if entry is not None else None
+        if entry is not None and body is None:
+            self._drop(key)
+            entry = None
+
+        if entry is not None and body is not None and _is_usable(entry, now=now, max_stale_s=max_stale_s):
+            self._touch(key, now)
+            self._count("hits")
+            return _response_from_entry(url, entry, body, revalidated=False)
+
+        if entry is not None:
+            etag = str(entry.get("etag") or "")
+            last_modified = str(entry.get("last_modified") or "")
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        request = Request(url, headers=request_headers, method="GET")
+        open_fn = opener or urlopen
+        try:
+            with open_fn(request, timeout=max(1.0, float(timeout_s))) as response:
+                status = int(getattr(response, "status", 0) or getattr(response, "code", 0) or 200)
+                response_headers = response.headers
+                final_url = response.geturl() or url
+                raw = response.read(max_bytes + 1)
+        except HTTPError as exc:
+            if exc.code != 304 or entry is None or body is None:
+                raise
+            self._refresh(key, entry, exc.headers, now)
+            self._count("revalidated")
+            return _response_from_entry(url, entry, body, revalidated=True)
+
+        if status == 304 and entry is not None and body is not None:
+            self._refresh(key, entry, response_headers, now)
+            self._count("revalidated")
+            return _response_from_entry(url, entry, body, revalidated=True)
+
+        self._count("misses")
+        if len(raw) > max_bytes:
+            raise ValueError(f"response too large (> {max_bytes} bytes)")
+
+        content_type = str(response_headers.get("Content-Type") or "")
+        charset = response_headers.get_content_charset() or "utf-8"
+        if 200 <= status < 300:
+            self._store(
+                key,
+                url=url,
+                final_url=final_url,
+                status=status,
+                content_type=content_type,
+                charset=charset,
+                headers=response_headers,
+                body=raw,
+                now=now,
+            )
+        return CachedResponse(
+            url=url,
+            final_url=final_url,
+            status=status,
+            content_type=content_type,
+            charset=charset,
+            body=raw,
+        )
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            index = self._load_index()
+            return sum(int(entry.get("size") or 0) for entry in index.values())
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def clear(self) -> None:
+        with self._lock, self._index_file_lock():
+            for key in self._read_index_file():
+                self._body_path(key).unlink(missing_ok=True)
+            self._dirty.clear()
+            self._accessed.clear()
+            self._index = {}
+            self._write_index_file()
+
+    def flush(self) -> None:
+        """Write pending access-time bumps back to the shared index."""
+        with self._lock:
+            if self._dirty or self._accessed:
+                self._commit_locked()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _lookup(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._load_index().get(key)
+            return dict(entry) if isinstance(entry, dict) else None
+
+    def _touch(self, key: str, now: float) -> None:
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry is None:
+                return
+            entry["last_access"] = now
+            self._accessed[key] = now
+            if (
+                len(self._accessed) >= HTTP_CACHE_ACCESS_FLUSH_COUNT
+                or time.monotonic() - self._accessed_flushed_at >= HTTP_CACHE_ACCESS_FLUSH_S
+            ):
+                self._commit_locked()
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._load_index().pop(key, None)
+            self._dirty[key] = None
+            self._body_path(key).unlink(missing_ok=True)
+            self._commit_locked()
+
+    def _refresh(self, key: str, entry: dict[str, Any], headers: Message | None, now: float) -> None:
+        if headers is not None:
+            entry.update(_freshness_fields(headers, now=now))
+            entry["etag"] = str(headers.get("ETag") or entry.get("etag") or "")
+            entry["last_modified"] = str(headers.get("Last-Modified") or entry.get("last_modified") or "")
+        entry["stored_at"] = now
+        entry["last_access"] = now
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key] = entry
+                self._dirty[key] = entry
+                self._commit_locked()
+
+    def _store(
+        self,
+        key: str,
+        *,
+        url: str,
+        final_url: str,
+        status: int,
+        content_type: str,
+        charset: str,
+        headers: Message,
+        body: bytes,
+        now: float,
+    ) -> None:
+        directives = _cache_control(headers)
+        if "no-store" in directives or "private" in directives:
+            return
+        compressed = gzip.compress(body, compresslevel=6)
+        if len(compressed) > self.max_bytes:
+            return
+        entry: dict[str, Any] = {
+            "url": url,
+            "final_url": final_url,
+            "status": status,
+            "content_type": content_type,
+            "charset": charset,
+            "etag": str(headers.get("ETag") or ""),
+            "last_modified": str(headers.get("Last-Modified") or ""),
+            "size": len(compressed),
+            "stored_at": now,
+            "last_access": now,
+        }
+        entry.update(_freshness_fields(headers, now=now))
+        with self._lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                _atomic_write_bytes(self._body_path(key), compressed)
+            except OSError:
+                return
+            self._load_index()[key] = entry
+            self._dirty[key] = entry
+            self.stats.stores += 1
+            self._commit_locked()
+
+    def _evict_locked(self) -> None:
+        index = self._load_index()
+        total = sum(int(entry.get("size") or 0) for entry in index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(index, key=lambda item: float(index[item].get("last_access") or 0.0)):
+            if total <= self.max_bytes:
+                break
+            total -= int(index[key].get("size") or 0)
+            index.pop(key, None)
+            self._body_path(key).unlink(missing_ok=True)
+            self.stats.evictions += 1
+
+    def _read_body(self, key: str) -> bytes | None:
+        try:
+            return gzip.decompress(self._body_path(key).read_bytes())
+        except Exception:
+            return None
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / f"{key}.gz"
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        """In-memory view of index.json plus local pending changes, reloaded when another process wrote it."""
+        mtime_ns = self._index_mtime()
+        if self._index is not None and mtime_ns == self._index_mtime_ns:
+            return self._index
+        index = self._read_index_file()
+        self._apply_pending(index)
+        self._index = index
+        self._index_mtime_ns = mtime_ns
+        return index
+
+    def _commit_locked(self) -> None:
+        """Merge pending changes into the on-disk index, trim it, and write it back (caller holds `_lock`)."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        with self._index_file_lock():
+            index = self._read_index_file()
+            self._apply_pending(index)
+            self._dirty.clear()
+            self._accessed.clear()
+            self._accessed_flushed_at = time.monotonic()
+            self._index = index
+            self._evict_locked()
+            self._write_index_file()
+
+    def _apply_pending(self, index: dict[str, dict[str, Any]]) -> None:
+        for key, entry in self._dirty.items():
+            if entry is None:
+                index.pop(key, None)
+            else:
+                index[key] = entry
+        for key, accessed_at in self._accessed.items():
+            entry = index.get(key)
+            if entry is not None:
+                entry["last_access"] = max(float(entry.get("last_access") or 0.0), accessed_at)
+
+    def _read_index_file(self) -> dict[str, dict[str, Any]]:
+        index: dict[str, dict[str, Any]] = {}
+        try:
+            payload = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except Exception:
+            payload = {}
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if isinstance(entries, dict):
+            for key, entry in entries.items():
+                if isinstance(key, str) and isinstance(entry, dict):
+                    index[key] = entry
+        return index
+
+    def _write_index_file(self) -> None:
+        payload = {"version": 1, "entries": self._index or {}}
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            _atomic_write_bytes(
+                self._index_path,
+                (json.dumps(payload, sort_keys=True, ensure_ascii=True, separators=(",", ":")) + "\n").encode("utf-8"),
+            )
+        except OSError:
+            return
+        self._index_mtime_ns = self._index_mtime()
+
+    def _index_mtime(self) -> int | None:
+        try:
+            return self._index_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @contextmanager
+    def _index_file_lock(self) -> Iterator[None]:
+        try:
+            import fcntl  # type: ignore
+        except ModuleNotFoundError:
+            # No advisory locks (Windows): fall back to last-writer-wins merges.
+            yield
+            return
+        try:
+            handle = self._index_lock_path.open("a+", encoding="utf-8")
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            yield
+        finally:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            except Exception:
+                pass
+            handle.close()
+
+
+_DEFAULT_CACHE: HttpCache | None = None
+
+
+def configure_http_cache(root: Path | None, *, max_bytes: int = HTTP_CACHE_MAX_BYTES) -> HttpCache | None:
+    """Install the process-wide cache used by `cached_fetch` (None disables it)."""
+
+    global _DEFAULT_CACHE
+    if root is None:
+        _DEFAULT_CACHE = None
+        return None
+    if _DEFAULT_CACHE is not None and _DEFAULT_CACHE.root == root:
+        return _DEFAULT_CACHE
+    _DEFAULT_CACHE = HttpCache(root, max_bytes=max_bytes)
+    return _DEFAULT_CACHE
+
+
+def default_http_cache() -> HttpCache | None:
+    return _DEFAULT_CACHE
+
+
+def http_cache_for_state_dir(state_dir: Path) -> HttpCache:
+    return HttpCache(state_dir / HTTP_CACHE_DIRNAME)
+
+
+_TOOL_CACHES: dict[Path, HttpCache] = {}
+
+
+def tool_http_cache(cache_dir: str | Path | None = None) -> HttpCache | None:
+    """Cache for workspace tools: `cache_dir`, else the runtime's, else `.tako/state/http-cache`.
+
+    Returns None outside a workspace (no `.tako/state`) so ad-hoc tool runs never
+    create runtime directories.
+    """
+
+    if cache_dir:
+        root = Path(cache_dir).expanduser()
+    elif _DEFAULT_CACHE is not None:
+        return _DEFAULT_CACHE
+    else:
+        from .paths import runtime_paths
+
+        state_dir = runtime_paths().state_dir
+        if not state_dir.is_dir():
+            return None
+        root = state_dir / HTTP_CACHE_DIRNAME
+    cache = _TOOL_CACHES.get(root)
+    if cache is None:
+        cache = _TOOL_CACHES.setdefault(root, HttpCache(root))
+    return cache
+
+
+def cached_fetch(
+    url: str,
+    *,
+    headers: Mapping[str, str] | None = None,
+    timeout_s: float = 20.0,
+    max_bytes: int = 2_000_000,
+    max_stale_s: float | None = None,
+    cache: HttpCache | None = None,
+    opener: Opener | None = None,
+) -> CachedResponse:
+    """GET `url` through the configured cache, or straight through when none is set."""
+
+    active = cache if cache is not None else _DEFAULT_CACHE
+    if active is not None:
+        return active.fetch(
+            url,
+            headers=headers,
+            timeout_s=timeout_s,
+            max_bytes=max_bytes,
+            max_stale_s=max_stale_s,
+            opener=opener,
+        )
+
+    request = Request(url, headers=dict(headers or {}), method="GET")
+    open_fn = opener or urlopen
+    with open_fn(request, timeout=max(1.0, float(timeout_s))) as response:
+        status = int(getattr(response, "status", 0) or getattr(response, "code", 0) or 200)
+        final_url = response.geturl() or url
+        content_type = str(response.headers.get("Content-Type") or "")
+        charset = response.headers.get_content_charset() or "utf-8"
+        raw = response.read(max_bytes + 1)
+    if len(raw) > max_bytes:
+        raise ValueError(f"response too large (> {max_bytes} bytes)")
+    return CachedResponse(
+        url=url,
+        final_url=final_url,
+        status=status,
+        content_type=content_type,
+        charset=charset,
+        body=raw,
+    )
+
+
+def http_cache_stats_lines(cache: HttpCache | None = None) -> list[str]:
+    active = cache if cache is not None else _DEFAULT_CACHE
+    if active is None:
+        return ["http_cache: off"]
+    stats = active.stats
+    return [
+        f"http_cache_hit_ratio: {stats.hit_ratio():.2f} ({stats.hits + stats.revalidated}/{stats.lookups})",
+        f"http_cache_hits: {stats.hits} fresh, {stats.revalidated} revalidated",
+        f"http_cache_misses: {stats.misses}",
+        f"http_cache_entries: {active.entry_count()} ({active.total_bytes()}/{active.max_bytes} bytes)",
+        f"http_cache_evictions: {stats.evictions}",
+    ]
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port is not None and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def cache_key(url: str, headers: Mapping[str, str] | None = None) -> str:
+    lowered = {str(name).lower(): " ".join(str(value).split()) for name, value in (headers or {}).items()}
+    vary = "\n".join(f"{name}:{lowered.get(name, '')}" for name in HTTP_CACHE_KEY_HEADERS)
+    digest = hashlib.sha256(f"{normalize_url(url)}\n{vary}".encode("utf-8"))
+    return digest.hexdigest()[:40]
+
+
+def _is_usable(entry: Mapping[str, Any], *, now: float, max_stale_s: float | None) -> bool:
+    if bool(entry.get("no_cache")):
+        return False
+    age = max(0.0, now - float(entry.get("stored_at") or 0.0))
+    lifetime = max(0.0, float(entry.get("fresh_for_s") or 0.0))
+    if age < lifetime:
+        return True
+    if max_stale_s is None or bool(entry.get("must_revalidate")):
+        return False
+    return age < lifetime + max(0.0, float(max_stale_s))
+
+
+def _freshness_fields(headers: Message, *, now: float) -> dict[str, Any]:
+    directives = _cache_control(headers)
+    fresh_for_s = 0.0
+    if "s-maxage" in directives or "max-age" in directives:
+        fresh_for_s = _as_seconds(directives.get("s-maxage") or directives.get("max-age"))
+        fresh_for_s -= _as_seconds(headers.get("Age"))
+    else:
+        date_ts = _http_date(headers.get("Date")) or now
+        expires_ts = _http_date(headers.get("Expires"))
+        last_modified_ts = _http_date(headers.get("Last-Modified"))
+        if expires_ts is not None:
+            fresh_for_s = expires_ts - date_ts
+        elif last_modified_ts is not None:
+            # RFC 9111 heuristic freshness: a tenth of the time since last change.
+            fresh_for_s = min(HTTP_CACHE_HEURISTIC_MAX_S, (date_ts - last_modified_ts) / 10.0)
+    return {
+        "fresh_for_s": max(0.0, fresh_for_s),
+        "no_cache": "no-cache" in directives,
+        "must_revalidate": "must-revalidate" in directives or "proxy-revalidate" in directives,
+    }
+
+
+def _cache_control(headers: Message | None) -> dict[str, str]:
+    if headers is None:
+        return {}
+    get_all = getattr(headers, "get_all", None)
+    # Plain mappings (and test doubles) only offer `get`; `Message` may repeat the header.
+    values = get_all("Cache-Control") if callable(get_all) else [headers.get("Cache-Control")]
+    raw = ",".join(str(value) for value in (values or []) if value)
+    out: dict[str, str] = {}
+    for part in raw.split(","):
+        token = part.strip()
+        if not token:
+            continue
+        name, _sep, value = token.partition("=")
+        out[name.strip().lower()] = value.strip().strip('"')
+    return out
+
+
+def _as_seconds(value: Any) -> float:
+    try:
+        return max(0.0, float(str(value).strip()))
+    except Exception:
+        return 0.0
+
+
+def _http_date(value: Any) -> float | None:
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except Exception:
+        return None
+
+
+def _response_from_entry(url: str, entry: Mapping[str, Any], body: bytes, *, revalidated: bool) -> CachedResponse:
+    return CachedResponse(
+        url=url,
+        final_url=str(entry.get("final_url") or url),
+        status=int(entry.get("status") or 200),
+        content_type=str(entry.get("content_type") or ""),
+        charset=str(entry.get("charset") or "utf-8"),
+        body=body,
+        from_cache=True,
+        revalidated=revalidated,
+    )
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
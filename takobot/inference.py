@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Mapping
 
+from .log_writer import shared_log_writer
 from .node_runtime import (
     NODE_RUNTIME_MIN_MAJOR,
     ensure_workspace_node_runtime,
@@ -1744,8 +1745,8 @@ def _append_inference_error_log(
         lines.append("stderr_tail:")
         lines.append(stderr_clean[-4000:])
     lines.append("")
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write("\n".join(lines) + "\n")
+    # Synchronous so the path quoted in the raised error already holds this entry.
+    shared_log_writer().write_now(log_path, "\n".join(lines) + "\n")
     return log_path
 
 
@@ -268,6 +268,17 @@ def claim_due_jobs(state_dir: Path, *, now: datetime | None = None) -> list[Sche
     return due_jobs
 
 
+def next_job_due_at(state_dir: Path, *, now: datetime | None = None) -> datetime | None:
+    """Earliest time any enabled job becomes due (`now` if one is already due), or None."""
+    local_now = _local_now(now)
+    upcoming = [
+        next_run
+        for job in list_jobs(state_dir)
+        if job.enabled and (next_run := _next_run_at(job, local_now)) is not None
+    ]
+    return min(upcoming) if upcoming else None
+
+
 def record_job_error(state_dir: Path, job_id: str, error: str) -> bool:
     cleaned_id = " ".join((job_id or "").split()).strip()
     if not cleaned_id:
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import atexit
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+from pathlib import Path
+import queue
+import shutil
+import threading
+import time
+from typing import Any, TextIO
+
+from .config import LoggingConfig
+
+LOG_MAX_BYTES_DEFAULT = 5_000_000
+LOG_BACKUPS_DEFAULT = 5
+LOG_QUEUE_MAX = 10_000
+LOG_BATCH_MAX = 512
+LOG_IDLE_CLOSE_S = 30.0
+LOG_FLUSH_TIMEOUT_S = 2.0
+
+
+@dataclass(frozen=True)
+class LogPolicy:
+    """Size-based rotation: `path` plus at most `backups` rotated files of ~`max_bytes` each."""
+
+    max_bytes: int = LOG_MAX_BYTES_DEFAULT
+    backups: int = LOG_BACKUPS_DEFAULT
+    compress: bool = True
+
+
+def format_log_line(level: str, message: str, fields: dict[str, Any] | None = None) -> str:
+    """`<utc stamp> [level] message key=value ...` on one line; values with spaces are JSON-quoted."""
+    stamp = datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
+    parts = [stamp, f"[{level.strip().lower() or 'info'}]", " ".join(str(message).split())]
+    for key, value in (fields or {}).items():
+        if value is None:
+            continue
+        text = " ".join(str(value).split())
+        if not text or any(char in text for char in ' "='):
+            text = json.dumps(text, ensure_ascii=True)
+        parts.append(f"{key}={text}")
+    return " ".join(part for part in parts if part) + "\n"
+
+
+def rotated_log_paths(path: Path) -> list[Path]:
+    """Existing rotated siblings of `path` (`app.log.1`, `app.log.2.gz`, ...), newest first."""
+    out: list[tuple[int, Path]] = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        index_text = candidate.name[len(path.name) + 1 :].removesuffix(".gz")
+        if index_text.isdigit():
+            out.append((int(index_text), candidate))
+    return [candidate for _index, candidate in sorted(out)]
+
+
+class RotatingLogFile:
+    """Append handle kept open between writes and rotated once it would exceed `max_bytes`."""
+
+    def __init__(self, path: Path, policy: LogPolicy) -> None:
+        self.path = path
+        self.policy = policy
+        self._handle: TextIO | None = None
+        self._size = 0
+        self.last_write_at = 0.0
+
+    def write(self, text: str) -> None:
+        encoded_len = len(text.encode("utf-8"))
+        if self._handle is None:
+            self._open()
+        if self._size and self._size + encoded_len > max(1, self.policy.max_bytes):
+            self.rotate()
+            self._open()
+        if self._handle is None:
+            return
+        self._handle.write(text)
+        self._size += encoded_len
+        self.last_write_at = time.monotonic()
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            self._handle.close()
+        finally:
+            self._handle = None
+
+    def rotate(self) -> None:
+        self.close()
+        backups = max(0, int(self.policy.backups))
+        for stale in rotated_log_paths(self.path):
+            index_text = stale.name[len(self.path.name) + 1 :].removesuffix(".gz")
+            if int(index_text) >= backups:
+                stale.unlink(missing_ok=True)
+        if backups == 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for index in range(backups - 1, 0, -1):
+            for suffix in ("", ".gz"):
+                source = self.path.with_name(f"{self.path.name}.{index}{suffix}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}{suffix}"))
+        first = self.path.with_name(f"{self.path.name}.1")
+        if self.path.exists():
+            os.replace(self.path, first)
+            if self.policy.compress:
+                _gzip_in_place(first)
+
+    def _open(self) -> None:
+        # Never recreate a removed logs dir (e.g. a deleted temp workspace); the write is dropped instead.
+        self._handle = self.path.open("a", encoding="utf-8")
+        try:
+            self._size = self.path.stat().st_size
+        except OSError:
+            self._size = 0
+
+
+class LogWriter:
+    """Queue-fed background writer shared by app.log, runtime.log and error.log.
+
+    `write()` only formats and enqueues, so hot paths (e.g. inference status
+    lines while streaming) never touch the filesystem. One daemon thread drains
+    the queue in batches, keeps handles open and flushes once per batch.
+    """
+
+    def __init__(self, policy: LogPolicy | None = None, *, queue_max: int = LOG_QUEUE_MAX) -> None:
+        self.policy = policy or LogPolicy()
+        # Per logs-dir overrides, so profiles sharing this process keep their own `[logging]`.
+        self._dir_policies: dict[Path, LogPolicy] = {}
+        self._queue: queue.Queue[tuple[Path, str]] = queue.Queue(maxsize=max(1, queue_max))
+        self._files: dict[Path, RotatingLogFile] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def configure(self, policy: LogPolicy, *, logs_dir: Path | None = None) -> None:
+        """Set the default policy, or only the one for files directly under `logs_dir`."""
+        with self._lock:
+            if logs_dir is None:
+                self.policy = policy
+            else:
+                self._dir_policies[logs_dir] = policy
+            for path, handle in self._files.items():
+                handle.policy = self._policy_for(path)
+
+    def write(self, path: Path, text: str) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((path, text))
+        except queue.Full:
+            self.dropped += 1
+
+    def write_now(self, path: Path, text: str) -> None:
+        """Write and flush synchronously (rare, must-be-on-disk entries such as error.log)."""
+        with self._lock:
+            self._append(path, text)
+            handle = self._files.get(path)
+            if handle is not None:
+                handle.flush()
+
+    def flush(self, timeout_s: float = LOG_FLUSH_TIMEOUT_S) -> bool:
+        """Block until everything queued so far is on disk (or `timeout_s` passes)."""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout_s
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+
+    def stats_line(self) -> str:
+        return (
+            f"log_writer: written={self.written} dropped={self.dropped} errors={self.errors} "
+            f"queued={self._queue.qsize()} open_files={len(self._files)}"
+        )
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="tako-log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=LOG_IDLE_CLOSE_S / 2)
+            except queue.Empty:
+                self._close_idle()
+                continue
+            batch = [first]
+            while len(batch) < LOG_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                touched: set[Path] = set()
+                for path, text in batch:
+                    self._append(path, text)
+                    touched.add(path)
+                for path in touched:
+                    handle = self._files.get(path)
+                    if handle is None:
+                        continue
+                    try:
+                        handle.flush()
+                    except OSError:
+                        self.errors += 1
+            for _item in batch:
+                self._queue.task_done()
+            self._close_idle()
+
+    def _policy_for(self, path: Path) -> LogPolicy:
+        return self._dir_policies.get(path.parent, self.policy)
+
+    def _append(self, path: Path, text: str) -> None:
+        handle = self._files.get(path)
+        if handle is None:
+            handle = RotatingLogFile(path, self._policy_for(path))
+            self._files[path] = handle
+        try:
+            handle.write(text)
+            self.written += 1
+        except OSError:
+            self.errors += 1
+            handle.close()
+            self._files.pop(path, None)
+
+    def _close_idle(self) -> None:
+        cutoff = time.monotonic() - LOG_IDLE_CLOSE_S
+        with self._lock:
+            for path, handle in list(self._files.items()):
+                if handle.last_write_at < cutoff:
+                    handle.close()
+                    self._files.pop(path, None)
+
+
+_SHARED_WRITER: LogWriter | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_log_writer() -> LogWriter:
+    global _SHARED_WRITER
+    if _SHARED_WRITER is None:
+        with _SHARED_LOCK:
+            if _SHARED_WRITER is None:
+                _SHARED_WRITER = LogWriter()
+                atexit.register(_SHARED_WRITER.close)
+    return _SHARED_WRITER
+
+
+def configure_log_rotation(config: LoggingConfig, logs_dir: Path | None = None) -> None:
+    """Apply the workspace `[logging]` settings to the shared writer (to `logs_dir` only, when given)."""
+    shared_log_writer().configure(
+        LogPolicy(max_bytes=config.max_bytes, backups=config.backups, compress=config.compress),
+        logs_dir=logs_dir,
+    )
+
+
+def append_log_line(path: Path, level: str, message: str, **fields: Any) -> None:
+    """Queue one structured line for `path`; never blocks or raises."""
+    shared_log_writer().write(path, format_log_line(level, message, fields))
+
+
+def _gzip_in_place(path: Path) -> None:
+    target = path.with_name(path.name + ".gz")
+    try:
+        with path.open("rb") as source, gzip.open(target, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+    except OSError:
+        target.unlink(missing_ok=True)
+        return
+    path.unlink(missing_ok=True)
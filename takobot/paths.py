@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
+
+
+_WORKSPACE_ROOT_OVERRIDE: ContextVar[Path | None] = ContextVar("takobot_workspace_root", default=None)
 
 
 def engine_root() -> Path:
@@ -32,9 +38,30 @@ def find_workspace_root(start: Path | None = None) -> Path:
 
 
 def workspace_root() -> Path:
+    override = _WORKSPACE_ROOT_OVERRIDE.get()
+    if override is not None:
+        return override
     return find_workspace_root()
 
 
+@contextmanager
+def use_workspace_root(root: Path) -> Iterator[Path]:
+    """Pin `workspace_root()` (and every path derived from it) to `root`.
+
+    The override lives in a context variable, so asyncio tasks created inside
+    the block (and `asyncio.to_thread` calls they make) keep resolving to this
+    workspace after the block exits. This is how one daemon process hosts
+    several workspace profiles.
+    """
+
+    resolved = root.expanduser().resolve()
+    token = _WORKSPACE_ROOT_OVERRIDE.set(resolved)
+    try:
+        yield resolved
+    finally:
+        _WORKSPACE_ROOT_OVERRIDE.reset(token)
+
+
 def repo_root() -> Path:
     """Compatibility alias for older code paths.
 
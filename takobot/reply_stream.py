@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+import time
+from typing import Awaitable, Callable
+
+REPLY_STREAM_FLUSH_S = 4.0
+REPLY_STREAM_MIN_CHARS = 240
+REPLY_STREAM_RESTART_MARKER = "(reply restarted)"
+
+ChunkSink = Callable[[str], Awaitable[object]]
+
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?:;])\s+|\n+")
+
+
+class ReplyStreamer:
+    """Turn an inference token stream into periodic chunked sends.
+
+    `on_event` is a `StreamEventHook` for `stream_inference_prompt_with_fallback`.
+    Every `flush_s` seconds, buffered `delta` text of at least `min_chars` is
+    cut at the last sentence (or word) boundary and handed to `sink` (an XMTP
+    send). `finish()` delivers whatever the final reply adds beyond what was
+    already streamed.
+
+    Sent chunks cannot be retracted, so once one has gone out the stream is
+    bound to that attempt: a provider fallback stops further chunks, and a
+    final reply that no longer starts with the streamed prefix (a retry, a
+    sync fallback or an error reply) is sent whole as a follow-up message
+    prefixed with `REPLY_STREAM_RESTART_MARKER` (`reply_restarted`), so the
+    peer never keeps a silent fragment.
+    """
+
+    def __init__(
+        self,
+        sink: ChunkSink,
+        *,
+        flush_s: float = REPLY_STREAM_FLUSH_S,
+        min_chars: int = REPLY_STREAM_MIN_CHARS,
+        max_chars: int = 0,
+    ) -> None:
+        self.sink = sink
+        self.flush_s = max(0.05, float(flush_s))
+        self.min_chars = max(1, int(min_chars))
+        self.max_chars = max(0, int(max_chars))
+        self.chunks_sent = 0
+        self.reply_restarted = False
+        self._buffer = ""
+        self._sent = ""
+        self._last_flush = time.monotonic()
+        self._ticker: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._restarted = False
+
+    @property
+    def streamed_text(self) -> str:
+        return self._sent
+
+    def on_event(self, kind: str, payload: str) -> None:
+        if self._closed or self._restarted:
+            return
+        if kind == "delta" and payload:
+            self._buffer += payload
+            self._ensure_ticker()
+        elif kind == "provider":
+            # A provider fallback restarts the answer; drop text nobody has seen yet.
+            self._buffer = ""
+            if self._sent:
+                self._restarted = True
+
+    async def finish(self, final_text: str) -> str:
+        """Stop streaming, send the rest of `final_text` and return the text the peer received."""
+        self._closed = True
+        if self._ticker is not None:
+            self._ticker.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._ticker
+            self._ticker = None
+        async with self._lock:
+            final = final_text.strip()
+            if not final:
+                return self._sent
+            remainder = remaining_text(final, self._sent) if self._sent else final
+            if remainder is None:
+                self.reply_restarted = True
+                await self._send(f"{REPLY_STREAM_RESTART_MARKER} {final}")
+                return self._sent
+            if remainder:
+                await self._send(remainder)
+            return self._sent
+
+    def _ensure_ticker(self) -> None:
+        if self._ticker is not None and not self._ticker.done():
+            return
+        with contextlib.suppress(RuntimeError):
+            self._ticker = asyncio.get_running_loop().create_task(self._tick())
+
+    async def _tick(self) -> None:
+        while not self._closed:
+            wait_s = self.flush_s - (time.monotonic() - self._last_flush)
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+            async with self._lock:
+                if self._closed or self._restarted:
+                    return
+                chunk = self._take_chunk()
+                self._last_flush = time.monotonic()
+                if chunk:
+                    await self._send(chunk)
+
+    def _take_chunk(self) -> str:
+        if len(self._buffer) < self.min_chars:
+            return ""
+        if self.max_chars and len(self._sent) + len(self._buffer) >= self.max_chars:
+            # Let `finish()` send the final, possibly truncated, reply in one piece.
+            return ""
+        cut = _boundary(self._buffer, self.min_chars)
+        if cut <= 0:
+            return ""
+        chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return " ".join(chunk.split())
+
+    async def _send(self, chunk: str) -> None:
+        if not chunk:
+            return
+        await self.sink(chunk)
+        self._sent = f"{self._sent} {chunk}".strip()
+        self.chunks_sent += 1
+
+
+def remaining_text(final_text: str, streamed: str) -> str | None:
+    """Return the part of `final_text` after `streamed`, ignoring whitespace differences.
+
+    Returns None when `final_text` does not start with `streamed`.
+    """
+    target = "".join(streamed.split())
+    matched = 0
+    idx = 0
+    while matched < len(target) and idx < len(final_text):
+        char = final_text[idx]
+        idx += 1
+        if char.isspace():
+            continue
+        if char != target[matched]:
+            return None
+        matched += 1
+    if matched < len(target):
+        return None
+    return final_text[idx:].strip()
+
+
+def _boundary(text: str, min_chars: int) -> int:
+    cut = 0
+    for match in _SENTENCE_BREAK_RE.finditer(text):
+        if match.start() >= min_chars:
+            cut = match.start()
+    if cut:
+        return cut
+    cut = text.rfind(" ", min_chars)
+    if cut > 0:
+        return cut
+    return 0
@@ -35,6 +35,7 @@ def take_research_notes(
     notes_root: Path | None = None,
     day: date | None = None,
     max_summary_chars: int = 240,
+    max_stale_s: float | None = None,
 ) -> ResearchNotesResult:
     cleaned_topic = " ".join((topic or "").split()).strip()
     if not cleaned_topic:
@@ -55,7 +56,7 @@ def take_research_notes(
     fail_count = 0
 
     for requested in cleaned_urls:
-        fetched = fetch_webpage(requested)
+        fetched = fetch_webpage(requested, max_stale_s=max_stale_s)
         if fetched.ok:
             ok_count += 1
             title = fetched.title or "(untitled)"
@@ -1,4 +1,5 @@
 from .events import EventBus
+from .ingest import EventDedupe, Type1Inbox
 from .runtime import Runtime, RuntimeHeartbeatTick
 
-__all__ = ["EventBus", "Runtime", "RuntimeHeartbeatTick"]
+__all__ = ["EventBus", "EventDedupe", "Runtime", "RuntimeHeartbeatTick", "Type1Inbox"]
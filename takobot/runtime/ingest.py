@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+import contextlib
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from ..config import normalize_overflow_policy
+
+TYPE1_QUEUE_MAX_DEFAULT = 512
+TYPE1_SPILL_FILE = "type1_spill.jsonl"
+TYPE1_SPILL_BATCH_MAX = 256
+EVENT_DEDUPE_MAX_DEFAULT = 4096
+EVENT_DEDUPE_WINDOW_S_DEFAULT = 60 * 60.0
+
+
+def event_id_timestamp(event_id: str) -> float | None:
+    """Seconds since epoch encoded in an `evt-<ms>-<token>` id, or None for foreign ids."""
+    parts = str(event_id or "").split("-")
+    if len(parts) < 3 or parts[0] != "evt":
+        return None
+    try:
+        return int(parts[1]) / 1000.0
+    except ValueError:
+        return None
+
+
+class EventDedupe:
+    """Insertion-ordered ring of recently seen event ids.
+
+    Ids are evicted once the ring exceeds `capacity` or their timestamp
+    (taken from the id itself when possible) falls outside `window_s`.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int = EVENT_DEDUPE_MAX_DEFAULT,
+        window_s: float = EVENT_DEDUPE_WINDOW_S_DEFAULT,
+    ) -> None:
+        self.capacity = max(1, int(capacity))
+        self.window_s = max(0.0, float(window_s))
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self.duplicates = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, event_id: object) -> bool:
+        return event_id in self._seen
+
+    def configure(self, *, capacity: int, window_s: float) -> None:
+        self.capacity = max(1, int(capacity))
+        self.window_s = max(0.0, float(window_s))
+        self._evict(time.time())
+
+    def seen(self, event_id: str, *, now: float | None = None) -> bool:
+        """Return True for a duplicate id; otherwise remember it and return False."""
+        now = time.time() if now is None else now
+        self._evict(now)
+        if event_id in self._seen:
+            self.duplicates += 1
+            return True
+        stamp = event_id_timestamp(event_id)
+        # Ids are kept in arrival order, so a skewed timestamp is clamped to stay monotonic.
+        if stamp is None or stamp > now:
+            stamp = now
+        if self._seen:
+            stamp = max(stamp, next(reversed(self._seen.values())))
+        self._seen[event_id] = stamp
+        self._evict(now)
+        return False
+
+    def _evict(self, now: float) -> None:
+        while len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+            self.evicted += 1
+        if self.window_s <= 0:
+            return
+        cutoff = now - self.window_s
+        while self._seen:
+            oldest = next(iter(self._seen.values()))
+            if oldest >= cutoff:
+                break
+            self._seen.popitem(last=False)
+            self.evicted += 1
+
+
+@dataclass
+class IngestCounters:
+    accepted: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    spilled: int = 0
+    restored: int = 0
+    spill_errors: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"dropped={self.dropped} coalesced={self.coalesced} "
+            f"spilled={self.spilled} restored={self.restored}"
+        )
+
+
+class Type1Inbox:
+    """Bounded single-consumer queue for Type1 events with an explicit overflow policy.
+
+    - `drop-oldest`: discard the oldest queued event to make room.
+    - `coalesce`: replace the newest queued event of the same type (counting merges
+      in `metadata.coalesced`); falls back to drop-oldest when no type matches.
+    - `spill`: append overflow to a JSONL file and refill from it as the queue
+      drains, preserving arrival order; falls back to drop-oldest without a path.
+
+    Spilled events are buffered and written in batches from a worker thread, so
+    an overflow storm never does file I/O on the event loop; a drain that finds
+    nothing unread on disk refills straight from that buffer. A spill file left
+    by a previous run is adopted (not deleted) when the path is configured.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = TYPE1_QUEUE_MAX_DEFAULT,
+        policy: str = "drop-oldest",
+        spill_path: Path | None = None,
+    ) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.policy = normalize_overflow_policy(policy)
+        self.spill_path = spill_path
+        self.counters = IngestCounters()
+        self._items: deque[dict[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._spill_offset = 0
+        self._spill_pending = 0
+        self._spill_buffer: list[str] = []
+        self._spill_lock = asyncio.Lock()
+        self._spill_flusher: asyncio.Task[None] | None = None
+        self._adopt_spill_file()
+
+    def configure(self, *, maxsize: int, policy: str, spill_path: Path | None = None) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.policy = normalize_overflow_policy(policy)
+        if spill_path is not None and spill_path != self.spill_path:
+            self.spill_path = spill_path
+            self._spill_offset = 0
+            self._spill_pending = len(self._spill_buffer)
+            self._adopt_spill_file()
+        while len(self._items) > self.maxsize:
+            self._items.popleft()
+            self.counters.dropped += 1
+
+    def qsize(self) -> int:
+        return len(self._items) + self._spill_pending
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def put_nowait(self, event: dict[str, Any]) -> str:
+        """Queue `event`; returns `queued`, `dropped-oldest`, `coalesced`, or `spilled`."""
+        self.counters.accepted += 1
+        if self._spill_pending and self.policy == "spill":
+            # Older events are already on disk; keep FIFO order by spilling behind them.
+            outcome = self._overflow(event)
+        elif len(self._items) < self.maxsize:
+            self._items.append(event)
+            outcome = "queued"
+        else:
+            outcome = self._overflow(event)
+        if self._items:
+            self._ready.set()
+        return outcome
+
+    async def get(self) -> dict[str, Any]:
+        while True:
+            if not self._items and self._spill_pending:
+                await self._restore_from_spill()
+            if self._items:
+                return self._items.popleft()
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def flush_spill(self) -> None:
+        """Write buffered spill lines to disk (e.g. before shutdown)."""
+        if self._spill_buffer:
+            await self._flush_spill()
+
+    def lines(self) -> list[str]:
+        return [
+            (
+                f"type1_queue: depth={len(self._items)}/{self.maxsize} spilled_pending={self._spill_pending} "
+                f"policy={self.policy}"
+            ),
+            f"type1_overflow: {self.counters.summary()} spill_errors={self.counters.spill_errors}",
+        ]
+
+    def _overflow(self, event: dict[str, Any]) -> str:
+        if self.policy == "coalesce" and self._coalesce(event):
+            self.counters.coalesced += 1
+            return "coalesced"
+        if self.policy == "spill" and self.spill_path is not None:
+            if self._spill(event):
+                self.counters.spilled += 1
+                return "spilled"
+            self.counters.spill_errors += 1
+        outcome = "queued"
+        if len(self._items) >= self.maxsize:
+            self._items.popleft()
+            self.counters.dropped += 1
+            outcome = "dropped-oldest"
+        self._items.append(event)
+        return outcome
+
+    def _coalesce(self, event: dict[str, Any]) -> bool:
+        event_type = str(event.get("type") or "")
+        for index in range(len(self._items) - 1, -1, -1):
+            queued = self._items[index]
+            if str(queued.get("type") or "") != event_type:
+                continue
+            queued_meta = queued.get("metadata") if isinstance(queued.get("metadata"), dict) else {}
+            # Copy instead of mutating: the bus shares event dicts with other subscribers.
+            merged = dict(event)
+            metadata = dict(event.get("metadata")) if isinstance(event.get("metadata"), dict) else {}
+            metadata["coalesced"] = int(queued_meta.get("coalesced", 0) or 0) + 1
+            merged["metadata"] = metadata
+            self._items[index] = merged
+            return True
+        return False
+
+    def _spill(self, event: dict[str, Any]) -> bool:
+        if self.spill_path is None:
+            return False
+        try:
+            line = json.dumps(event, ensure_ascii=True, default=str)
+        except Exception:  # noqa: BLE001
+            return False
+        self._spill_buffer.append(line)
+        self._spill_pending += 1
+        self._schedule_spill_flush()
+        return True
+
+    def _schedule_spill_flush(self) -> None:
+        if self._spill_flusher is not None and not self._spill_flusher.done():
+            return
+        # Without a running loop the buffer is drained by the next `get()` or `flush_spill()`.
+        with contextlib.suppress(RuntimeError):
+            self._spill_flusher = asyncio.get_running_loop().create_task(self._flush_spill())
+
+    async def _flush_spill(self) -> None:
+        async with self._spill_lock:
+            while self._spill_buffer and self.spill_path is not None:
+                batch = self._spill_buffer[:TYPE1_SPILL_BATCH_MAX]
+                del self._spill_buffer[: len(batch)]
+                if not await asyncio.to_thread(_append_lines, self.spill_path, batch):
+                    self.counters.spill_errors += 1
+                    self.counters.dropped += len(batch)
+                    self._spill_pending = max(0, self._spill_pending - len(batch))
+
+    async def _restore_from_spill(self) -> None:
+        async with self._spill_lock:
+            on_disk = max(0, self._spill_pending - len(self._spill_buffer))
+            lines: list[str] = []
+            exhausted = True
+            if on_disk and self.spill_path is not None:
+                lines, exhausted = await asyncio.to_thread(self._read_spill_lines, self.maxsize)
+            if exhausted:
+                on_disk = 0
+                # Everything on disk has been read; continue from the not-yet-written buffer.
+                take = max(0, self.maxsize - len(lines))
+                lines.extend(self._spill_buffer[:take])
+                del self._spill_buffer[:take]
+            else:
+                on_disk = max(0, on_disk - len(lines))
+            restored: list[dict[str, Any]] = []
+            for line in lines:
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError:
+                    self.counters.spill_errors += 1
+                    continue
+                if isinstance(payload, dict):
+                    restored.append(payload)
+            self._items.extend(restored)
+            self.counters.restored += len(restored)
+            self._spill_pending = on_disk + len(self._spill_buffer)
+
+    def _read_spill_lines(self, limit: int) -> tuple[list[str], bool]:
+        """Read up to `limit` unread lines; at end of file, delete it so it never grows across bursts."""
+        if self.spill_path is None:
+            return [], True
+        lines: list[str] = []
+        exhausted = False
+        try:
+            with self.spill_path.open("r", encoding="utf-8") as handle:
+                handle.seek(self._spill_offset)
+                while len(lines) < limit:
+                    line = handle.readline()
+                    if not line:
+                        exhausted = True
+                        break
+                    self._spill_offset = handle.tell()
+                    if line.strip():
+                        lines.append(line)
+                if not exhausted and not handle.readline():
+                    exhausted = True
+        except OSError:
+            self.counters.spill_errors += 1
+            exhausted = True
+        if exhausted:
+            self._spill_offset = 0
+            self._discard_spill_file()
+        return lines, exhausted
+
+    def _adopt_spill_file(self) -> None:
+        """Count events a previous run left in the spill file so `get()` restores them first."""
+        if self.spill_path is None:
+            return
+        try:
+            with self.spill_path.open("rb") as handle:
+                pending = sum(1 for line in handle if line.strip())
+        except FileNotFoundError:
+            return
+        except OSError:
+            self.counters.spill_errors += 1
+            return
+        self._spill_pending += pending
+        if pending:
+            self._ready.set()
+
+    def _discard_spill_file(self) -> None:
+        if self.spill_path is None:
+            return
+        try:
+            os.remove(self.spill_path)
+        except FileNotFoundError:
+            return
+        except OSError:
+            self.counters.spill_errors += 1
+
+
+def _append_lines(path: Path, lines: list[str]) -> bool:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write("".join(f"{line}\n" for line in lines))
+    except OSError:
+        return False
+    return True
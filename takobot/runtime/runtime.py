@@ -16,6 +16,7 @@ from ..daily import append_daily_note, ensure_daily_log
 from ..sensors.base import Sensor, SensorContext
 from ..topic_research import TopicResearchResult, collect_topic_research
 from .events import EventBus
+from .world_notebook import WorldItem, WorldNotebookWriter
 
 BRIEFING_MAX_PER_DAY = 3
 BRIEFING_COOLDOWN_S = 90 * 60
@@ -108,6 +109,10 @@ class Runtime:
         }
 
         self._world_dir = self.memory_root / "world"
+        self._notebook_writer = WorldNotebookWriter(
+            self._world_dir,
+            index_path=self.state_dir / "world_notebook_index.json",
+        )
         self._briefing_state_path = self.state_dir / "briefing_state.json"
         self._briefing_state = self._load_briefing_state()
         self._unsubscribe_error_listener = self.event_bus.subscribe(self._track_errors)
@@ -213,7 +218,7 @@ class Runtime:
             self.last_explore_at = time.monotonic()
             today = date.today()
             ensure_daily_log(self.daily_log_root, today)
-            _ensure_world_memory_scaffold(self._world_dir)
+            self._notebook_writer.ensure_scaffold()
             topic_focus = _clean_value(topic)
             mission_objectives = self._mission_objectives()
             if topic_focus:
@@ -227,6 +232,19 @@ class Runtime:
                 topic_focus=topic_focus,
             )
 
+            research_task: asyncio.Future[TopicResearchResult] | None = None
+            if trigger == "manual" and topic_focus:
+                # Topic research fans out to its own sources; overlap it with the sensor sweep.
+                research_task = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        collect_topic_research,
+                        topic_focus,
+                        mission_objectives=mission_objectives,
+                        timeout_s=self.sensor_timeout_s,
+                        user_agent=self.sensor_user_agent,
+                    )
+                )
+
             world_items: list[WorldItem] = []
             sensor_events_total = 0
             sensor_failures = 0
@@ -252,7 +270,7 @@ class Runtime:
 
             new_world_count = 0
             if world_items:
-                notebook_path, new_world_count = _append_world_notebook_entries(self._world_dir, today, world_items)
+                notebook_path, new_world_count = self._notebook_writer.append_items(today, world_items)
                 if new_world_count > 0:
                     append_daily_note(
                         self.daily_log_root,
@@ -282,16 +300,10 @@ class Runtime:
             topic_research_highlight = ""
             topic_research_path = ""
             topic_research_brief: list[dict[str, str]] = []
-            if trigger == "manual" and topic_focus:
-                research_result = await asyncio.to_thread(
-                    collect_topic_research,
-                    topic_focus,
-                    mission_objectives=mission_objectives,
-                    timeout_s=self.sensor_timeout_s,
-                    user_agent=self.sensor_user_agent,
-                )
+            if research_task is not None:
+                research_result = await research_task
                 if research_result.notes:
-                    notes_path, topic_research_notes = _append_topic_research_entries(self._world_dir, today, research_result)
+                    notes_path, topic_research_notes = self._notebook_writer.append_topic_research(today, research_result)
                     topic_research_path = str(notes_path)
                     topic_research_highlight = _clean_value(research_result.highlight)
                     topic_research_brief = [_topic_note_brief(note) for note in research_result.notes[:6]]
@@ -547,7 +559,7 @@ class Runtime:
         message = " ".join(str(event.get("message", "")).split())
         if not event_type or not message:
             return
-        signature = _error_signature(event_type, message)
+        signature = error_signature(event_type, message)
         count = self._error_counts.get(signature, 0) + 1
         self._error_counts[signature] = count
         if count >= 2:
@@ -649,21 +661,6 @@ class Runtime:
             self.on_activity(kind, detail)
 
 
-@dataclass(frozen=True)
-class WorldItem:
-    item_id: str
-    title: str
-    source: str
-    link: str
-    published: str
-    why_it_matters: str
-    mission_relevance: str
-    question: str
-
-    def sort_key(self) -> tuple[str, str, str]:
-        return (self.source.lower(), self.title.lower(), self.link.lower())
-
-
 def _world_item_from_event(event: dict[str, Any]) -> WorldItem | None:
     metadata = event.get("metadata")
     if not isinstance(metadata, dict):
@@ -690,89 +687,6 @@ def _world_item_from_event(event: dict[str, Any]) -> WorldItem | None:
     )
 
 
-def _append_world_notebook_entries(world_dir: Path, day: date, items: list[WorldItem]) -> tuple[Path, int]:
-    world_dir.mkdir(parents=True, exist_ok=True)
-    _ensure_world_memory_scaffold(world_dir)
-    path = world_dir / f"{day.isoformat()}.md"
-    if not path.exists():
-        path.write_text(f"# World Notebook — {day.isoformat()}\n\n", encoding="utf-8")
-
-    text = path.read_text(encoding="utf-8")
-    section_header = f"## {day.isoformat()}"
-    if section_header not in text:
-        if text and not text.endswith("\n"):
-            text += "\n"
-        text += f"\n{section_header}\n"
-        path.write_text(text, encoding="utf-8")
-        text = path.read_text(encoding="utf-8")
-
-    existing_ids = set(re.findall(r"<!-- world_item_id: (.+?) -->", text))
-    pending = [item for item in sorted(items, key=lambda entry: entry.sort_key()) if item.item_id not in existing_ids]
-    if not pending:
-        return path, 0
-
-    with path.open("a", encoding="utf-8") as handle:
-        for item in pending:
-            safe_id = item.item_id.replace("--", "-")
-            safe_title = _clean_value(item.title) or "(untitled)"
-            safe_source = _clean_value(item.source) or "unknown source"
-            safe_link = _clean_value(item.link) or "(no link)"
-            handle.write(f"<!-- world_item_id: {safe_id} -->\n")
-            handle.write(f"- **[{safe_title}]** ({safe_source}) — {safe_link}\n")
-            why_it_matters = _line_or_blank("Why it matters:", item.why_it_matters)
-            mission_relevance = _line_or_blank("Possible mission relevance:", item.mission_relevance)
-            handle.write(f"  - {why_it_matters}\n")
-            handle.write(f"  - {mission_relevance}\n")
-            handle.write("  - Questions:\n")
-            question = _clean_value(item.question)
-            if question:
-                handle.write(f"    - {question}\n")
-    _append_world_entities(world_dir / "entities.md", day, pending)
-    return path, len(pending)
-
-
-def _append_topic_research_entries(world_dir: Path, day: date, result: TopicResearchResult) -> tuple[Path, int]:
-    world_dir.mkdir(parents=True, exist_ok=True)
-    _ensure_world_memory_scaffold(world_dir)
-    path = world_dir / f"{day.isoformat()}.md"
-    if not path.exists():
-        path.write_text(f"# World Notebook — {day.isoformat()}\n\n", encoding="utf-8")
-
-    text = path.read_text(encoding="utf-8")
-    section_header = f"## {day.isoformat()}"
-    if section_header not in text:
-        if text and not text.endswith("\n"):
-            text += "\n"
-        text += f"\n{section_header}\n"
-        path.write_text(text, encoding="utf-8")
-
-    notes = list(result.notes)
-    if not notes:
-        return path, 0
-
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(f"\n### Topic Explore — {result.topic}\n")
-        highlight = _clean_value(result.highlight)
-        if highlight:
-            handle.write(f"- Interesting thing learned: {highlight}\n")
-        handle.write(f"- Notes captured: {len(notes)}\n")
-        for idx, note in enumerate(notes, start=1):
-            source = _clean_value(note.source) or "source"
-            title = _clean_value(note.title) or "(untitled)"
-            link = _clean_value(note.link) or "(no link)"
-            learned = _clean_value(note.summary) or "(no summary)"
-            relevance = _clean_value(note.mission_relevance)
-            question = _clean_value(note.question)
-            handle.write(f"- Research note {idx} ({source})\n")
-            handle.write(f"  - Title: {title}\n")
-            handle.write(f"  - Link: {link}\n")
-            handle.write(f"  - What I learned: {learned}\n")
-            handle.write(f"  - Possible mission relevance: {relevance}\n")
-            handle.write(f"  - Question: {question}\n")
-        handle.write("\n")
-    return path, len(notes)
-
-
 def _topic_note_brief(note: Any) -> dict[str, str]:
     return {
         "source": _clean_value(getattr(note, "source", "")),
@@ -783,83 +697,6 @@ def _topic_note_brief(note: Any) -> dict[str, str]:
     }
 
 
-def _ensure_world_memory_scaffold(world_dir: Path) -> None:
-    world_dir.mkdir(parents=True, exist_ok=True)
-    model_path = world_dir / "model.md"
-    if not model_path.exists():
-        model_path.write_text(
-            "\n".join(
-                [
-                    "# World Model",
-                    "",
-                    "## Mission Hypotheses",
-                    "",
-                    "- (capture evidence-backed hypotheses here)",
-                    "",
-                    "## Signals To Watch",
-                    "",
-                    "- (list stable external signals and why they matter)",
-                    "",
-                ]
-            ),
-            encoding="utf-8",
-        )
-
-    entities_path = world_dir / "entities.md"
-    if not entities_path.exists():
-        entities_path.write_text(
-            "\n".join(
-                [
-                    "# World Entities",
-                    "",
-                    "## Sources",
-                    "",
-                    "- (new sources are appended automatically from world-watch items)",
-                    "",
-                ]
-            ),
-            encoding="utf-8",
-        )
-
-    assumptions_path = world_dir / "assumptions.md"
-    if not assumptions_path.exists():
-        assumptions_path.write_text(
-            "\n".join(
-                [
-                    "# Assumptions",
-                    "",
-                    "## Active Assumptions",
-                    "",
-                    "- [ ] (assumption) | confidence: low/medium/high | evidence:",
-                    "",
-                    "## Invalidated Assumptions",
-                    "",
-                    "- (move resolved assumptions here with rationale)",
-                    "",
-                ]
-            ),
-            encoding="utf-8",
-        )
-
-
-def _append_world_entities(path: Path, day: date, items: list[WorldItem]) -> None:
-    if not items:
-        return
-    _ensure_world_memory_scaffold(path.parent)
-    text = path.read_text(encoding="utf-8") if path.exists() else ""
-    existing = set(re.findall(r"<!-- world_source: (.+?) -->", text))
-    sources = sorted({_clean_value(item.source) for item in items if _clean_value(item.source)})
-    pending = [source for source in sources if source not in existing]
-    if not pending:
-        return
-    with path.open("a", encoding="utf-8") as handle:
-        for source in pending:
-            safe = source.replace("--", "-")
-            handle.write(f"<!-- world_source: {safe} -->\n")
-            handle.write(f"- **{source}**\n")
-            handle.write(f"  - First seen: {day.isoformat()}\n")
-
-
 def _mission_status(*, new_world_count: int, repeated_errors: list[str], objectives: list[str]) -> str:
     if repeated_errors:
         return "off track"
@@ -994,15 +831,8 @@ def _clean_value(value: Any) -> str:
     return " ".join(str(value or "").split()).strip()
 
 
-def _line_or_blank(label: str, value: str) -> str:
-    cleaned_label = _clean_value(label).rstrip(":") + ":"
-    cleaned_value = _clean_value(value)
-    if not cleaned_value:
-        return cleaned_label
-    return f"{cleaned_label} {cleaned_value}"
-
-
-def _error_signature(event_type: str, message: str) -> str:
+def error_signature(event_type: str, message: str) -> str:
+    """Normalized `type|message` key used to recognize repeats of the same error."""
     prefix = _clean_value(event_type).lower()[:120]
     detail = _clean_value(message).lower()[:160]
     return f"{prefix}|{detail}"
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+from ..histogram import DurationHistogram
+from .runtime import error_signature
+
+TYPE2_WORKERS_DEFAULT = 2
+TYPE2_BATCH_WINDOW_S = 0.75
+TYPE2_BATCH_MAX_EVENTS = 25
+TYPE2_COOLDOWN_S = 60.0
+TYPE2_LATENCY_BUCKETS_MS = (100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0, 60000.0, 120000.0)
+_DEPTH_RANK = {"light": 0, "medium": 1, "deep": 2}
+
+
+def escalation_signature(event: dict[str, Any]) -> str:
+    """Root-cause key shared by escalations that should be reasoned about once."""
+    return error_signature(str(event.get("type", "unknown")), str(event.get("message", "")))
+
+
+@dataclass
+class Type2Batch:
+    signature: str
+    depth: str
+    reason: str
+    events: list[dict[str, Any]] = field(default_factory=list)
+    folded: int = 0
+    folded_reported: int = 0
+    opened_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def event(self) -> dict[str, Any]:
+        """Most recent escalation; it carries the freshest message and metadata."""
+        return self.events[-1]
+
+    @property
+    def size(self) -> int:
+        return len(self.events)
+
+    @property
+    def occurrences(self) -> int:
+        """Escalations this batch stands for, including ones folded in after it was sealed."""
+        return self.size + self.folded
+
+    def outranked_by(self, depth: str) -> bool:
+        return _DEPTH_RANK.get(depth, 1) > _DEPTH_RANK.get(self.depth, 1)
+
+    def add(self, event: dict[str, Any], *, depth: str) -> None:
+        self.events.append(event)
+        if _DEPTH_RANK.get(depth, 1) > _DEPTH_RANK.get(self.depth, 1):
+            self.depth = depth
+
+
+@dataclass
+class Type2PoolMetrics:
+    submitted: int = 0
+    batches: int = 0
+    completed: int = 0
+    failed: int = 0
+    folded: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    largest_batch: int = 0
+    latency: DurationHistogram = field(default_factory=lambda: DurationHistogram(buckets_ms=TYPE2_LATENCY_BUCKETS_MS))
+
+    @property
+    def merged(self) -> int:
+        """Escalations folded into an earlier batch instead of costing their own Type2 pass."""
+        return max(0, self.submitted - self.batches)
+
+
+class Type2Pool:
+    """Bounded Type2 worker pool that batches escalations sharing a root cause.
+
+    Escalations with the same `escalation_signature` submitted within
+    `window_s` of the first one are handed to `handler` as one batch; up to
+    `workers` batches are handled concurrently. Once a batch is sealed, later
+    escalations with its signature are folded into it (counted in
+    `Type2Batch.folded`, not handled again) while it waits for a worker, while
+    it runs, and for `cooldown_s` after it finishes, so a storm slower than the
+    window still costs one Type2 pass. A repeat that asks for a deeper pass
+    than the sealed batch opens a new batch instead. Repeats folded in after
+    the handler started are passed to `on_repeats(batch, count)` when the
+    handler finishes and again when the cooldown ends.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Type2Batch], Awaitable[None]],
+        *,
+        workers: int = TYPE2_WORKERS_DEFAULT,
+        window_s: float = TYPE2_BATCH_WINDOW_S,
+        max_batch: int = TYPE2_BATCH_MAX_EVENTS,
+        cooldown_s: float = TYPE2_COOLDOWN_S,
+        on_repeats: Callable[[Type2Batch, int], None] | None = None,
+    ) -> None:
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.window_s = max(0.0, float(window_s))
+        self.max_batch = max(1, int(max_batch))
+        self.cooldown_s = max(0.0, float(cooldown_s))
+        self.on_repeats = on_repeats
+        self.metrics = Type2PoolMetrics()
+        self._open: dict[str, Type2Batch] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._ready: asyncio.Queue[Type2Batch] = asyncio.Queue()
+        self._ready_events = 0
+        # Latest sealed batch per signature, kept while queued, running or cooling down.
+        self._sealed: dict[str, Type2Batch] = {}
+        self._cooldown_timers: dict[int, asyncio.TimerHandle] = {}
+
+    def submit(self, event: dict[str, Any], *, depth: str, reason: str) -> Type2Batch:
+        """Add an escalation to the batch for its signature (must be called on the loop)."""
+        self.metrics.submitted += 1
+        signature = escalation_signature(event)
+        batch = self._open.get(signature)
+        if batch is None:
+            sealed = self._sealed.get(signature)
+            if sealed is not None and not sealed.outranked_by(depth):
+                sealed.folded += 1
+                self.metrics.folded += 1
+                return sealed
+            batch = Type2Batch(signature=signature, depth=depth, reason=reason)
+            self._open[signature] = batch
+            if self.window_s > 0:
+                loop = asyncio.get_running_loop()
+                self._timers[signature] = loop.call_later(self.window_s, self._close, signature)
+        batch.add(event, depth=depth)
+        if self.window_s <= 0 or batch.size >= self.max_batch:
+            self._close(signature)
+        return batch
+
+    def pending(self) -> int:
+        """Escalations waiting for a worker, whether their batch window is still open or not."""
+        return sum(batch.size for batch in self._open.values()) + self._ready_events
+
+    async def run(self) -> None:
+        workers = [
+            asyncio.create_task(self._worker(), name=f"tako-type2-{index}") for index in range(self.workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            for task in workers:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+            for timer in [*self._timers.values(), *self._cooldown_timers.values()]:
+                timer.cancel()
+            self._timers.clear()
+            self._cooldown_timers.clear()
+
+    def lines(self) -> list[str]:
+        metrics = self.metrics
+        return [
+            (
+                f"type2_pool: workers={self.workers} in_flight={metrics.in_flight} peak={metrics.peak_in_flight} "
+                f"pending={self.pending()}"
+            ),
+            (
+                f"type2_batches: escalations={metrics.submitted} batches={metrics.batches} merged={metrics.merged} "
+                f"folded={metrics.folded} largest={metrics.largest_batch} completed={metrics.completed} "
+                f"failed={metrics.failed}"
+            ),
+            metrics.latency.summary("type2_batch_latency"),
+        ]
+
+    def _close(self, signature: str) -> None:
+        timer = self._timers.pop(signature, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._open.pop(signature, None)
+        if batch is None:
+            return
+        self.metrics.batches += 1
+        self.metrics.largest_batch = max(self.metrics.largest_batch, batch.size)
+        self._sealed[signature] = batch
+        self._ready_events += batch.size
+        self._ready.put_nowait(batch)
+
+    def _report_repeats(self, batch: Type2Batch) -> None:
+        repeats = batch.folded - batch.folded_reported
+        batch.folded_reported = batch.folded
+        if repeats <= 0 or self.on_repeats is None:
+            return
+        try:
+            self.on_repeats(batch, repeats)
+        except Exception:  # noqa: BLE001
+            return
+
+    def _end_cooldown(self, batch: Type2Batch) -> None:
+        self._cooldown_timers.pop(id(batch), None)
+        if self._sealed.get(batch.signature) is batch:
+            del self._sealed[batch.signature]
+        self._report_repeats(batch)
+
+    def _release(self, batch: Type2Batch) -> None:
+        self._report_repeats(batch)
+        if self._sealed.get(batch.signature) is not batch:
+            return
+        if self.cooldown_s <= 0:
+            del self._sealed[batch.signature]
+            return
+        loop = asyncio.get_running_loop()
+        self._cooldown_timers[id(batch)] = loop.call_later(self.cooldown_s, self._end_cooldown, batch)
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._ready.get()
+            self._ready_events -= batch.size
+            # Repeats folded in while queued reach the handler through `occurrences`.
+            batch.folded_reported = batch.folded
+            self.metrics.in_flight += 1
+            self.metrics.peak_in_flight = max(self.metrics.peak_in_flight, self.metrics.in_flight)
+            try:
+                await self.handler(batch)
+                self.metrics.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                # The handler reports its own errors; a failed batch must not take the worker down.
+                self.metrics.failed += 1
+            finally:
+                self.metrics.in_flight -= 1
+                self.metrics.latency.observe(time.perf_counter() - batch.opened_at)
+                self._release(batch)
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+import json
+import os
+from pathlib import Path
+import re
+from typing import Any
+
+WORLD_ITEM_MARKER_RE = re.compile(r"<!-- world_item_id: (.+?) -->")
+WORLD_SOURCE_MARKER_RE = re.compile(r"<!-- world_source: (.+?) -->")
+
+
+@dataclass(frozen=True)
+class WorldItem:
+    item_id: str
+    title: str
+    source: str
+    link: str
+    published: str
+    why_it_matters: str
+    mission_relevance: str
+    question: str
+
+    def sort_key(self) -> tuple[str, str, str]:
+        return (self.source.lower(), self.title.lower(), self.link.lower())
+
+
+class WorldNotebookWriter:
+    """Append-only writer for `memory/world/` notebooks.
+
+    Dedupe state (today's `world_item_id` markers and the `entities.md` source
+    set) is kept in memory and mirrored to a small sidecar index, so a tick
+    costs one stat per file plus one append instead of re-reading notebooks
+    that grow for months. A file whose size no longer matches what we last
+    wrote (operator edit, git checkout) is rescanned once.
+    """
+
+    def __init__(self, world_dir: Path, *, index_path: Path | None = None) -> None:
+        self.world_dir = world_dir
+        self.index_path = index_path
+        self._scaffold_ready = False
+        self._day = ""
+        self._day_ids: set[str] = set()
+        self._day_size = -1
+        self._day_has_section = False
+        self._sources: set[str] = set()
+        self._entities_size = -1
+        self._index_loaded = False
+
+    def notebook_path(self, day: date) -> Path:
+        return self.world_dir / f"{day.isoformat()}.md"
+
+    def ensure_scaffold(self) -> None:
+        if self._scaffold_ready:
+            return
+        ensure_world_memory_scaffold(self.world_dir)
+        self._scaffold_ready = True
+
+    def append_items(self, day: date, items: list[WorldItem]) -> tuple[Path, int]:
+        self.ensure_scaffold()
+        path = self._prepare_day(day)
+        pending: list[WorldItem] = []
+        for item in sorted(items, key=lambda entry: entry.sort_key()):
+            safe_id = item.item_id.replace("--", "-")
+            if item.item_id in self._day_ids or safe_id in self._day_ids:
+                continue
+            self._day_ids.add(safe_id)
+            pending.append(item)
+
+        chunks = [self._section_prefix(day)]
+        for item in pending:
+            chunks.append(_format_world_item(item))
+        self._append_day(path, "".join(chunks))
+        if pending:
+            self._append_entities(day, pending)
+        self._save_index()
+        return path, len(pending)
+
+    def append_topic_research(self, day: date, result: Any) -> tuple[Path, int]:
+        self.ensure_scaffold()
+        path = self._prepare_day(day)
+        notes = list(getattr(result, "notes", ()) or ())
+        if not notes:
+            self._append_day(path, self._section_prefix(day))
+            self._save_index()
+            return path, 0
+
+        chunks = [self._section_prefix(day), f"\n### Topic Explore — {getattr(result, 'topic', '')}\n"]
+        highlight = _clean_value(getattr(result, "highlight", ""))
+        if highlight:
+            chunks.append(f"- Interesting thing learned: {highlight}\n")
+        chunks.append(f"- Notes captured: {len(notes)}\n")
+        for idx, note in enumerate(notes, start=1):
+            source = _clean_value(getattr(note, "source", "")) or "source"
+            title = _clean_value(getattr(note, "title", "")) or "(untitled)"
+            link = _clean_value(getattr(note, "link", "")) or "(no link)"
+            learned = _clean_value(getattr(note, "summary", "")) or "(no summary)"
+            relevance = _clean_value(getattr(note, "mission_relevance", ""))
+            question = _clean_value(getattr(note, "question", ""))
+            chunks.append(f"- Research note {idx} ({source})\n")
+            chunks.append(f"  - Title: {title}\n")
+            chunks.append(f"  - Link: {link}\n")
+            chunks.append(f"  - What I learned: {learned}\n")
+            chunks.append(f"  - Possible mission relevance: {relevance}\n")
+            chunks.append(f"  - Question: {question}\n")
+        chunks.append("\n")
+        self._append_day(path, "".join(chunks))
+        self._save_index()
+        return path, len(notes)
+
+    def _prepare_day(self, day: date) -> Path:
+        day_iso = day.isoformat()
+        path = self.notebook_path(day)
+        self._load_index()
+        if self._day != day_iso:
+            self._day = day_iso
+            self._day_ids = set()
+            self._day_size = -1
+            self._day_has_section = False
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            header = f"# World Notebook — {day_iso}\n\n"
+            path.write_text(header, encoding="utf-8")
+            self._day_ids = set()
+            self._day_has_section = False
+            self._day_size = len(header.encode("utf-8"))
+        elif _file_size(path) != self._day_size:
+            text = path.read_text(encoding="utf-8")
+            self._day_ids = set(WORLD_ITEM_MARKER_RE.findall(text))
+            self._day_has_section = f"## {day_iso}" in text
+            self._day_size = len(text.encode("utf-8"))
+            if text and not text.endswith("\n") and not self._day_has_section:
+                self._append_day(path, "\n")
+        return path
+
+    def _section_prefix(self, day: date) -> str:
+        if self._day_has_section:
+            return ""
+        self._day_has_section = True
+        return f"\n## {day.isoformat()}\n"
+
+    def _append_day(self, path: Path, text: str) -> None:
+        if not text:
+            return
+        payload = text.encode("utf-8")
+        with path.open("ab") as handle:
+            handle.write(payload)
+        self._day_size = _file_size(path)
+
+    def _append_entities(self, day: date, items: list[WorldItem]) -> None:
+        path = self.world_dir / "entities.md"
+        if _file_size(path) != self._entities_size:
+            text = path.read_text(encoding="utf-8") if path.exists() else ""
+            self._sources = set(WORLD_SOURCE_MARKER_RE.findall(text))
+            self._entities_size = len(text.encode("utf-8"))
+        sources = sorted({_clean_value(item.source) for item in items if _clean_value(item.source)})
+        chunks: list[str] = []
+        for source in sources:
+            safe = source.replace("--", "-")
+            if source in self._sources or safe in self._sources:
+                continue
+            self._sources.add(safe)
+            chunks.append(f"<!-- world_source: {safe} -->\n")
+            chunks.append(f"- **{source}**\n")
+            chunks.append(f"  - First seen: {day.isoformat()}\n")
+        if not chunks:
+            return
+        with path.open("ab") as handle:
+            handle.write("".join(chunks).encode("utf-8"))
+        self._entities_size = _file_size(path)
+
+    def _load_index(self) -> None:
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+        if self.index_path is None:
+            return
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(payload, dict):
+            return
+        day = payload.get("day")
+        ids = payload.get("item_ids")
+        if isinstance(day, str) and isinstance(ids, list):
+            self._day = day
+            self._day_ids = {str(value) for value in ids if str(value).strip()}
+            self._day_size = _as_int(payload.get("day_size"), default=-1)
+            self._day_has_section = bool(payload.get("day_has_section"))
+        sources = payload.get("sources")
+        if isinstance(sources, list):
+            self._sources = {str(value) for value in sources if str(value).strip()}
+            self._entities_size = _as_int(payload.get("entities_size"), default=-1)
+
+    def _save_index(self) -> None:
+        if self.index_path is None:
+            return
+        payload = {
+            "day": self._day,
+            "day_size": self._day_size,
+            "day_has_section": self._day_has_section,
+            "item_ids": sorted(self._day_ids),
+            "entities_size": self._entities_size,
+            "sources": sorted(self._sources),
+        }
+        tmp = self.index_path.with_name(f".{self.index_path.name}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, ensure_ascii=True, separators=(",", ":")) + "\n", encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            return
+
+
+def ensure_world_memory_scaffold(world_dir: Path) -> None:
+    world_dir.mkdir(parents=True, exist_ok=True)
+    model_path = world_dir / "model.md"
+    if not model_path.exists():
+        model_path.write_text(
+            "\n".join(
+                [
+                    "# World Model",
+                    "",
+                    "## Mission Hypotheses",
+                    "",
+                    "- (capture evidence-backed hypotheses here)",
+                    "",
+                    "## Signals To Watch",
+                    "",
+                    "- (list stable external signals and why they matter)",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+    entities_path = world_dir / "entities.md"
+    if not entities_path.exists():
+        entities_path.write_text(
+            "\n".join(
+                [
+                    "# World Entities",
+                    "",
+                    "## Sources",
+                    "",
+                    "- (new sources are appended automatically from world-watch items)",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+    assumptions_path = world_dir / "assumptions.md"
+    if not assumptions_path.exists():
+        assumptions_path.write_text(
+            "\n".join(
+                [
+                    "# Assumptions",
+                    "",
+                    "## Active Assumptions",
+                    "",
+                    "- [ ] (assumption) | confidence: low/medium/high | evidence:",
+                    "",
+                    "## Invalidated Assumptions",
+                    "",
+                    "- (move resolved assumptions here with rationale)",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+
+def _format_world_item(item: WorldItem) -> str:
+    safe_id = item.item_id.replace("--", "-")
+    safe_title = _clean_value(item.title) or "(untitled)"
+    safe_source = _clean_value(item.source) or "unknown source"
+    safe_link = _clean_value(item.link) or "(no link)"
+    lines = [
+        f"<!-- world_item_id: {safe_id} -->\n",
+        f"- **[{safe_title}]** ({safe_source}) — {safe_link}\n",
+        f"  - {_line_or_blank('Why it matters:', item.why_it_matters)}\n",
+        f"  - {_line_or_blank('Possible mission relevance:', item.mission_relevance)}\n",
+        "  - Questions:\n",
+    ]
+    question = _clean_value(item.question)
+    if question:
+        lines.append(f"    - {question}\n")
+    return "".join(lines)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return -1
+
+
+def _as_int(value: Any, *, default: int) -> int:
+    try:
+        return int(value)
+    except Exception:
+        return default
+
+
+def _clean_value(value: Any) -> str:
+    return " ".join(str(value or "").split()).strip()
+
+
+def _line_or_blank(label: str, value: str) -> str:
+    cleaned_label = _clean_value(label).rstrip(":") + ":"
+    cleaned_value = _clean_value(value)
+    if not cleaned_value:
+        return cleaned_label
+    return f"{cleaned_label} {cleaned_value}"
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from array import array
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import threading
+from typing import Iterable
+
+SEEN_IDS_FILE_MAGIC = b"TAKOSEEN1\n"
+SEEN_IDS_DEFAULT_CAPACITY = 20_000
+SEEN_IDS_COMPACT_RATIO = 2
+
+
+def seen_id_hash(value: str | bytes) -> int:
+    """Stable 64-bit hash for a seen id (strings are whitespace-normalized)."""
+    if isinstance(value, str):
+        raw = " ".join(value.split()).encode("utf-8")
+    else:
+        raw = bytes(value)
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+def seen_id_store_paths(path: Path) -> tuple[Path, Path | None]:
+    """Binary store path and legacy JSON path for a configured seen-id file.
+
+    A `.json` path names the legacy JSON store: records go to its `.ids`
+    sibling and the JSON file is only read once for migration.
+    """
+    ids_path = path.with_suffix(".ids") if path.suffix == ".json" else path
+    legacy_path = ids_path.with_suffix(".json")
+    return ids_path, legacy_path if legacy_path != ids_path else None
+
+
+class SeenIdStore:
+    """Bounded dedupe horizon of hashed ids shared by sensors and message loops.
+
+    Ids are reduced to 64-bit hashes held in a fixed `array('Q')` ring, so the
+    oldest id is evicted once `capacity` is reached; membership is an exact
+    set of those hashes.
+    Persistence is append-only: `flush()` writes only the hashes added since
+    the last flush, and the file is rewritten from the ring once it holds more
+    than `SEEN_IDS_COMPACT_RATIO * capacity` records.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        capacity: int = SEEN_IDS_DEFAULT_CAPACITY,
+        legacy_json_path: Path | None = None,
+    ) -> None:
+        self.path = path
+        self.capacity = max(1, int(capacity))
+        self.legacy_json_path = legacy_json_path
+        self._ring = array("Q", bytes(8 * self.capacity))
+        self._head = 0
+        self._count = 0
+        self._members: set[int] = set()
+        self._pending = array("Q")
+        self._records_on_disk = 0
+        self._loaded = path is None and legacy_json_path is None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self._count
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, (str, bytes, bytearray)):
+            return False
+        return self.contains_hash(seen_id_hash(value))
+
+    def contains_hash(self, hashed: int) -> bool:
+        self._ensure_loaded()
+        return hashed in self._members
+
+    def add(self, value: str | bytes) -> bool:
+        """Remember `value`; returns True when it was not already present."""
+        return self.add_hash(seen_id_hash(value))
+
+    def add_hash(self, hashed: int) -> bool:
+        self._ensure_loaded()
+        with self._lock:
+            if hashed in self._members:
+                return False
+            self._insert(hashed)
+            if self.path is not None:
+                self._pending.append(hashed)
+            return True
+
+    def add_many(self, values: Iterable[str | bytes]) -> int:
+        return sum(1 for value in values if self.add(value))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring = array("Q", bytes(8 * self.capacity))
+            self._head = 0
+            self._count = 0
+            self._members.clear()
+            self._pending = array("Q")
+            self._loaded = True
+            if self.path is not None:
+                self._rewrite()
+
+    def flush(self) -> None:
+        if self.path is None:
+            return
+        self._ensure_loaded()
+        with self._lock:
+            if not self._pending:
+                return
+            if self._records_on_disk + len(self._pending) > SEEN_IDS_COMPACT_RATIO * self.capacity:
+                self._rewrite()
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                new_file = not self.path.exists() or self.path.stat().st_size == 0
+                with self.path.open("ab") as handle:
+                    if new_file:
+                        handle.write(SEEN_IDS_FILE_MAGIC)
+                    handle.write(_pack(self._pending))
+            except OSError:
+                return
+            self._records_on_disk += len(self._pending)
+            self._pending = array("Q")
+
+    def _insert(self, hashed: int) -> None:
+        if self._count == self.capacity:
+            evicted = self._ring[self._head]
+            self._members.discard(evicted)
+        else:
+            self._count += 1
+        self._ring[self._head] = hashed
+        self._head = (self._head + 1) % self.capacity
+        self._members.add(hashed)
+
+    def _ordered(self) -> array:
+        if self._count < self.capacity:
+            return self._ring[: self._count]
+        return self._ring[self._head :] + self._ring[: self._head]
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            hashes = self._read_file()
+            migrated = False
+            if hashes is None:
+                hashes = self._read_legacy_json()
+                migrated = bool(hashes)
+            for hashed in hashes or ():
+                if hashed not in self._members:
+                    self._insert(hashed)
+            if migrated or self._records_on_disk > SEEN_IDS_COMPACT_RATIO * self.capacity:
+                self._rewrite()
+
+    def _read_file(self) -> array | None:
+        if self.path is None:
+            return None
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None
+        if not data.startswith(SEEN_IDS_FILE_MAGIC):
+            return None
+        body = data[len(SEEN_IDS_FILE_MAGIC) :]
+        body = body[: len(body) - (len(body) % 8)]
+        hashes = _unpack(body)
+        self._records_on_disk = len(hashes)
+        return hashes
+
+    def _read_legacy_json(self) -> list[int]:
+        if self.legacy_json_path is None:
+            return []
+        try:
+            payload = json.loads(self.legacy_json_path.read_text(encoding="utf-8"))
+        except Exception:
+            return []
+        ids = payload.get("seen_ids") if isinstance(payload, dict) else None
+        if not isinstance(ids, list):
+            return []
+        return [seen_id_hash(str(value)) for value in ids if str(value).strip()]
+
+    def _rewrite(self) -> None:
+        if self.path is None:
+            return
+        ordered = self._ordered()
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(SEEN_IDS_FILE_MAGIC + _pack(ordered))
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._records_on_disk = len(ordered)
+        self._pending = array("Q")
+
+
+def _pack(values: array) -> bytes:
+    packed = array("Q", values)
+    if packed.itemsize != 8:
+        raise RuntimeError("array('Q') must be 8 bytes wide")
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(raw: bytes) -> array:
+    values = array("Q")
+    values.frombytes(raw)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import html
 import json
@@ -13,7 +13,9 @@ from typing import Any, Callable, Mapping
 from urllib.parse import quote, urlparse
 from urllib.request import Request, urlopen
 
+from ..seen_ids import SeenIdStore, seen_id_store_paths
 from .base import SensorContext
+from .hackernews import HackerNewsItemCache
 
 CURIOSITY_MAX_BYTES = 1_500_000
 DEFAULT_CURIOSITY_SOURCES = ("reddit", "hackernews", "wikipedia")
@@ -27,6 +29,9 @@ DEFAULT_REDDIT_SUBREDDITS = (
 )
 HN_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL_TEMPLATE = "https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+HN_TOP_STORIES_WINDOW = 120
+HN_ITEM_FETCH_BATCH = 4
+HN_ITEM_FETCH_WORKERS = 4
 WIKIPEDIA_RANDOM_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/random/summary"
 REDDIT_HOT_TEMPLATE = "https://www.reddit.com/r/{subreddit}/hot.json?raw_json=1&limit=25"
 
@@ -50,7 +55,7 @@ class CuriositySensor:
     ) -> None:
         self._source_fetchers: dict[str, SourceFetcher] = {
             "reddit": _fetch_reddit_item,
-            "hackernews": _fetch_hackernews_item,
+            "hackernews": self._fetch_hackernews_item,
             "wikipedia": _fetch_wikipedia_item,
         }
         if source_fetchers:
@@ -64,12 +69,11 @@ class CuriositySensor:
         self.poll_interval_s = max(300, int(poll_minutes) * 60)
         self._next_poll_at = 0.0
         self._seen_path = seen_path
-        self._seen_ids: set[str] = set()
-        self._seen_order: deque[str] = deque()
-        self._seen_loaded = False
+        self._seen_ids: SeenIdStore | None = None
         self._max_seen_ids = max(1_000, int(max_seen_ids))
         self._max_events_per_tick = max(1, int(max_events_per_tick))
         self._rng = rng if rng is not None else random.Random()
+        self._hn_cache: HackerNewsItemCache | None = None
 
     async def tick(self, ctx: SensorContext) -> list[dict[str, Any]]:
         if not self.sources:
@@ -138,58 +142,63 @@ class CuriositySensor:
             "why_it_matters": "Operator-preferred source; likely to contain mission-relevant context.",
         }
 
+    def _fetch_hackernews_item(self, ctx: SensorContext, rng: random.Random) -> dict[str, Any] | None:
+        cache = self._hackernews_cache(ctx.state_dir)
+        top_stories = cache.top_story_ids()
+        if top_stories is None:
+            payload = _fetch_json(HN_TOP_STORIES_URL, timeout_s=ctx.timeout_s, user_agent=ctx.user_agent)
+            if not isinstance(payload, list):
+                return None
+            top_stories = cache.store_top_story_ids(payload)
+        candidates = [
+            story_id
+            for story_id in top_stories[:HN_TOP_STORIES_WINDOW]
+            if f"hackernews:{story_id}" not in self._seen_ids
+        ]
+        if not candidates:
+            return None
+        rng.shuffle(candidates)
+
+        # Prefer stories already fetched by an earlier batch; they cost no request.
+        for story_id in candidates:
+            cached = cache.get(story_id)
+            if cached is not None and _clean_text(str(cached.get("title") or "")):
+                return _hackernews_item(story_id, cached)
+
+        batch = candidates[:HN_ITEM_FETCH_BATCH]
+        fetched = _fetch_hackernews_items(batch, timeout_s=ctx.timeout_s, user_agent=ctx.user_agent)
+        cache.put_many(list(fetched.values()))
+        for story_id in batch:
+            payload = fetched.get(story_id)
+            if payload is not None and _clean_text(str(payload.get("title") or "")):
+                return _hackernews_item(story_id, payload)
+        return None
+
+    def _hackernews_cache(self, state_dir: Path) -> HackerNewsItemCache:
+        if self._hn_cache is None:
+            self._hn_cache = HackerNewsItemCache(
+                state_dir / "hn_items.jsonl",
+                top_stories_path=state_dir / "hn_topstories.json",
+            )
+        return self._hn_cache
+
     def _ensure_seen_loaded(self, state_dir: Path) -> None:
-        if self._seen_loaded:
+        if self._seen_ids is not None:
             return
-        self._seen_loaded = True
         if self._seen_path is None:
-            self._seen_path = state_dir / "curiosity_seen.json"
-        path = self._seen_path
-        if not path.exists():
-            return
-        try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return
-        seen_ids = payload.get("seen_ids")
-        if not isinstance(seen_ids, list):
-            return
-        for raw in seen_ids:
-            item_id = _clean_text(str(raw))
-            if not item_id or item_id in self._seen_ids:
-                continue
-            self._seen_ids.add(item_id)
-            self._seen_order.append(item_id)
-        self._truncate_seen()
+            self._seen_path = state_dir / "curiosity_seen.ids"
+        ids_path, legacy_path = seen_id_store_paths(self._seen_path)
+        self._seen_ids = SeenIdStore(ids_path, capacity=self._max_seen_ids, legacy_json_path=legacy_path)
 
     def _remember_item_id(self, item_id: str) -> None:
         clean = _clean_text(item_id)
-        if not clean or clean in self._seen_ids:
+        if not clean or self._seen_ids is None:
             return
         self._seen_ids.add(clean)
-        self._seen_order.append(clean)
-        self._truncate_seen()
-
-    def _truncate_seen(self) -> None:
-        while len(self._seen_order) > self._max_seen_ids:
-            dropped = self._seen_order.popleft()
-            self._seen_ids.discard(dropped)
 
     def _persist_seen(self) -> None:
-        if self._seen_path is None:
-            return
-        payload = {
-            "updated_at": time.time(),
-            "seen_ids": list(self._seen_order),
-        }
-        try:
-            self._seen_path.parent.mkdir(parents=True, exist_ok=True)
-            self._seen_path.write_text(
-                json.dumps(payload, sort_keys=True, ensure_ascii=True, indent=2) + "\n",
-                encoding="utf-8",
-            )
-        except Exception:
-            return
+        if self._seen_ids is not None:
+            self._seen_ids.flush()
 
 
 def _normalize_sources(values: list[str]) -> list[str]:
@@ -364,21 +373,33 @@ def _fetch_reddit_item(ctx: SensorContext, rng: random.Random) -> dict[str, Any]
     return None
 
 
-def _fetch_hackernews_item(ctx: SensorContext, rng: random.Random) -> dict[str, Any] | None:
-    top_stories = _fetch_json(HN_TOP_STORIES_URL, timeout_s=ctx.timeout_s, user_agent=ctx.user_agent)
-    if not isinstance(top_stories, list) or not top_stories:
-        return None
-    story_id = int(rng.choice(top_stories[:120]))
-    payload = _fetch_json(
-        HN_ITEM_URL_TEMPLATE.format(story_id=story_id),
-        timeout_s=ctx.timeout_s,
-        user_agent=ctx.user_agent,
-    )
-    if not isinstance(payload, dict):
-        return None
+def _fetch_hackernews_items(story_ids: list[int], *, timeout_s: float, user_agent: str) -> dict[int, dict[str, Any]]:
+    def fetch_one(story_id: int) -> dict[str, Any] | None:
+        try:
+            payload = _fetch_json(
+                HN_ITEM_URL_TEMPLATE.format(story_id=story_id),
+                timeout_s=timeout_s,
+                user_agent=user_agent,
+            )
+        except Exception:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    if not story_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(HN_ITEM_FETCH_WORKERS, len(story_ids))) as executor:
+        results = list(executor.map(fetch_one, story_ids))
+    out: dict[int, dict[str, Any]] = {}
+    for story_id, payload in zip(story_ids, results):
+        if payload is None:
+            continue
+        payload.setdefault("id", story_id)
+        out[story_id] = payload
+    return out
+
+
+def _hackernews_item(story_id: int, payload: dict[str, Any]) -> dict[str, Any]:
     title = _clean_text(str(payload.get("title") or ""))
-    if not title:
-        return None
     link = _clean_text(str(payload.get("url") or f"https://news.ycombinator.com/item?id={story_id}"))
     published = _epoch_to_iso(payload.get("time"))
     return {
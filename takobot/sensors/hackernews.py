@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+HN_TOP_STORIES_TTL_S = 10 * 60
+HN_ITEM_CACHE_MAX_ITEMS = 2_000
+
+
+class HackerNewsItemCache:
+    """Persistent cache for Hacker News items plus a short-lived top-story list.
+
+    Posted items never change in ways the curiosity sensor cares about, so they
+    are appended once to a JSON-lines file and kept until the file is compacted
+    down to the newest `max_items` entries. The top-story list changes often and
+    is kept separately with a TTL.
+    """
+
+    def __init__(
+        self,
+        items_path: Path,
+        *,
+        top_stories_path: Path,
+        max_items: int = HN_ITEM_CACHE_MAX_ITEMS,
+        top_stories_ttl_s: float = HN_TOP_STORIES_TTL_S,
+    ) -> None:
+        self.items_path = items_path
+        self.top_stories_path = top_stories_path
+        self.max_items = max(100, int(max_items))
+        self.top_stories_ttl_s = max(0.0, float(top_stories_ttl_s))
+        self._items: dict[int, dict[str, Any]] = {}
+        self._lines_on_disk = 0
+        self._loaded = False
+
+    def get(self, story_id: int) -> dict[str, Any] | None:
+        self._ensure_loaded()
+        item = self._items.get(int(story_id))
+        return dict(item) if item is not None else None
+
+    def put_many(self, items: list[dict[str, Any]]) -> None:
+        self._ensure_loaded()
+        fresh: list[dict[str, Any]] = []
+        for item in items:
+            story_id = _as_story_id(item.get("id"))
+            if story_id is None or story_id in self._items:
+                continue
+            record = {
+                "id": story_id,
+                "title": str(item.get("title") or ""),
+                "url": str(item.get("url") or ""),
+                "time": item.get("time"),
+            }
+            self._items[story_id] = record
+            fresh.append(record)
+        if not fresh:
+            return
+        try:
+            self.items_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.items_path.open("a", encoding="utf-8") as handle:
+                for record in fresh:
+                    handle.write(json.dumps(record, sort_keys=True, ensure_ascii=True, separators=(",", ":")) + "\n")
+        except OSError:
+            return
+        self._lines_on_disk += len(fresh)
+        if len(self._items) > self.max_items or self._lines_on_disk > 2 * self.max_items:
+            self._compact()
+
+    def top_story_ids(self, *, now: float | None = None) -> list[int] | None:
+        current = time.time() if now is None else now
+        try:
+            payload = json.loads(self.top_stories_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        fetched_at = float(payload.get("fetched_at") or 0.0)
+        if current - fetched_at >= self.top_stories_ttl_s:
+            return None
+        ids = payload.get("ids")
+        if not isinstance(ids, list):
+            return None
+        return [story_id for story_id in (_as_story_id(value) for value in ids) if story_id is not None]
+
+    def store_top_story_ids(self, ids: list[Any], *, now: float | None = None) -> list[int]:
+        cleaned = [story_id for story_id in (_as_story_id(value) for value in ids) if story_id is not None]
+        payload = {"fetched_at": time.time() if now is None else now, "ids": cleaned}
+        try:
+            self.top_stories_path.parent.mkdir(parents=True, exist_ok=True)
+            self.top_stories_path.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+        except OSError:
+            pass
+        return cleaned
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            lines = self.items_path.read_text(encoding="utf-8").splitlines()
+        except Exception:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except Exception:
+                continue
+            if not isinstance(record, dict):
+                continue
+            story_id = _as_story_id(record.get("id"))
+            if story_id is None:
+                continue
+            self._items[story_id] = record
+        self._lines_on_disk = len(lines)
+        if len(self._items) > self.max_items:
+            self._compact()
+
+    def _compact(self) -> None:
+        keep = sorted(self._items)[-self.max_items :]
+        self._items = {story_id: self._items[story_id] for story_id in keep}
+        tmp = self.items_path.with_name(f".{self.items_path.name}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as handle:
+                for story_id in keep:
+                    handle.write(
+                        json.dumps(self._items[story_id], sort_keys=True, ensure_ascii=True, separators=(",", ":")) + "\n"
+                    )
+            os.replace(tmp, self.items_path)
+        except OSError:
+            return
+        self._lines_on_disk = len(keep)
+
+
+def _as_story_id(value: Any) -> int | None:
+    try:
+        story_id = int(value)
+    except Exception:
+        return None
+    if story_id <= 0:
+        return None
+    return story_id
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
-import json
 from pathlib import Path
 import time
 from typing import Any
@@ -10,6 +8,7 @@ from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 import xml.etree.ElementTree as ET
 
+from ..seen_ids import SeenIdStore, seen_id_store_paths
 from .base import SensorContext
 
 RSS_MAX_BYTES = 2_500_000
@@ -36,9 +35,7 @@ class RSSSensor:
         self._max_seen_ids = max(1_000, int(max_seen_ids))
         self._last_fetch_by_host: dict[str, float] = {}
         self._seen_path = seen_path
-        self._seen_ids: set[str] = set()
-        self._seen_order: deque[str] = deque()
-        self._seen_loaded = False
+        self._seen_ids: SeenIdStore | None = None
 
     async def tick(self, ctx: SensorContext) -> list[dict[str, Any]]:
         if not self.feeds:
@@ -105,56 +102,22 @@ class RSSSensor:
         return events
 
     def _ensure_seen_loaded(self, state_dir: Path) -> None:
-        if self._seen_loaded:
+        if self._seen_ids is not None:
             return
-        self._seen_loaded = True
         if self._seen_path is None:
-            self._seen_path = state_dir / "rss_seen.json"
-        path = self._seen_path
-        if not path.exists():
-            return
-        try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return
-        ids = payload.get("seen_ids")
-        if not isinstance(ids, list):
-            return
-        for value in ids:
-            item_id = _clean_text(str(value))
-            if not item_id or item_id in self._seen_ids:
-                continue
-            self._seen_ids.add(item_id)
-            self._seen_order.append(item_id)
-        self._truncate_seen()
+            self._seen_path = state_dir / "rss_seen.ids"
+        ids_path, legacy_path = seen_id_store_paths(self._seen_path)
+        self._seen_ids = SeenIdStore(ids_path, capacity=self._max_seen_ids, legacy_json_path=legacy_path)
 
     def _remember_item_id(self, item_id: str) -> None:
         clean = _clean_text(item_id)
-        if not clean:
-            return
-        if clean in self._seen_ids:
+        if not clean or self._seen_ids is None:
             return
         self._seen_ids.add(clean)
-        self._seen_order.append(clean)
-        self._truncate_seen()
-
-    def _truncate_seen(self) -> None:
-        while len(self._seen_order) > self._max_seen_ids:
-            dropped = self._seen_order.popleft()
-            self._seen_ids.discard(dropped)
 
     def _persist_seen(self) -> None:
-        if self._seen_path is None:
-            return
-        payload = {
-            "updated_at": time.time(),
-            "seen_ids": list(self._seen_order),
-        }
-        try:
-            self._seen_path.parent.mkdir(parents=True, exist_ok=True)
-            self._seen_path.write_text(json.dumps(payload, sort_keys=True, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
-        except Exception:
-            return
+        if self._seen_ids is not None:
+            self._seen_ids.flush()
 
 
 def _fetch_feed(url: str, *, timeout_s: float, user_agent: str) -> tuple[str, str]:
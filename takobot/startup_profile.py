@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import contextlib
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+from typing import Awaitable, Iterator, TypeVar
+
+STARTUP_FIRST_INPUT_TARGET_S = 1.5
+STARTUP_PROFILE_FILE = "startup_profile.json"
+IMPORT_PROFILE_TIMEOUT_S = 30.0
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+@dataclass
+class StartupProfile:
+    """Wall-clock phases from process start to the first usable input prompt.
+
+    Phases may overlap when boot work runs concurrently; each phase records
+    its own start offset and duration so the report shows the overlap.
+    """
+
+    started_at: float = field(default_factory=time.perf_counter)
+    target_first_input_s: float = STARTUP_FIRST_INPUT_TARGET_S
+    phases: list[tuple[str, float, float]] = field(default_factory=list)
+    marks: dict[str, float] = field(default_factory=dict)
+    imports: list[ImportTiming] = field(default_factory=list)
+    _lap_at: float | None = field(default=None, repr=False)
+
+    def offset(self) -> float:
+        return max(0.0, time.perf_counter() - self.started_at)
+
+    def record(self, name: str, started_at: float, seconds: float | None = None) -> None:
+        if seconds is None:
+            seconds = max(0.0, time.perf_counter() - started_at)
+        self.phases.append((name, max(0.0, started_at - self.started_at), max(0.0, seconds)))
+
+    def lap(self, name: str) -> None:
+        """Record a sequential phase running from the previous lap (or profile start) until now."""
+        now = time.perf_counter()
+        started_at = self.started_at if self._lap_at is None else self._lap_at
+        self.record(name, started_at, now - started_at)
+        self._lap_at = now
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at)
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        started_at = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.record(name, started_at)
+
+    def mark(self, name: str) -> None:
+        """Record the first time a milestone (e.g. `first_paint`, `first_input`) is reached."""
+        self.marks.setdefault(name, self.offset())
+
+    @property
+    def first_input_s(self) -> float | None:
+        return self.marks.get("first_input")
+
+    def lines(self) -> list[str]:
+        first_input = self.first_input_s
+        if first_input is None:
+            verdict = "pending"
+            first_input_text = "n/a"
+        else:
+            verdict = "ok" if first_input <= self.target_first_input_s else "over"
+            first_input_text = f"{first_input * 1000.0:.0f}ms"
+        lines = [
+            (
+                f"startup: first_input={first_input_text} target={self.target_first_input_s * 1000.0:.0f}ms "
+                f"({verdict})"
+            )
+        ]
+        for name, offset_s in sorted(self.marks.items(), key=lambda item: item[1]):
+            if name != "first_input":
+                lines.append(f"startup_mark[{name}]: at={offset_s * 1000.0:.0f}ms")
+        for name, offset_s, seconds in sorted(self.phases, key=lambda item: item[1]):
+            lines.append(f"startup_phase[{name}]: at={offset_s * 1000.0:.0f}ms took={seconds * 1000.0:.1f}ms")
+        for timing in self.imports:
+            lines.append(
+                f"startup_import[{timing.module}]: cumulative={timing.cumulative_us / 1000.0:.1f}ms "
+                f"self={timing.self_us / 1000.0:.1f}ms"
+            )
+        return lines
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "target_first_input_ms": round(self.target_first_input_s * 1000.0, 1),
+            "first_input_ms": None if self.first_input_s is None else round(self.first_input_s * 1000.0, 1),
+            "marks_ms": {name: round(value * 1000.0, 1) for name, value in self.marks.items()},
+            "phases": [
+                {"name": name, "at_ms": round(offset_s * 1000.0, 1), "took_ms": round(seconds * 1000.0, 1)}
+                for name, offset_s, seconds in self.phases
+            ],
+            "imports": [
+                {"module": item.module, "self_ms": item.self_us / 1000.0, "cumulative_ms": item.cumulative_us / 1000.0}
+                for item in self.imports
+            ],
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def parse_importtime(stderr_text: str) -> list[ImportTiming]:
+    """Parse `python -X importtime` output into one entry per imported module."""
+    out: list[ImportTiming] = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue
+        out.append(ImportTiming(module=parts[2].strip(), self_us=self_us, cumulative_us=cumulative_us))
+    return out
+
+
+def profile_imports(module: str = "takobot.app", *, limit: int = 15) -> list[ImportTiming]:
+    """Import `module` in a fresh interpreter with `-X importtime` and return the slowest entries.
+
+    A subprocess is used because this process has already imported most of
+    the package by the time the CLI parses `--profile-startup`.
+    """
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            timeout=IMPORT_PROFILE_TIMEOUT_S,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    timings = parse_importtime(proc.stderr)
+    package = module.split(".", 1)[0]
+    # Report the package's own modules plus whatever third-party roots they pull in.
+    interesting = [
+        item for item in timings if item.module.startswith(package) or "." not in item.module
+    ]
+    interesting.sort(key=lambda item: item.cumulative_us, reverse=True)
+    return interesting[: max(1, limit)]
@@ -5,6 +5,12 @@ from html.parser import HTMLParser
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
+try:
+    from takobot.http_cache import cached_fetch, tool_http_cache
+except Exception:  # noqa: BLE001
+    cached_fetch = None
+    tool_http_cache = None
+
 
 TOOL_MANIFEST = {
     "name": "web_fetch",
@@ -22,8 +28,8 @@ DEFAULT_MAX_CHARS = 4_000
 
 
 def run(input: dict, ctx: dict) -> dict:
-    del ctx
     payload = input if isinstance(input, dict) else {}
+    cache = _http_cache(ctx)
     url = _clean(str(payload.get("url") or ""))
     if not _is_http_url(url):
         return {"ok": False, "error": "Missing or invalid input.url (http/https required)."}
@@ -32,6 +38,7 @@ def run(input: dict, ctx: dict) -> dict:
     max_bytes = _as_int(payload.get("max_bytes"), default=DEFAULT_MAX_BYTES, min_value=50_000, max_value=5_000_000)
     max_chars = _as_int(payload.get("max_chars"), default=DEFAULT_MAX_CHARS, min_value=300, max_value=20_000)
     render_js = _as_bool(payload.get("render_js"), default=False)
+    max_stale_s = _as_optional_float(payload.get("max_stale_s"))
 
     render_error = ""
     if render_js:
@@ -40,7 +47,14 @@ def run(input: dict, ctx: dict) -> dict:
             return rendered
         render_error = _clean(str(rendered.get("error") or ""))
 
-    plain = _fetch_plain(url, timeout_s=timeout_s, max_bytes=max_bytes, max_chars=max_chars)
+    plain = _fetch_plain(
+        url,
+        timeout_s=timeout_s,
+        max_bytes=max_bytes,
+        max_chars=max_chars,
+        cache=cache,
+        max_stale_s=max_stale_s,
+    )
     if plain.get("ok") and render_error:
         plain["note"] = f"playwright render unavailable; fallback to plain fetch ({render_error})"
     return plain
@@ -79,21 +93,41 @@ def _fetch_with_playwright(url: str, *, timeout_s: float, max_chars: int) -> dic
     }
 
 
-def _fetch_plain(url: str, *, timeout_s: float, max_bytes: int, max_chars: int) -> dict:
-    request = Request(
-        url,
-        headers={
-            "User-Agent": "takobot-web-fetch/1.0 (+https://tako.bot)",
-            "Accept": "text/html, text/plain;q=0.9, */*;q=0.2",
-        },
-        method="GET",
-    )
+def _fetch_plain(
+    url: str,
+    *,
+    timeout_s: float,
+    max_bytes: int,
+    max_chars: int,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> dict:
+    headers = {
+        "User-Agent": "takobot-web-fetch/1.0 (+https://tako.bot)",
+        "Accept": "text/html, text/plain;q=0.9, */*;q=0.2",
+    }
     try:
-        with urlopen(request, timeout=timeout_s) as response:
-            final_url = response.geturl() or url
-            content_type = (response.headers.get("Content-Type") or "").lower()
-            charset = response.headers.get_content_charset() or "utf-8"
-            raw = response.read(max_bytes + 1)
+        if cache is not None:
+            cached = cached_fetch(
+                url,
+                headers=headers,
+                timeout_s=timeout_s,
+                max_bytes=max_bytes,
+                max_stale_s=max_stale_s,
+                cache=cache,
+                opener=urlopen,
+            )
+            final_url = cached.final_url or url
+            content_type = cached.content_type.lower()
+            charset = cached.charset
+            raw = cached.body
+        else:
+            request = Request(url, headers=headers, method="GET")
+            with urlopen(request, timeout=timeout_s) as response:
+                final_url = response.geturl() or url
+                content_type = (response.headers.get("Content-Type") or "").lower()
+                charset = response.headers.get_content_charset() or "utf-8"
+                raw = response.read(max_bytes + 1)
     except Exception as exc:  # noqa: BLE001
         return {"ok": False, "error": _short(str(exc), 220)}
 
@@ -124,6 +158,23 @@ def _fetch_plain(url: str, *, timeout_s: float, max_bytes: int, max_chars: int)
     }
 
 
+def _http_cache(ctx):
+    # `ctx.http_cache_dir` overrides the workspace's shared `.tako/state/http-cache`.
+    if tool_http_cache is None:
+        return None
+    cache_dir = _clean(str(ctx.get("http_cache_dir") or "")) if isinstance(ctx, dict) else ""
+    return tool_http_cache(cache_dir or None)
+
+
+def _as_optional_float(value) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except Exception:
+        return None
+
+
 def _is_http_url(value: str) -> bool:
     parsed = urlparse(value)
     return parsed.scheme in {"http", "https"} and bool(parsed.netloc)
@@ -7,7 +7,8 @@ from pathlib import Path
 import subprocess
 from typing import Sequence
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+
+from .http_cache import cached_fetch
 
 
 WEB_FETCH_TIMEOUT_S = 20.0
@@ -42,33 +43,30 @@ def fetch_webpage(
     timeout_s: float = WEB_FETCH_TIMEOUT_S,
     max_bytes: int = WEB_FETCH_MAX_BYTES,
     text_limit: int = WEB_FETCH_TEXT_LIMIT,
+    max_stale_s: float | None = None,
 ) -> WebFetchResult:
     target = url.strip()
     parsed = urlparse(target)
     if parsed.scheme not in {"http", "https"} or not parsed.netloc:
         return WebFetchResult(False, target, "", "", "URL must be http(s) with a host.")
 
-    request = Request(
-        target,
-        headers={
-            "User-Agent": "takobot/1.0 (+https://tako.bot)",
-            "Accept": "text/html, text/plain;q=0.9, */*;q=0.2",
-        },
-        method="GET",
-    )
     try:
-        with urlopen(request, timeout=timeout_s) as response:
-            final_url = response.geturl() or target
-            content_type = (response.headers.get("Content-Type") or "").lower()
-            charset = response.headers.get_content_charset() or "utf-8"
-            raw = response.read(max_bytes + 1)
+        response = cached_fetch(
+            target,
+            headers={
+                "User-Agent": "takobot/1.0 (+https://tako.bot)",
+                "Accept": "text/html, text/plain;q=0.9, */*;q=0.2",
+            },
+            timeout_s=timeout_s,
+            max_bytes=max_bytes,
+            max_stale_s=max_stale_s,
+        )
     except Exception as exc:  # noqa: BLE001
         return WebFetchResult(False, target, "", "", _short(str(exc), 220))
 
-    if len(raw) > max_bytes:
-        return WebFetchResult(False, target, "", "", f"response too large (> {max_bytes} bytes)")
-
-    decoded = raw.decode(charset, errors="replace")
+    final_url = response.final_url or target
+    content_type = response.content_type.lower()
+    decoded = response.body.decode(response.charset, errors="replace")
     if "html" in content_type or "<html" in decoded[:1024].lower():
         parser = _HTMLTextParser()
         parser.feed(decoded)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 import json
 import re
 from typing import Any
 from urllib.parse import quote, quote_plus
-from urllib.request import Request, urlopen
+
+from .http_cache import cached_fetch
 
 TOPIC_RESEARCH_MAX_BYTES = 2_000_000
+# Search/summary APIs rarely change within hours, so repeat explores may reuse
+# a cached answer this far past its advertised freshness.
+TOPIC_RESEARCH_MAX_STALE_S = 6 * 60 * 60
+TOPIC_RESEARCH_DEADLINE_SLACK_S = 2.0
 
 
 @dataclass(frozen=True)
@@ -34,6 +40,8 @@ def collect_topic_research(
     timeout_s: float = 12.0,
     user_agent: str = "takobot/1.0 (+https://tako.bot; topic-research)",
     max_notes: int = 8,
+    max_stale_s: float | None = TOPIC_RESEARCH_MAX_STALE_S,
+    deadline_s: float | None = None,
 ) -> TopicResearchResult:
     cleaned_topic = _clean_text(topic)
     if not cleaned_topic:
@@ -46,22 +54,39 @@ def collect_topic_research(
             mission = value
             break
 
-    notes: list[TopicResearchNote] = []
-    for fetcher in (
+    fetchers = (
         _fetch_wikipedia_notes,
         _fetch_hackernews_notes,
         _fetch_reddit_notes,
         _fetch_duckduckgo_note,
-    ):
-        with _suppress_exceptions():
-            notes.extend(
-                fetcher(
-                    cleaned_topic,
-                    mission=mission,
-                    timeout_s=timeout_s,
-                    user_agent=user_agent,
-                )
+    )
+    # Sources run side by side under one overall deadline; whatever has not
+    # finished by then is dropped so explore latency tracks the slowest source.
+    budget_s = max(1.0, float(deadline_s if deadline_s is not None else timeout_s + TOPIC_RESEARCH_DEADLINE_SLACK_S))
+    executor = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="tako-topic-research")
+    try:
+        futures = [
+            executor.submit(
+                fetcher,
+                cleaned_topic,
+                mission=mission,
+                timeout_s=timeout_s,
+                user_agent=user_agent,
+                max_stale_s=max_stale_s,
             )
+            for fetcher in fetchers
+        ]
+        done, _pending = wait(futures, timeout=budget_s)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    notes: list[TopicResearchNote] = []
+    # Merge in fixed source order (not completion order) so dedupe stays deterministic.
+    for future in futures:
+        if future not in done:
+            continue
+        with _suppress_exceptions():
+            notes.extend(future.result())
 
     deduped: list[TopicResearchNote] = []
     seen: set[tuple[str, str]] = set()
@@ -78,12 +103,20 @@ def collect_topic_research(
     return TopicResearchResult(topic=cleaned_topic, notes=tuple(deduped), highlight=highlight)
 
 
-def _fetch_wikipedia_notes(topic: str, *, mission: str, timeout_s: float, user_agent: str) -> list[TopicResearchNote]:
+def _fetch_wikipedia_notes(
+    topic: str,
+    *,
+    mission: str,
+    timeout_s: float,
+    user_agent: str,
+    max_stale_s: float | None = None,
+) -> list[TopicResearchNote]:
     slug = quote(topic.replace(" ", "_"), safe="")
     payload = _fetch_json(
         f"https://en.wikipedia.org/api/rest_v1/page/summary/{slug}",
         timeout_s=timeout_s,
         user_agent=user_agent,
+        max_stale_s=max_stale_s,
     )
     if not isinstance(payload, dict):
         return []
@@ -109,12 +142,20 @@ def _fetch_wikipedia_notes(topic: str, *, mission: str, timeout_s: float, user_a
     ]
 
 
-def _fetch_hackernews_notes(topic: str, *, mission: str, timeout_s: float, user_agent: str) -> list[TopicResearchNote]:
+def _fetch_hackernews_notes(
+    topic: str,
+    *,
+    mission: str,
+    timeout_s: float,
+    user_agent: str,
+    max_stale_s: float | None = None,
+) -> list[TopicResearchNote]:
     payload = _fetch_json(
         "https://hn.algolia.com/api/v1/search?"
         f"query={quote_plus(topic)}&tags=story&hitsPerPage=4",
         timeout_s=timeout_s,
         user_agent=user_agent,
+        max_stale_s=max_stale_s,
     )
     hits = payload.get("hits") if isinstance(payload, dict) else None
     if not isinstance(hits, list):
@@ -150,12 +191,20 @@ def _fetch_hackernews_notes(topic: str, *, mission: str, timeout_s: float, user_
     return notes
 
 
-def _fetch_reddit_notes(topic: str, *, mission: str, timeout_s: float, user_agent: str) -> list[TopicResearchNote]:
+def _fetch_reddit_notes(
+    topic: str,
+    *,
+    mission: str,
+    timeout_s: float,
+    user_agent: str,
+    max_stale_s: float | None = None,
+) -> list[TopicResearchNote]:
     payload = _fetch_json(
         "https://www.reddit.com/search.json?"
         f"q={quote_plus(topic)}&sort=top&t=month&limit=4&raw_json=1",
         timeout_s=timeout_s,
         user_agent=user_agent,
+        max_stale_s=max_stale_s,
     )
     data = payload.get("data") if isinstance(payload, dict) else None
     children = data.get("children") if isinstance(data, dict) else None
@@ -197,11 +246,19 @@ def _fetch_reddit_notes(topic: str, *, mission: str, timeout_s: float, user_agen
     return notes
 
 
-def _fetch_duckduckgo_note(topic: str, *, mission: str, timeout_s: float, user_agent: str) -> list[TopicResearchNote]:
+def _fetch_duckduckgo_note(
+    topic: str,
+    *,
+    mission: str,
+    timeout_s: float,
+    user_agent: str,
+    max_stale_s: float | None = None,
+) -> list[TopicResearchNote]:
     payload = _fetch_json(
         f"https://api.duckduckgo.com/?q={quote_plus(topic)}&format=json&no_html=1&skip_disambig=1",
         timeout_s=timeout_s,
         user_agent=user_agent,
+        max_stale_s=max_stale_s,
     )
     if not isinstance(payload, dict):
         return []
@@ -223,21 +280,18 @@ def _fetch_duckduckgo_note(topic: str, *, mission: str, timeout_s: float, user_a
     ]
 
 
-def _fetch_json(url: str, *, timeout_s: float, user_agent: str) -> Any:
-    request = Request(
+def _fetch_json(url: str, *, timeout_s: float, user_agent: str, max_stale_s: float | None = None) -> Any:
+    response = cached_fetch(
         url,
         headers={
             "User-Agent": user_agent,
             "Accept": "application/json, text/plain;q=0.5, */*;q=0.2",
         },
-        method="GET",
+        timeout_s=timeout_s,
+        max_bytes=TOPIC_RESEARCH_MAX_BYTES,
+        max_stale_s=max_stale_s,
     )
-    with urlopen(request, timeout=max(1.0, float(timeout_s))) as response:
-        charset = response.headers.get_content_charset() or "utf-8"
-        raw = response.read(TOPIC_RESEARCH_MAX_BYTES + 1)
-        if len(raw) > TOPIC_RESEARCH_MAX_BYTES:
-            raise ValueError(f"response too large (> {TOPIC_RESEARCH_MAX_BYTES} bytes)")
-    return json.loads(raw.decode(charset, errors="replace"))
+    return json.loads(response.body.decode(response.charset, errors="replace"))
 
 
 def _clean_text(value: str) -> str:
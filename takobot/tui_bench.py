@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import contextlib
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+
+from .app import SessionState, TakoTerminalApp
+from .paths import use_workspace_root
+
+BENCH_DELTA_TEXT = "streamed token text for the bubble box "
+
+
+@dataclass
+class BenchConfig:
+    transcript_lines: int = 3000
+    stream_deltas: int = 2000
+    delta_chars: int = 24
+    inputs: int = 200
+    events: int = 5000
+    batch: int = 50
+    lag_probe_ms: float = 5.0
+    width: int = 160
+    height: int = 48
+    trace_memory: bool = False
+    timeout_s: float = 300.0
+
+
+@dataclass
+class PhaseReport:
+    name: str
+    items: int = 0
+    wall_s: float = 0.0
+    step_ms: list[float] = field(default_factory=list)
+    frame_ms: list[float] = field(default_factory=list)
+    lag_ms: list[float] = field(default_factory=list)
+    rss_kb_before: int = 0
+    rss_kb_after: int = 0
+    traced_peak_kb: int | None = None
+
+    @property
+    def step_p95_ms(self) -> float:
+        return _percentile(self.step_ms, 0.95)
+
+    @property
+    def lag_p95_ms(self) -> float:
+        return _percentile(self.lag_ms, 0.95)
+
+    def line(self) -> str:
+        per_item_us = self.wall_s / self.items * 1_000_000 if self.items else 0.0
+        traced = f" traced_peak={self.traced_peak_kb}KB" if self.traced_peak_kb is not None else ""
+        return (
+            f"{self.name}: items={self.items} wall={self.wall_s:.2f}s ({per_item_us:.0f}us/item) "
+            f"step p50={_percentile(self.step_ms, 0.5):.1f}ms p95={self.step_p95_ms:.1f}ms "
+            f"max={max(self.step_ms, default=0.0):.1f}ms | "
+            f"frames={len(self.frame_ms)} p95={_percentile(self.frame_ms, 0.95):.2f}ms "
+            f"max={max(self.frame_ms, default=0.0):.2f}ms | "
+            f"loop lag p50={_percentile(self.lag_ms, 0.5):.1f}ms p95={self.lag_p95_ms:.1f}ms "
+            f"max={max(self.lag_ms, default=0.0):.1f}ms | "
+            f"rss={self.rss_kb_after}KB ({self.rss_kb_after - self.rss_kb_before:+d}KB){traced}"
+        )
+
+
+@dataclass
+class BenchReport:
+    config: BenchConfig
+    phases: list[PhaseReport] = field(default_factory=list)
+    panel_lines: list[str] = field(default_factory=list)
+    transcript_rows: int = 0
+    wall_s: float = 0.0
+
+    def lines(self) -> list[str]:
+        return [
+            *(phase.line() for phase in self.phases),
+            *self.panel_lines,
+            f"transcript rows kept: {self.transcript_rows}",
+            f"wall: {self.wall_s:.2f}s",
+        ]
+
+    def over_budget(self, *, max_step_p95_ms: float = 0.0, max_lag_p95_ms: float = 0.0) -> list[str]:
+        failures: list[str] = []
+        for phase in self.phases:
+            if max_step_p95_ms > 0 and phase.step_p95_ms > max_step_p95_ms:
+                failures.append(f"{phase.name}: step p95 {phase.step_p95_ms:.1f}ms > {max_step_p95_ms:.1f}ms")
+            if max_lag_p95_ms > 0 and phase.lag_p95_ms > max_lag_p95_ms:
+                failures.append(f"{phase.name}: loop lag p95 {phase.lag_p95_ms:.1f}ms > {max_lag_p95_ms:.1f}ms")
+        return failures
+
+
+class _BenchApp(TakoTerminalApp):
+    """Terminal app with boot (keys, XMTP, inference discovery) replaced by an immediate ready state."""
+
+    async def _boot(self) -> None:
+        self._set_state(SessionState.RUNNING)
+
+    async def _route_input(self, text: str) -> None:
+        self._write_tako(f"ack: {text}")
+
+
+class _FrameRecorder:
+    """Collects the duration of every panel frame the app renders."""
+
+    def __init__(self, app: TakoTerminalApp) -> None:
+        self.samples_ms: list[float] = []
+        scheduler = app.panel_refresh
+        original = scheduler.record_frame
+
+        def record_frame(started_at: float) -> None:
+            self.samples_ms.append(max(0.0, time.perf_counter() - started_at) * 1000.0)
+            original(started_at)
+
+        scheduler.record_frame = record_frame  # type: ignore[method-assign]
+
+    def take(self) -> list[float]:
+        samples, self.samples_ms = self.samples_ms, []
+        return samples
+
+
+class _LagProbe:
+    """Measures how late a fixed-interval sleep wakes up, i.e. event-loop lag."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = max(0.001, interval_s)
+        self.samples_ms: list[float] = []
+
+    async def run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval_s)
+            late_s = time.perf_counter() - started_at - self.interval_s
+            self.samples_ms.append(max(0.0, late_s) * 1000.0)
+
+    def take(self) -> list[float]:
+        samples, self.samples_ms = self.samples_ms, []
+        return samples
+
+
+async def run_benchmark(config: BenchConfig, root: Path) -> BenchReport:
+    report = BenchReport(config=config)
+    if config.trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        with use_workspace_root(root):
+            app = _BenchApp(interval=3600.0)
+            async with app.run_test(size=(config.width, config.height)) as pilot:
+                await app.boot_task
+                app.event_bus.set_log_path(root / ".tako" / "state" / "events.jsonl")
+                app.type1_task = asyncio.create_task(app._type1_loop(), name="tako-type1")
+                frames = _FrameRecorder(app)
+                probe = _LagProbe(config.lag_probe_ms / 1000.0)
+                probe_task = asyncio.create_task(probe.run(), name="tako-bench-lag")
+                try:
+                    await pilot.pause()
+                    for name, count, step in _workloads(app, config):
+                        report.phases.append(
+                            await asyncio.wait_for(
+                                _run_phase(name, count, config.batch, step, pilot, frames, probe, config.trace_memory),
+                                timeout=config.timeout_s,
+                            )
+                        )
+                    inputs_phase = next((phase for phase in report.phases if phase.name == "inputs"), None)
+                    if inputs_phase is not None:
+                        drain_started = time.perf_counter()
+                        await asyncio.wait_for(app.input_queue.join(), timeout=config.timeout_s)
+                        inputs_phase.wall_s += time.perf_counter() - drain_started
+                finally:
+                    probe_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await probe_task
+                report.panel_lines = app.panel_refresh.stats.lines()
+                report.transcript_rows = len(app.transcript_row_counts)
+    finally:
+        if config.trace_memory:
+            tracemalloc.stop()
+    report.wall_s = time.perf_counter() - started
+    return report
+
+
+def _workloads(
+    app: TakoTerminalApp,
+    config: BenchConfig,
+) -> list[tuple[str, int, Callable[[int], None]]]:
+    delta = (BENCH_DELTA_TEXT * (config.delta_chars // len(BENCH_DELTA_TEXT) + 1))[: max(1, config.delta_chars)]
+
+    def transcript_step(index: int) -> None:
+        app._write_system(f"bench transcript line {index}: " + "lorem ipsum " * (1 + index % 6))
+
+    def stream_step(index: int) -> None:
+        if index == 0:
+            app._stream_begin(focus="benchmark stream")
+        app._on_inference_stream_event("delta", delta)
+        if index % 25 == 0:
+            app._on_inference_stream_event("status", f"bench status {index}")
+        if index == config.stream_deltas - 1:
+            app.stream_active = False
+            app._stream_render(force=True)
+
+    def input_step(index: int) -> None:
+        app._enqueue_local_input(f"bench input {index}")
+
+    def event_step(index: int) -> None:
+        app._record_event("bench.tick", f"synthetic event {index}", source="bench", metadata={"n": index})
+
+    return [
+        ("transcript", config.transcript_lines, transcript_step),
+        ("stream", config.stream_deltas, stream_step),
+        ("inputs", config.inputs, input_step),
+        ("events", config.events, event_step),
+    ]
+
+
+async def _run_phase(
+    name: str,
+    count: int,
+    batch: int,
+    step: Callable[[int], None],
+    pilot,
+    frames: _FrameRecorder,
+    probe: _LagProbe,
+    trace_memory: bool,
+) -> PhaseReport:
+    phase = PhaseReport(name=name, items=max(0, count), rss_kb_before=_rss_kb())
+    if trace_memory:
+        tracemalloc.reset_peak()
+    frames.take()
+    probe.take()
+    started = time.perf_counter()
+    batch = max(1, batch)
+    for offset in range(0, phase.items, batch):
+        step_started = time.perf_counter()
+        for index in range(offset, min(phase.items, offset + batch)):
+            step(index)
+        # One step = a batch of work plus waiting until the app is idle again (messages, refreshes, workers).
+        await pilot.pause()
+        phase.step_ms.append((time.perf_counter() - step_started) * 1000.0)
+    phase.wall_s = time.perf_counter() - started
+    phase.frame_ms = frames.take()
+    phase.lag_ms = probe.take()
+    phase.rss_kb_after = _rss_kb()
+    if trace_memory:
+        phase.traced_peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+    return phase
+
+
+def _rss_kb() -> int:
+    with contextlib.suppress(OSError, ValueError, IndexError):
+        pages = int(Path("/proc/self/statm").read_text(encoding="utf-8").split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    try:
+        import resource
+    except ImportError:  # Windows has no `resource` module.
+        return 0
+    # Peak rather than current RSS (kilobytes on Linux, bytes on macOS) where /proc is unavailable.
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = BenchConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m takobot.tui_bench",
+        description="Benchmark the terminal app main loop headlessly with synthetic load.",
+    )
+    parser.add_argument("--transcript-lines", type=int, default=defaults.transcript_lines)
+    parser.add_argument("--stream-deltas", type=int, default=defaults.stream_deltas)
+    parser.add_argument("--delta-chars", type=int, default=defaults.delta_chars, help="Characters per stream delta.")
+    parser.add_argument("--inputs", type=int, default=defaults.inputs, help="Queued local inputs.")
+    parser.add_argument("--events", type=int, default=defaults.events, help="Events recorded through the event bus.")
+    parser.add_argument("--batch", type=int, default=defaults.batch, help="Work items per step before the app settles.")
+    parser.add_argument("--lag-probe-ms", type=float, default=defaults.lag_probe_ms)
+    parser.add_argument("--size", default=f"{defaults.width}x{defaults.height}", help="Terminal size, e.g. 160x48.")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peaks (slower).")
+    parser.add_argument("--max-step-p95-ms", type=float, default=0.0, help="Exit 1 if any phase step p95 exceeds this.")
+    parser.add_argument("--max-lag-p95-ms", type=float, default=0.0, help="Exit 1 if any phase loop-lag p95 exceeds this.")
+    parser.add_argument("--timeout", type=float, default=defaults.timeout_s)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--keep-dir", type=Path, default=None, help="Run in (and keep) this workspace directory.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        width_text, height_text = str(args.size).lower().split("x", 1)
+        width, height = max(40, int(width_text)), max(12, int(height_text))
+    except ValueError:
+        parser.error(f"invalid --size: {args.size}")
+    config = BenchConfig(
+        transcript_lines=max(0, args.transcript_lines),
+        stream_deltas=max(0, args.stream_deltas),
+        delta_chars=max(1, args.delta_chars),
+        inputs=max(0, args.inputs),
+        events=max(0, args.events),
+        batch=max(1, args.batch),
+        lag_probe_ms=max(1.0, args.lag_probe_ms),
+        width=width,
+        height=height,
+        trace_memory=bool(args.trace_memory),
+        timeout_s=args.timeout,
+    )
+    with contextlib.ExitStack() as stack:
+        root = args.keep_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="takobot-tui-bench-")))
+        root.mkdir(parents=True, exist_ok=True)
+        report = asyncio.run(run_benchmark(config, root))
+    failures = report.over_budget(max_step_p95_ms=args.max_step_p95_ms, max_lag_p95_ms=args.max_lag_p95_ms)
+    if args.json:
+        print(json.dumps({**asdict(report), "over_budget": failures}, indent=2, sort_keys=True))
+    else:
+        print("\n".join(report.lines()))
+        for failure in failures:
+            print(f"over budget: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import time
+
+PANEL_NAMES = ("octo", "tasks", "memory", "sensors", "activity")
+
+
+@dataclass
+class PanelRenderStats:
+    requests: int = 0
+    frames: int = 0
+    renders: int = 0
+    unchanged: int = 0
+    render_s: float = 0.0
+    max_frame_s: float = 0.0
+    per_panel: dict[str, int] = field(default_factory=dict)
+
+    def lines(self) -> list[str]:
+        avg_ms = (self.render_s / self.frames * 1000.0) if self.frames else 0.0
+        coalesced = max(0, self.requests - self.frames)
+        per_panel = ", ".join(f"{name}={count}" for name, count in sorted(self.per_panel.items())) or "none"
+        return [
+            (
+                f"panel_refresh: requests={self.requests} frames={self.frames} coalesced={coalesced} "
+                f"updates={self.renders} unchanged_skipped={self.unchanged}"
+            ),
+            f"panel_render_ms: avg={avg_ms:.2f} max={self.max_frame_s * 1000.0:.2f} total={self.render_s * 1000.0:.0f}",
+            f"panel_updates: {per_panel}",
+        ]
+
+
+class PanelRefreshScheduler:
+    """Dirty-flag scheduler that coalesces TUI panel refreshes into frames.
+
+    Handlers call `mark()` with the panels whose inputs changed (no names means
+    all panels); the app's frame timer calls `take()` once per frame and
+    rebuilds only the dirty panels. `changed()` lets the renderer skip widget
+    updates whose text is identical to what is already on screen.
+    """
+
+    def __init__(self, panels: tuple[str, ...] = PANEL_NAMES) -> None:
+        self.panels = panels
+        self.stats = PanelRenderStats()
+        self._dirty: set[str] = set()
+        self._last_text: dict[str, str] = {}
+
+    @property
+    def pending(self) -> frozenset[str]:
+        return frozenset(self._dirty)
+
+    def mark(self, *panels: str) -> None:
+        self.stats.requests += 1
+        self._dirty.update(panels or self.panels)
+
+    def take(self) -> frozenset[str]:
+        dirty = frozenset(self._dirty)
+        self._dirty.clear()
+        return dirty
+
+    def changed(self, panel: str, text: str) -> bool:
+        if self._last_text.get(panel) == text:
+            self.stats.unchanged += 1
+            return False
+        self._last_text[panel] = text
+        self.stats.renders += 1
+        self.stats.per_panel[panel] = self.stats.per_panel.get(panel, 0) + 1
+        return True
+
+    def record_frame(self, started_at: float) -> None:
+        elapsed = max(0.0, time.perf_counter() - started_at)
+        self.stats.frames += 1
+        self.stats.render_s += elapsed
+        self.stats.max_frame_s = max(self.stats.max_frame_s, elapsed)
@@ -15,6 +15,7 @@ import shutil
 import socket
 import subprocess
 from typing import Any
+import weakref
 
 from .node_runtime import ensure_workspace_node_runtime
 from .paths import ensure_runtime_dirs, runtime_paths
@@ -23,9 +24,11 @@ from .xmtp_runtime import (
     XMTP_MIN_NODE_MAJOR,
     ensure_workspace_xmtp_runtime_if_needed,
     probe_xmtp_runtime as _probe_xmtp_runtime,
+    workspace_xmtp_bridge_script_path,
     workspace_xmtp_cli_path,
     workspace_xmtp_helper_script_path,
 )
+from .xmtp_bridge import XmtpBridge, XmtpBridgeUnavailable, XmtpBridgeUnsupported, bridge_request_for_cli_args, ensure_bridge_script
 
 
 XMTP_PROFILE_STATE_VERSION = 3
@@ -44,6 +47,13 @@ XMTPCMD_STREAM_TIMEOUT_S = 0.0
 _ETH_ADDRESS_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
 _INBOX_ID_RE = re.compile(r"^[a-fA-F0-9]{64}$")
 
+# Profile publishes are serialized per broadcast-state file (and per event loop);
+# targets queued while a publish is running are picked up by the next helper run.
+_PROFILE_PUBLISH_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Lock]]" = (
+    weakref.WeakKeyDictionary()
+)
+_PROFILE_PENDING_TARGETS: dict[tuple[str, str], dict[str, object]] = {}
+
 CONVERGE_PROFILE_CONTENT_TYPE: dict[str, Any] = {
     "authorityId": "converge.cv",
     "typeId": "profile",
@@ -103,6 +113,8 @@ class XmtpProfileBroadcastResult:
     self_sent: bool
     peer_sent_count: int
     errors: tuple[str, ...]
+    # Whether `target_conversation` has this payload recorded, whichever caller's helper run sent it.
+    target_published: bool = False
 
 
 @dataclass(frozen=True)
@@ -118,6 +130,14 @@ class XmtpCliConversation:
     id_hex: str
     type: str
     peer_inbox_id: str
+    last_message_id: str = ""
+    last_message_sent_at: str = ""
+
+    @property
+    def activity_marker(self) -> str:
+        if not self.last_message_id and not self.last_message_sent_at:
+            return ""
+        return f"{self.last_message_id}@{self.last_message_sent_at}"
 
     @property
     def id(self) -> bytes:
@@ -332,10 +352,20 @@ class XmtpCliConversations:
             json_expected=False,
         )
 
-    async def messages(self, conversation_id: bytes | str, *, limit: int) -> list[XmtpCliMessage]:
+    async def messages(
+        self,
+        conversation_id: bytes | str,
+        *,
+        limit: int,
+        sent_after: datetime | None = None,
+        direction: str = "ascending",
+    ) -> list[XmtpCliMessage]:
         cid = _conversation_id_text(conversation_id)
         if not cid:
             return []
+        bridge_params: dict[str, Any] = {}
+        if sent_after is not None:
+            bridge_params["sentAfterNs"] = str(_datetime_ns(sent_after) - 1)
         payload = await self._client.run_json(
             [
                 "conversation",
@@ -345,10 +375,11 @@ class XmtpCliConversations:
                 "--limit",
                 str(max(1, int(limit))),
                 "--direction",
-                "ascending",
+                "descending" if direction == "descending" else "ascending",
             ],
             timeout_s=XMTPCMD_SYNC_TIMEOUT_S,
             json_expected=False,
+            bridge_params=bridge_params,
         )
         if not isinstance(payload, list):
             return []
@@ -357,8 +388,12 @@ class XmtpCliConversations:
             if not isinstance(item, dict):
                 continue
             message = _message_from_payload(item)
-            if message is not None:
-                out.append(message)
+            if message is None:
+                continue
+            # The CLI has no server-side filter; drop older history here so callers see one contract.
+            if sent_after is not None and message.sent_at < sent_after:
+                continue
+            out.append(message)
         return out
 
     def stream_all_messages(self) -> XmtpCliMessageStream:
@@ -376,6 +411,7 @@ class XmtpCliClient:
         runtime_env: dict[str, str],
         inbox_id: str,
         address: str,
+        bridge: XmtpBridge | None = None,
     ) -> None:
         self.env_name = env_name
         self.cli_path = cli_path
@@ -387,6 +423,7 @@ class XmtpCliClient:
         self.address = address
         self.account_address = address
         self.conversations = XmtpCliConversations(self)
+        self.bridge = bridge
 
     def command_for(self, args: list[str]) -> list[str]:
         cmd = [str(self.cli_path), *args]
@@ -404,7 +441,19 @@ class XmtpCliClient:
         *,
         timeout_s: float,
         json_expected: bool = True,
+        bridge_params: dict[str, Any] | None = None,
     ) -> Any:
+        request = bridge_request_for_cli_args(args) if self.bridge is not None else None
+        if self.bridge is not None and request is not None:
+            method, params = request
+            if bridge_params:
+                params = {**params, **bridge_params}
+            try:
+                return await self.bridge.call(method, params, timeout_s=timeout_s)
+            except (XmtpBridgeUnavailable, XmtpBridgeUnsupported):
+                # The request never reached the SDK; a one-off CLI spawn is still safe.
+                pass
+
         cmd = self.command_for(args)
         proc = await asyncio.to_thread(_run_process, cmd, self.env, timeout_s)
         if proc.returncode != 0:
@@ -453,6 +502,10 @@ class XmtpCliClient:
         dm = await self.conversations.new_dm(address)
         return dm.peer_inbox_id
 
+    async def close(self) -> None:
+        if self.bridge is not None:
+            await self.bridge.close()
+
 
 def default_message() -> str:
     hostname = socket.gethostname()
@@ -500,15 +553,24 @@ async def create_client(env: str, db_root: Path, wallet_key: str, db_encryption_
     env_file = _write_xmtp_client_env(wallet_key, db_encryption_key)
     db_root.mkdir(parents=True, exist_ok=True)
     db_path = db_root / "xmtp-production.db3"
+    env_name = (env or "production").strip() or "production"
+    bridge = _create_bridge(
+        node_runtime,
+        env_name=env_name,
+        db_path=db_path,
+        wallet_key=wallet_key,
+        db_encryption_key=db_encryption_key,
+    )
 
     probe_client = XmtpCliClient(
-        env_name=(env or "production").strip() or "production",
+        env_name=env_name,
         cli_path=workspace_xmtp_cli_path(),
         env_file=env_file,
         db_path=db_path,
         runtime_env=node_runtime.env,
         inbox_id="",
         address="",
+        bridge=bridge,
     )
     payload = await probe_client.run_json(
         ["client", "info", "--json"],
@@ -517,22 +579,56 @@ async def create_client(env: str, db_root: Path, wallet_key: str, db_encryption_
     )
     info = payload.get("properties") if isinstance(payload, dict) else None
     if not isinstance(info, dict):
+        await probe_client.close()
         raise RuntimeError("xmtp client info returned unexpected payload")
     inbox_id = str(info.get("inboxId") or "").strip()
     address = str(info.get("address") or "").strip().lower()
     if not inbox_id:
+        await probe_client.close()
         raise RuntimeError("xmtp client info did not return inboxId")
     if not _looks_like_eth_address(address):
+        await probe_client.close()
         raise RuntimeError("xmtp client info did not return a valid wallet address")
 
     return XmtpCliClient(
-        env_name=(env or "production").strip() or "production",
+        env_name=env_name,
         cli_path=workspace_xmtp_cli_path(),
         env_file=env_file,
         db_path=db_path,
         runtime_env=node_runtime.env,
         inbox_id=inbox_id,
         address=address,
+        bridge=bridge,
+    )
+
+
+def _create_bridge(
+    node_runtime: object,
+    *,
+    env_name: str,
+    db_path: Path,
+    wallet_key: str,
+    db_encryption_key: str,
+) -> XmtpBridge | None:
+    node_exec = _resolve_node_exec(getattr(node_runtime, "node_bin_dir", None))
+    if not node_exec:
+        return None
+
+    def command() -> list[str]:
+        script_path = workspace_xmtp_bridge_script_path()
+        ensure_bridge_script(script_path)
+        return [node_exec, str(script_path)]
+
+    return XmtpBridge(
+        command,
+        env=dict(getattr(node_runtime, "env", {}) or {}),
+        init_params={
+            "version": XMTP_CLI_VERSION,
+            "env": env_name,
+            "walletKey": wallet_key.strip(),
+            "dbEncryptionKey": db_encryption_key.strip(),
+            "dbPath": str(db_path),
+        },
     )
 
 
@@ -741,8 +837,14 @@ def _write_profile_broadcast_state(
         "self_sent_at": self_sent_at,
         "peer_sent": dict(sorted(peer_sent.items())),
     }
+    _atomic_write_text(path, json.dumps(payload, ensure_ascii=True, indent=2, sort_keys=True) + "\n")
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=True, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def _conversation_state_key(conversation: object) -> str:
@@ -798,100 +900,134 @@ async def publish_profile_message(
 ) -> XmtpProfileBroadcastResult:
     payload_sha256 = _payload_sha256(identity_name, avatar_url)
     state_path = state_dir / XMTP_PROFILE_BROADCAST_STATE_FILE
-    previous_hash, self_sent_at, peer_sent = _read_profile_broadcast_state(state_path)
-    if previous_hash != payload_sha256:
-        self_sent_at = ""
-        peer_sent = {}
-
-    errors: list[str] = []
-    state_key_by_conversation_id: dict[str, str] = {}
-
-    dm_ids: list[str] = []
-    group_ids: list[str] = []
-
-    async def queue_conversation(conversation: object, *, label: str) -> None:
-        key = _conversation_state_key(conversation)
-        if not key:
-            errors.append(f"{label}: missing stable conversation key")
-            return
-        if key in peer_sent:
-            return
-        cid = _conversation_id_hex(conversation)
-        if not cid:
-            errors.append(f"{label}: conversation id is missing")
-            return
-        state_key_by_conversation_id[cid] = key
-        if _conversation_kind(conversation) == "group":
-            group_ids.append(cid)
-            return
-        dm_ids.append(cid)
-
-    if target_conversation is not None:
-        await queue_conversation(target_conversation, label="target-conversation")
+    batch_key = (str(state_path), payload_sha256)
+    target_id = _conversation_id_hex(target_conversation) if target_conversation is not None else ""
+    target_key = _conversation_state_key(target_conversation) if target_conversation is not None else ""
+    if target_id:
+        _PROFILE_PENDING_TARGETS.setdefault(batch_key, {})[target_id] = target_conversation
+
+    async with _profile_publish_lock(state_path):
+        # Concurrent callers queue their targets above; whoever holds the lock
+        # publishes all of them in one helper run and the rest find them recorded.
+        targets = list(_PROFILE_PENDING_TARGETS.pop(batch_key, {}).values())
+        previous_hash, self_sent_at, peer_sent = _read_profile_broadcast_state(state_path)
+        if previous_hash != payload_sha256:
+            self_sent_at = ""
+            peer_sent = {}
+
+        errors: list[str] = []
+        state_key_by_conversation_id: dict[str, str] = {}
+
+        dm_ids: list[str] = []
+        group_ids: list[str] = []
+
+        async def queue_conversation(conversation: object, *, label: str) -> None:
+            key = _conversation_state_key(conversation)
+            if not key:
+                errors.append(f"{label}: missing stable conversation key")
+                return
+            if key in peer_sent:
+                return
+            cid = _conversation_id_hex(conversation)
+            if not cid:
+                errors.append(f"{label}: conversation id is missing")
+                return
+            if cid in state_key_by_conversation_id:
+                return
+            state_key_by_conversation_id[cid] = key
+            if _conversation_kind(conversation) == "group":
+                group_ids.append(cid)
+                return
+            dm_ids.append(cid)
+
+        for conversation in targets:
+            await queue_conversation(conversation, label="target-conversation")
+
+        if include_known_groups:
+            for group in await client.conversations.list_groups():
+                await queue_conversation(group, label="group")
+
+        if include_known_dm_peers:
+            for dm in await client.conversations.list_dms():
+                peer = dm.peer_inbox_id.strip().lower()
+                if peer and peer == client.inbox_id.lower():
+                    continue
+                await queue_conversation(dm, label="dm")
+
+        send_self = include_self_dm and not bool(self_sent_at)
+        if not dm_ids and not group_ids and not send_self:
+            # Every requested conversation already has this payload; skip the Node helper.
+            return XmtpProfileBroadcastResult(
+                payload_sha256=payload_sha256,
+                self_sent=False,
+                peer_sent_count=0,
+                errors=tuple(errors[:8]),
+                target_published=bool(target_key) and target_key in peer_sent,
+            )
 
-    if include_known_groups:
-        for group in await client.conversations.list_groups():
-            await queue_conversation(group, label="group")
+        helper = await _run_profile_helper(
+            client,
+            mode="publish",
+            display_name=identity_name,
+            avatar_url=avatar_url,
+            target_conversation_id=target_id if target_id in state_key_by_conversation_id else "",
+            include_self_dm=send_self,
+            dm_conversation_ids=dm_ids,
+            group_conversation_ids=group_ids,
+        )
 
-    if include_known_dm_peers:
-        for dm in await client.conversations.list_dms():
-            peer = dm.peer_inbox_id.strip().lower()
-            if peer and peer == client.inbox_id.lower():
+        helper_errors = helper.get("errors")
+        if isinstance(helper_errors, list):
+            for item in helper_errors:
+                if isinstance(item, str) and item.strip():
+                    errors.append(item.strip())
+
+        self_sent = bool(helper.get("fallbackSelfSent"))
+        sent_ids_raw = helper.get("sentConversationIds")
+        sent_ids: set[str] = set()
+        if isinstance(sent_ids_raw, list):
+            for item in sent_ids_raw:
+                if isinstance(item, str) and item.strip():
+                    sent_ids.add(item.strip().lower())
+
+        now_stamp = datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
+        peer_sent_count = 0
+        for cid in sorted(sent_ids):
+            key = state_key_by_conversation_id.get(cid)
+            if not key:
                 continue
-            await queue_conversation(dm, label="dm")
-
-    helper_target_id = _conversation_id_hex(target_conversation) if target_conversation is not None else ""
-    helper = await _run_profile_helper(
-        client,
-        mode="publish",
-        display_name=identity_name,
-        avatar_url=avatar_url,
-        target_conversation_id=helper_target_id,
-        include_self_dm=include_self_dm and not bool(self_sent_at),
-        dm_conversation_ids=dm_ids,
-        group_conversation_ids=group_ids,
-    )
-
-    helper_errors = helper.get("errors")
-    if isinstance(helper_errors, list):
-        for item in helper_errors:
-            if isinstance(item, str) and item.strip():
-                errors.append(item.strip())
-
-    self_sent = bool(helper.get("fallbackSelfSent"))
-    sent_ids_raw = helper.get("sentConversationIds")
-    sent_ids: set[str] = set()
-    if isinstance(sent_ids_raw, list):
-        for item in sent_ids_raw:
-            if isinstance(item, str) and item.strip():
-                sent_ids.add(item.strip().lower())
-
-    now_stamp = datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
-    peer_sent_count = 0
-    for cid in sorted(sent_ids):
-        key = state_key_by_conversation_id.get(cid)
-        if not key:
-            continue
-        peer_sent[key] = now_stamp
-        peer_sent_count += 1
+            peer_sent[key] = now_stamp
+            peer_sent_count += 1
 
-    if self_sent:
-        self_sent_at = now_stamp
+        if self_sent:
+            self_sent_at = now_stamp
 
-    _write_profile_broadcast_state(
-        state_path,
-        payload_sha256=payload_sha256,
-        self_sent_at=self_sent_at,
-        peer_sent=peer_sent,
-    )
+        _write_profile_broadcast_state(
+            state_path,
+            payload_sha256=payload_sha256,
+            self_sent_at=self_sent_at,
+            peer_sent=peer_sent,
+        )
     return XmtpProfileBroadcastResult(
         payload_sha256=payload_sha256,
         self_sent=self_sent,
         peer_sent_count=peer_sent_count,
         errors=tuple(errors[:8]),
+        target_published=bool(target_key) and target_key in peer_sent,
     )
 
 
+def _profile_publish_lock(state_path: Path) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    locks = _PROFILE_PUBLISH_LOCKS.setdefault(loop, {})
+    key = str(state_path)
+    lock = locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        locks[key] = lock
+    return lock
+
+
 def _write_profile_state(
     state_path: Path,
     *,
@@ -928,8 +1064,7 @@ def _write_profile_state(
         "fallback_peer_sent_count": fallback_peer_sent_count,
         "errors": list(errors),
     }
-    state_path.parent.mkdir(parents=True, exist_ok=True)
-    state_path.write_text(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=True) + "\n", encoding="utf-8")
+    _atomic_write_text(state_path, json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=True) + "\n")
 
 
 async def sync_identity_profile(
@@ -1043,8 +1178,11 @@ async def send_dm(
     db_encryption_key: str,
 ) -> None:
     client = await create_client(env, db_root, wallet_key, db_encryption_key)
-    dm = await client.conversations.new_dm(recipient)
-    await dm.send(message)
+    try:
+        dm = await client.conversations.new_dm(recipient)
+        await dm.send(message)
+    finally:
+        await close_client(client)
 
 
 def send_dm_sync(
@@ -1068,11 +1206,16 @@ def _conversation_from_payload(client: XmtpCliClient, payload: Any) -> XmtpCliCo
     if kind not in {"dm", "group"}:
         kind = "dm" if isinstance(payload.get("peerInboxId"), str) else "group"
     peer = str(payload.get("peerInboxId") or "").strip().lower()
+    last_message = payload.get("lastMessage")
+    if not isinstance(last_message, dict):
+        last_message = {}
     return XmtpCliConversation(
         _client=client,
         id_hex=cid,
         type=kind,
         peer_inbox_id=peer,
+        last_message_id=str(last_message.get("id") or "").strip().lower(),
+        last_message_sent_at=str(last_message.get("sentAt") or "").strip(),
     )
 
 
@@ -1146,6 +1289,13 @@ def _parse_sent_at(value: str) -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+def _datetime_ns(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1_000
+
+
 def _conversation_id_text(value: bytes | str) -> str:
     if isinstance(value, bytes):
         return value.hex()
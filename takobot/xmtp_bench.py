@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import contextlib
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from .cli import (
+    STREAM_ERROR_BURST_THRESHOLD,
+    STREAM_POLL_INTERVAL_S,
+    STREAM_POLL_STABLE_CYCLES,
+    XMTP_CLIENT_REBUILD_COOLDOWN_S,
+    XMTP_STREAM_CRASH_REBUILD_THRESHOLD,
+    XmtpTransportSettings,
+    XmtpTransportStats,
+    _is_retryable_xmtp_error,
+    _message_conversation_key,
+    _run_xmtp_transport,
+)
+from .seen_ids import SeenIdStore
+from .xmtp import XmtpCliClient
+from .xmtp_dispatch import ConversationDispatcher
+from .xmtp_fake import FAKE_XMTP_SELF_ADDRESS, FAKE_XMTP_SELF_INBOX, FakeXmtpConfig, FakeXmtpNetwork
+from .xmtp_outbox import XmtpOutbox
+from .xmtp_poll import XmtpPollCursors
+
+
+@dataclass
+class BenchConfig:
+    messages: int = 60
+    conversations: int = 4
+    rate_per_s: float = 20.0
+    latency_ms: float = 5.0
+    latency_jitter_ms: float = 5.0
+    error_rate: float = 0.0
+    stream_crash_after: int = 0
+    history_messages: int = 0
+    poll_interval_s: float = STREAM_POLL_INTERVAL_S
+    poll_stable_cycles: int = STREAM_POLL_STABLE_CYCLES
+    error_burst_threshold: int = STREAM_ERROR_BURST_THRESHOLD
+    rebuild_threshold: int = XMTP_STREAM_CRASH_REBUILD_THRESHOLD
+    rebuild_cooldown_s: float = XMTP_CLIENT_REBUILD_COOLDOWN_S
+    reconnect_scale: float = 1.0
+    warmup_s: float = 0.5
+    timeout_s: float = 120.0
+
+
+@dataclass
+class BenchReport:
+    config: BenchConfig
+    injected: int = 0
+    replied: int = 0
+    duplicates: int = 0
+    history_replies: int = 0
+    wall_s: float = 0.0
+    latency_p50_s: float = 0.0
+    latency_p95_s: float = 0.0
+    latency_max_s: float = 0.0
+    cpu_daemon_ms_per_message: float = 0.0
+    cpu_total_ms_per_message: float = 0.0
+    cli_calls: dict[str, int] = field(default_factory=dict)
+    stream_crashes: int = 0
+    stream_error_bursts: int = 0
+    client_rebuilds: int = 0
+    poll_cycles: int = 0
+    recovery_s: list[float] = field(default_factory=list)
+    send_retries: int = 0
+
+    @property
+    def lost(self) -> int:
+        return max(0, self.injected - self.replied)
+
+    def lines(self) -> list[str]:
+        per_message = sum(self.cli_calls.values()) / self.replied if self.replied else 0.0
+        recovery_avg = statistics.fmean(self.recovery_s) if self.recovery_s else 0.0
+        recovery_max = max(self.recovery_s) if self.recovery_s else 0.0
+        calls = " ".join(f"{name}={count}" for name, count in sorted(self.cli_calls.items()))
+        return [
+            (
+                f"messages: injected={self.injected} replied={self.replied} lost={self.lost} "
+                f"duplicates={self.duplicates} history_replies={self.history_replies}"
+            ),
+            f"wall: {self.wall_s:.2f}s",
+            (
+                f"reply latency: p50={self.latency_p50_s * 1000:.0f}ms "
+                f"p95={self.latency_p95_s * 1000:.0f}ms max={self.latency_max_s * 1000:.0f}ms"
+            ),
+            (
+                f"cpu per message: daemon={self.cpu_daemon_ms_per_message:.1f}ms "
+                f"total={self.cpu_total_ms_per_message:.1f}ms (incl. CLI processes)"
+            ),
+            f"cli calls: {per_message:.2f}/message ({calls or 'none'})",
+            (
+                f"stream: crashes={self.stream_crashes} error_bursts={self.stream_error_bursts} "
+                f"rebuilds={self.client_rebuilds} poll_cycles={self.poll_cycles} "
+                f"recovery_avg={recovery_avg:.2f}s recovery_max={recovery_max:.2f}s"
+            ),
+            f"send retries: {self.send_retries}",
+        ]
+
+
+class _TransportLoop:
+    """Drives the daemon's `_run_xmtp_transport` against a fake network, with a bench-side handler."""
+
+    def __init__(self, network: FakeXmtpNetwork, config: BenchConfig, report: BenchReport) -> None:
+        self.network = network
+        self.config = config
+        self.report = report
+        self.client = self._new_client()
+        self.seen = SeenIdStore(capacity=max(1_000, (config.messages + config.history_messages) * 4))
+        self.cursors = XmtpPollCursors()
+        self.conversations: dict[str, object] = {}
+        self.stats = XmtpTransportStats()
+        self.settings = XmtpTransportSettings(
+            poll_interval_s=config.poll_interval_s,
+            poll_stable_cycles=config.poll_stable_cycles,
+            error_burst_threshold=config.error_burst_threshold,
+            stream_crash_rebuild_threshold=config.rebuild_threshold,
+            rebuild_cooldown_s=config.rebuild_cooldown_s,
+            reconnect_scale=config.reconnect_scale,
+        )
+        self.recovered_at = 0.0
+        self.history: set[str] = set()
+        self.replies: Counter[str] = Counter()
+        self.done = asyncio.Event()
+        self.outbox = XmtpOutbox(self._send, is_retryable=_is_retryable_xmtp_error)
+        self.dispatcher = ConversationDispatcher(self._handle, key_fn=_message_conversation_key)
+
+    def _new_client(self) -> XmtpCliClient:
+        root = self.network.root
+        return XmtpCliClient(
+            env_name="dev",
+            cli_path=self.network.cli_path,
+            env_file=root / ".env",
+            db_path=root / "db",
+            runtime_env=self.network.env(),
+            inbox_id=FAKE_XMTP_SELF_INBOX,
+            address=FAKE_XMTP_SELF_ADDRESS,
+        )
+
+    async def _rebuild(self, _stale_client: object) -> XmtpCliClient:
+        self.client = self._new_client()
+        self.conversations.clear()
+        return self.client
+
+    async def _send(self, conversation_id: str, text: str, _conversation: object) -> object:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            conversation = await self.client.conversations.get_conversation_by_id(conversation_id)
+            if conversation is None:
+                raise RuntimeError(f"conversation not found: {conversation_id[:12]}")
+            self.conversations[conversation_id] = conversation
+        return await conversation.send(text)
+
+    async def _handle(self, item: Any) -> None:
+        failed_at = self.stats.last_stream_failure_at
+        if failed_at > self.recovered_at:
+            self.report.recovery_s.append(time.monotonic() - failed_at)
+            self.recovered_at = failed_at
+        content = str(getattr(item, "content", "") or "")
+        if content in self.history:
+            # History present before startup must be primed as seen, never answered.
+            self.report.history_replies += 1
+            return
+        self.replies[content] += 1
+        if self.replies[content] > 1:
+            self.report.duplicates += 1
+            return
+        await self.outbox.send(bytes(item.conversation_id).hex(), f"re: {content}")
+        if sum(1 for count in self.replies.values() if count) >= self.config.messages:
+            self.done.set()
+
+    async def run(self) -> None:
+        await _run_xmtp_transport(
+            self.client,
+            seen=self.seen,
+            cursors=self.cursors,
+            submit=self.dispatcher.submit,
+            rebuild=self._rebuild,
+            settings=self.settings,
+            stats=self.stats,
+        )
+
+
+async def run_benchmark(config: BenchConfig, root: Path) -> BenchReport:
+    network = FakeXmtpNetwork(
+        root,
+        FakeXmtpConfig(
+            conversations=config.conversations,
+            latency_ms=config.latency_ms,
+            latency_jitter_ms=config.latency_jitter_ms,
+            error_rate=config.error_rate,
+            stream_crash_after=config.stream_crash_after,
+        ),
+    )
+    report = BenchReport(config=config)
+    loop = _TransportLoop(network, config, report)
+    injected: dict[str, float] = {}
+    for idx in range(config.history_messages):
+        loop.history.add(str(network.inject(idx, f"history message {idx}")["content"]))
+
+    async def generate() -> None:
+        await asyncio.sleep(config.warmup_s)
+        interval = 1.0 / config.rate_per_s if config.rate_per_s > 0 else 0.0
+        for idx in range(config.messages):
+            record = network.inject(idx, f"bench message {idx}")
+            injected[record["content"]] = float(record["sentAtEpoch"])
+            report.injected += 1
+            if interval:
+                await asyncio.sleep(interval)
+
+    self_cpu_start, children_cpu_start = _cpu_times()
+    started = time.monotonic()
+    transport = asyncio.create_task(loop.run())
+    generator = asyncio.create_task(generate())
+    try:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(loop.done.wait(), timeout=config.timeout_s)
+        with contextlib.suppress(Exception):
+            await loop.dispatcher.join()
+    finally:
+        for task in (generator, transport):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        await loop.dispatcher.close()
+        await loop.outbox.close(timeout_s=5.0)
+    report.wall_s = time.monotonic() - started
+    self_cpu_end, children_cpu_end = _cpu_times()
+    daemon_cpu = self_cpu_end - self_cpu_start
+    children_cpu = children_cpu_end - children_cpu_start
+
+    latencies: list[float] = []
+    for record in network.sent():
+        content = str(record.get("content") or "")
+        if not content.startswith("re: "):
+            continue
+        sent_at = injected.get(content[len("re: ") :])
+        if sent_at is not None:
+            latencies.append(float(record.get("at") or 0.0) - sent_at)
+    report.replied = len(latencies)
+    if latencies:
+        latencies.sort()
+        report.latency_p50_s = statistics.median(latencies)
+        report.latency_p95_s = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+        report.latency_max_s = latencies[-1]
+        report.cpu_daemon_ms_per_message = daemon_cpu * 1000 / len(latencies)
+        report.cpu_total_ms_per_message = (daemon_cpu + children_cpu) * 1000 / len(latencies)
+    report.cli_calls = dict(Counter(str(call.get("command") or "") for call in network.calls()))
+    report.send_retries = loop.outbox.stats.retries
+    report.stream_crashes = loop.stats.stream_crashes
+    report.stream_error_bursts = loop.stats.stream_error_bursts
+    report.client_rebuilds = loop.stats.client_rebuilds
+    report.poll_cycles = loop.stats.poll_cycles
+    return report
+
+
+def _cpu_times() -> tuple[float, float]:
+    """User+system CPU seconds of this process and of its reaped children (CLI processes)."""
+    try:
+        import resource
+    except ImportError:  # Windows has no `resource` module; child CPU is not reported there.
+        return time.process_time(), 0.0
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage_self.ru_utime + usage_self.ru_stime, usage_children.ru_utime + usage_children.ru_stime
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = BenchConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m takobot.xmtp_bench",
+        description="Benchmark the XMTP transport loop against a local fake XMTP CLI.",
+    )
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--conversations", type=int, default=defaults.conversations)
+    parser.add_argument("--rate", type=float, default=defaults.rate_per_s, help="Inbound messages per second.")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Added latency per CLI call.")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.latency_jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Transient failure rate per CLI call.")
+    parser.add_argument("--crash-after", type=int, default=defaults.stream_crash_after, help="Crash each stream after N messages.")
+    parser.add_argument("--history", type=int, default=defaults.history_messages, help="Messages already in conversations at startup.")
+    parser.add_argument("--poll-interval", type=float, default=defaults.poll_interval_s)
+    parser.add_argument("--poll-stable-cycles", type=int, default=defaults.poll_stable_cycles)
+    parser.add_argument("--reconnect-scale", type=float, default=defaults.reconnect_scale, help="Multiplier for stream reconnect delays.")
+    parser.add_argument("--timeout", type=float, default=defaults.timeout_s)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--keep-dir", type=Path, default=None, help="Keep fake network state in this directory.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = BenchConfig(
+        messages=max(1, args.messages),
+        conversations=max(1, args.conversations),
+        rate_per_s=args.rate,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        stream_crash_after=max(0, args.crash_after),
+        history_messages=max(0, args.history),
+        poll_interval_s=args.poll_interval,
+        poll_stable_cycles=max(1, args.poll_stable_cycles),
+        reconnect_scale=max(0.0, args.reconnect_scale),
+        timeout_s=args.timeout,
+    )
+    with contextlib.ExitStack() as stack:
+        root = args.keep_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="takobot-xmtp-bench-")))
+        report = asyncio.run(run_benchmark(config, root))
+    if args.json:
+        print(json.dumps({**asdict(report), "lost": report.lost}, indent=2, sort_keys=True))
+    else:
+        print("\n".join(report.lines()))
+    return 0 if report.lost == 0 and report.history_replies == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,549 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+XMTP_BRIDGE_START_TIMEOUT_S = 60.0
+XMTP_BRIDGE_RESTART_BACKOFF_S = 1.0
+XMTP_BRIDGE_FAILURE_THRESHOLD = 3
+XMTP_BRIDGE_COOLDOWN_S = 300.0
+XMTP_BRIDGE_MAX_LINE_BYTES = 16_000_000
+XMTP_BRIDGE_METHOD_NOT_FOUND = -32601
+
+
+class XmtpBridgeError(RuntimeError):
+    """A bridge call failed after it was handed to the bridge process."""
+
+
+class XmtpBridgeUnavailable(XmtpBridgeError):
+    """The bridge could not be started; the request was never sent."""
+
+
+class XmtpBridgeUnsupported(XmtpBridgeError):
+    """The bridge does not implement the requested method."""
+
+
+class XmtpBridge:
+    """Long-lived helper process speaking line-delimited JSON-RPC over stdio.
+
+    One process holds the XMTP client (and its encrypted database) open for the
+    whole daemon session. Requests carry integer ids so several calls can be in
+    flight at once; a reader task resolves them as responses arrive in any
+    order. If the process exits, in-flight calls fail and the next call starts a
+    fresh process and re-sends `initialize`. Calls never wait on a restart:
+    during the restart backoff, and for `cooldown_s` after `failure_threshold`
+    consecutive failed starts, they raise `XmtpBridgeUnavailable` at once so
+    the caller falls back to a one-off CLI spawn.
+    """
+
+    def __init__(
+        self,
+        command_factory: Callable[[], list[str]],
+        *,
+        env: dict[str, str] | None = None,
+        init_params: dict[str, Any] | None = None,
+        start_timeout_s: float = XMTP_BRIDGE_START_TIMEOUT_S,
+        restart_backoff_s: float = XMTP_BRIDGE_RESTART_BACKOFF_S,
+        failure_threshold: int = XMTP_BRIDGE_FAILURE_THRESHOLD,
+        cooldown_s: float = XMTP_BRIDGE_COOLDOWN_S,
+    ) -> None:
+        self.command_factory = command_factory
+        self.env = dict(env) if env is not None else None
+        self.init_params = dict(init_params or {})
+        self.start_timeout_s = max(1.0, float(start_timeout_s))
+        self.restart_backoff_s = max(0.0, float(restart_backoff_s))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_s = max(0.0, float(cooldown_s))
+        self.starts = 0
+        self.crashes = 0
+        self.start_failures = 0
+        self.disabled_until = 0.0
+        self.init_result: Any = None
+        self._proc: asyncio.subprocess.Process | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
+        self._stderr_tail: list[str] = []
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._ids = itertools.count(1)
+        self._start_lock: asyncio.Lock | None = None
+        self._write_lock: asyncio.Lock | None = None
+        self._last_exit_at = 0.0
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def call(self, method: str, params: dict[str, Any] | None = None, *, timeout_s: float) -> Any:
+        await self._ensure_started()
+        return await self._request(method, params or {}, timeout_s=timeout_s)
+
+    async def close(self) -> None:
+        self._closed = True
+        proc = self._proc
+        self._proc = None
+        if proc is not None:
+            if proc.stdin is not None:
+                with contextlib.suppress(Exception):
+                    proc.stdin.close()
+            if proc.returncode is None:
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(proc.wait(), timeout=2.0)
+            if proc.returncode is None:
+                with contextlib.suppress(Exception):
+                    proc.terminate()
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(proc.wait(), timeout=2.0)
+            if proc.returncode is None:
+                with contextlib.suppress(Exception):
+                    proc.kill()
+                with contextlib.suppress(Exception):
+                    await proc.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None:
+                with contextlib.suppress(Exception):
+                    await task
+        self._reader_task = None
+        self._stderr_task = None
+        self._fail_pending(XmtpBridgeError("xmtp bridge closed"))
+
+    async def _ensure_started(self) -> None:
+        if self._closed:
+            raise XmtpBridgeUnavailable("xmtp bridge is closed")
+        if self.running:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.running:
+                return
+            now = time.monotonic()
+            if now < self.disabled_until:
+                remaining_s = self.disabled_until - now
+                raise XmtpBridgeUnavailable(f"xmtp bridge disabled for {remaining_s:.0f}s after failed starts")
+            if self._last_exit_at and now - self._last_exit_at < self.restart_backoff_s:
+                raise XmtpBridgeUnavailable("xmtp bridge is restarting")
+            try:
+                command = await asyncio.to_thread(self.command_factory)
+                self._proc = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self.env,
+                    limit=XMTP_BRIDGE_MAX_LINE_BYTES,
+                )
+            except Exception as exc:  # noqa: BLE001
+                self._proc = None
+                self._record_start_failure()
+                raise XmtpBridgeUnavailable(f"xmtp bridge failed to start: {exc}") from exc
+            self.starts += 1
+            self._stderr_tail = []
+            self._reader_task = asyncio.create_task(self._read_stdout(self._proc))
+            self._stderr_task = asyncio.create_task(self._drain_stderr(self._proc))
+            try:
+                self.init_result = await self._request("initialize", self.init_params, timeout_s=self.start_timeout_s)
+            except XmtpBridgeError as exc:
+                await self._terminate()
+                self._record_start_failure()
+                raise XmtpBridgeUnavailable(str(exc)) from exc
+            self.start_failures = 0
+
+    def _record_start_failure(self) -> None:
+        self._last_exit_at = time.monotonic()
+        self.start_failures += 1
+        if self.start_failures >= self.failure_threshold:
+            self.start_failures = 0
+            self.disabled_until = self._last_exit_at + self.cooldown_s
+
+    async def _request(self, method: str, params: dict[str, Any], *, timeout_s: float) -> Any:
+        proc = self._proc
+        if proc is None or proc.stdin is None or proc.returncode is not None:
+            raise XmtpBridgeUnavailable("xmtp bridge is not running")
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        request_id = next(self._ids)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        line = json.dumps(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params},
+            ensure_ascii=True,
+            separators=(",", ":"),
+        )
+        try:
+            async with self._write_lock:
+                proc.stdin.write(line.encode("utf-8") + b"\n")
+                await proc.stdin.drain()
+        except Exception as exc:  # noqa: BLE001
+            self._pending.pop(request_id, None)
+            raise XmtpBridgeUnavailable(f"xmtp bridge write failed: {exc}") from exc
+        timeout = None if timeout_s <= 0 else float(timeout_s)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError as exc:
+            raise XmtpBridgeError(f"xmtp bridge call timed out: {method}") from exc
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_stdout(self, proc: asyncio.subprocess.Process) -> None:
+        assert proc.stdout is not None
+        while True:
+            try:
+                chunk = await proc.stdout.readline()
+            except Exception:  # noqa: BLE001
+                break
+            if not chunk:
+                break
+            payload = _parse_response(chunk)
+            if payload is None:
+                continue
+            future = self._pending.get(payload.get("id"))  # type: ignore[arg-type]
+            if future is None or future.done():
+                continue
+            error = payload.get("error")
+            if isinstance(error, dict):
+                message = str(error.get("message") or "bridge error").strip()
+                if error.get("code") == XMTP_BRIDGE_METHOD_NOT_FOUND:
+                    future.set_exception(XmtpBridgeUnsupported(message))
+                else:
+                    future.set_exception(XmtpBridgeError(f"xmtp bridge error: {_summarize(message)}"))
+            else:
+                future.set_result(payload.get("result"))
+
+        with contextlib.suppress(Exception):
+            await proc.wait()
+        if self._proc is proc:
+            self._proc = None
+        self._last_exit_at = time.monotonic()
+        if not self._closed:
+            self.crashes += 1
+        detail = "\n".join(self._stderr_tail[-6:]).strip() or f"exit={proc.returncode}"
+        self._fail_pending(XmtpBridgeError(f"xmtp bridge exited: {_summarize(detail)}"))
+
+    async def _drain_stderr(self, proc: asyncio.subprocess.Process) -> None:
+        if proc.stderr is None:
+            return
+        while True:
+            try:
+                chunk = await proc.stderr.readline()
+            except Exception:  # noqa: BLE001
+                return
+            if not chunk:
+                return
+            line = chunk.decode("utf-8", errors="replace").strip()
+            if line:
+                self._stderr_tail.append(line)
+                del self._stderr_tail[:-40]
+
+    async def _terminate(self) -> None:
+        proc = self._proc
+        if proc is None:
+            return
+        with contextlib.suppress(Exception):
+            proc.kill()
+        with contextlib.suppress(Exception):
+            await proc.wait()
+
+    def _fail_pending(self, error: Exception) -> None:
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+
+def bridge_request_for_cli_args(args: list[str]) -> tuple[str, dict[str, Any]] | None:
+    """Map an `xmtp` CLI argv onto the equivalent bridge method, if there is one."""
+    if list(args[:2]) == ["conversation", "send-text"] and len(args) >= 4:
+        # Message text is free-form and may itself look like a flag.
+        return "conversation.sendText", {"id": str(args[2]), "text": str(args[3])}
+    positional: list[str] = []
+    options: dict[str, str] = {}
+    flags: set[str] = set()
+    idx = 0
+    while idx < len(args):
+        token = str(args[idx])
+        if token in {"--limit", "--direction", "--type"} and idx + 1 < len(args):
+            options[token[2:]] = str(args[idx + 1])
+            idx += 2
+            continue
+        if token.startswith("--"):
+            flags.add(token[2:])
+        else:
+            positional.append(token)
+        idx += 1
+
+    head = tuple(positional[:2])
+    rest = positional[2:]
+    if head == ("client", "info"):
+        return "client.info", {}
+    if head == ("conversations", "get") and rest:
+        return "conversations.get", {"id": rest[0]}
+    if head == ("conversations", "list"):
+        return "conversations.list", {"sync": "sync" in flags, "type": options.get("type", "")}
+    if head == ("conversations", "sync-all"):
+        return "conversations.syncAll", {}
+    if head == ("conversations", "create-dm") and rest:
+        return "conversations.createDm", {"target": rest[0]}
+    if head == ("conversation", "messages") and rest:
+        try:
+            limit = max(1, int(options.get("limit", "50")))
+        except ValueError:
+            limit = 50
+        return "conversation.messages", {
+            "id": rest[0],
+            "limit": limit,
+            "direction": options.get("direction", "ascending"),
+        }
+    if positional[:1] == ["inbox-states"] and len(positional) >= 2:
+        return "inboxStates", {"inboxIds": positional[1:]}
+    return None
+
+
+def _parse_response(chunk: bytes) -> dict[str, Any] | None:
+    text = chunk.decode("utf-8", errors="replace").strip()
+    if not text.startswith("{"):
+        return None
+    with contextlib.suppress(Exception):
+        payload = json.loads(text)
+        if isinstance(payload, dict) and isinstance(payload.get("id"), int):
+            return payload
+    return None
+
+
+def _summarize(value: str, limit: int = 220) -> str:
+    text = " ".join((value or "").split())
+    if not text:
+        return "no details available"
+    if len(text) <= limit:
+        return text
+    return text[: limit - 3] + "..."
+
+
+def ensure_bridge_script(path: Path) -> None:
+    """Write the bundled Node bridge script to `path` when it is missing or stale."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        current = path.read_text(encoding="utf-8")
+    except Exception:  # noqa: BLE001
+        current = ""
+    if current != XMTP_BRIDGE_SCRIPT:
+        path.write_text(XMTP_BRIDGE_SCRIPT, encoding="utf-8")
+    with contextlib.suppress(Exception):
+        path.chmod(0o700)
+
+
+XMTP_BRIDGE_SCRIPT = r'''#!/usr/bin/env node
+import readline from "node:readline";
+import { Client } from "@xmtp/node-sdk";
+import { isHex, toBytes } from "viem";
+import { privateKeyToAccount } from "viem/accounts";
+
+let client = null;
+
+function normalizeHex(input) {
+  const raw = String(input || "").trim();
+  if (!raw) return "";
+  return raw.startsWith("0x") ? raw : `0x${raw}`;
+}
+
+function createSigner(walletKey) {
+  const hex = normalizeHex(walletKey);
+  if (!isHex(hex, { strict: true })) {
+    throw new Error("walletKey is not valid hex");
+  }
+  const account = privateKeyToAccount(hex);
+  return {
+    type: "EOA",
+    getIdentifier: () => ({
+      identifierKind: 0,
+      identifier: account.address.toLowerCase(),
+    }),
+    signMessage: async (message) => {
+      const signature = await account.signMessage({ message });
+      return toBytes(signature);
+    },
+  };
+}
+
+function hexToBytes(value) {
+  const hex = normalizeHex(value);
+  if (!isHex(hex, { strict: true })) {
+    throw new Error("dbEncryptionKey is not valid hex");
+  }
+  return toBytes(hex);
+}
+
+function write(payload) {
+  process.stdout.write(
+    JSON.stringify(payload, (_key, value) => (typeof value === "bigint" ? value.toString() : value)) + "\n",
+  );
+}
+
+function requireClient() {
+  if (!client) throw new Error("bridge not initialized");
+  return client;
+}
+
+async function maybeArray(value) {
+  const out = await Promise.resolve(value);
+  if (Array.isArray(out)) return out;
+  if (out && typeof out[Symbol.iterator] === "function") return Array.from(out);
+  return [];
+}
+
+async function peerInboxId(conversation) {
+  const value = conversation.peerInboxId;
+  if (typeof value === "function") return String((await value.call(conversation)) || "");
+  return typeof value === "string" ? value : "";
+}
+
+async function conversationPayload(conversation) {
+  const peer = await peerInboxId(conversation);
+  const payload = peer ? { id: conversation.id, type: "dm", peerInboxId: peer } : { id: conversation.id, type: "group" };
+  if (typeof conversation.lastMessage === "function") {
+    const last = await conversation.lastMessage();
+    if (last) payload.lastMessage = { id: last.id, sentAt: messagePayload(last).sentAt };
+  }
+  return payload;
+}
+
+function messagePayload(message) {
+  let sentAt = "";
+  if (message.sentAt instanceof Date) {
+    sentAt = message.sentAt.toISOString();
+  } else if (message.sentAtNs !== undefined) {
+    sentAt = new Date(Number(BigInt(message.sentAtNs) / 1000000n)).toISOString();
+  }
+  const type = message.contentType || null;
+  return {
+    id: message.id,
+    conversationId: message.conversationId,
+    senderInboxId: message.senderInboxId,
+    content: typeof message.content === "string" ? message.content : null,
+    contentType: type
+      ? {
+          authorityId: type.authorityId,
+          typeId: type.typeId,
+          versionMajor: type.versionMajor,
+          versionMinor: type.versionMinor,
+        }
+      : null,
+    sentAt,
+  };
+}
+
+async function getConversation(id) {
+  const conversation = await requireClient().conversations.getConversationById(String(id || ""));
+  if (!conversation) throw new Error(`conversation not found: ${id}`);
+  return conversation;
+}
+
+const methods = {
+  async initialize(params) {
+    if (!client) {
+      client = await Client.create(createSigner(params.walletKey || ""), {
+        env: String(params.env || "production"),
+        dbPath: String(params.dbPath || "").trim(),
+        dbEncryptionKey: hexToBytes(params.dbEncryptionKey || ""),
+        appVersion: `takobot-xmtp-bridge/${String(params.version || "dev")}`,
+      });
+    }
+    return { inboxId: client.inboxId, address: client.accountIdentifier?.identifier || "" };
+  },
+  async "client.info"() {
+    const current = requireClient();
+    return { properties: { inboxId: current.inboxId, address: current.accountIdentifier?.identifier || "" } };
+  },
+  async "conversations.get"(params) {
+    return conversationPayload(await getConversation(params.id));
+  },
+  async "conversations.list"(params) {
+    const conversations = requireClient().conversations;
+    if (params.sync) await conversations.sync();
+    let items;
+    if (params.type === "dm") items = await maybeArray(conversations.listDms());
+    else if (params.type === "group") items = await maybeArray(conversations.listGroups());
+    else items = await maybeArray(conversations.list());
+    return Promise.all(items.map(conversationPayload));
+  },
+  async "conversations.syncAll"() {
+    await requireClient().conversations.syncAll();
+    return {};
+  },
+  async "conversations.createDm"(params) {
+    const conversations = requireClient().conversations;
+    const target = String(params.target || "").trim();
+    let dm;
+    if (/^0x[0-9a-fA-F]{40}$/.test(target)) {
+      const identifier = { identifier: target.toLowerCase(), identifierKind: 0 };
+      dm = typeof conversations.newDmWithIdentifier === "function"
+        ? await conversations.newDmWithIdentifier(identifier)
+        : await conversations.createDmWithIdentifier(identifier);
+    } else {
+      dm = typeof conversations.newDm === "function"
+        ? await conversations.newDm(target)
+        : await conversations.createDm(target);
+    }
+    return conversationPayload(dm);
+  },
+  async "conversation.sendText"(params) {
+    const conversation = await getConversation(params.id);
+    const text = String(params.text || "");
+    const messageId = typeof conversation.sendText === "function"
+      ? await conversation.sendText(text)
+      : await conversation.send(text);
+    return { messageId };
+  },
+  async "conversation.messages"(params) {
+    const conversation = await getConversation(params.id);
+    if (typeof conversation.sync === "function") await conversation.sync();
+    const direction = String(params.direction || "ascending") === "descending" ? 1 : 0;
+    const options = { limit: Number(params.limit || 50), direction };
+    if (params.sentAfterNs) options.sentAfterNs = BigInt(String(params.sentAfterNs));
+    const items = await maybeArray(conversation.messages(options));
+    return items.map(messagePayload);
+  },
+  async inboxStates(params) {
+    const ids = Array.isArray(params.inboxIds) ? params.inboxIds.map(String) : [];
+    return maybeArray(requireClient().preferences.inboxStateFromInboxIds(ids, true));
+  },
+};
+
+async function handle(request) {
+  const id = request && typeof request.id === "number" ? request.id : null;
+  const method = methods[String(request && request.method)];
+  if (!method) {
+    return { jsonrpc: "2.0", id, error: { code: -32601, message: `method not found: ${request && request.method}` } };
+  }
+  try {
+    return { jsonrpc: "2.0", id, result: await method(request.params || {}) };
+  } catch (error) {
+    return { jsonrpc: "2.0", id, error: { code: -32000, message: String(error && error.message ? error.message : error) } };
+  }
+}
+
+const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+lines.on("line", (line) => {
+  const text = line.trim();
+  if (!text) return;
+  let request;
+  try {
+    request = JSON.parse(text);
+  } catch (error) {
+    write({ jsonrpc: "2.0", id: null, error: { code: -32700, message: "parse error" } });
+    return;
+  }
+  handle(request).then(write);
+});
+lines.on("close", () => process.exit(0));
+'''
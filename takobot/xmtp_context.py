@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import base64
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .config import XmtpConfig, load_tako_toml
+from .operator import get_operator_inbox_id, load_operator
+
+XMTP_CONTEXT_MAX_CONVERSATIONS = 256
+
+_Fingerprint = tuple[int, int] | None
+
+
+@dataclass
+class ContextCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def summary(self) -> str:
+        return f"context_cache hits={self.hits} misses={self.misses} invalidations={self.invalidations}"
+
+
+class XmtpContextCache:
+    """Per-daemon cache of the conversation and identity context a reply needs.
+
+    Inbound handling used to re-fetch the conversation, re-read `operator.json`,
+    re-derive the identity name, re-encode the avatar and re-run the profile
+    broadcast helper (and re-parse `tako.toml` for the `[xmtp]` settings) for
+    every message. Those values only change on profile
+    sync, pairing changes and identity renames, which call the matching
+    `invalidate_*` method. File-backed entries also carry an `(mtime_ns, size)`
+    fingerprint so edits made by another process are picked up on the next
+    message for the price of a `stat()`.
+    """
+
+    def __init__(
+        self,
+        *,
+        operator_path: Path,
+        avatar_path: Path,
+        identity_loader: Callable[[], str],
+        identity_paths: Iterable[Path] = (),
+        config_path: Path | None = None,
+        max_conversations: int = XMTP_CONTEXT_MAX_CONVERSATIONS,
+    ) -> None:
+        self.operator_path = operator_path
+        self.avatar_path = avatar_path
+        self.identity_loader = identity_loader
+        self.identity_paths = tuple(identity_paths)
+        self.config_path = config_path
+        self.max_conversations = max(1, int(max_conversations))
+        self.stats = ContextCacheStats()
+        self._client: object | None = None
+        self._conversations: OrderedDict[str, object] = OrderedDict()
+        self._operator_loaded = False
+        self._operator_cfg: dict[str, Any] | None = None
+        self._operator_fingerprint: _Fingerprint = None
+        self._identity_loaded = False
+        self._identity_name = ""
+        self._identity_fingerprint: tuple[_Fingerprint, ...] = ()
+        self._avatar_loaded = False
+        self._avatar_url = ""
+        self._avatar_fingerprint: _Fingerprint = None
+        self._profile_published: set[str] = set()
+        self._xmtp_loaded = False
+        self._xmtp_config = XmtpConfig()
+        self._xmtp_fingerprint: _Fingerprint = None
+
+    async def conversation(self, client: Any, conversation_id: bytes | str) -> object | None:
+        if client is not self._client:
+            # Conversation handles are bound to the client that fetched them.
+            self._client = client
+            self._conversations.clear()
+        key = _conversation_key(conversation_id)
+        if not key:
+            return None
+        cached = self._conversations.get(key)
+        if cached is not None:
+            self._conversations.move_to_end(key)
+            self.stats.hits += 1
+            return cached
+        self.stats.misses += 1
+        conversation = await client.conversations.get_conversation_by_id(conversation_id)
+        if conversation is None:
+            return None
+        self._conversations[key] = conversation
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+        return conversation
+
+    def operator_config(self) -> dict[str, Any] | None:
+        fingerprint = _fingerprint(self.operator_path)
+        if self._operator_loaded and fingerprint == self._operator_fingerprint:
+            self.stats.hits += 1
+            return self._operator_cfg
+        self.stats.misses += 1
+        self._operator_cfg = load_operator(self.operator_path)
+        self._operator_fingerprint = fingerprint
+        self._operator_loaded = True
+        return self._operator_cfg
+
+    def xmtp_config(self) -> XmtpConfig:
+        if self.config_path is None:
+            return self._xmtp_config
+        fingerprint = _fingerprint(self.config_path)
+        if self._xmtp_loaded and fingerprint == self._xmtp_fingerprint:
+            self.stats.hits += 1
+            return self._xmtp_config
+        self.stats.misses += 1
+        cfg, _warn = load_tako_toml(self.config_path)
+        self._xmtp_config = cfg.xmtp
+        self._xmtp_fingerprint = fingerprint
+        self._xmtp_loaded = True
+        return self._xmtp_config
+
+    def operator_inbox_id(self) -> str | None:
+        return get_operator_inbox_id(self.operator_config())
+
+    def identity_name(self) -> str:
+        fingerprint = tuple(_fingerprint(path) for path in self.identity_paths)
+        if self._identity_loaded and fingerprint == self._identity_fingerprint:
+            self.stats.hits += 1
+            return self._identity_name
+        self.stats.misses += 1
+        name = self.identity_loader()
+        if self._identity_loaded and name != self._identity_name:
+            self._profile_published.clear()
+        self._identity_name = name
+        self._identity_fingerprint = fingerprint
+        self._identity_loaded = True
+        return name
+
+    def avatar_url(self) -> str:
+        fingerprint = _fingerprint(self.avatar_path)
+        if self._avatar_loaded and fingerprint == self._avatar_fingerprint:
+            self.stats.hits += 1
+            return self._avatar_url
+        self.stats.misses += 1
+        avatar_url = ""
+        if fingerprint is not None:
+            try:
+                encoded = base64.b64encode(self.avatar_path.read_bytes()).decode("ascii")
+                avatar_url = f"data:image/svg+xml;base64,{encoded}"
+            except OSError:
+                avatar_url = ""
+        if self._avatar_loaded and avatar_url != self._avatar_url:
+            self._profile_published.clear()
+        self._avatar_url = avatar_url
+        self._avatar_fingerprint = fingerprint
+        self._avatar_loaded = True
+        return avatar_url
+
+    def profile_published(self, conversation_id: bytes | str) -> bool:
+        return _conversation_key(conversation_id) in self._profile_published
+
+    def mark_profile_published(self, conversation_id: bytes | str) -> None:
+        key = _conversation_key(conversation_id)
+        if key:
+            self._profile_published.add(key)
+
+    def invalidate_conversations(self) -> None:
+        self.stats.invalidations += 1
+        self._conversations.clear()
+
+    def invalidate_operator(self) -> None:
+        self.stats.invalidations += 1
+        self._operator_loaded = False
+        self._operator_cfg = None
+
+    def invalidate_identity(self) -> None:
+        self.stats.invalidations += 1
+        self._identity_loaded = False
+        self._profile_published.clear()
+
+    def invalidate_profile(self) -> None:
+        self.stats.invalidations += 1
+        self._avatar_loaded = False
+        self._profile_published.clear()
+
+    def invalidate_all(self) -> None:
+        self.invalidate_conversations()
+        self.invalidate_operator()
+        self.invalidate_identity()
+        self.invalidate_profile()
+
+
+def _conversation_key(conversation_id: bytes | str) -> str:
+    if isinstance(conversation_id, (bytes, bytearray)):
+        return bytes(conversation_id).hex()
+    return " ".join(str(conversation_id or "").split()).strip().lower()
+
+
+def _fingerprint(path: Path) -> _Fingerprint:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
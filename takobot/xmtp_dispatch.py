@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from dataclasses import dataclass
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+XMTP_DISPATCH_WORKERS = 4
+XMTP_DISPATCH_MAX_PENDING = 256
+
+
+@dataclass
+class DispatchStats:
+    submitted: int = 0
+    priority_submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    backpressure_waits: int = 0
+    max_pending: int = 0
+    total_queue_wait_s: float = 0.0
+    max_queue_wait_s: float = 0.0
+
+    def summary(self, *, pending: int, in_flight: int) -> str:
+        done = self.completed + self.failed
+        avg_wait = (self.total_queue_wait_s / done) if done else 0.0
+        return (
+            f"dispatch pending={pending} in_flight={in_flight} done={done} failed={self.failed} "
+            f"priority={self.priority_submitted} max_pending={self.max_pending} "
+            f"backpressure_waits={self.backpressure_waits} "
+            f"queue_wait_avg={avg_wait:.2f}s queue_wait_max={self.max_queue_wait_s:.2f}s"
+        )
+
+
+@dataclass
+class _Queued:
+    item: Any
+    priority: int
+    enqueued_at: float
+
+
+class ConversationDispatcher:
+    """Run message handlers concurrently across conversations, in order within one.
+
+    Every conversation key owns a FIFO queue, and a key is held by at most one
+    worker at a time, so replies in a single chat never reorder. Ready keys are
+    served from a priority queue (operator traffic first) by a bounded pool of
+    workers. `submit()` waits once `max_pending` messages are queued or running,
+    which pushes back on the stream/poll reader instead of growing without bound.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        *,
+        key_fn: Callable[[Any], Hashable | None],
+        priority_fn: Callable[[Any], bool] | None = None,
+        max_workers: int = XMTP_DISPATCH_WORKERS,
+        max_pending: int = XMTP_DISPATCH_MAX_PENDING,
+        on_error: Callable[[BaseException, Any], None] | None = None,
+    ) -> None:
+        self.handler = handler
+        self.key_fn = key_fn
+        self.priority_fn = priority_fn
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.on_error = on_error
+        self.stats = DispatchStats()
+        self._queues: dict[Hashable, deque[_Queued]] = {}
+        self._scheduled: set[Hashable] = set()
+        self._ready: asyncio.PriorityQueue[tuple[int, int, Hashable]] | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._idle: asyncio.Event | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._seq = itertools.count()
+        self._pending = 0
+        self._in_flight = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def summary(self) -> str:
+        return self.stats.summary(pending=self._pending, in_flight=self._in_flight)
+
+    async def submit(self, item: Any) -> None:
+        self._ensure_started()
+        assert self._slots is not None and self._ready is not None and self._idle is not None
+        if self._slots.locked():
+            self.stats.backpressure_waits += 1
+        await self._slots.acquire()
+
+        priority = 0 if (self.priority_fn is not None and _safe_bool(self.priority_fn, item)) else 1
+        key = self.key_fn(item)
+        if key is None:
+            key = ("item", next(self._seq))
+        self._queues.setdefault(key, deque()).append(_Queued(item, priority, time.monotonic()))
+        self._pending += 1
+        self._idle.clear()
+        self.stats.submitted += 1
+        if priority == 0:
+            self.stats.priority_submitted += 1
+        self.stats.max_pending = max(self.stats.max_pending, self._pending)
+        if key not in self._scheduled:
+            self._scheduled.add(key)
+            self._ready.put_nowait((priority, next(self._seq), key))
+
+    async def join(self) -> None:
+        if self._idle is None:
+            return
+        await self._idle.wait()
+
+    async def close(self) -> None:
+        workers = self._workers
+        self._workers = []
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+    def _ensure_started(self) -> None:
+        if self._workers:
+            return
+        self._ready = asyncio.PriorityQueue()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def _worker(self) -> None:
+        assert self._ready is not None and self._slots is not None and self._idle is not None
+        while True:
+            _priority, _seq, key = await self._ready.get()
+            queue = self._queues.get(key)
+            if not queue:
+                self._scheduled.discard(key)
+                self._queues.pop(key, None)
+                continue
+            queued = queue.popleft()
+            waited = time.monotonic() - queued.enqueued_at
+            self.stats.total_queue_wait_s += waited
+            self.stats.max_queue_wait_s = max(self.stats.max_queue_wait_s, waited)
+            self._in_flight += 1
+            try:
+                await self.handler(queued.item)
+                self.stats.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self.stats.failed += 1
+                if self.on_error is not None:
+                    with contextlib.suppress(Exception):
+                        self.on_error(exc, queued.item)
+            finally:
+                self._in_flight -= 1
+                self._pending -= 1
+                self._slots.release()
+                if queue:
+                    # Keep the key held so later messages in this conversation stay in order.
+                    self._ready.put_nowait((queue[0].priority, next(self._seq), key))
+                else:
+                    self._scheduled.discard(key)
+                    self._queues.pop(key, None)
+                if self._pending == 0:
+                    self._idle.set()
+
+
+def _safe_bool(fn: Callable[[Any], bool], item: Any) -> bool:
+    try:
+        return bool(fn(item))
+    except Exception:  # noqa: BLE001
+        return False
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any
+
+FAKE_XMTP_DIR_ENV = "TAKOBOT_FAKE_XMTP_DIR"
+FAKE_XMTP_CONFIG_FILE = "config.json"
+FAKE_XMTP_INBOUND_FILE = "inbound.jsonl"
+FAKE_XMTP_SENT_FILE = "sent.jsonl"
+FAKE_XMTP_CALLS_FILE = "calls.jsonl"
+FAKE_XMTP_SELF_INBOX = "f" * 64
+FAKE_XMTP_SELF_ADDRESS = "0x" + "f" * 40
+FAKE_XMTP_TRANSIENT_ERROR = "fake transport error: deadline exceeded (timeout)"
+
+_GLOBAL_FLAGS = {"--env-file", "--db-path", "--env"}
+
+
+@dataclass
+class FakeXmtpConfig:
+    """Knobs for the fake `xmtp` CLI; stored as JSON next to the fake network state."""
+
+    conversations: int = 4
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_commands: list[str] = field(default_factory=lambda: ["send-text", "messages", "list", "get"])
+    stream_crash_after: int = 0
+    stream_poll_s: float = 0.01
+    seed: int = 0
+
+
+def conversation_id(index: int) -> str:
+    return f"{index + 1:032x}"
+
+
+def peer_inbox_id(index: int) -> str:
+    return f"{index + 1:064x}"
+
+
+class FakeXmtpNetwork:
+    """File-backed stand-in for the XMTP network behind the fake CLI.
+
+    The harness injects inbound messages with `inject()`; the fake CLI reads
+    them back for `conversation messages`, `conversations list` and the
+    `stream-all-messages` tail, and journals every `send-text` and command
+    call so replies and transport cost can be measured after a run.
+    """
+
+    def __init__(self, root: Path, config: FakeXmtpConfig | None = None) -> None:
+        self.root = root
+        self.config = config or FakeXmtpConfig()
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / FAKE_XMTP_CONFIG_FILE).write_text(json.dumps(asdict(self.config)) + "\n", encoding="utf-8")
+        for name in (FAKE_XMTP_INBOUND_FILE, FAKE_XMTP_SENT_FILE, FAKE_XMTP_CALLS_FILE):
+            (self.root / name).write_text("", encoding="utf-8")
+        self._seq = 0
+
+    @property
+    def cli_path(self) -> Path:
+        """Executable wrapper that runs this module's `cli_main` with the current interpreter."""
+        path = self.root / "xmtp"
+        package_parent = Path(__file__).resolve().parent.parent
+        script = (
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            f"sys.path.insert(0, {str(package_parent)!r})\n"
+            "from takobot.xmtp_fake import cli_main\n"
+            "raise SystemExit(cli_main(sys.argv[1:]))\n"
+        )
+        if not path.exists() or path.read_text(encoding="utf-8") != script:
+            path.write_text(script, encoding="utf-8")
+            path.chmod(0o755)
+        return path
+
+    def env(self, base: dict[str, str] | None = None) -> dict[str, str]:
+        env = dict(base if base is not None else os.environ)
+        env[FAKE_XMTP_DIR_ENV] = str(self.root)
+        return env
+
+    def inject(self, conversation_index: int, content: str) -> dict[str, Any]:
+        self._seq += 1
+        index = conversation_index % max(1, self.config.conversations)
+        record = {
+            "id": f"{int(time.time() * 1_000_000):x}{self._seq:08x}",
+            "conversationId": conversation_id(index),
+            "senderInboxId": peer_inbox_id(index),
+            "content": content,
+            "sentAt": _iso_now(),
+            "sentAtEpoch": time.time(),
+        }
+        _append_jsonl(self.root / FAKE_XMTP_INBOUND_FILE, record)
+        return record
+
+    def sent(self) -> list[dict[str, Any]]:
+        return _read_jsonl(self.root / FAKE_XMTP_SENT_FILE)
+
+    def calls(self) -> list[dict[str, Any]]:
+        return _read_jsonl(self.root / FAKE_XMTP_CALLS_FILE)
+
+
+def cli_main(argv: list[str]) -> int:
+    root = Path(os.environ.get(FAKE_XMTP_DIR_ENV) or ".")
+    config = _load_config(root)
+    args = _strip_global_flags(argv)
+    positional = [arg for arg in args if not arg.startswith("--")]
+    command = " ".join(positional[:2])
+    rng = random.Random((config.seed or 0) ^ os.getpid() ^ time.time_ns())
+
+    _append_jsonl(root / FAKE_XMTP_CALLS_FILE, {"command": command, "at": time.time()})
+    delay_ms = config.latency_ms + rng.uniform(0.0, max(0.0, config.latency_jitter_ms))
+    if delay_ms > 0:
+        time.sleep(delay_ms / 1000.0)
+
+    if command == "conversations stream-all-messages":
+        return _stream(root, config)
+
+    verb = positional[1] if len(positional) > 1 else ""
+    if config.error_rate > 0 and verb in config.error_commands and rng.random() < config.error_rate:
+        print(FAKE_XMTP_TRANSIENT_ERROR, file=sys.stderr)
+        return 1
+
+    try:
+        payload = _dispatch(root, config, positional, args)
+    except LookupError as exc:
+        print(f"not found: {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps(payload))
+    return 0
+
+
+def _dispatch(root: Path, config: FakeXmtpConfig, positional: list[str], args: list[str]) -> Any:
+    command = " ".join(positional[:2])
+    if command == "client info":
+        return {"properties": {"inboxId": FAKE_XMTP_SELF_INBOX, "address": FAKE_XMTP_SELF_ADDRESS}}
+    if command == "conversations sync-all":
+        return {"synced": True}
+    if command == "conversations list":
+        kind = _flag_value(args, "--type")
+        if kind == "group":
+            return []
+        inbound = _read_jsonl(root / FAKE_XMTP_INBOUND_FILE)
+        return [_conversation_payload(index, inbound) for index in range(config.conversations)]
+    if command == "conversations get":
+        index = _conversation_index(config, positional[2] if len(positional) > 2 else "")
+        return _conversation_payload(index, _read_jsonl(root / FAKE_XMTP_INBOUND_FILE))
+    if command == "conversations create-dm":
+        return _conversation_payload(0, [])
+    if command == "conversation send-text":
+        cid = positional[2] if len(positional) > 2 else ""
+        _conversation_index(config, cid)
+        text = positional[3] if len(positional) > 3 else ""
+        message_id = f"{time.time_ns():x}{os.getpid():06x}"
+        _append_jsonl(
+            root / FAKE_XMTP_SENT_FILE,
+            {"id": message_id, "conversationId": cid, "content": text, "at": time.time()},
+        )
+        return {"messageId": message_id}
+    if command == "conversation messages":
+        cid = positional[2] if len(positional) > 2 else ""
+        _conversation_index(config, cid)
+        limit = int(_flag_value(args, "--limit") or 50)
+        messages = [_message_payload(record) for record in _read_jsonl(root / FAKE_XMTP_INBOUND_FILE) if record.get("conversationId") == cid]
+        # Like the real CLI, a limited page starts at the oldest message unless the caller asks for descending.
+        if _flag_value(args, "--direction") == "descending":
+            return list(reversed(messages))[:limit]
+        return messages[:limit]
+    if positional[:1] == ["inbox-states"]:
+        return []
+    raise LookupError(command or "(empty command)")
+
+
+def _stream(root: Path, config: FakeXmtpConfig) -> int:
+    """Tail inbound messages from the moment the stream opens, like a live subscription."""
+    path = root / FAKE_XMTP_INBOUND_FILE
+    emitted = 0
+    with path.open("r", encoding="utf-8") as handle:
+        handle.seek(0, os.SEEK_END)
+        buffer = ""
+        while True:
+            chunk = handle.readline()
+            if not chunk:
+                time.sleep(config.stream_poll_s)
+                continue
+            buffer += chunk
+            if not buffer.endswith("\n"):
+                continue
+            line, buffer = buffer, ""
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            sys.stdout.write(json.dumps(_message_payload(record)) + "\n")
+            sys.stdout.flush()
+            emitted += 1
+            if config.stream_crash_after and emitted >= config.stream_crash_after:
+                print("fake stream crash: connection reset by peer", file=sys.stderr)
+                return 1
+
+
+def _conversation_payload(index: int, inbound: list[dict[str, Any]]) -> dict[str, Any]:
+    cid = conversation_id(index)
+    payload: dict[str, Any] = {"id": cid, "type": "dm", "peerInboxId": peer_inbox_id(index)}
+    last = None
+    for record in inbound:
+        if record.get("conversationId") == cid:
+            last = record
+    if last is not None:
+        payload["lastMessage"] = {"id": last["id"], "sentAt": last["sentAt"]}
+    return payload
+
+
+def _message_payload(record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": record.get("id"),
+        "conversationId": record.get("conversationId"),
+        "senderInboxId": record.get("senderInboxId"),
+        "content": record.get("content"),
+        "sentAt": record.get("sentAt"),
+    }
+
+
+def _conversation_index(config: FakeXmtpConfig, cid: str) -> int:
+    for index in range(config.conversations):
+        if conversation_id(index) == cid.strip().lower():
+            return index
+    raise LookupError(f"conversation {cid}")
+
+
+def _strip_global_flags(argv: list[str]) -> list[str]:
+    out: list[str] = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg in _GLOBAL_FLAGS:
+            skip = True
+            continue
+        out.append(arg)
+    return out
+
+
+def _flag_value(args: list[str], flag: str) -> str:
+    for idx, arg in enumerate(args[:-1]):
+        if arg == flag:
+            return args[idx + 1]
+    return ""
+
+
+def _load_config(root: Path) -> FakeXmtpConfig:
+    try:
+        raw = json.loads((root / FAKE_XMTP_CONFIG_FILE).read_text(encoding="utf-8"))
+    except Exception:  # noqa: BLE001
+        return FakeXmtpConfig()
+    known = {key: value for key, value in raw.items() if key in FakeXmtpConfig.__dataclass_fields__}
+    return FakeXmtpConfig(**known)
+
+
+def _append_jsonl(path: Path, record: dict[str, Any]) -> None:
+    # One short O_APPEND write per record keeps concurrent fake CLI processes from interleaving.
+    data = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _read_jsonl(path: Path) -> list[dict[str, Any]]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    out: list[dict[str, Any]] = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            out.append(record)
+    return out
+
+
+def _iso_now() -> str:
+    return datetime.now(tz=timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli_main(sys.argv[1:]))
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from dataclasses import dataclass, field
+import itertools
+import json
+import os
+from pathlib import Path
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+XMTP_OUTBOX_FILE = "xmtp_outbox.jsonl"
+XMTP_OUTBOX_DEAD_LETTER_FILE = "xmtp_outbox_failed.jsonl"
+XMTP_OUTBOX_MAX_CONCURRENCY = 4
+XMTP_OUTBOX_MAX_ATTEMPTS = 4
+XMTP_OUTBOX_RETRY_BASE_S = 0.4
+XMTP_OUTBOX_RETRY_MAX_S = 8.0
+XMTP_OUTBOX_COALESCE_WINDOW_S = 0.25
+XMTP_OUTBOX_COALESCE_MAX_CHARS = 3500
+XMTP_OUTBOX_MAX_AGE_S = 6 * 60 * 60
+XMTP_OUTBOX_COMPACT_AFTER = 256
+
+KIND_REPLY = "reply"
+KIND_SYSTEM = "system"
+
+SendFn = Callable[[str, str, Any], Awaitable[Any]]
+
+
+@dataclass
+class OutboxStats:
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    coalesced: int = 0
+    restored: int = 0
+    dead_lettered: int = 0
+    total_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+
+    def summary(self, *, depth: int, in_flight: int, dead_letter: int) -> str:
+        avg = (self.total_latency_s / self.sent) if self.sent else 0.0
+        return (
+            f"outbox depth={depth} in_flight={in_flight} sent={self.sent} failed={self.failed} "
+            f"retries={self.retries} coalesced={self.coalesced} restored={self.restored} "
+            f"dead_letter={dead_letter} "
+            f"latency_avg={avg:.2f}s latency_max={self.max_latency_s:.2f}s"
+        )
+
+
+@dataclass
+class OutboundMessage:
+    message_id: str
+    conversation_id: str
+    text: str
+    kind: str
+    created_at: float
+    enqueued_at: float = field(default_factory=time.monotonic)
+    conversation: Any = None
+    started: bool = False
+    waiters: list[asyncio.Future[Any]] = field(default_factory=list)
+
+
+class XmtpOutbox:
+    """Per-conversation outbound queue for XMTP text sends.
+
+    Messages for one conversation leave in order through a single worker, while
+    different conversations send concurrently up to `max_concurrency`.
+    Transient failures retry with exponential backoff and jitter. `system`
+    messages (presence pings, follow-up notes) are fire-and-forget, and ones
+    queued within `coalesce_window_s` of each other are merged into one send;
+    replies are never merged and `send()` waits for their delivery. Every
+    queued message is journaled to a JSONL spool until it is sent, so unsent
+    messages are re-queued by `restore()` after a restart.
+
+    Messages that finally fail are moved to a dead-letter file instead of being
+    dropped. An `is_ambiguous` failure (e.g. a timeout after the request was
+    handed off) may already have been delivered, so it is dead-lettered at once
+    rather than retried into a duplicate reply.
+    """
+
+    def __init__(
+        self,
+        send_fn: SendFn,
+        *,
+        spool_path: Path | None = None,
+        dead_letter_path: Path | None = None,
+        max_concurrency: int = XMTP_OUTBOX_MAX_CONCURRENCY,
+        max_attempts: int = XMTP_OUTBOX_MAX_ATTEMPTS,
+        retry_base_s: float = XMTP_OUTBOX_RETRY_BASE_S,
+        retry_max_s: float = XMTP_OUTBOX_RETRY_MAX_S,
+        coalesce_window_s: float = XMTP_OUTBOX_COALESCE_WINDOW_S,
+        is_retryable: Callable[[Exception], bool] | None = None,
+        is_ambiguous: Callable[[Exception], bool] | None = None,
+        on_retry: Callable[[OutboundMessage, int, float, Exception], None] | None = None,
+        on_failure: Callable[[OutboundMessage, Exception], None] | None = None,
+    ) -> None:
+        self.send_fn = send_fn
+        self.spool_path = spool_path
+        self.dead_letter_path = dead_letter_path
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_base_s = max(0.0, float(retry_base_s))
+        self.retry_max_s = max(self.retry_base_s, float(retry_max_s))
+        self.coalesce_window_s = max(0.0, float(coalesce_window_s))
+        self.is_retryable = is_retryable
+        self.is_ambiguous = is_ambiguous
+        self.on_retry = on_retry
+        self.on_failure = on_failure
+        self.stats = OutboxStats()
+        self._queues: dict[str, deque[OutboundMessage]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._spool_done = 0
+        self._dead_letter_count: int | None = None
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def summary(self) -> str:
+        return self.stats.summary(depth=self.depth, in_flight=self._in_flight, dead_letter=self.dead_letter_count())
+
+    def dead_letter_count(self) -> int:
+        """Messages in the dead-letter file, including ones left by earlier runs."""
+        if self._dead_letter_count is None:
+            self._dead_letter_count = len(self.dead_letters())
+        return self._dead_letter_count
+
+    def dead_letters(self) -> list[dict[str, Any]]:
+        if self.dead_letter_path is None:
+            return []
+        try:
+            lines = self.dead_letter_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        out: list[dict[str, Any]] = []
+        for line in lines:
+            with contextlib.suppress(Exception):
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    out.append(record)
+        return out
+
+    async def send(self, conversation_id: str, text: str, *, conversation: Any = None) -> Any:
+        """Queue a reply and wait until it is delivered (raises if it is not)."""
+        message = self._enqueue(conversation_id, text, kind=KIND_REPLY, conversation=conversation)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        message.waiters.append(future)
+        return await future
+
+    def post(self, conversation_id: str, text: str, *, conversation: Any = None) -> None:
+        """Queue a system message without waiting; it may be merged with its neighbours."""
+        self._enqueue(conversation_id, text, kind=KIND_SYSTEM, conversation=conversation)
+
+    def restore(self, *, max_age_s: float = XMTP_OUTBOX_MAX_AGE_S) -> int:
+        """Re-queue messages left in the spool by a previous run."""
+        pending = self._read_spool()
+        now = time.time()
+        restored = 0
+        for record in pending:
+            if max_age_s and now - record["created_at"] > max_age_s:
+                continue
+            message = OutboundMessage(
+                message_id=record["id"],
+                conversation_id=record["conversation_id"],
+                text=record["text"],
+                kind=record["kind"],
+                created_at=record["created_at"],
+            )
+            self._queues.setdefault(message.conversation_id, deque()).append(message)
+            self._ensure_worker(message.conversation_id)
+            restored += 1
+        self.stats.restored += restored
+        self._rewrite_spool()
+        return restored
+
+    async def drain(self, timeout_s: float | None = None) -> bool:
+        workers = list(self._workers.values())
+        if not workers:
+            return True
+        _done, pending = await asyncio.wait(workers, timeout=timeout_s)
+        return not pending
+
+    async def close(self, timeout_s: float = 5.0) -> None:
+        with contextlib.suppress(Exception):
+            await self.drain(timeout_s)
+        workers = list(self._workers.values())
+        self._workers.clear()
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        # Whatever is still queued stays in the spool for the next start.
+        for queue in self._queues.values():
+            for message in queue:
+                for waiter in message.waiters:
+                    if not waiter.done():
+                        waiter.cancel()
+        self._queues.clear()
+
+    def _enqueue(self, conversation_id: str, text: str, *, kind: str, conversation: Any) -> OutboundMessage:
+        cid = " ".join(str(conversation_id or "").split()).strip().lower()
+        if not cid:
+            raise ValueError("conversation id is required")
+        queue = self._queues.setdefault(cid, deque())
+        self.stats.enqueued += 1
+        if kind == KIND_SYSTEM and queue:
+            tail = queue[-1]
+            if (
+                tail.kind == KIND_SYSTEM
+                and not tail.started
+                and time.monotonic() - tail.enqueued_at <= self.coalesce_window_s
+                and len(tail.text) + len(text) + 1 <= XMTP_OUTBOX_COALESCE_MAX_CHARS
+            ):
+                tail.text = f"{tail.text}\n{text}"
+                self.stats.coalesced += 1
+                self._append_spool({"op": "add", **_record(tail)})
+                return tail
+        message = OutboundMessage(
+            message_id=f"{int(time.time() * 1000):x}-{os.getpid():x}-{next(self._seq):x}",
+            conversation_id=cid,
+            text=text,
+            kind=kind,
+            created_at=time.time(),
+            conversation=conversation,
+        )
+        queue.append(message)
+        self._append_spool({"op": "add", **_record(message)})
+        self._ensure_worker(cid)
+        return message
+
+    def _ensure_worker(self, conversation_id: str) -> None:
+        task = self._workers.get(conversation_id)
+        if task is not None and not task.done():
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._workers[conversation_id] = asyncio.create_task(self._worker(conversation_id))
+
+    async def _worker(self, conversation_id: str) -> None:
+        assert self._slots is not None
+        try:
+            while True:
+                queue = self._queues.get(conversation_id)
+                if not queue:
+                    return
+                message = queue[0]
+                if message.kind == KIND_SYSTEM:
+                    linger = self.coalesce_window_s - (time.monotonic() - message.enqueued_at)
+                    if linger > 0:
+                        await asyncio.sleep(linger)
+                message.started = True
+                async with self._slots:
+                    self._in_flight += 1
+                    try:
+                        result, error = await self._deliver(message)
+                    finally:
+                        self._in_flight -= 1
+                queue.popleft()
+                self._finish(message, result, error)
+        finally:
+            if not self._queues.get(conversation_id):
+                self._queues.pop(conversation_id, None)
+            if self._workers.get(conversation_id) is asyncio.current_task():
+                self._workers.pop(conversation_id, None)
+            self._maybe_compact()
+
+    async def _deliver(self, message: OutboundMessage) -> tuple[Any, Exception | None]:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await self.send_fn(message.conversation_id, message.text, message.conversation), None
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                if self.is_ambiguous is not None and self.is_ambiguous(exc):
+                    return None, exc
+                retryable = self.is_retryable(exc) if self.is_retryable is not None else True
+                if attempt >= self.max_attempts or not retryable:
+                    return None, exc
+                delay = retry_delay(attempt, base_s=self.retry_base_s, max_s=self.retry_max_s)
+                self.stats.retries += 1
+                if self.on_retry is not None:
+                    with contextlib.suppress(Exception):
+                        self.on_retry(message, attempt, delay, exc)
+                await asyncio.sleep(delay)
+
+    def _finish(self, message: OutboundMessage, result: Any, error: Exception | None) -> None:
+        if error is not None:
+            self._dead_letter(message, error)
+        self._append_spool({"op": "done", "id": message.message_id})
+        self._spool_done += 1
+        if error is None:
+            self.stats.sent += 1
+            latency = time.monotonic() - message.enqueued_at
+            self.stats.total_latency_s += latency
+            self.stats.max_latency_s = max(self.stats.max_latency_s, latency)
+        else:
+            self.stats.failed += 1
+            if self.on_failure is not None and not message.waiters:
+                with contextlib.suppress(Exception):
+                    self.on_failure(message, error)
+        for waiter in message.waiters:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(result)
+            else:
+                waiter.set_exception(error)
+
+    def _dead_letter(self, message: OutboundMessage, error: Exception) -> None:
+        if self.dead_letter_path is None:
+            return
+        record = {
+            **_record(message),
+            "failed_at": time.time(),
+            "error": " ".join(str(error).split())[:500] or error.__class__.__name__,
+            "ambiguous": bool(self.is_ambiguous is not None and self.is_ambiguous(error)),
+        }
+        try:
+            self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.dead_letter_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n")
+        except OSError:
+            return
+        self.stats.dead_lettered += 1
+        if self._dead_letter_count is not None:
+            self._dead_letter_count += 1
+
+    def _append_spool(self, record: dict[str, Any]) -> None:
+        if self.spool_path is None:
+            return
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.spool_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n")
+        except OSError:
+            return
+
+    def _read_spool(self) -> list[dict[str, Any]]:
+        if self.spool_path is None:
+            return []
+        try:
+            lines = self.spool_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        pending: dict[str, dict[str, Any]] = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except Exception:  # noqa: BLE001
+                continue
+            if not isinstance(record, dict):
+                continue
+            message_id = str(record.get("id") or "")
+            if not message_id:
+                continue
+            if record.get("op") == "done":
+                pending.pop(message_id, None)
+                continue
+            cid = str(record.get("conversation_id") or "").strip().lower()
+            text = record.get("text")
+            if record.get("op") != "add" or not cid or not isinstance(text, str) or not text:
+                continue
+            kind = record.get("kind") if record.get("kind") in {KIND_REPLY, KIND_SYSTEM} else KIND_REPLY
+            created_at = record.get("created_at")
+            pending[message_id] = {
+                "id": message_id,
+                "conversation_id": cid,
+                "text": text,
+                "kind": kind,
+                "created_at": float(created_at) if isinstance(created_at, (int, float)) else 0.0,
+            }
+        return list(pending.values())
+
+    def _maybe_compact(self) -> None:
+        if self._spool_done < XMTP_OUTBOX_COMPACT_AFTER or self._queues:
+            return
+        self._rewrite_spool()
+
+    def _rewrite_spool(self) -> None:
+        if self.spool_path is None:
+            return
+        records = [_record(message) for queue in self._queues.values() for message in queue]
+        tmp = self.spool_path.with_name(f".{self.spool_path.name}.tmp")
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(
+                "".join(
+                    json.dumps({"op": "add", **record}, ensure_ascii=True, separators=(",", ":")) + "\n"
+                    for record in records
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.spool_path)
+        except OSError:
+            return
+        self._spool_done = 0
+
+
+def retry_delay(attempt: int, *, base_s: float, max_s: float) -> float:
+    """Exponential backoff with jitter: a random delay in [50%, 100%] of the capped step."""
+    step = min(max_s, base_s * (2 ** max(0, attempt - 1)))
+    return step * random.uniform(0.5, 1.0)
+
+
+def _record(message: OutboundMessage) -> dict[str, Any]:
+    return {
+        "id": message.message_id,
+        "conversation_id": message.conversation_id,
+        "text": message.text,
+        "kind": message.kind,
+        "created_at": message.created_at,
+    }
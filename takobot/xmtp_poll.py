@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+XMTP_POLL_CURSORS_FILE = "xmtp_poll_cursors.json"
+XMTP_POLL_CURSORS_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class ConversationCursor:
+    sent_at_us: int = 0
+    message_id: str = ""
+    marker: str = ""
+
+
+class XmtpPollCursors:
+    """Per-conversation high-water marks for the XMTP polling fallback.
+
+    Each conversation remembers the newest `sent_at` (microseconds) and message
+    id it has delivered, plus the conversation's last-message marker from the
+    list call. Polling skips conversations whose marker is unchanged and asks
+    for messages at or after the high-water mark for the rest; the seen-id store
+    absorbs the inclusive boundary.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._cursors: dict[str, ConversationCursor] = {}
+        self._dirty = False
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def get(self, conversation_id: str) -> ConversationCursor | None:
+        return self._cursors.get(conversation_id)
+
+    def unchanged(self, conversation_id: str, marker: str) -> bool:
+        cursor = self._cursors.get(conversation_id)
+        return bool(marker) and cursor is not None and cursor.marker == marker
+
+    def sent_after(self, conversation_id: str) -> datetime | None:
+        cursor = self._cursors.get(conversation_id)
+        if cursor is None or cursor.sent_at_us <= 0:
+            return None
+        return _EPOCH + timedelta(microseconds=cursor.sent_at_us)
+
+    def advance(self, conversation_id: str, messages: Iterable[object], *, marker: str, complete: bool) -> None:
+        """Move the high-water mark past `messages`.
+
+        `complete` says the fetch returned everything up to the conversation's
+        head; only then is `marker` recorded, so a truncated page is re-polled.
+        """
+        cursor = self._cursors.get(conversation_id)
+        if cursor is None:
+            cursor = ConversationCursor()
+            self._cursors[conversation_id] = cursor
+            self._dirty = True
+        for message in messages:
+            sent_at_us = _sent_at_us(getattr(message, "sent_at", None))
+            if sent_at_us < cursor.sent_at_us:
+                continue
+            cursor.sent_at_us = sent_at_us
+            cursor.message_id = _message_id_text(getattr(message, "id", b""))
+            self._dirty = True
+        next_marker = marker if complete else ""
+        if cursor.marker != next_marker:
+            cursor.marker = next_marker
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        payload = {
+            "version": XMTP_POLL_CURSORS_VERSION,
+            "conversations": {
+                conversation_id: {
+                    "sent_at_us": cursor.sent_at_us,
+                    "message_id": cursor.message_id,
+                    "marker": cursor.marker,
+                }
+                for conversation_id, cursor in sorted(self._cursors.items())
+            },
+        }
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:  # noqa: BLE001
+            return
+        if not isinstance(payload, dict) or payload.get("version") != XMTP_POLL_CURSORS_VERSION:
+            return
+        conversations = payload.get("conversations")
+        if not isinstance(conversations, dict):
+            return
+        for conversation_id, raw in conversations.items():
+            if not isinstance(raw, dict):
+                continue
+            self._cursors[str(conversation_id)] = ConversationCursor(
+                sent_at_us=_as_int(raw.get("sent_at_us")),
+                message_id=str(raw.get("message_id") or ""),
+                marker=str(raw.get("marker") or ""),
+            )
+
+
+def _sent_at_us(value: Any) -> int:
+    if not isinstance(value, datetime):
+        return 0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _message_id_text(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    return str(value or "")
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except Exception:  # noqa: BLE001
+        return 0
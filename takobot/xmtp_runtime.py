@@ -55,6 +55,10 @@ def workspace_xmtp_helper_script_path() -> Path:
     return workspace_xmtp_prefix() / "takobot-profile-sync.mjs"
 
 
+def workspace_xmtp_bridge_script_path() -> Path:
+    return workspace_xmtp_prefix() / "takobot-bridge.mjs"
+
+
 def ensure_workspace_xmtp_runtime_if_needed() -> str:
     probe = probe_xmtp_runtime()
     if probe.cli_installed and probe.node_ready and probe.cli_version == XMTP_CLI_VERSION:
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from takobot.app import TakoTerminalApp
+from takobot.paths import use_workspace_root
+
+
+async def _skip_boot(_self) -> None:
+    return None
+
+
+class TestAppTranscript(unittest.TestCase):
+    def test_transcript_appends_incrementally_and_trims_in_batches(self) -> None:
+        async def scenario(root: Path) -> None:
+            with (
+                use_workspace_root(root),
+                patch.object(TakoTerminalApp, "_boot", _skip_boot),
+                patch("takobot.app.TRANSCRIPT_LOG_MAX", 4),
+                patch("takobot.app.TRANSCRIPT_TRIM_BATCH", 2),
+            ):
+                app = TakoTerminalApp(interval=5.0)
+                async with app.run_test(size=(100, 30)):
+                    with patch.object(app.transcript, "load_text", side_effect=AssertionError("full reload")):
+                        app._write_user("hello")
+                        app._write_tako("multi\nline reply")
+                        for index in range(4):
+                            app._write_system(f"note {index}")
+                        self.assertEqual(
+                            ["You: hello", "Tako: multi", "line reply", "System: note 0", "System: note 1"],
+                            app.transcript.text.splitlines()[:5],
+                        )
+                        app._write_system("note 4")
+                    self.assertEqual(
+                        ["System: note 1", "System: note 2", "System: note 3", "System: note 4"],
+                        app.transcript.text.splitlines(),
+                    )
+                    self.assertEqual(list(app.transcript_lines), app.transcript.text.splitlines())
+
+        with TemporaryDirectory() as tmp:
+            asyncio.run(scenario(Path(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
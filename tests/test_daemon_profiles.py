@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from takobot.cli import RuntimeHooks, _DaemonProfile, _run_daemon_profiles, build_parser
+from takobot.paths import repo_root, runtime_paths, use_workspace_root
+
+
+def _profile(root: Path) -> _DaemonProfile:
+    with use_workspace_root(root):
+        paths = runtime_paths()
+    return _DaemonProfile(
+        name=root.name,
+        root=root.resolve(),
+        paths=paths,
+        wallet_key="0x" + "1" * 64,
+        db_encryption_key="0x" + "2" * 64,
+        address="0x" + "3" * 40,
+        hooks=RuntimeHooks(emit_console=False),
+    )
+
+
+class TestDaemonProfiles(unittest.TestCase):
+    def test_workspace_override_follows_tasks_and_threads(self) -> None:
+        with TemporaryDirectory() as tmp:
+            alpha = Path(tmp) / "alpha"
+            beta = Path(tmp) / "beta"
+
+            async def probe() -> tuple[Path, Path]:
+                await asyncio.sleep(0)
+                return repo_root(), await asyncio.to_thread(lambda: runtime_paths().root)
+
+            async def scenario() -> list[tuple[Path, Path]]:
+                tasks = []
+                for root in (alpha, beta):
+                    with use_workspace_root(root):
+                        tasks.append(asyncio.create_task(probe()))
+                return list(await asyncio.gather(*tasks))
+
+            results = asyncio.run(scenario())
+            self.assertEqual(
+                [(alpha.resolve(), alpha.resolve() / ".tako"), (beta.resolve(), beta.resolve() / ".tako")],
+                results,
+            )
+            self.assertNotIn(repo_root(), {alpha.resolve(), beta.resolve()})
+
+    def test_profiles_share_inference_and_run_in_their_own_workspace(self) -> None:
+        calls: list[dict[str, object]] = []
+        shared_runtime = object()
+
+        async def fake_run_daemon(_args, paths, _env, _wallet, _db_key, address, hooks=None, **kwargs) -> int:
+            calls.append(
+                {
+                    "root": repo_root(),
+                    "state_dir": paths.state_dir,
+                    "inference_runtime": kwargs.get("inference_runtime"),
+                    "update_check": kwargs.get("update_check"),
+                }
+            )
+            return 0
+
+        with TemporaryDirectory() as tmp:
+            profiles = [_profile(Path(tmp) / "alpha"), _profile(Path(tmp) / "beta")]
+            with (
+                patch("takobot.cli.discover_inference_runtime", return_value=shared_runtime) as discover,
+                patch("takobot.cli._run_daemon", side_effect=fake_run_daemon),
+            ):
+                code = asyncio.run(_run_daemon_profiles(argparse.Namespace(once=True), profiles))
+
+        self.assertEqual(0, code)
+        discover.assert_called_once()
+        self.assertEqual([profile.root for profile in profiles], [call["root"] for call in calls])
+        self.assertEqual([profile.paths.state_dir for profile in profiles], [call["state_dir"] for call in calls])
+        self.assertTrue(all(call["inference_runtime"] is shared_runtime for call in calls))
+        self.assertEqual([True, False], [call["update_check"] for call in calls])
+
+    def test_run_accepts_repeatable_workspace_flag(self) -> None:
+        args = build_parser().parse_args(["run", "--workspace", "a", "--workspace", "b"])
+        self.assertEqual(["a", "b"], args.workspace)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from takobot.config import load_tako_toml
+from takobot.runtime import EventDedupe, Type1Inbox
+from takobot.runtime.ingest import event_id_timestamp
+
+
+def _event(index: int, event_type: str = "sensor.tick") -> dict[str, object]:
+    return {"id": f"evt-{1_000_000 + index}-{index:08x}", "type": event_type, "metadata": {"n": index}}
+
+
+async def _drain(inbox: Type1Inbox) -> list[dict[str, object]]:
+    out: list[dict[str, object]] = []
+    while not inbox.empty():
+        out.append(await inbox.get())
+    return out
+
+
+class TestEventDedupe(unittest.TestCase):
+    def test_duplicates_are_dropped_and_ring_evicts_by_size_and_age(self) -> None:
+        dedupe = EventDedupe(capacity=3, window_s=60.0)
+        now = 2_000.0
+        self.assertFalse(dedupe.seen("evt-1990000-aa", now=now))
+        self.assertTrue(dedupe.seen("evt-1990000-aa", now=now))
+        self.assertEqual(1, dedupe.duplicates)
+
+        for token in ("bb", "cc", "dd"):
+            dedupe.seen(f"evt-1995000-{token}", now=now)
+        self.assertEqual(3, len(dedupe))
+        self.assertNotIn("evt-1990000-aa", dedupe)
+        self.assertEqual(1, dedupe.evicted)
+
+        # Sixty seconds after the ids' own timestamps, the whole window has aged out.
+        self.assertFalse(dedupe.seen("foreign-id", now=2_056.0))
+        self.assertEqual(["foreign-id"], list(dedupe._seen))
+        self.assertEqual(4, dedupe.evicted)
+        self.assertEqual(1995.0, event_id_timestamp("evt-1995000-bb"))
+        self.assertIsNone(event_id_timestamp("foreign-id"))
+
+
+class TestType1Inbox(unittest.TestCase):
+    def test_drop_oldest_keeps_the_newest_events(self) -> None:
+        inbox = Type1Inbox(maxsize=2, policy="drop-oldest")
+        outcomes = [inbox.put_nowait(_event(idx)) for idx in range(4)]
+        self.assertEqual(["queued", "queued", "dropped-oldest", "dropped-oldest"], outcomes)
+        self.assertEqual(2, inbox.counters.dropped)
+        drained = asyncio.run(_drain(inbox))
+        self.assertEqual([2, 3], [event["metadata"]["n"] for event in drained])
+
+    def test_coalesce_merges_by_type_without_mutating_bus_events(self) -> None:
+        inbox = Type1Inbox(maxsize=2, policy="coalesce")
+        inbox.put_nowait(_event(0, "sensor.tick"))
+        inbox.put_nowait(_event(1, "operator.message"))
+        late = _event(2, "sensor.tick")
+        self.assertEqual("coalesced", inbox.put_nowait(late))
+        self.assertEqual("coalesced", inbox.put_nowait(_event(3, "sensor.tick")))
+        self.assertEqual("dropped-oldest", inbox.put_nowait(_event(4, "world.note")))
+        self.assertNotIn("coalesced", late["metadata"])
+
+        drained = asyncio.run(_drain(inbox))
+        self.assertEqual(["operator.message", "world.note"], [event["type"] for event in drained])
+        self.assertEqual(2, inbox.counters.coalesced)
+        self.assertEqual(1, inbox.counters.dropped)
+
+        inbox = Type1Inbox(maxsize=2, policy="coalesce")
+        for idx in range(3):
+            inbox.put_nowait(_event(idx, "sensor.tick"))
+        drained = asyncio.run(_drain(inbox))
+        self.assertEqual(2, drained[1]["metadata"]["n"])
+        self.assertEqual(1, drained[1]["metadata"]["coalesced"])
+
+    def test_spill_preserves_order_and_truncates_when_drained(self) -> None:
+        with TemporaryDirectory() as tmp:
+            spill_path = Path(tmp) / "state" / "type1_spill.jsonl"
+            inbox = Type1Inbox(maxsize=2, policy="spill", spill_path=spill_path)
+            outcomes = [inbox.put_nowait(_event(idx)) for idx in range(5)]
+            self.assertEqual(["queued", "queued", "spilled", "spilled", "spilled"], outcomes)
+            self.assertEqual(5, inbox.qsize())
+
+            async def scenario() -> list[int]:
+                order = [(await inbox.get())["metadata"]["n"] for _ in range(3)]
+                # Arrivals while the spill file is non-empty queue behind it.
+                self.assertEqual("spilled", inbox.put_nowait(_event(5)))
+                order.extend(event["metadata"]["n"] for event in await _drain(inbox))
+                return order
+
+            self.assertEqual([0, 1, 2, 3, 4, 5], asyncio.run(scenario()))
+            self.assertEqual(0, inbox.counters.dropped)
+            self.assertEqual(4, inbox.counters.restored)
+            self.assertFalse(spill_path.exists())
+
+    def test_spill_writes_batches_off_loop_and_survives_a_restart(self) -> None:
+        with TemporaryDirectory() as tmp:
+            spill_path = Path(tmp) / "state" / "type1_spill.jsonl"
+
+            async def overflow() -> None:
+                inbox = Type1Inbox(maxsize=2, policy="spill", spill_path=spill_path)
+                for idx in range(6):
+                    inbox.put_nowait(_event(idx))
+                await inbox.flush_spill()
+                self.assertEqual(4, inbox.qsize() - 2)
+
+            asyncio.run(overflow())
+            self.assertEqual(4, len(spill_path.read_text(encoding="utf-8").splitlines()))
+
+            # A fresh inbox (next boot) adopts the spill file instead of deleting it.
+            inbox = Type1Inbox(maxsize=2, policy="drop-oldest")
+            inbox.configure(maxsize=2, policy="spill", spill_path=spill_path)
+            self.assertEqual(4, inbox.qsize())
+            drained = asyncio.run(_drain(inbox))
+            self.assertEqual([2, 3, 4, 5], [event["metadata"]["n"] for event in drained])
+            self.assertFalse(spill_path.exists())
+
+    def test_get_waits_for_the_next_event(self) -> None:
+        async def scenario() -> dict[str, object]:
+            inbox = Type1Inbox(maxsize=4)
+            waiter = asyncio.create_task(inbox.get())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            inbox.put_nowait(_event(7))
+            return await asyncio.wait_for(waiter, 1.0)
+
+        self.assertEqual(7, asyncio.run(scenario())["metadata"]["n"])
+
+
+class TestEventsConfig(unittest.TestCase):
+    def test_events_settings_parse_and_clamp(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tako.toml"
+            path.write_text(
+                "[events]\ntype1_queue_max = 4\ntype1_overflow = \"SPILL\"\ndedupe_max = 10000\n",
+                encoding="utf-8",
+            )
+            cfg, warn = load_tako_toml(path)
+            self.assertEqual("", warn)
+            self.assertEqual(16, cfg.events.type1_queue_max)
+            self.assertEqual("spill", cfg.events.type1_overflow)
+            self.assertEqual(10000, cfg.events.dedupe_max)
+
+            path.write_text("[events]\ntype1_overflow = \"block\"\n", encoding="utf-8")
+            cfg, _warn = load_tako_toml(path)
+            self.assertEqual("drop-oldest", cfg.events.type1_overflow)
+
+
+if __name__ == "__main__":
+    unittest.main()
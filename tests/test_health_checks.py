@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import threading
+import time
+import unittest
+
+from takobot.health_checks import HealthCheck, format_health_timing_lines, run_health_checks
+
+
+class TestHealthChecks(unittest.TestCase):
+    def test_checks_run_concurrently_with_individual_deadlines(self) -> None:
+        release = threading.Event()
+
+        def slow_ok() -> tuple[bool, str]:
+            time.sleep(0.2)
+            return True, "fine"
+
+        def hung() -> tuple[bool, str]:
+            release.wait(5.0)
+            return True, "late"
+
+        checks = [
+            HealthCheck(name="a", probe=slow_ok),
+            HealthCheck(name="b", probe=slow_ok),
+            HealthCheck(name="c", probe=slow_ok),
+            HealthCheck(name="hung", probe=hung, timeout_s=0.3),
+        ]
+        started_at = time.perf_counter()
+        try:
+            results = run_health_checks(checks)
+        finally:
+            release.set()
+        elapsed = time.perf_counter() - started_at
+
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(["a", "b", "c", "hung"], list(results))
+        self.assertTrue(all(results[name].ok for name in ("a", "b", "c")))
+        self.assertTrue(results["hung"].timed_out)
+        self.assertFalse(results["hung"].ok)
+
+    def test_passing_results_are_cached_until_fingerprint_or_ttl_changes(self) -> None:
+        calls: list[str] = []
+        fingerprint = {"value": "node-22"}
+        outcome = {"ok": True}
+
+        def probe() -> tuple[bool, str]:
+            calls.append("probe")
+            return outcome["ok"], "runtime ready"
+
+        check = HealthCheck(
+            name="xmtp_runtime",
+            probe=probe,
+            ttl_s=60.0,
+            fingerprint=lambda: fingerprint["value"],
+        )
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "state" / "health.json"
+            first = run_health_checks([check], cache_path=cache_path, now=1000.0)["xmtp_runtime"]
+            second = run_health_checks([check], cache_path=cache_path, now=1030.0)["xmtp_runtime"]
+            self.assertFalse(first.cached)
+            self.assertTrue(second.cached)
+            self.assertEqual("runtime ready", second.detail)
+            self.assertEqual(1, len(calls))
+            self.assertIn("cached (30s old", format_health_timing_lines({"xmtp_runtime": second})[0])
+
+            run_health_checks([check], cache_path=cache_path, now=1100.0)
+            self.assertEqual(2, len(calls), "expired TTL must re-probe")
+
+            fingerprint["value"] = "node-24"
+            run_health_checks([check], cache_path=cache_path, now=1101.0)
+            self.assertEqual(3, len(calls), "changed inputs must re-probe")
+
+            outcome["ok"] = False
+            fingerprint["value"] = "node-20"
+            failed = run_health_checks([check], cache_path=cache_path, now=1102.0)["xmtp_runtime"]
+            again = run_health_checks([check], cache_path=cache_path, now=1103.0)["xmtp_runtime"]
+            self.assertFalse(failed.ok)
+            self.assertFalse(again.cached)
+            self.assertEqual(5, len(calls), "failures are never cached")
+
+    def test_uncached_checks_and_probe_errors(self) -> None:
+        def broken() -> tuple[bool, str]:
+            raise RuntimeError("boom")
+
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "health.json"
+            results = run_health_checks([HealthCheck(name="broken", probe=broken)], cache_path=cache_path)
+        self.assertFalse(results["broken"].ok)
+        self.assertEqual("probe error: boom", results["broken"].detail)
+        self.assertTrue(format_health_timing_lines(results)[0].startswith("- health check broken: failed in "))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+import unittest
+from unittest.mock import patch
+
+from takobot import app as app_module
+from takobot.app import TakoTerminalApp
+from takobot.heartbeat_stages import DurationHistogram, StageInputs, directory_signature
+from takobot.paths import ensure_runtime_dirs, runtime_paths, use_workspace_root
+from takobot.runtime import RuntimeHeartbeatTick
+
+
+class TestHeartbeatStages(unittest.TestCase):
+    def test_histogram_buckets_and_percentiles(self) -> None:
+        histogram = DurationHistogram()
+        for millis in (1, 2, 3, 40, 900):
+            histogram.observe(millis / 1000.0)
+        self.assertEqual(5, histogram.count)
+        self.assertEqual(5.0, histogram.percentile_ms(0.5))
+        self.assertEqual(1000.0, histogram.percentile_ms(0.95))
+        self.assertTrue(histogram.summary("tick").startswith("tick: n=5"))
+
+    def test_directory_signature_and_stage_inputs_detect_edits(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "a.md").write_text("one", encoding="utf-8")
+            inputs = StageInputs()
+            first = directory_signature(root)
+            inputs.remember("tasks", first)
+            self.assertTrue(inputs.unchanged("tasks", directory_signature(root)))
+            (root / "a.md").write_text("one + more", encoding="utf-8")
+            self.assertFalse(inputs.unchanged("tasks", directory_signature(root)))
+
+    def test_app_heartbeat_skips_unchanged_open_loops_and_records_timings(self) -> None:
+        async def scenario(root: Path) -> None:
+            with use_workspace_root(root):
+                app = TakoTerminalApp(interval=5.0)
+                app.paths = ensure_runtime_dirs(runtime_paths())
+                app.open_loops_path = app.paths.state_dir / "open_loops.json"
+                calls: list[int] = []
+                real_compute = app_module._compute_open_loops
+
+                def counting_compute(*args, **kwargs):
+                    calls.append(1)
+                    return real_compute(*args, **kwargs)
+
+                async def no_git() -> None:
+                    return None
+
+                with (
+                    patch.object(app_module, "_compute_open_loops", side_effect=counting_compute),
+                    patch.object(app, "_run_git_autocommit", side_effect=no_git),
+                ):
+                    for tick in range(1, 4):
+                        await app._on_runtime_heartbeat_tick(
+                            RuntimeHeartbeatTick(tick=tick, at_monotonic=time.monotonic(), at_wall=time.time())
+                        )
+                    # The first pass writes the outcomes section, so the second still recomputes once.
+                    self.assertLessEqual(len(calls), 2)
+                    tasks_dir = root / "tasks"
+                    (tasks_dir / "new-task.md").write_text(
+                        "---\nid: t1\ntitle: Fresh task\nstatus: open\n---\n",
+                        encoding="utf-8",
+                    )
+                    before = len(calls)
+                    await app._on_runtime_heartbeat_tick(
+                        RuntimeHeartbeatTick(tick=4, at_monotonic=time.monotonic(), at_wall=time.time())
+                    )
+                    self.assertEqual(before + 1, len(calls))
+                    self.assertEqual(1, app.open_tasks_count)
+
+                    # A skipped tick rebuilds session/outcome loops from cached inputs with the current time.
+                    since = time.time()
+                    await app._on_runtime_heartbeat_tick(
+                        RuntimeHeartbeatTick(tick=5, at_monotonic=time.monotonic(), at_wall=time.time())
+                    )
+                    self.assertEqual(before + 1, len(calls))
+                    fresh = [loop for loop in app.open_loops_cache if loop.kind in {"pairing", "onboarding", "outcome"}]
+                    self.assertTrue(fresh)
+                    self.assertTrue(all(loop.created_ts >= since for loop in fresh))
+
+                self.assertEqual(5, app.heartbeat_timings.tick.count)
+                self.assertGreaterEqual(app.heartbeat_timings.skipped.get("open_loops", 0), 1)
+                self.assertGreaterEqual(app.heartbeat_timings.skipped.get("jobs", 0), 1)
+                self.assertTrue(any(line.startswith("heartbeat_tick: n=5") for line in app.heartbeat_timings.lines()))
+
+        with TemporaryDirectory() as tmp:
+            asyncio.run(scenario(Path(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
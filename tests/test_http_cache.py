@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import threading
+import time
+import unittest
+
+from takobot import http_cache
+from takobot.http_cache import HttpCache, cache_key, normalize_url
+from takobot.paths import use_workspace_root
+from takobot.tools.loader import discover_tools
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@contextmanager
+def local_cache_server(*, cache_control: str = "", etag: str = "", body: bytes = b"cached body"):
+    hits: dict[str, int] = {"full": 0, "not_modified": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            if etag and self.headers.get("If-None-Match") == etag:
+                hits["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            hits["full"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if cache_control:
+                self.send_header("Cache-Control", cache_control)
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, _format, *_args):  # noqa: A003
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/doc", hits
+    finally:
+        server.shutdown()
+        thread.join(timeout=5.0)
+        server.server_close()
+
+
+class TestHttpCache(unittest.TestCase):
+    def test_fresh_response_is_served_from_disk(self) -> None:
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="max-age=600") as (url, hits):
+            cache = HttpCache(Path(tmp) / "http-cache")
+            first = cache.fetch(url)
+            second = cache.fetch(url)
+
+            self.assertFalse(first.from_cache)
+            self.assertTrue(second.from_cache)
+            self.assertEqual(b"cached body", second.body)
+            self.assertEqual(1, hits["full"])
+            self.assertEqual(0.5, cache.stats.hit_ratio())
+
+            reopened = HttpCache(Path(tmp) / "http-cache")
+            third = reopened.fetch(url)
+            self.assertTrue(third.from_cache)
+            self.assertEqual(1, hits["full"])
+
+    def test_stale_response_revalidates_with_etag(self) -> None:
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="no-cache", etag='"v1"') as (url, hits):
+            cache = HttpCache(Path(tmp) / "http-cache")
+            cache.fetch(url)
+            second = cache.fetch(url)
+
+            self.assertTrue(second.from_cache)
+            self.assertTrue(second.revalidated)
+            self.assertEqual(b"cached body", second.body)
+            self.assertEqual(1, hits["full"])
+            self.assertEqual(1, hits["not_modified"])
+
+    def test_max_stale_override_skips_network(self) -> None:
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="max-age=0") as (url, hits):
+            cache = HttpCache(Path(tmp) / "http-cache")
+            cache.fetch(url)
+            cache.fetch(url)
+            self.assertEqual(2, hits["full"])
+
+            cached = cache.fetch(url, max_stale_s=3600)
+            self.assertTrue(cached.from_cache)
+            self.assertEqual(2, hits["full"])
+
+    def test_no_store_is_not_cached(self) -> None:
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="no-store") as (url, hits):
+            cache = HttpCache(Path(tmp) / "http-cache")
+            cache.fetch(url, max_stale_s=3600)
+            cache.fetch(url, max_stale_s=3600)
+            self.assertEqual(2, hits["full"])
+            self.assertEqual(0, cache.entry_count())
+
+    def test_lru_eviction_drops_least_recently_used(self) -> None:
+        body = os.urandom(400_000)
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="max-age=600", body=body) as (url, hits):
+            cache = HttpCache(Path(tmp) / "http-cache", max_bytes=1_000_000)
+            cache.fetch(url + "?page=1")
+            time.sleep(0.01)
+            cache.fetch(url + "?page=2")
+            time.sleep(0.01)
+            cache.fetch(url + "?page=1")
+            time.sleep(0.01)
+            cache.fetch(url + "?page=3")
+
+            self.assertEqual(1, cache.stats.evictions)
+            self.assertLessEqual(cache.total_bytes(), cache.max_bytes)
+            self.assertTrue(cache.fetch(url + "?page=1").from_cache)
+            self.assertEqual(3, hits["full"])
+            self.assertFalse(cache.fetch(url + "?page=2").from_cache)
+
+    def test_processes_sharing_a_dir_merge_index_and_batch_access_updates(self) -> None:
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="max-age=600") as (url, hits):
+            root = Path(tmp) / "http-cache"
+            daemon = HttpCache(root)
+            tui = HttpCache(root)
+            self.assertEqual(0, tui.entry_count())
+            daemon.fetch(url + "?from=daemon")
+            tui.fetch(url + "?from=tui")
+
+            index_path = root / "index.json"
+            self.assertEqual(2, HttpCache(root).entry_count())
+            self.assertEqual({"index.json", "index.lock"}, {path.name for path in root.iterdir() if path.suffix != ".gz"})
+            self.assertEqual(2, len(list(root.glob("*.gz"))))
+
+            before = index_path.stat().st_mtime_ns
+            time.sleep(0.01)
+            for _ in range(5):
+                self.assertTrue(daemon.fetch(url + "?from=tui").from_cache)
+            self.assertEqual(before, index_path.stat().st_mtime_ns, "cache hits must not rewrite the index")
+            daemon.flush()
+            self.assertNotEqual(before, index_path.stat().st_mtime_ns)
+            self.assertEqual(2, hits["full"])
+            self.assertEqual(5, daemon.stats.hits)
+
+    def test_web_fetch_tool_uses_the_workspace_cache(self) -> None:
+        tools = {tool.name: tool for tool in discover_tools(ROOT / "tools")}
+        page = b"<html><head><title>Cached</title></head><body><p>hello from the cache</p></body></html>"
+        with TemporaryDirectory() as tmp, local_cache_server(cache_control="max-age=600", body=page) as (url, hits):
+            workspace = Path(tmp)
+            (workspace / ".tako" / "state").mkdir(parents=True)
+            previous = http_cache.default_http_cache()
+            http_cache.configure_http_cache(None)
+            try:
+                with use_workspace_root(workspace):
+                    first = tools["web_fetch"].entrypoint({"url": url}, {})
+                    second = tools["web_fetch"].entrypoint({"url": url}, {})
+            finally:
+                http_cache._DEFAULT_CACHE = previous
+
+            self.assertTrue(first["ok"], first)
+            self.assertEqual(first["text"], second["text"])
+            self.assertEqual(1, hits["full"])
+            self.assertEqual(1, HttpCache(workspace / ".tako" / "state" / "http-cache").entry_count())
+
+    def test_cache_key_normalizes_url_and_ignores_user_agent(self) -> None:
+        self.assertEqual(
+            normalize_url("HTTPS://Example.com:443/a?b=2&a=1#frag"),
+            "https://example.com/a?a=1&b=2",
+        )
+        left = cache_key("https://example.com/a", {"User-Agent": "one", "Accept": "text/html"})
+        right = cache_key("https://EXAMPLE.com/a", {"User-Agent": "two", "Accept": "text/html"})
+        other = cache_key("https://example.com/a", {"Accept": "application/json"})
+        self.assertEqual(left, right)
+        self.assertNotEqual(left, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
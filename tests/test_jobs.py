@@ -13,6 +13,7 @@ from takobot.jobs import (
     list_jobs,
     looks_like_natural_job_request,
     mark_job_manual_trigger,
+    next_job_due_at,
     parse_natural_job_request,
     record_job_error,
     remove_job,
@@ -65,6 +66,24 @@ class TestJobs(unittest.TestCase):
             self.assertTrue(remove_job(state_dir, created.job_id))
             self.assertEqual([], list_jobs(state_dir))
 
+    def test_next_job_due_at_tracks_claimed_slots(self) -> None:
+        with TemporaryDirectory() as tmp:
+            state_dir = Path(tmp) / "state"
+            self.assertIsNone(next_job_due_at(state_dir))
+            ok, _summary, _created = add_job_from_natural_text(state_dir, "every day at 3pm run doctor")
+            self.assertTrue(ok)
+
+            morning = datetime.now().astimezone().replace(hour=9, minute=0, second=0, microsecond=0)
+            self.assertEqual(morning.replace(hour=15), next_job_due_at(state_dir, now=morning))
+
+            afternoon = morning.replace(hour=15, minute=1)
+            self.assertEqual(afternoon, next_job_due_at(state_dir, now=afternoon))
+            claim_due_jobs(state_dir, now=afternoon)
+            self.assertEqual(
+                (morning + timedelta(days=1)).replace(hour=15),
+                next_job_due_at(state_dir, now=afternoon),
+            )
+
     def test_claim_due_jobs_runs_once_per_slot(self) -> None:
         with TemporaryDirectory() as tmp:
             state_dir = Path(tmp) / "state"
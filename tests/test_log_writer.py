@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from takobot.config import load_tako_toml
+from takobot.log_writer import LogPolicy, LogWriter, RotatingLogFile, format_log_line, rotated_log_paths
+
+
+class TestLogWriter(unittest.TestCase):
+    def test_format_log_line_appends_structured_fields(self) -> None:
+        line = format_log_line("INFO", "chat   success", {"provider": "pi", "note": "two words", "skip": None})
+        self.assertTrue(line.endswith('[info] chat success provider=pi note="two words"\n'))
+
+    def test_rotation_keeps_bounded_compressed_backups(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "app.log"
+            log_file = RotatingLogFile(path, LogPolicy(max_bytes=200, backups=2, compress=True))
+            for index in range(20):
+                log_file.write(f"line {index:02d} " + "x" * 40 + "\n")
+            log_file.close()
+
+            rotated = rotated_log_paths(path)
+            self.assertEqual(["app.log.1.gz", "app.log.2.gz"], [item.name for item in rotated])
+            self.assertLessEqual(path.stat().st_size, 200)
+            self.assertIn("line 19", path.read_text(encoding="utf-8"))
+            newest_backup = gzip.decompress(rotated[0].read_bytes()).decode("utf-8")
+            self.assertLessEqual(len(newest_backup.encode("utf-8")), 200)
+            self.assertIn("line 1", newest_backup)
+
+            uncompressed = RotatingLogFile(path, LogPolicy(max_bytes=200, backups=1, compress=False))
+            for index in range(8):
+                uncompressed.write(f"again {index} " + "y" * 40 + "\n")
+            uncompressed.close()
+            self.assertEqual(["app.log.1"], [item.name for item in rotated_log_paths(path)])
+
+    def test_background_writer_batches_queue_and_counts_drops(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "runtime.log"
+            writer = LogWriter()
+            for index in range(50):
+                writer.write(path, format_log_line("info", f"tick {index}"))
+            self.assertTrue(writer.flush())
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(50, len(lines))
+            self.assertTrue(lines[-1].endswith("[info] tick 49"))
+            self.assertEqual(50, writer.written)
+
+            missing = Path(tmp) / "gone" / "app.log"
+            writer.write(missing, "lost\n")
+            self.assertTrue(writer.flush())
+            self.assertFalse(missing.parent.exists(), "writer must not recreate removed log dirs")
+            self.assertEqual(1, writer.errors)
+            writer.close()
+
+            bounded = LogWriter(queue_max=1)
+            with bounded._lock:
+                for index in range(3):
+                    bounded.write(path, f"burst {index}\n")
+            self.assertGreaterEqual(bounded.dropped, 1)
+            bounded.close()
+
+    def test_policies_are_kept_per_logs_dir(self) -> None:
+        with TemporaryDirectory() as tmp:
+            first_dir = Path(tmp) / "first"
+            second_dir = Path(tmp) / "second"
+            first_dir.mkdir()
+            second_dir.mkdir()
+            writer = LogWriter()
+            writer.configure(LogPolicy(max_bytes=100, backups=1, compress=False), logs_dir=first_dir)
+            writer.configure(LogPolicy(max_bytes=100_000, backups=3, compress=False), logs_dir=second_dir)
+            for index in range(10):
+                line = format_log_line("info", f"line {index} " + "x" * 40)
+                writer.write(first_dir / "app.log", line)
+                writer.write(second_dir / "app.log", line)
+            self.assertTrue(writer.flush())
+            writer.close()
+
+            self.assertEqual(["app.log.1"], [item.name for item in rotated_log_paths(first_dir / "app.log")])
+            self.assertEqual([], rotated_log_paths(second_dir / "app.log"))
+            self.assertEqual(10, len((second_dir / "app.log").read_text(encoding="utf-8").splitlines()))
+
+    def test_logging_settings_parse(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tako.toml"
+            path.write_text("[logging]\nmax_bytes = 10\nbackups = 2\ncompress = false\n", encoding="utf-8")
+            cfg, warn = load_tako_toml(path)
+        self.assertEqual("", warn)
+        self.assertEqual(100_000, cfg.logging.max_bytes)
+        self.assertEqual(2, cfg.logging.backups)
+        self.assertFalse(cfg.logging.compress)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from takobot.config import load_tako_toml
+from takobot.cli import _deliver_chat_reply
+from takobot.reply_stream import REPLY_STREAM_RESTART_MARKER, ReplyStreamer, remaining_text
+
+
+class TestReplyStreamer(unittest.TestCase):
+    def test_deltas_flush_in_sentence_chunks_and_finish_sends_remainder(self) -> None:
+        sent: list[str] = []
+
+        async def sink(text: str) -> None:
+            sent.append(text)
+
+        async def scenario() -> None:
+            streamer = ReplyStreamer(sink, flush_s=0.05, min_chars=10)
+            streamer.on_event("delta", "First sentence here. Second ")
+            await asyncio.sleep(0.15)
+            streamer.on_event("delta", "sentence still going")
+            await streamer.finish("First sentence here. Second sentence still going.")
+            self.assertEqual(2, streamer.chunks_sent)
+
+        asyncio.run(scenario())
+        self.assertEqual(["First sentence here.", "Second sentence still going."], sent)
+
+    def test_short_replies_are_sent_once_on_finish(self) -> None:
+        sent: list[str] = []
+
+        async def sink(text: str) -> None:
+            sent.append(text)
+
+        async def scenario() -> None:
+            streamer = ReplyStreamer(sink, flush_s=0.05, min_chars=240)
+            streamer.on_event("delta", "short answer")
+            await asyncio.sleep(0.1)
+            await streamer.finish("short answer")
+
+        asyncio.run(scenario())
+        self.assertEqual(["short answer"], sent)
+
+    def test_diverged_final_reply_is_sent_as_a_restarted_follow_up(self) -> None:
+        self.assertEqual("rest", remaining_text("hello  world\nrest", "hello world"))
+        self.assertIsNone(remaining_text("goodbye world", "hello"))
+
+        sent: list[str] = []
+
+        async def sink(text: str) -> None:
+            sent.append(text)
+
+        async def scenario() -> str:
+            streamer = ReplyStreamer(sink, flush_s=0.05, min_chars=5)
+            streamer.on_event("delta", "Draft answer. ")
+            await asyncio.sleep(0.15)
+            streamer.on_event("provider", "codex")
+            streamer.on_event("delta", "A different final answer, streamed again. ")
+            await asyncio.sleep(0.15)
+            delivered = await streamer.finish("A different final answer.")
+            self.assertTrue(streamer.reply_restarted)
+            return delivered
+
+        delivered = asyncio.run(scenario())
+        self.assertEqual(["Draft answer.", f"{REPLY_STREAM_RESTART_MARKER} A different final answer."], sent)
+        self.assertEqual(f"Draft answer. {REPLY_STREAM_RESTART_MARKER} A different final answer.", delivered)
+
+    def test_provider_failure_after_chunks_still_delivers_the_fallback_reply(self) -> None:
+        class _Convo:
+            def __init__(self) -> None:
+                self.sent: list[str] = []
+
+            async def send(self, text: str) -> None:
+                self.sent.append(text)
+
+        convo = _Convo()
+        fallback = "Inference is unavailable right now, so I'm replying in fallback mode."
+
+        async def scenario() -> str:
+            streamer = ReplyStreamer(convo.send, flush_s=0.05, min_chars=10)
+            streamer.on_event("provider", "pi")
+            streamer.on_event("delta", "The first sentence is here. And the second one")
+            await asyncio.sleep(0.15)
+            streamer.on_event("status", "pi failed: stream closed")
+            return await _deliver_chat_reply(convo, fallback, streamer)
+
+        delivered = asyncio.run(scenario())
+        self.assertEqual("The first sentence is here.", convo.sent[0])
+        self.assertEqual(f"{REPLY_STREAM_RESTART_MARKER} {fallback}", convo.sent[-1])
+        self.assertTrue(delivered.endswith(fallback))
+        self.assertIn("The first sentence is here.", delivered)
+
+    def test_provider_fallback_before_any_chunk_restarts_cleanly(self) -> None:
+        sent: list[str] = []
+
+        async def sink(text: str) -> None:
+            sent.append(text)
+
+        async def scenario() -> None:
+            streamer = ReplyStreamer(sink, flush_s=0.05, min_chars=240)
+            streamer.on_event("delta", "half an answer")
+            streamer.on_event("provider", "codex")
+            await streamer.finish("Fresh answer.")
+            self.assertFalse(streamer.reply_restarted)
+
+        asyncio.run(scenario())
+        self.assertEqual(["Fresh answer."], sent)
+
+    def test_xmtp_stream_settings_parse(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tako.toml"
+            path.write_text(
+                "[xmtp]\nstream_replies = true\nstream_flush_seconds = 0.1\nstream_min_chars = 80\n",
+                encoding="utf-8",
+            )
+            cfg, warn = load_tako_toml(path)
+        self.assertEqual("", warn)
+        self.assertTrue(cfg.xmtp.stream_replies)
+        self.assertEqual(0.5, cfg.xmtp.stream_flush_seconds)
+        self.assertEqual(80, cfg.xmtp.stream_min_chars)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from takobot.seen_ids import SEEN_IDS_FILE_MAGIC, SeenIdStore, seen_id_store_paths
+
+
+class TestSeenIdStore(unittest.TestCase):
+    def test_ring_evicts_oldest_ids_once_full(self) -> None:
+        store = SeenIdStore(capacity=3)
+        self.assertTrue(store.add("a"))
+        self.assertFalse(store.add("a"))
+        store.add_many(["b", "c", "d"])
+
+        self.assertEqual(3, len(store))
+        self.assertNotIn("a", store)
+        self.assertIn("d", store)
+
+    def test_bytes_ids_are_supported(self) -> None:
+        store = SeenIdStore(capacity=2)
+        self.assertTrue(store.add(b"\x01\x02"))
+        self.assertIn(b"\x01\x02", store)
+        self.assertNotIn(b"\x01\x03", store)
+
+    def test_flush_appends_and_compacts(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "seen.ids"
+            store = SeenIdStore(path, capacity=4)
+            store.add_many(["one", "two"])
+            store.flush()
+            self.assertEqual(len(SEEN_IDS_FILE_MAGIC) + 2 * 8, path.stat().st_size)
+            store.add("three")
+            store.flush()
+            self.assertEqual(len(SEEN_IDS_FILE_MAGIC) + 3 * 8, path.stat().st_size)
+
+            store.add_many(["four", "five", "six", "seven", "eight", "nine"])
+            store.flush()
+            self.assertEqual(len(SEEN_IDS_FILE_MAGIC) + 4 * 8, path.stat().st_size)
+
+            reopened = SeenIdStore(path, capacity=4)
+            self.assertIn("nine", reopened)
+            self.assertNotIn("one", reopened)
+            self.assertEqual(4, len(reopened))
+
+    def test_legacy_json_is_migrated(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            legacy = root / "rss_seen.json"
+            legacy.write_text(json.dumps({"seen_ids": ["x-1", "x-2"]}), encoding="utf-8")
+            store = SeenIdStore(root / "rss_seen.ids", legacy_json_path=legacy)
+            self.assertIn("x-1", store)
+            self.assertTrue((root / "rss_seen.ids").exists())
+
+    def test_json_seen_path_maps_to_binary_sibling(self) -> None:
+        root = Path("/state")
+        self.assertEqual((root / "rss_seen.ids", root / "rss_seen.json"), seen_id_store_paths(root / "rss_seen.json"))
+        self.assertEqual((root / "rss_seen.ids", root / "rss_seen.json"), seen_id_store_paths(root / "rss_seen.ids"))
+        self.assertEqual((root / "seen", root / "seen.json"), seen_id_store_paths(root / "seen"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,7 @@ class TestCuriositySensor(unittest.TestCase):
     def test_emits_mission_linked_question_and_dedupes_after_restart(self) -> None:
         with TemporaryDirectory() as tmp:
             state_dir = Path(tmp)
-            seen_path = state_dir / "curiosity_seen.json"
+            seen_path = state_dir / "curiosity_seen.ids"
 
             def reddit_fetcher(_ctx: SensorContext, _rng: random.Random) -> dict[str, str]:
                 return {
@@ -87,7 +87,7 @@ class TestCuriositySensor(unittest.TestCase):
             sensor = CuriositySensor(
                 sources=["reddit", "hackernews"],
                 poll_minutes=1,
-                seen_path=state_dir / "curiosity_seen.json",
+                seen_path=state_dir / "curiosity_seen.ids",
                 rng=random.Random(7),
                 source_fetchers={
                     "reddit": reddit_fetcher,
@@ -111,7 +111,7 @@ class TestCuriositySensor(unittest.TestCase):
                 sources=[],
                 site_urls=["https://example.com"],
                 poll_minutes=1,
-                seen_path=state_dir / "curiosity_seen.json",
+                seen_path=state_dir / "curiosity_seen.ids",
                 rng=random.Random(3),
             )
             with patch("takobot.sensors.curiosity._fetch_html_title", return_value="Example Domain"):
@@ -124,7 +124,7 @@ class TestCuriositySensor(unittest.TestCase):
     def test_manual_trigger_bypasses_poll_interval(self) -> None:
         with TemporaryDirectory() as tmp:
             state_dir = Path(tmp)
-            seen_path = state_dir / "curiosity_seen.json"
+            seen_path = state_dir / "curiosity_seen.ids"
             calls = 0
 
             def reddit_fetcher(_ctx: SensorContext, _rng: random.Random) -> dict[str, str]:
@@ -165,6 +165,39 @@ class TestCuriositySensor(unittest.TestCase):
             self.assertEqual("reddit:test:2", manual[0]["metadata"].get("item_id"))
             self.assertEqual(2, calls)
 
+    def test_hackernews_items_are_cached_and_seen_ids_prefiltered(self) -> None:
+        with TemporaryDirectory() as tmp:
+            state_dir = Path(tmp)
+            seen_path = state_dir / "curiosity_seen.ids"
+            requested: list[str] = []
+
+            def fake_fetch(url: str, *, timeout_s: float, user_agent: str):
+                requested.append(url)
+                if url.endswith("topstories.json"):
+                    return [101, 102, 103, 104, 105]
+                story_id = int(url.rsplit("/", 1)[1].split(".", 1)[0])
+                return {"id": story_id, "title": f"Story {story_id}", "time": 1_700_000_000}
+
+            ctx = SensorContext.create(state_dir=state_dir, user_agent="takobot-test", timeout_s=2.0, trigger="manual")
+            emitted: list[str] = []
+            with patch("takobot.sensors.curiosity._fetch_json", side_effect=fake_fetch):
+                sensor = CuriositySensor(sources=["hackernews"], seen_path=seen_path, rng=random.Random(5))
+                first = asyncio.run(sensor.tick(ctx))
+                self.assertEqual(1, len(first))
+                emitted.append(first[0]["metadata"]["item_id"])
+                self.assertEqual(1 + 4, len(requested))
+
+                restarted = CuriositySensor(sources=["hackernews"], seen_path=seen_path, rng=random.Random(5))
+                second = asyncio.run(restarted.tick(ctx))
+                self.assertEqual(1, len(second))
+                emitted.append(second[0]["metadata"]["item_id"])
+                self.assertEqual(1 + 4, len(requested))
+
+            self.assertEqual(2, len(set(emitted)))
+            self.assertTrue((state_dir / "hn_items.jsonl").exists())
+            item_requests = [url for url in requested if "/item/" in url]
+            self.assertEqual(len(item_requests), len(set(item_requests)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -59,7 +59,7 @@ class TestRSSSensor(unittest.TestCase):
 </rss>"""
         with TemporaryDirectory() as tmp:
             state_dir = Path(tmp)
-            seen_path = state_dir / "rss_seen.json"
+            seen_path = state_dir / "rss_seen.ids"
             with local_feed_server(feed) as url:
                 ctx = SensorContext.create(
                     state_dir=state_dir,
@@ -72,7 +72,7 @@ class TestRSSSensor(unittest.TestCase):
                 self.assertTrue(all(event["type"] == "world.news.item" for event in first))
                 self.assertTrue(seen_path.exists())
 
-                # Rebuild sensor to ensure dedupe survives process restarts via rss_seen.json.
+                # Rebuild sensor to ensure dedupe survives process restarts via rss_seen.ids.
                 sensor_restarted = RSSSensor([url], poll_minutes=1, seen_path=seen_path)
                 second = asyncio.run(sensor_restarted.tick(ctx))
                 self.assertEqual([], second)
@@ -102,7 +102,7 @@ class TestRSSSensor(unittest.TestCase):
 </rss>"""
         with TemporaryDirectory() as tmp:
             state_dir = Path(tmp)
-            seen_path = state_dir / "rss_seen.json"
+            seen_path = state_dir / "rss_seen.ids"
             auto_ctx = SensorContext.create(
                 state_dir=state_dir,
                 user_agent="takobot-test",
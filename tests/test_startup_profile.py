@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from takobot import cli
+from takobot.app import SessionState, TakoTerminalApp
+from takobot.paths import use_workspace_root
+from takobot.startup_profile import StartupProfile, parse_importtime
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_laps_phases_and_first_input_verdict(self) -> None:
+        profile = StartupProfile(started_at=100.0, target_first_input_s=1.0)
+        with patch("takobot.startup_profile.time.perf_counter", side_effect=[100.2, 100.5]):
+            profile.lap("launch")
+            profile.lap("workspace")
+        profile.record("inference_discovery", 100.5, 0.3)
+        profile.marks["first_input"] = 0.9
+
+        lines = profile.lines()
+        self.assertEqual("startup: first_input=900ms target=1000ms (ok)", lines[0])
+        self.assertIn("startup_phase[launch]: at=0ms took=200.0ms", lines)
+        self.assertIn("startup_phase[workspace]: at=200ms took=300.0ms", lines)
+        self.assertIn("startup_phase[inference_discovery]: at=500ms took=300.0ms", lines)
+
+        profile.marks["first_input"] = 1.2
+        self.assertTrue(profile.lines()[0].endswith("(over)"))
+        self.assertEqual(1200.0, profile.to_dict()["first_input_ms"])
+
+    def test_parse_importtime_reads_self_and_cumulative_columns(self) -> None:
+        text = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |     takobot.paths",
+                "import time:      4000 |      93000 |   takobot.cli",
+                "noise",
+            ]
+        )
+        timings = parse_importtime(text)
+        self.assertEqual(["takobot.paths", "takobot.cli"], [item.module for item in timings])
+        self.assertEqual(93000, timings[1].cumulative_us)
+
+
+class TestProfileStartupFlag(unittest.TestCase):
+    def test_flag_defaults_to_app_and_attaches_profile(self) -> None:
+        with patch("takobot.cli.cmd_app", return_value=0) as app_mock:
+            self.assertEqual(0, cli.main(["--profile-startup"]))
+        args = app_mock.call_args.args[0]
+        self.assertEqual("app", args.cmd)
+        self.assertIsInstance(args.startup_profile, StartupProfile)
+
+    def test_flag_is_rejected_for_daemon_commands(self) -> None:
+        with patch("sys.stderr"), self.assertRaises(SystemExit):
+            cli.main(["--profile-startup", "doctor"])
+
+
+class TestBootInputHandoff(unittest.TestCase):
+    def test_input_typed_during_boot_is_held_until_first_interactive_state(self) -> None:
+        async def scenario(root: Path) -> None:
+            gate = asyncio.Event()
+
+            async def slow_boot(app: TakoTerminalApp) -> None:
+                await gate.wait()
+                app._set_state(SessionState.RUNNING)
+
+            routed: list[str] = []
+
+            async def record_route(_app: TakoTerminalApp, text: str) -> None:
+                routed.append(text)
+
+            with (
+                use_workspace_root(root),
+                patch.object(TakoTerminalApp, "_boot", slow_boot),
+                patch.object(TakoTerminalApp, "_route_input", record_route),
+            ):
+                app = TakoTerminalApp(interval=5.0)
+                async with app.run_test(size=(100, 30)) as pilot:
+                    app._enqueue_local_input("hello early")
+                    await pilot.pause(0.05)
+                    self.assertEqual([], routed)
+                    self.assertIsNone(app.startup_profile.first_input_s)
+
+                    gate.set()
+                    await app.boot_task
+                    await app.input_queue.join()
+                    self.assertEqual(["hello early"], routed)
+                    self.assertIsNotNone(app.startup_profile.first_input_s)
+                    self.assertIn("first_paint", app.startup_profile.marks)
+
+        with TemporaryDirectory() as tmp:
+            asyncio.run(scenario(Path(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
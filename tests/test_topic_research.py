@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
@@ -8,7 +10,7 @@ from takobot.topic_research import collect_topic_research
 
 class TestTopicResearch(unittest.TestCase):
     def test_collect_topic_research_returns_structured_notes(self) -> None:
-        def fake_fetch(url: str, *, timeout_s: float, user_agent: str):
+        def fake_fetch(url: str, *, timeout_s: float, user_agent: str, max_stale_s: float | None = None):
             if "wikipedia.org/api/rest_v1/page/summary" in url:
                 return {
                     "title": "Potato",
@@ -73,7 +75,7 @@ class TestTopicResearch(unittest.TestCase):
         self.assertEqual("", result.highlight)
 
     def test_collect_topic_research_ignores_low_signal_duckduckgo_abstract(self) -> None:
-        def fake_fetch(url: str, *, timeout_s: float, user_agent: str):
+        def fake_fetch(url: str, *, timeout_s: float, user_agent: str, max_stale_s: float | None = None):
             if "api.duckduckgo.com" in url:
                 return {
                     "Heading": "XMTP",
@@ -86,6 +88,38 @@ class TestTopicResearch(unittest.TestCase):
             result = collect_topic_research("XMTP", max_notes=4)
         self.assertEqual(0, len(result.notes))
 
+    def test_collect_topic_research_fans_out_and_drops_late_sources(self) -> None:
+        release = threading.Event()
+
+        def fake_fetch(url: str, *, timeout_s: float, user_agent: str, max_stale_s: float | None = None):
+            if "api.duckduckgo.com" in url:
+                release.wait(timeout=5.0)
+                return {
+                    "Heading": "Late",
+                    "AbstractText": "This answer arrives long after the overall research deadline has passed.",
+                }
+            if "wikipedia.org" in url:
+                time.sleep(0.2)
+                return {
+                    "title": "Potato",
+                    "extract": "The potato is a starchy tuber first domesticated in the Andes.",
+                }
+            if "hn.algolia.com" in url:
+                time.sleep(0.2)
+                return {"hits": [{"title": "Potato storage at scale", "url": "https://example.com/hn"}]}
+            return {}
+
+        started = time.monotonic()
+        try:
+            with patch("takobot.topic_research._fetch_json", side_effect=fake_fetch):
+                result = collect_topic_research("potatoes", deadline_s=1.0)
+        finally:
+            release.set()
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(["Wikipedia", "Hacker News"], [note.source for note in result.notes])
+
 
 if __name__ == "__main__":
     unittest.main()
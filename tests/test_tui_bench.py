@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from takobot import tui_bench
+from takobot.tui_bench import BenchConfig, BenchReport, PhaseReport, run_benchmark
+
+
+class TestTuiBench(unittest.TestCase):
+    def test_small_run_reports_every_phase(self) -> None:
+        config = BenchConfig(transcript_lines=40, stream_deltas=30, inputs=5, events=40, batch=20, timeout_s=60.0)
+        with TemporaryDirectory() as tmp:
+            report = asyncio.run(run_benchmark(config, Path(tmp)))
+
+        self.assertEqual(["transcript", "stream", "inputs", "events"], [phase.name for phase in report.phases])
+        self.assertEqual([40, 30, 5, 40], [phase.items for phase in report.phases])
+        self.assertTrue(all(phase.step_ms for phase in report.phases))
+        self.assertGreater(report.phases[0].rss_kb_after, 0)
+        # 40 transcript lines plus one Tako acknowledgement per drained input.
+        self.assertGreaterEqual(report.transcript_rows, 45)
+        self.assertTrue(any(line.startswith("panel_render_ms:") for line in report.lines()))
+
+    def test_budget_check_names_the_slow_phase(self) -> None:
+        report = BenchReport(
+            config=BenchConfig(),
+            phases=[
+                PhaseReport(name="stream", step_ms=[10.0, 12.0], lag_ms=[1.0, 80.0]),
+                PhaseReport(name="events", step_ms=[5.0], lag_ms=[2.0]),
+            ],
+        )
+        self.assertEqual([], report.over_budget())
+        self.assertEqual(
+            ["stream: loop lag p95 80.0ms > 50.0ms"],
+            report.over_budget(max_step_p95_ms=50.0, max_lag_p95_ms=50.0),
+        )
+
+    def test_imports_without_the_resource_module(self) -> None:
+        try:
+            with patch.dict(sys.modules, {"resource": None}):
+                module = importlib.reload(tui_bench)
+                with patch.object(module, "Path", side_effect=OSError("no /proc")):
+                    self.assertEqual(0, module._rss_kb())
+        finally:
+            importlib.reload(tui_bench)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+import unittest
+from unittest.mock import patch
+
+from takobot.app import TakoTerminalApp
+from takobot.paths import use_workspace_root
+from takobot.tui_render import PANEL_NAMES, PanelRefreshScheduler
+
+
+async def _skip_boot(_self) -> None:
+    return None
+
+
+class TestPanelRefreshScheduler(unittest.TestCase):
+    def test_marks_coalesce_until_taken(self) -> None:
+        scheduler = PanelRefreshScheduler()
+        scheduler.mark("activity")
+        scheduler.mark("activity")
+        scheduler.mark("tasks")
+        self.assertEqual(frozenset({"activity", "tasks"}), scheduler.take())
+        self.assertEqual(frozenset(), scheduler.take())
+        scheduler.mark()
+        self.assertEqual(frozenset(PANEL_NAMES), scheduler.take())
+        self.assertEqual(4, scheduler.stats.requests)
+
+    def test_unchanged_text_is_skipped_and_frames_are_counted(self) -> None:
+        scheduler = PanelRefreshScheduler()
+        self.assertTrue(scheduler.changed("tasks", "a"))
+        self.assertFalse(scheduler.changed("tasks", "a"))
+        self.assertTrue(scheduler.changed("tasks", "b"))
+        scheduler.record_frame(time.perf_counter())
+        self.assertEqual(1, scheduler.stats.frames)
+        self.assertEqual(2, scheduler.stats.renders)
+        self.assertEqual(1, scheduler.stats.unchanged)
+        self.assertTrue(scheduler.stats.lines()[0].startswith("panel_refresh: requests=0 frames=1"))
+
+
+class TestAppPanelRefresh(unittest.TestCase):
+    def test_activity_bursts_render_once_per_frame(self) -> None:
+        async def scenario(root: Path) -> None:
+            with use_workspace_root(root), patch.object(TakoTerminalApp, "_boot", _skip_boot):
+                app = TakoTerminalApp(interval=5.0)
+                async with app.run_test(size=(120, 40)):
+                    with patch.object(app.activity_panel, "update") as update:
+                        for index in range(30):
+                            app._add_activity("tool", f"step {index}")
+                        update.assert_not_called()
+                        app._flush_panels()
+                        update.assert_called_once()
+                        self.assertIn("step 29", str(update.call_args.args[0]))
+                        app._refresh_panels("activity")
+                        app._flush_panels()
+                        update.assert_called_once()
+
+        with TemporaryDirectory() as tmp:
+            asyncio.run(scenario(Path(tmp)))
+
+    def test_stream_box_appends_reply_deltas_and_rewrites_only_status(self) -> None:
+        async def scenario(root: Path) -> None:
+            with (
+                use_workspace_root(root),
+                patch.object(TakoTerminalApp, "_boot", _skip_boot),
+                patch("takobot.app.STREAM_BOX_MAX_CHARS", 40),
+                patch("takobot.app.STREAM_BOX_TRIM_SLACK_CHARS", 20),
+            ):
+                app = TakoTerminalApp(interval=5.0)
+                async with app.run_test(size=(120, 40)):
+                    app._stream_begin(focus="demo")
+                    with patch.object(app.stream_box, "load_text", side_effect=AssertionError("full reload")):
+                        app._on_inference_stream_event("status", "pi thinking: hello")
+                        app._on_inference_stream_event("delta", "Hello ")
+                        app._stream_render(force=True)
+                        app._on_inference_stream_event("status", "pi thinking: hello world")
+                        app._on_inference_stream_event("delta", "there.")
+                        app._stream_render(force=True)
+                        self.assertEqual("pi thinking: hello world\n\nHello there.", app.stream_box.text)
+                        self.assertIn("focus: demo", app.stream_header_text)
+                    for _ in range(12):
+                        app._on_inference_stream_event("delta", "abcdef")
+                    app._stream_render(force=True)
+                    self.assertLessEqual(app.stream_reply_chars, 60)
+                    self.assertTrue(app.stream_box.text.endswith(app.stream_reply))
+                    self.assertTrue(app.stream_reply.endswith("abcdef"))
+
+        with TemporaryDirectory() as tmp:
+            asyncio.run(scenario(Path(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from takobot.app import TakoTerminalApp
+from takobot.runtime.type2_pool import Type2Batch, Type2Pool, escalation_signature
+
+
+def _event(event_type: str, message: str) -> dict[str, object]:
+    return {"type": event_type, "message": message, "severity": "error", "source": "runtime"}
+
+
+class TestType2Pool(unittest.TestCase):
+    def test_escalations_sharing_a_signature_are_batched(self) -> None:
+        handled: list[Type2Batch] = []
+
+        async def handler(batch: Type2Batch) -> None:
+            handled.append(batch)
+
+        async def scenario() -> Type2Pool:
+            pool = Type2Pool(handler, workers=2, window_s=0.05)
+            runner = asyncio.create_task(pool.run())
+            for _ in range(10):
+                pool.submit(_event("runtime.crash", "XMTP stream died"), depth="medium", reason="runtime crash")
+            pool.submit(_event("runtime.crash", "xmtp  stream DIED"), depth="deep", reason="runtime crash")
+            pool.submit(_event("health.check.issue", "dns failed"), depth="medium", reason="health")
+            self.assertEqual(12, pool.pending())
+            await asyncio.sleep(0.15)
+            runner.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await runner
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual([11, 1], sorted((batch.size for batch in handled), reverse=True))
+        storm = max(handled, key=lambda batch: batch.size)
+        self.assertEqual("deep", storm.depth)
+        self.assertEqual(escalation_signature(_event("runtime.crash", "XMTP stream died")), storm.signature)
+        self.assertEqual(2, pool.metrics.batches)
+        self.assertEqual(10, pool.metrics.merged)
+        self.assertEqual(0, pool.pending())
+        self.assertIn("type2_batches: escalations=12 batches=2 merged=10", "\n".join(pool.lines()))
+
+    def test_a_storm_slower_than_the_window_costs_one_batch(self) -> None:
+        handled: list[Type2Batch] = []
+
+        async def handler(batch: Type2Batch) -> None:
+            handled.append(batch)
+            await asyncio.sleep(0.3)
+
+        async def scenario() -> Type2Pool:
+            pool = Type2Pool(handler, workers=2, window_s=0.02, cooldown_s=1.0)
+            runner = asyncio.create_task(pool.run())
+            for _ in range(10):
+                pool.submit(_event("runtime.crash", "XMTP stream died"), depth="medium", reason="runtime crash")
+                await asyncio.sleep(0.1)
+            runner.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await runner
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual(1, len(handled))
+        self.assertEqual(1, pool.metrics.batches)
+        self.assertEqual(9, pool.metrics.folded)
+        self.assertEqual(10, handled[0].occurrences)
+
+    def test_deeper_repeats_open_a_batch_and_late_repeats_are_reported(self) -> None:
+        handled: list[tuple[str, int]] = []
+        repeats: list[tuple[str, int]] = []
+
+        async def handler(batch: Type2Batch) -> None:
+            handled.append((batch.depth, batch.occurrences))
+            await asyncio.sleep(0.2)
+
+        async def scenario() -> Type2Pool:
+            pool = Type2Pool(
+                handler,
+                workers=2,
+                window_s=0.02,
+                cooldown_s=0.3,
+                on_repeats=lambda batch, count: repeats.append((batch.depth, count)),
+            )
+            runner = asyncio.create_task(pool.run())
+            crash = _event("runtime.crash", "XMTP stream died")
+            pool.submit(crash, depth="light", reason="runtime crash")
+            await asyncio.sleep(0.05)
+            pool.submit(crash, depth="light", reason="runtime crash")
+            pool.submit(crash, depth="deep", reason="runtime crash")
+            await asyncio.sleep(0.05)
+            pool.submit(crash, depth="medium", reason="runtime crash")
+            await asyncio.sleep(0.35)
+            # Cooling down after the deep pass: folded, then reported when the cooldown ends.
+            pool.submit(crash, depth="light", reason="runtime crash")
+            await asyncio.sleep(0.4)
+            runner.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await runner
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual([("light", 1), ("deep", 1)], handled)
+        self.assertEqual([("light", 1), ("deep", 1), ("deep", 1)], repeats)
+        self.assertEqual(2, pool.metrics.batches)
+        self.assertEqual(3, pool.metrics.folded)
+
+    def test_workers_run_batches_concurrently_and_survive_failures(self) -> None:
+        async def scenario() -> Type2Pool:
+            gate = asyncio.Event()
+            started: list[str] = []
+
+            async def handler(batch: Type2Batch) -> None:
+                started.append(batch.signature)
+                if "boom" in batch.signature:
+                    raise RuntimeError("boom")
+                await gate.wait()
+
+            pool = Type2Pool(handler, workers=2, window_s=0.0)
+            runner = asyncio.create_task(pool.run())
+            pool.submit(_event("runtime.crash", "boom"), depth="light", reason="x")
+            for name in ("a", "b", "c"):
+                pool.submit(_event("runtime.crash", name), depth="light", reason="x")
+            await asyncio.sleep(0.05)
+            self.assertEqual(2, pool.metrics.in_flight)
+            self.assertEqual(1, pool.pending())
+            gate.set()
+            await asyncio.sleep(0.05)
+            runner.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await runner
+            self.assertEqual(4, len(started))
+            return pool
+
+        pool = asyncio.run(scenario())
+        self.assertEqual(2, pool.metrics.peak_in_flight)
+        self.assertEqual(1, pool.metrics.failed)
+        self.assertEqual(3, pool.metrics.completed)
+
+
+class TestType2BatchBudget(unittest.TestCase):
+    def test_budget_is_charged_once_per_batch(self) -> None:
+        app = TakoTerminalApp(interval=5.0)
+        batch = Type2Batch(signature="runtime.crash|boom", depth="medium", reason="runtime crash")
+        for _ in range(6):
+            batch.add(_event("runtime.crash", "boom"), depth="medium")
+
+        with (
+            patch.object(app, "_run_type2_thinking", new=AsyncMock()) as thinking,
+            patch.object(app, "_record_event") as record_event,
+        ):
+            asyncio.run(app._run_type2_batch(batch))
+            self.assertEqual(1, app.type2_budget_used_today)
+            self.assertEqual(6, thinking.await_args.kwargs["occurrences"])
+
+            app.type2_budget_used_today = app.stage_policy.type2_budget_per_day
+            asyncio.run(app._run_type2_batch(batch))
+        self.assertEqual(1, thinking.await_count)
+        self.assertEqual("type2.budget.exhausted", record_event.call_args.args[0])
+        self.assertEqual(6, record_event.call_args.kwargs["metadata"]["occurrences"])
+        self.assertEqual("idle", app.indicator)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+from takobot.runtime.world_notebook import WorldItem, WorldNotebookWriter
+
+
+def _item(item_id: str, *, title: str = "Signal", source: str = "Example News") -> WorldItem:
+    return WorldItem(
+        item_id=item_id,
+        title=title,
+        source=source,
+        link=f"https://example.com/{item_id}",
+        published="",
+        why_it_matters="Because it shifts the plan.",
+        mission_relevance="Touches the roadmap.",
+        question="What changes next?",
+    )
+
+
+class TestWorldNotebookWriter(unittest.TestCase):
+    def test_batches_items_and_dedupes_from_memory(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            writer = WorldNotebookWriter(root / "world", index_path=root / "state" / "world_notebook_index.json")
+            day = date(2026, 2, 16)
+
+            path, count = writer.append_items(day, [_item("b"), _item("a"), _item("a")])
+            self.assertEqual(2, count)
+            _, again = writer.append_items(day, [_item("a"), _item("c", source="Other Wire")])
+            self.assertEqual(1, again)
+
+            text = path.read_text(encoding="utf-8")
+            self.assertTrue(text.startswith("# World Notebook — 2026-02-16\n\n\n## 2026-02-16\n"))
+            self.assertEqual(1, text.count("## 2026-02-16"))
+            self.assertEqual(1, text.count("<!-- world_item_id: a -->"))
+            self.assertIn("  - Why it matters: Because it shifts the plan.\n", text)
+
+            entities = (root / "world" / "entities.md").read_text(encoding="utf-8")
+            self.assertEqual(1, entities.count("<!-- world_source: Example News -->"))
+            self.assertIn("<!-- world_source: Other Wire -->", entities)
+            self.assertTrue((root / "state" / "world_notebook_index.json").exists())
+
+    def test_sidecar_index_survives_restart_and_external_edits_rescan(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            index_path = root / "state" / "world_notebook_index.json"
+            day = date(2026, 2, 16)
+            path, _ = WorldNotebookWriter(root / "world", index_path=index_path).append_items(day, [_item("a")])
+
+            restarted = WorldNotebookWriter(root / "world", index_path=index_path)
+            _, count = restarted.append_items(day, [_item("a")])
+            self.assertEqual(0, count)
+
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write("<!-- world_item_id: manual -->\n- operator note\n")
+            _, count = restarted.append_items(day, [_item("manual"), _item("b")])
+            self.assertEqual(1, count)
+            self.assertEqual(1, path.read_text(encoding="utf-8").count("<!-- world_item_id: manual -->"))
+
+
+if __name__ == "__main__":
+    unittest.main()
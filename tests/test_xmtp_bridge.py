@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import textwrap
+import unittest
+from unittest.mock import patch
+
+from takobot.xmtp import XmtpCliClient
+from takobot.xmtp_bridge import XmtpBridge, XmtpBridgeError, XmtpBridgeUnavailable, bridge_request_for_cli_args
+
+FAKE_BRIDGE = textwrap.dedent(
+    """
+    import json
+    import os
+    import sys
+    import threading
+    import time
+
+    lock = threading.Lock()
+
+    def reply(payload):
+        with lock:
+            sys.stdout.write(json.dumps(payload) + "\\n")
+            sys.stdout.flush()
+
+    def handle(request):
+        method = request.get("method")
+        params = request.get("params") or {}
+        rid = request.get("id")
+        if method == "initialize":
+            reply({"id": rid, "result": {"inboxId": "a" * 64, "pid": os.getpid()}})
+        elif method == "conversations.get":
+            reply({"id": rid, "result": {"id": params["id"], "type": "dm", "peerInboxId": "b" * 64}})
+        elif method == "conversation.sendText":
+            reply({"id": rid, "result": {"messageId": "ab" * 8}})
+        elif method == "crash":
+            os._exit(3)
+        elif method == "sleep":
+            time.sleep(float(params["seconds"]))
+            reply({"id": rid, "result": {"slept": params["seconds"], "pid": os.getpid()}})
+        else:
+            reply({"id": rid, "error": {"code": -32601, "message": "method not found"}})
+
+    for line in sys.stdin:
+        if line.strip():
+            threading.Thread(target=handle, args=(json.loads(line),), daemon=True).start()
+    """
+)
+
+
+def _bridge(tmp: str) -> XmtpBridge:
+    script = Path(tmp) / "fake_bridge.py"
+    script.write_text(FAKE_BRIDGE, encoding="utf-8")
+    return XmtpBridge(lambda: [sys.executable, str(script)], restart_backoff_s=0.0)
+
+
+class TestXmtpBridge(unittest.TestCase):
+    def test_concurrent_calls_resolve_out_of_order_on_one_process(self) -> None:
+        async def scenario(bridge: XmtpBridge) -> list[object]:
+            try:
+                return await asyncio.gather(
+                    bridge.call("sleep", {"seconds": 0.3}, timeout_s=5.0),
+                    bridge.call("sleep", {"seconds": 0.05}, timeout_s=5.0),
+                    bridge.call("conversations.get", {"id": "cc"}, timeout_s=5.0),
+                )
+            finally:
+                await bridge.close()
+
+        with TemporaryDirectory() as tmp:
+            bridge = _bridge(tmp)
+            slow, fast, convo = asyncio.run(scenario(bridge))
+
+        self.assertEqual(1, bridge.starts)
+        self.assertEqual(slow["pid"], fast["pid"])
+        self.assertEqual("dm", convo["type"])
+
+    def test_crash_fails_in_flight_calls_and_restarts(self) -> None:
+        async def scenario(bridge: XmtpBridge) -> tuple[object, object]:
+            try:
+                first = await bridge.call("sleep", {"seconds": 0.0}, timeout_s=5.0)
+                with self.assertRaises(XmtpBridgeError):
+                    await bridge.call("crash", timeout_s=5.0)
+                second = await bridge.call("sleep", {"seconds": 0.0}, timeout_s=5.0)
+                return first, second
+            finally:
+                await bridge.close()
+
+        with TemporaryDirectory() as tmp:
+            bridge = _bridge(tmp)
+            first, second = asyncio.run(scenario(bridge))
+
+        self.assertEqual(2, bridge.starts)
+        self.assertEqual(1, bridge.crashes)
+        self.assertNotEqual(first["pid"], second["pid"])
+
+    def test_repeated_start_failures_open_the_circuit(self) -> None:
+        spawned: list[int] = []
+
+        def command() -> list[str]:
+            spawned.append(1)
+            return [sys.executable, "-c", "import sys; sys.exit(2)"]
+
+        async def scenario(bridge: XmtpBridge) -> int:
+            failures = 0
+            for _ in range(5):
+                with self.assertRaises(XmtpBridgeUnavailable):
+                    await bridge.call("sleep", {"seconds": 0.0}, timeout_s=5.0)
+                failures += 1
+            return failures
+
+        bridge = XmtpBridge(command, restart_backoff_s=0.0, failure_threshold=2, cooldown_s=600.0)
+        self.assertEqual(5, asyncio.run(scenario(bridge)))
+        self.assertEqual(2, len(spawned), "calls during the cooldown must not spawn node")
+        self.assertGreater(bridge.disabled_until, 0.0)
+
+    def test_client_routes_cli_args_through_bridge_and_falls_back_when_unsupported(self) -> None:
+        async def scenario(client: XmtpCliClient) -> tuple[object, object]:
+            try:
+                convo = await client.conversations.get_conversation_by_id("cc")
+                sync = await client.run_json(["conversations", "sync-all", "--json"], timeout_s=5.0, json_expected=False)
+                return convo, sync
+            finally:
+                await client.close()
+
+        with TemporaryDirectory() as tmp:
+            client = XmtpCliClient(
+                env_name="dev",
+                cli_path=Path(tmp) / "xmtp",
+                env_file=Path(tmp) / "client.env",
+                db_path=Path(tmp) / "db.db3",
+                runtime_env={},
+                inbox_id="a" * 64,
+                address="",
+                bridge=_bridge(tmp),
+            )
+            completed = subprocess.CompletedProcess(args=[], returncode=0, stdout='{"synced": true}', stderr="")
+            with patch("takobot.xmtp._run_process", return_value=completed) as run_process:
+                convo, sync = asyncio.run(scenario(client))
+
+        self.assertIsNotNone(convo)
+        assert convo is not None
+        self.assertEqual("b" * 64, convo.peer_inbox_id)
+        self.assertEqual({"synced": True}, sync)
+        self.assertEqual(1, run_process.call_count)
+        self.assertIn("sync-all", run_process.call_args.args[0])
+
+    def test_cli_args_map_to_bridge_methods(self) -> None:
+        self.assertEqual(
+            ("conversation.messages", {"id": "cc", "limit": 20, "direction": "ascending"}),
+            bridge_request_for_cli_args(
+                ["conversation", "messages", "cc", "--json", "--limit", "20", "--direction", "ascending"]
+            ),
+        )
+        self.assertEqual(
+            ("conversations.list", {"sync": True, "type": "dm"}),
+            bridge_request_for_cli_args(["conversations", "list", "--sync", "--type", "dm", "--json"]),
+        )
+        self.assertEqual(
+            ("conversation.sendText", {"id": "cc", "text": "--help"}),
+            bridge_request_for_cli_args(["conversation", "send-text", "cc", "--help", "--json"]),
+        )
+        self.assertIsNone(bridge_request_for_cli_args(["conversations", "stream-all-messages", "--json"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+import tempfile
+from types import SimpleNamespace
+import unittest
+
+from takobot.xmtp_context import XmtpContextCache
+
+
+class _FakeConversations:
+    def __init__(self) -> None:
+        self.lookups = 0
+
+    async def get_conversation_by_id(self, conversation_id):
+        self.lookups += 1
+        return SimpleNamespace(id=conversation_id)
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestXmtpContextCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.operator_path = self.root / "operator.json"
+        self.avatar_path = self.root / "xmtp-avatar.svg"
+        self.soul_path = self.root / "SOUL.md"
+        self.soul_path.write_text("name", encoding="utf-8")
+        self.identity_calls = 0
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _cache(self) -> XmtpContextCache:
+        def identity_loader() -> str:
+            self.identity_calls += 1
+            return self.soul_path.read_text(encoding="utf-8")
+
+        return XmtpContextCache(
+            operator_path=self.operator_path,
+            avatar_path=self.avatar_path,
+            identity_loader=identity_loader,
+            identity_paths=(self.soul_path,),
+            config_path=self.root / "tako.toml",
+        )
+
+    def test_conversations_are_cached_per_client(self) -> None:
+        cache = self._cache()
+        first = SimpleNamespace(conversations=_FakeConversations())
+        second = SimpleNamespace(conversations=_FakeConversations())
+
+        async def scenario() -> None:
+            convo = await cache.conversation(first, b"\x01")
+            self.assertIs(convo, await cache.conversation(first, b"\x01"))
+            self.assertIs(convo, await cache.conversation(first, "01"))
+            await cache.conversation(second, b"\x01")
+
+        asyncio.run(scenario())
+        self.assertEqual(1, first.conversations.lookups)
+        self.assertEqual(1, second.conversations.lookups)
+
+    def test_operator_reload_follows_file_changes_and_invalidation(self) -> None:
+        cache = self._cache()
+        self.assertIsNone(cache.operator_inbox_id())
+
+        self.operator_path.write_text(json.dumps({"operator_inbox_id": "inbox-a"}), encoding="utf-8")
+        self.assertEqual("inbox-a", cache.operator_inbox_id())
+
+        self.operator_path.write_text(json.dumps({"operator_inbox_id": "inbox-b"}), encoding="utf-8")
+        _bump_mtime(self.operator_path)
+        self.assertEqual("inbox-b", cache.operator_inbox_id())
+
+        misses = cache.stats.misses
+        cache.operator_inbox_id()
+        self.assertEqual(misses, cache.stats.misses)
+        cache.invalidate_operator()
+        cache.operator_inbox_id()
+        self.assertEqual(misses + 1, cache.stats.misses)
+
+    def test_identity_and_avatar_changes_reset_profile_publication(self) -> None:
+        cache = self._cache()
+        self.assertEqual("name", cache.identity_name())
+        self.assertEqual("name", cache.identity_name())
+        self.assertEqual(1, self.identity_calls)
+        self.assertEqual("", cache.avatar_url())
+
+        cache.mark_profile_published(b"\x01")
+        self.assertTrue(cache.profile_published("01"))
+
+        self.avatar_path.write_text("<svg/>", encoding="utf-8")
+        self.assertTrue(cache.avatar_url().startswith("data:image/svg+xml;base64,"))
+        self.assertFalse(cache.profile_published(b"\x01"))
+
+        cache.mark_profile_published(b"\x01")
+        self.soul_path.write_text("renamed", encoding="utf-8")
+        _bump_mtime(self.soul_path)
+        self.assertEqual("renamed", cache.identity_name())
+        self.assertFalse(cache.profile_published(b"\x01"))
+
+        cache.mark_profile_published(b"\x01")
+        cache.invalidate_identity()
+        self.assertFalse(cache.profile_published(b"\x01"))
+        self.assertEqual("renamed", cache.identity_name())
+        self.assertEqual(3, self.identity_calls)
+
+    def test_xmtp_config_is_parsed_once_until_tako_toml_changes(self) -> None:
+        cache = self._cache()
+        config_path = self.root / "tako.toml"
+        self.assertFalse(cache.xmtp_config().stream_replies)
+
+        config_path.write_text("[xmtp]\nstream_replies = true\nstream_min_chars = 80\n", encoding="utf-8")
+        self.assertTrue(cache.xmtp_config().stream_replies)
+        misses = cache.stats.misses
+        self.assertEqual(80, cache.xmtp_config().stream_min_chars)
+        self.assertEqual(misses, cache.stats.misses)
+
+        config_path.write_text("[xmtp]\nstream_replies = false\n", encoding="utf-8")
+        _bump_mtime(config_path)
+        self.assertFalse(cache.xmtp_config().stream_replies)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+import unittest
+
+from takobot.xmtp_dispatch import ConversationDispatcher
+
+
+def _msg(convo: bytes, text: str, sender: str = "peer") -> SimpleNamespace:
+    return SimpleNamespace(conversation_id=convo, content=text, sender_inbox_id=sender)
+
+
+class TestConversationDispatcher(unittest.TestCase):
+    def test_conversations_run_in_parallel_but_stay_ordered(self) -> None:
+        events: list[str] = []
+
+        async def handler(item) -> None:
+            events.append(f"start:{item.content}")
+            await asyncio.sleep(0.2 if item.content == "a1" else 0.01)
+            events.append(f"end:{item.content}")
+
+        async def scenario() -> None:
+            dispatcher = ConversationDispatcher(handler, key_fn=lambda item: item.conversation_id, max_workers=2)
+            try:
+                for item in (_msg(b"a", "a1"), _msg(b"a", "a2"), _msg(b"b", "b1")):
+                    await dispatcher.submit(item)
+                await asyncio.wait_for(dispatcher.join(), timeout=5.0)
+            finally:
+                await dispatcher.close()
+            self.assertEqual(3, dispatcher.stats.completed)
+
+        asyncio.run(scenario())
+        self.assertLess(events.index("end:b1"), events.index("end:a1"))
+        self.assertLess(events.index("end:a1"), events.index("start:a2"))
+
+    def test_operator_messages_jump_the_queue_and_errors_are_isolated(self) -> None:
+        handled: list[str] = []
+        errors: list[str] = []
+
+        async def handler(item) -> None:
+            handled.append(item.content)
+            if item.content == "boom":
+                raise RuntimeError("handler failed")
+
+        async def scenario() -> None:
+            dispatcher = ConversationDispatcher(
+                handler,
+                key_fn=lambda item: item.conversation_id,
+                priority_fn=lambda item: item.sender_inbox_id == "operator",
+                max_workers=1,
+                on_error=lambda exc, _item: errors.append(str(exc)),
+            )
+            gate = asyncio.Event()
+
+            async def blocker(_item) -> None:
+                await gate.wait()
+
+            dispatcher.handler = blocker
+            await dispatcher.submit(_msg(b"z", "hold"))
+            await asyncio.sleep(0)
+            dispatcher.handler = handler
+            await dispatcher.submit(_msg(b"p1", "boom"))
+            await dispatcher.submit(_msg(b"p2", "peer"))
+            await dispatcher.submit(_msg(b"op", "operator", sender="operator"))
+            gate.set()
+            try:
+                await asyncio.wait_for(dispatcher.join(), timeout=5.0)
+            finally:
+                await dispatcher.close()
+            self.assertEqual(1, dispatcher.stats.failed)
+            self.assertEqual(1, dispatcher.stats.priority_submitted)
+
+        asyncio.run(scenario())
+        self.assertEqual(["operator", "boom", "peer"], handled)
+        self.assertEqual(["handler failed"], errors)
+
+    def test_submit_applies_backpressure_at_max_pending(self) -> None:
+        async def scenario() -> int:
+            gate = asyncio.Event()
+
+            async def handler(_item) -> None:
+                await gate.wait()
+
+            dispatcher = ConversationDispatcher(handler, key_fn=lambda item: item.conversation_id, max_pending=2)
+            await dispatcher.submit(_msg(b"a", "1"))
+            await dispatcher.submit(_msg(b"b", "2"))
+            blocked = asyncio.create_task(dispatcher.submit(_msg(b"c", "3")))
+            await asyncio.sleep(0.05)
+            self.assertFalse(blocked.done())
+            gate.set()
+            await asyncio.wait_for(blocked, timeout=5.0)
+            await asyncio.wait_for(dispatcher.join(), timeout=5.0)
+            await dispatcher.close()
+            return dispatcher.stats.backpressure_waits
+
+        self.assertEqual(1, asyncio.run(scenario()))
+
+
+if __name__ == "__main__":
+    unittest.main()
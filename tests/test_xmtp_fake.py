@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import tempfile
+import unittest
+
+from takobot.xmtp import XmtpCliClient
+from takobot.xmtp_bench import BenchConfig, run_benchmark
+from takobot.xmtp_fake import (
+    FAKE_XMTP_SELF_ADDRESS,
+    FAKE_XMTP_SELF_INBOX,
+    FakeXmtpConfig,
+    FakeXmtpNetwork,
+    conversation_id,
+)
+
+
+def _client(network: FakeXmtpNetwork) -> XmtpCliClient:
+    return XmtpCliClient(
+        env_name="dev",
+        cli_path=network.cli_path,
+        env_file=network.root / ".env",
+        db_path=network.root / "db",
+        runtime_env=network.env(),
+        inbox_id=FAKE_XMTP_SELF_INBOX,
+        address=FAKE_XMTP_SELF_ADDRESS,
+    )
+
+
+class TestFakeXmtpCli(unittest.TestCase):
+    def test_client_round_trip_against_fake_cli(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            network = FakeXmtpNetwork(Path(tmp), FakeXmtpConfig(conversations=2))
+            network.inject(1, "hello")
+            client = _client(network)
+
+            async def scenario() -> None:
+                conversations = await client.conversations.list()
+                self.assertEqual([conversation_id(0), conversation_id(1)], [c.id_hex for c in conversations])
+                self.assertTrue(conversations[1].activity_marker)
+                messages = await client.conversations.messages(conversations[1].id, limit=10)
+                self.assertEqual(["hello"], [message.content for message in messages])
+                await conversations[1].send("hi back")
+
+            asyncio.run(scenario())
+            self.assertEqual(["hi back"], [record["content"] for record in network.sent()])
+            self.assertIn("conversation send-text", {call["command"] for call in network.calls()})
+
+    def test_injected_errors_and_stream_crash_surface_as_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            network = FakeXmtpNetwork(
+                Path(tmp),
+                FakeXmtpConfig(conversations=1, error_rate=1.0, error_commands=["send-text"], stream_crash_after=1),
+            )
+            client = _client(network)
+
+            async def scenario() -> None:
+                conversation = await client.conversations.get_conversation_by_id(conversation_id(0))
+                assert conversation is not None
+                with self.assertRaisesRegex(RuntimeError, "timeout"):
+                    await conversation.send("dropped")
+
+                stream = client.conversations.stream_all_messages()
+                try:
+                    first = asyncio.ensure_future(stream.__anext__())
+                    await asyncio.sleep(0.5)
+                    network.inject(0, "streamed")
+                    self.assertEqual("streamed", (await asyncio.wait_for(first, timeout=10)).content)
+                    with self.assertRaisesRegex(RuntimeError, "stream-all-messages failed"):
+                        await asyncio.wait_for(stream.__anext__(), timeout=10)
+                finally:
+                    await stream.close()
+
+            asyncio.run(scenario())
+
+    def test_benchmark_recovers_from_stream_crashes(self) -> None:
+        config = BenchConfig(
+            messages=12,
+            conversations=3,
+            rate_per_s=30.0,
+            latency_ms=0.0,
+            latency_jitter_ms=0.0,
+            stream_crash_after=4,
+            history_messages=5,
+            poll_interval_s=0.2,
+            poll_stable_cycles=1,
+            reconnect_scale=0.05,
+            timeout_s=60.0,
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            report = asyncio.run(run_benchmark(config, Path(tmp)))
+        self.assertEqual(12, report.injected)
+        self.assertEqual(0, report.lost)
+        self.assertEqual(0, report.duplicates)
+        self.assertEqual(0, report.history_replies)
+        self.assertGreaterEqual(report.stream_crashes, 1)
+        self.assertTrue(report.recovery_s)
+        self.assertTrue(any(line.startswith("reply latency:") for line in report.lines()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from takobot.xmtp_outbox import XmtpOutbox, retry_delay
+
+
+class TestXmtpOutbox(unittest.TestCase):
+    def test_conversations_send_concurrently_and_stay_ordered(self) -> None:
+        events: list[str] = []
+
+        async def send_fn(conversation_id: str, text: str, _conversation) -> str:
+            events.append(f"start:{text}")
+            await asyncio.sleep(0.2 if text == "a1" else 0.01)
+            events.append(f"end:{text}")
+            return f"id-{text}"
+
+        async def scenario() -> list[str]:
+            outbox = XmtpOutbox(send_fn, max_concurrency=2)
+            results = await asyncio.gather(
+                outbox.send("aa", "a1"),
+                outbox.send("aa", "a2"),
+                outbox.send("bb", "b1"),
+            )
+            await outbox.close()
+            self.assertEqual(3, outbox.stats.sent)
+            self.assertEqual(0, outbox.depth)
+            return list(results)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(["id-a1", "id-a2", "id-b1"], results)
+        self.assertLess(events.index("end:b1"), events.index("end:a1"))
+        self.assertLess(events.index("end:a1"), events.index("start:a2"))
+
+    def test_retries_transient_errors_and_surfaces_permanent_ones(self) -> None:
+        calls: list[str] = []
+
+        async def send_fn(_conversation_id: str, text: str, _conversation) -> str:
+            calls.append(text)
+            if text == "flaky" and calls.count("flaky") < 3:
+                raise RuntimeError("timeout")
+            if text == "broken":
+                raise ValueError("permanent")
+            return "ok"
+
+        async def scenario() -> None:
+            outbox = XmtpOutbox(
+                send_fn,
+                retry_base_s=0.0,
+                is_retryable=lambda exc: isinstance(exc, RuntimeError),
+            )
+            self.assertEqual("ok", await outbox.send("aa", "flaky"))
+            with self.assertRaises(ValueError):
+                await outbox.send("aa", "broken")
+            await outbox.close()
+            self.assertEqual(2, outbox.stats.retries)
+            self.assertEqual(1, outbox.stats.failed)
+
+        asyncio.run(scenario())
+        self.assertEqual(["flaky", "flaky", "flaky", "broken"], calls)
+
+    def test_failures_are_dead_lettered_and_ambiguous_timeouts_are_not_retried(self) -> None:
+        calls: list[str] = []
+
+        async def send_fn(_conversation_id: str, text: str, _conversation) -> str:
+            calls.append(text)
+            if text == "slow":
+                raise TimeoutError("xmtp bridge call timed out: conversation.sendText")
+            raise RuntimeError("unavailable")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dead_letter = Path(tmp) / "xmtp_outbox_failed.jsonl"
+
+            async def scenario() -> XmtpOutbox:
+                outbox = XmtpOutbox(
+                    send_fn,
+                    spool_path=Path(tmp) / "xmtp_outbox.jsonl",
+                    dead_letter_path=dead_letter,
+                    max_attempts=3,
+                    retry_base_s=0.0,
+                    is_ambiguous=lambda exc: "timed out" in str(exc),
+                )
+                with self.assertRaises(TimeoutError):
+                    await outbox.send("aa", "slow")
+                outbox.post("aa", "presence")
+                await outbox.drain(timeout_s=2.0)
+                await outbox.close()
+                return outbox
+
+            outbox = asyncio.run(scenario())
+            self.assertEqual(["slow", "presence", "presence", "presence"], calls)
+            records = [json.loads(line) for line in dead_letter.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([("slow", True), ("presence", False)], [(r["text"], r["ambiguous"]) for r in records])
+            self.assertIn("dead_letter=2", outbox.summary())
+            self.assertEqual(2, XmtpOutbox(send_fn, dead_letter_path=dead_letter).dead_letter_count())
+
+    def test_system_messages_coalesce_but_replies_do_not(self) -> None:
+        sent: list[str] = []
+
+        async def send_fn(_conversation_id: str, text: str, _conversation) -> str:
+            sent.append(text)
+            return "ok"
+
+        async def scenario() -> None:
+            outbox = XmtpOutbox(send_fn, coalesce_window_s=0.05)
+            outbox.post("aa", "note one")
+            outbox.post("aa", "note two")
+            await outbox.send("aa", "reply")
+            await outbox.close()
+            self.assertEqual(1, outbox.stats.coalesced)
+
+        asyncio.run(scenario())
+        self.assertEqual(["note one\nnote two", "reply"], sent)
+
+    def test_unsent_messages_survive_restart_via_spool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = Path(tmp) / "xmtp_outbox.jsonl"
+
+            async def failing_send(_conversation_id: str, _text: str, _conversation) -> str:
+                await asyncio.sleep(10)
+                return "never"
+
+            async def first_run() -> None:
+                outbox = XmtpOutbox(failing_send, spool_path=spool, coalesce_window_s=0.0)
+                outbox.post("aa", "queued before shutdown")
+                await asyncio.sleep(0.01)
+                await outbox.close(timeout_s=0.01)
+
+            asyncio.run(first_run())
+            records = [json.loads(line) for line in spool.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(["add"], [record["op"] for record in records])
+
+            sent: list[tuple[str, str]] = []
+
+            async def send_fn(conversation_id: str, text: str, _conversation) -> str:
+                sent.append((conversation_id, text))
+                return "ok"
+
+            async def second_run() -> int:
+                outbox = XmtpOutbox(send_fn, spool_path=spool, coalesce_window_s=0.0)
+                restored = outbox.restore()
+                self.assertTrue(await outbox.drain(timeout_s=2.0))
+                await outbox.close()
+                return restored
+
+            self.assertEqual(1, asyncio.run(second_run()))
+            self.assertEqual([("aa", "queued before shutdown")], sent)
+
+            async def third_run() -> int:
+                outbox = XmtpOutbox(send_fn, spool_path=spool)
+                return outbox.restore()
+
+            self.assertEqual(0, asyncio.run(third_run()))
+
+    def test_retry_delay_is_capped_and_jittered(self) -> None:
+        for attempt in range(1, 8):
+            delay = retry_delay(attempt, base_s=0.5, max_s=4.0)
+            step = min(4.0, 0.5 * 2 ** (attempt - 1))
+            self.assertGreaterEqual(delay, step * 0.5)
+            self.assertLessEqual(delay, step)
+
+
+if __name__ == "__main__":
+    unittest.main()
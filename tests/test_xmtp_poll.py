@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+import unittest
+
+from takobot.cli import _poll_new_messages, _prime_seen_messages, _resume_seen_messages
+from takobot.seen_ids import SeenIdStore
+from takobot.xmtp_poll import XmtpPollCursors
+
+BASE = datetime(2026, 2, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _message(convo_id: bytes, index: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=convo_id + bytes([index]),
+        conversation_id=convo_id,
+        sender_inbox_id="peer",
+        content=f"message {index}",
+        sent_at=BASE + timedelta(seconds=index),
+    )
+
+
+class _FakeConversations:
+    def __init__(self) -> None:
+        self.history: dict[bytes, list[SimpleNamespace]] = {b"\xaa": [_message(b"\xaa", 1)], b"\xbb": [_message(b"\xbb", 1)]}
+        self.message_calls: list[tuple[bytes, datetime | None]] = []
+
+    async def sync_all_conversations(self) -> None:
+        return None
+
+    async def list(self) -> list[SimpleNamespace]:
+        out = []
+        for convo_id, items in self.history.items():
+            last = items[-1]
+            out.append(SimpleNamespace(id=convo_id, activity_marker=f"{last.id.hex()}@{last.sent_at.isoformat()}"))
+        return out
+
+    async def messages(
+        self,
+        convo_id: bytes,
+        *,
+        limit: int,
+        sent_after: datetime | None = None,
+        direction: str = "ascending",
+    ) -> list[SimpleNamespace]:
+        self.message_calls.append((convo_id, sent_after))
+        items = self.history[convo_id]
+        if sent_after is not None:
+            items = [item for item in items if item.sent_at >= sent_after]
+        if direction == "descending":
+            items = list(reversed(items))
+        return items[:limit]
+
+
+class TestXmtpPollCursors(unittest.TestCase):
+    def test_idle_inbox_skips_message_fetches_and_new_messages_use_cursor(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cursor_path = Path(tmp) / "xmtp_poll_cursors.json"
+            conversations = _FakeConversations()
+            client = SimpleNamespace(conversations=conversations)
+            seen = SeenIdStore(capacity=100)
+            cursors = XmtpPollCursors(cursor_path)
+
+            asyncio.run(_prime_seen_messages(client, seen, cursors))
+            self.assertEqual(2, len(conversations.message_calls))
+            self.assertTrue(cursor_path.exists())
+
+            conversations.message_calls.clear()
+            idle = asyncio.run(_poll_new_messages(client, seen, cursors))
+            self.assertEqual([], idle)
+            self.assertEqual([], conversations.message_calls)
+
+            conversations.history[b"\xaa"].append(_message(b"\xaa", 2))
+            fresh = asyncio.run(_poll_new_messages(client, seen, cursors))
+            self.assertEqual(["message 2"], [item.content for item in fresh])
+            self.assertEqual([(b"\xaa", BASE + timedelta(seconds=1))], conversations.message_calls)
+
+            restarted = XmtpPollCursors(cursor_path)
+            conversations.message_calls.clear()
+            asyncio.run(_poll_new_messages(client, SeenIdStore(capacity=100), restarted))
+            self.assertEqual([], conversations.message_calls)
+
+    def test_priming_a_long_conversation_starts_at_its_head(self) -> None:
+        conversations = _FakeConversations()
+        conversations.history = {b"\xaa": [_message(b"\xaa", index) for index in range(200)]}
+        client = SimpleNamespace(conversations=conversations)
+        seen = SeenIdStore(capacity=1_000)
+        cursors = XmtpPollCursors()
+
+        asyncio.run(_prime_seen_messages(client, seen, cursors))
+        self.assertEqual(BASE + timedelta(seconds=199), cursors.sent_after(b"\xaa".hex()))
+
+        # No new traffic: nothing from the older pages may be dispatched, even once the marker changes.
+        self.assertEqual([], asyncio.run(_poll_new_messages(client, seen, cursors)))
+        cursors.advance(b"\xaa".hex(), [], marker="", complete=False)
+        self.assertEqual([], asyncio.run(_poll_new_messages(client, seen, cursors)))
+
+        conversations.history[b"\xaa"].append(_message(b"\xaa", 200))
+        fresh = asyncio.run(_poll_new_messages(client, seen, cursors))
+        self.assertEqual(["message 200"], [item.content for item in fresh])
+
+    def test_resume_from_persisted_ledger_skips_history_and_drops_stale_backlog(self) -> None:
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            conversations = _FakeConversations()
+            client = SimpleNamespace(conversations=conversations)
+            seen = SeenIdStore(root / "xmtp_seen.ids", capacity=100)
+            asyncio.run(_prime_seen_messages(client, seen, XmtpPollCursors(root / "cursors.json")))
+
+            conversations.history[b"\xaa"].append(_message(b"\xaa", 2))
+            recent = _message(b"\xbb", 3)
+            recent.sent_at = datetime.now(tz=timezone.utc)
+            conversations.history[b"\xbb"].append(recent)
+            conversations.message_calls.clear()
+
+            restarted_seen = SeenIdStore(root / "xmtp_seen.ids", capacity=100)
+            self.assertEqual(2, len(restarted_seen))
+            backlog = asyncio.run(
+                _resume_seen_messages(client, restarted_seen, XmtpPollCursors(root / "cursors.json"), max_age_s=600)
+            )
+
+            self.assertEqual([recent.content], [item.content for item in backlog])
+            self.assertTrue(all(sent_after is not None for _convo, sent_after in conversations.message_calls))
+            self.assertIn(_message(b"\xaa", 2).id, SeenIdStore(root / "xmtp_seen.ids", capacity=100))
+
+    def test_resume_after_rebuild_applies_the_age_cutoff_by_default(self) -> None:
+        conversations = _FakeConversations()
+        client = SimpleNamespace(conversations=conversations)
+        seen = SeenIdStore(capacity=100)
+        cursors = XmtpPollCursors()
+        asyncio.run(_prime_seen_messages(client, seen, cursors))
+
+        # Backlog that piled up while the stream was down: one stale, one recent.
+        conversations.history[b"\xaa"].append(_message(b"\xaa", 2))
+        recent = _message(b"\xaa", 3)
+        recent.sent_at = datetime.now(tz=timezone.utc)
+        conversations.history[b"\xaa"].append(recent)
+
+        backlog = asyncio.run(_resume_seen_messages(client, seen, cursors))
+        self.assertEqual([recent.content], [item.content for item in backlog])
+        self.assertIn(_message(b"\xaa", 2).id, seen)
+
+
+if __name__ == "__main__":
+    unittest.main()
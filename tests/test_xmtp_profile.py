@@ -208,6 +208,75 @@ class TestXmtpProfile(unittest.TestCase):
             self.assertEqual(["aabb"], helper_kwargs["dm_conversation_ids"])
             self.assertEqual([], helper_kwargs["group_conversation_ids"])
 
+    def test_publish_profile_message_skips_helper_when_payload_already_recorded(self) -> None:
+        dm = SimpleNamespace(id_hex="11" * 16, type="dm", peer_inbox_id="peer-inbox")
+        client = SimpleNamespace(inbox_id="self-inbox", conversations=_FakeConversations(dms=[dm]))
+
+        with TemporaryDirectory() as tmp:
+            state_dir = Path(tmp) / "state"
+            helper = AsyncMock(
+                return_value={"fallbackSelfSent": True, "sentConversationIds": [dm.id_hex], "errors": []}
+            )
+            with patch("takobot.xmtp._run_profile_helper", new=helper):
+                for _ in range(2):
+                    asyncio.run(publish_profile_message(client, state_dir=state_dir, identity_name="InkTako"))
+                self.assertEqual(1, helper.await_count)
+
+                asyncio.run(publish_profile_message(client, state_dir=state_dir, identity_name="Renamed"))
+                self.assertEqual(2, helper.await_count)
+            self.assertEqual([], list(state_dir.glob(".*.tmp")))
+
+    def test_concurrent_conversation_publishes_share_one_helper_run(self) -> None:
+        targets = [SimpleNamespace(id_hex=f"{idx:02x}" * 16, type="dm", peer_inbox_id=f"peer-{idx}") for idx in range(3)]
+        client = SimpleNamespace(inbox_id="self-inbox", conversations=_FakeConversations())
+        batches: list[list[str]] = []
+
+        async def fake_helper(_client, **kwargs):
+            batches.append(list(kwargs["dm_conversation_ids"]))
+            await asyncio.sleep(0.05)
+            return {"fallbackSelfSent": False, "sentConversationIds": kwargs["dm_conversation_ids"], "errors": []}
+
+        async def scenario(state_dir: Path) -> None:
+            await asyncio.gather(
+                *(
+                    ensure_profile_message_for_conversation(client, target, state_dir=state_dir, identity_name="InkTako")
+                    for target in targets
+                )
+            )
+
+        with TemporaryDirectory() as tmp:
+            state_dir = Path(tmp) / "state"
+            with patch("takobot.xmtp._run_profile_helper", new=fake_helper):
+                asyncio.run(scenario(state_dir))
+            state_payload = json.loads((state_dir / "xmtp-profile-broadcast.json").read_text(encoding="utf-8"))
+
+        self.assertEqual([[targets[0].id_hex], sorted([targets[1].id_hex, targets[2].id_hex])], batches)
+        self.assertEqual(3, len(state_payload["peer_sent"]))
+
+    def test_folded_targets_report_their_own_outcome(self) -> None:
+        targets = [SimpleNamespace(id_hex=f"{idx:02x}" * 16, type="dm", peer_inbox_id=f"peer-{idx}") for idx in range(3)]
+        client = SimpleNamespace(inbox_id="self-inbox", conversations=_FakeConversations())
+
+        async def fake_helper(_client, **kwargs):
+            await asyncio.sleep(0.05)
+            # The second target's send fails inside a run that another caller owns.
+            sent = [cid for cid in kwargs["dm_conversation_ids"] if cid != targets[1].id_hex]
+            return {"fallbackSelfSent": False, "sentConversationIds": sent, "errors": ["dm send failed"]}
+
+        async def scenario(state_dir: Path) -> list[object]:
+            return await asyncio.gather(
+                *(
+                    ensure_profile_message_for_conversation(client, target, state_dir=state_dir, identity_name="InkTako")
+                    for target in targets
+                )
+            )
+
+        with TemporaryDirectory() as tmp:
+            with patch("takobot.xmtp._run_profile_helper", new=fake_helper):
+                results = asyncio.run(scenario(Path(tmp) / "state"))
+
+        self.assertEqual([True, False, True], [result.target_published for result in results])
+
     def test_sync_identity_profile_writes_state_from_publish_result(self) -> None:
         client = SimpleNamespace(inbox_id="self-inbox", conversations=_FakeConversations())
         with TemporaryDirectory() as tmp:
@@ -6,6 +6,12 @@ import json
 from urllib.parse import parse_qs, quote_plus, unquote, urlparse
 from urllib.request import Request, urlopen
 
+try:
+    from takobot.http_cache import cached_fetch, tool_http_cache
+except Exception:  # noqa: BLE001
+    cached_fetch = None
+    tool_http_cache = None
+
 
 TOOL_MANIFEST = {
     "name": "web_search",
@@ -25,8 +31,8 @@ DEFAULT_MAX_BYTES = 1_500_000
 
 
 def run(input: dict, ctx: dict) -> dict:
-    del ctx
     payload = input if isinstance(input, dict) else {}
+    cache = _http_cache(ctx)
     query = _clean(str(payload.get("query") or ""))
     if not query:
         return {"ok": False, "error": "Missing input.query (string)."}
@@ -47,10 +53,23 @@ def run(input: dict, ctx: dict) -> dict:
         max_value=2_000,
     )
     render_js = _as_bool(payload.get("render_js"), default=False)
-
-    results = _search_duckduckgo_html(query, timeout_s=timeout_s, max_results=max_results)
+    max_stale_s = _as_optional_float(payload.get("max_stale_s"))
+
+    results = _search_duckduckgo_html(
+        query,
+        timeout_s=timeout_s,
+        max_results=max_results,
+        cache=cache,
+        max_stale_s=max_stale_s,
+    )
     if not results:
-        results = _search_duckduckgo_instant(query, timeout_s=timeout_s, max_results=max_results)
+        results = _search_duckduckgo_instant(
+            query,
+            timeout_s=timeout_s,
+            max_results=max_results,
+            cache=cache,
+            max_stale_s=max_stale_s,
+        )
     if not results:
         return {"ok": True, "query": query, "results": [], "count": 0, "source": "duckduckgo"}
 
@@ -61,6 +80,8 @@ def run(input: dict, ctx: dict) -> dict:
                 timeout_s=timeout_s,
                 max_chars=page_text_chars,
                 render_js=render_js,
+                cache=cache,
+                max_stale_s=max_stale_s,
             )
             if fetched.get("ok"):
                 preview = _clean(str(fetched.get("text") or ""))
@@ -81,20 +102,26 @@ def run(input: dict, ctx: dict) -> dict:
     }
 
 
-def _search_duckduckgo_html(query: str, *, timeout_s: float, max_results: int) -> list[dict]:
+def _search_duckduckgo_html(
+    query: str,
+    *,
+    timeout_s: float,
+    max_results: int,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> list[dict]:
     url = f"https://duckduckgo.com/html/?q={quote_plus(query)}"
-    request = Request(
-        url,
-        headers={
-            "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
-            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
-        },
-        method="GET",
-    )
     try:
-        with urlopen(request, timeout=timeout_s) as response:
-            charset = response.headers.get_content_charset() or "utf-8"
-            raw = response.read(DEFAULT_MAX_BYTES + 1)
+        _final_url, _content_type, charset, raw = _http_get(
+            url,
+            headers={
+                "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+            },
+            timeout_s=timeout_s,
+            cache=cache,
+            max_stale_s=max_stale_s,
+        )
     except Exception:
         return []
     if len(raw) > DEFAULT_MAX_BYTES:
@@ -121,20 +148,27 @@ def _search_duckduckgo_html(query: str, *, timeout_s: float, max_results: int) -
     return out
 
 
-def _search_duckduckgo_instant(query: str, *, timeout_s: float, max_results: int) -> list[dict]:
+def _search_duckduckgo_instant(
+    query: str,
+    *,
+    timeout_s: float,
+    max_results: int,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> list[dict]:
     url = f"https://api.duckduckgo.com/?q={quote_plus(query)}&format=json&no_redirect=1&no_html=1&skip_disambig=0"
-    request = Request(
-        url,
-        headers={
-            "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
-            "Accept": "application/json,text/plain;q=0.4,*/*;q=0.1",
-        },
-        method="GET",
-    )
     try:
-        with urlopen(request, timeout=timeout_s) as response:
-            charset = response.headers.get_content_charset() or "utf-8"
-            payload = json.loads(response.read(DEFAULT_MAX_BYTES + 1).decode(charset, errors="replace"))
+        _final_url, _content_type, charset, raw = _http_get(
+            url,
+            headers={
+                "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
+                "Accept": "application/json,text/plain;q=0.4,*/*;q=0.1",
+            },
+            timeout_s=timeout_s,
+            cache=cache,
+            max_stale_s=max_stale_s,
+        )
+        payload = json.loads(raw.decode(charset, errors="replace"))
     except Exception:
         return []
     if not isinstance(payload, dict):
@@ -181,12 +215,20 @@ def _search_duckduckgo_instant(query: str, *, timeout_s: float, max_results: int
     return deduped
 
 
-def _fetch_page_preview(url: str, *, timeout_s: float, max_chars: int, render_js: bool) -> dict:
+def _fetch_page_preview(
+    url: str,
+    *,
+    timeout_s: float,
+    max_chars: int,
+    render_js: bool,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> dict:
     if render_js:
         rendered = _fetch_with_playwright(url, timeout_s=timeout_s, max_chars=max_chars)
         if rendered.get("ok"):
             return rendered
-    return _fetch_plain(url, timeout_s=timeout_s, max_chars=max_chars)
+    return _fetch_plain(url, timeout_s=timeout_s, max_chars=max_chars, cache=cache, max_stale_s=max_stale_s)
 
 
 def _fetch_with_playwright(url: str, *, timeout_s: float, max_chars: int) -> dict:
@@ -214,20 +256,25 @@ def _fetch_with_playwright(url: str, *, timeout_s: float, max_chars: int) -> dic
     return {"ok": True, "url": url, "title": title, "text": text, "render_mode": "playwright"}
 
 
-def _fetch_plain(url: str, *, timeout_s: float, max_chars: int) -> dict:
-    request = Request(
-        url,
-        headers={
-            "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
-            "Accept": "text/html,text/plain;q=0.9,*/*;q=0.2",
-        },
-        method="GET",
-    )
+def _fetch_plain(
+    url: str,
+    *,
+    timeout_s: float,
+    max_chars: int,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> dict:
     try:
-        with urlopen(request, timeout=timeout_s) as response:
-            charset = response.headers.get_content_charset() or "utf-8"
-            content_type = (response.headers.get("Content-Type") or "").lower()
-            raw = response.read(DEFAULT_MAX_BYTES + 1)
+        _final_url, content_type, charset, raw = _http_get(
+            url,
+            headers={
+                "User-Agent": "takobot-web-search/1.0 (+https://tako.bot)",
+                "Accept": "text/html,text/plain;q=0.9,*/*;q=0.2",
+            },
+            timeout_s=timeout_s,
+            cache=cache,
+            max_stale_s=max_stale_s,
+        )
     except Exception as exc:  # noqa: BLE001
         return {"ok": False, "error": _short(str(exc), 220)}
     if len(raw) > DEFAULT_MAX_BYTES:
@@ -247,6 +294,51 @@ def _fetch_plain(url: str, *, timeout_s: float, max_chars: int) -> dict:
     return {"ok": True, "url": url, "title": title, "text": text, "render_mode": "plain_http"}
 
 
+def _http_get(
+    url: str,
+    *,
+    headers: dict[str, str],
+    timeout_s: float,
+    cache=None,
+    max_stale_s: float | None = None,
+) -> tuple[str, str, str, bytes]:
+    if cache is not None:
+        cached = cached_fetch(
+            url,
+            headers=headers,
+            timeout_s=timeout_s,
+            max_bytes=DEFAULT_MAX_BYTES,
+            max_stale_s=max_stale_s,
+            cache=cache,
+            opener=urlopen,
+        )
+        return cached.final_url or url, cached.content_type.lower(), cached.charset, cached.body
+    request = Request(url, headers=headers, method="GET")
+    with urlopen(request, timeout=timeout_s) as response:
+        final_url = response.geturl() or url
+        content_type = (response.headers.get("Content-Type") or "").lower()
+        charset = response.headers.get_content_charset() or "utf-8"
+        raw = response.read(DEFAULT_MAX_BYTES + 1)
+    return final_url, content_type, charset, raw
+
+
+def _http_cache(ctx):
+    # `ctx.http_cache_dir` overrides the workspace's shared `.tako/state/http-cache`.
+    if tool_http_cache is None:
+        return None
+    cache_dir = _clean(str(ctx.get("http_cache_dir") or "")) if isinstance(ctx, dict) else ""
+    return tool_http_cache(cache_dir or None)
+
+
+def _as_optional_float(value) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except Exception:
+        return None
+
+
 def _unwrap_duckduckgo_href(href: str) -> str:
     raw = html.unescape(href)
     if raw.startswith("/l/?"):